@@ -0,0 +1,10 @@
+###
+# Async serving mode (API_SERVER_MODE=async)
+#
+# ASGI app for uvicorn, see backend/aio:
+#   uvicorn async_app:app --host 0.0.0.0 --port 4000
+###
+from backend.aio import create_async_app
+from backend.rest_entry import create_app
+
+app = create_async_app(create_app())
@@ -0,0 +1,96 @@
+#------------------------------------------------------------
+# Async serving mode (API_SERVER_MODE=async, see async_app.py)
+#
+# An ASGI app served by uvicorn. The I/O-bound read routes listed in
+# backend.aio.routes run as coroutines on aiomysql, so one process
+# keeps many database round trips in flight instead of parking a
+# thread on each. Every other request (writes, exports, routes without
+# an async handler) is passed to the Flask app through asgiref's WSGI
+# adapter, which runs it in a thread pool exactly as before.
+#
+# The async routes skip the response cache, ETags and compression of
+# the Flask app: they are meant for the uncached, per-student reads.
+#------------------------------------------------------------
+import logging
+import time
+from urllib.parse import parse_qsl
+
+from asgiref.wsgi import WsgiToAsgi
+from werkzeug.exceptions import HTTPException
+from werkzeug.routing import RequestRedirect
+
+from backend.aio.db import adb
+from backend.aio.routes import EXPORTABLE, dispatch, url_map
+from backend.export import FORMATS
+from backend.json_provider import dumps_bytes
+
+logger = logging.getLogger(__name__)
+
+
+def _wants_export(args, headers):
+    fmt = args.get('format', '').lower()
+    if fmt and fmt != 'json':
+        return True
+    accept = headers.get(b'accept', b'').decode('latin-1')
+    return any(mimetype in accept for mimetype in FORMATS.values())
+
+
+class AsyncApp:
+    """ASGI entry point: async handlers first, the Flask app for the rest"""
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.wsgi = WsgiToAsgi(flask_app)
+        self.urls = url_map.bind('')
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self._lifespan(receive, send)
+        if scope['type'] != 'http' or scope['method'] != 'GET':
+            return await self.wsgi(scope, receive, send)
+
+        try:
+            endpoint, view_args = self.urls.match(scope['path'], method='GET')
+        except (HTTPException, RequestRedirect):
+            return await self.wsgi(scope, receive, send)
+
+        args = dict(parse_qsl(scope['query_string'].decode('latin-1')))
+        if endpoint in EXPORTABLE and _wants_export(args, dict(scope['headers'])):
+            return await self.wsgi(scope, receive, send)
+
+        started = time.perf_counter()
+        body, status = await dispatch(endpoint, args, view_args)
+        payload = dumps_bytes(body)
+        total = (time.perf_counter() - started) * 1000
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(payload)).encode()),
+                (b'server-timing', f'total;dur={total:.2f}'.encode()),
+            ],
+        })
+        await send({'type': 'http.response.body', 'body': payload})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                try:
+                    await adb.open(self.flask_app.config)
+                except Exception as e:
+                    logger.error(f'async mode: cannot open the database pool: {str(e)}')
+                    await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                    return
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await adb.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+def create_async_app(flask_app):
+    """Wrap the Flask app from create_app() in the async serving mode"""
+    flask_app.config.setdefault('MYSQL_ASYNC_POOL_SIZE', 20)
+    return AsyncApp(flask_app)
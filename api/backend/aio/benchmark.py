@@ -0,0 +1,147 @@
+###
+# Sync vs async serving mode benchmark
+#
+# Start the API once per mode (API_SERVER_MODE=production and
+# API_SERVER_MODE=async, on different ports) and run:
+#   python -m backend.aio.benchmark --sync-url http://localhost:4000 \
+#          --async-url http://localhost:4001 --concurrency 64 --requests 5000
+#
+# Each run keeps `concurrency` keep-alive connections busy with the
+# student dashboard reads (for user ids drawn from --users) and reports
+# throughput and latency percentiles per mode. Only the standard
+# library is used, so it runs anywhere the API code does.
+###
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import sys
+import time
+from urllib.parse import urlsplit
+
+from backend.loadtest.client import parse_ids, percentile, read_response
+
+DEFAULT_PATHS = (
+    '/student/{user_id}/dashboard',
+    '/student/info/{user_id}',
+    '/student/{user_id}/resume',
+    '/student/{user_id}/applications/history?limit=20',
+)
+
+
+async def _client(base_url, requests, results):
+    url = urlsplit(base_url)
+    host, port = url.hostname, url.port or 80
+    reader = writer = None
+    for path in requests:
+        started = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            writer.write((f'GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\n'
+                          f'Accept: application/json\r\nAccept-Encoding: identity\r\n\r\n').encode())
+            await writer.drain()
+            status, body, headers = await read_response(reader)
+            if headers.get('connection', '').lower() == 'close':
+                writer.close()
+                writer = None
+        except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+            results['errors'] += 1
+            results['last_error'] = str(e)
+            if writer is not None:
+                writer.close()
+            writer = None
+            continue
+        results['latencies'].append(time.perf_counter() - started)
+        results['bytes'] += len(body)
+        if status >= 500:
+            results['errors'] += 1
+        results['status'][status] = results['status'].get(status, 0) + 1
+    if writer is not None:
+        writer.close()
+
+
+def request_paths(paths, user_ids, total, seed):
+    """The same pseudo-random request mix for every mode"""
+    rng = random.Random(seed)
+    cycle = itertools.cycle(paths)
+    return [next(cycle).format(user_id=rng.choice(user_ids)) for _ in range(total)]
+
+
+async def run(base_url, paths, concurrency):
+    results = {'latencies': [], 'errors': 0, 'bytes': 0, 'status': {}, 'last_error': None}
+    # spread the requests over the connections round-robin
+    shares = [paths[n::concurrency] for n in range(concurrency)]
+    started = time.perf_counter()
+    await asyncio.gather(*(_client(base_url, share, results) for share in shares if share))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(results['latencies'])
+    return {
+        'url': base_url,
+        'requests': len(paths),
+        'concurrency': concurrency,
+        'seconds': round(elapsed, 3),
+        'throughput': round(len(latencies) / elapsed, 1) if elapsed else None,
+        'p50_ms': _ms(percentile(latencies, 50)),
+        'p95_ms': _ms(percentile(latencies, 95)),
+        'p99_ms': _ms(percentile(latencies, 99)),
+        'max_ms': _ms(latencies[-1] if latencies else None),
+        'errors': results['errors'],
+        'last_error': results['last_error'],
+        'status': {str(code): count for code, count in sorted(results['status'].items())},
+        'bytes': results['bytes'],
+    }
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 2) if seconds is not None else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m backend.aio.benchmark',
+                                     description='Compare the sync and async serving modes')
+    parser.add_argument('--sync-url', default='http://localhost:4000')
+    parser.add_argument('--async-url', default='http://localhost:4001')
+    parser.add_argument('--concurrency', type=int, default=32, help='open connections')
+    parser.add_argument('--requests', type=int, default=2000, help='requests per mode')
+    parser.add_argument('--warmup', type=int, default=200, help='unmeasured requests per mode')
+    parser.add_argument('--users', default='1-30', help='student ids, e.g. 1-500 or 3,7,9')
+    parser.add_argument('--path', action='append', dest='paths',
+                        help='path template with {user_id} (repeatable)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', action='store_true', help='print the results as JSON')
+    args = parser.parse_args(argv)
+
+    paths = request_paths(args.paths or DEFAULT_PATHS, parse_ids(args.users),
+                          args.requests, args.seed)
+    warmup = request_paths(args.paths or DEFAULT_PATHS, parse_ids(args.users),
+                           args.warmup, args.seed + 1)
+
+    report = {}
+    for mode, url in (('sync', args.sync_url), ('async', args.async_url)):
+        if warmup:
+            asyncio.run(run(url, warmup, args.concurrency))
+        report[mode] = asyncio.run(run(url, paths, args.concurrency))
+
+    if report['sync']['throughput'] and report['async']['throughput']:
+        report['speedup'] = round(report['async']['throughput'] / report['sync']['throughput'], 2)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{'mode':<6} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'errors':>7}")
+        for mode in ('sync', 'async'):
+            r = report[mode]
+            print(f"{mode:<6} {r['throughput'] or 0:>9} {r['p50_ms'] or 0:>8} {r['p95_ms'] or 0:>8} "
+                  f"{r['p99_ms'] or 0:>8} {r['max_ms'] or 0:>8} {r['errors']:>7}")
+        if 'speedup' in report:
+            print(f"async / sync throughput: {report['speedup']}x")
+
+    failed = any(report[mode]['errors'] == report[mode]['requests'] for mode in ('sync', 'async'))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,65 @@
+#------------------------------------------------------------
+# aiomysql connection pool for the async serving mode
+#
+# Same MYSQL_DATABASE_* settings as backend.db_connection; its size is
+# MYSQL_ASYNC_POOL_SIZE. The pool is opened at ASGI lifespan startup
+# and closed at shutdown (see backend.aio.AsyncApp).
+#------------------------------------------------------------
+import aiomysql
+
+
+class AsyncMySQLPool:
+    """
+    Handlers run one query per call of fetchone / fetchall, each on a
+    connection borrowed from the pool for just that query. Autocommit is
+    on: the async routes only read.
+    """
+
+    def __init__(self):
+        self._pool = None
+
+    async def open(self, config):
+        self._pool = await aiomysql.create_pool(
+            host=config['MYSQL_DATABASE_HOST'],
+            port=config['MYSQL_DATABASE_PORT'],
+            user=config['MYSQL_DATABASE_USER'],
+            password=config['MYSQL_DATABASE_PASSWORD'],
+            db=config['MYSQL_DATABASE_DB'],
+            charset=config.get('MYSQL_DATABASE_CHARSET', 'utf8mb4'),
+            minsize=config.get('MYSQL_ASYNC_POOL_MIN', 1),
+            maxsize=config.get('MYSQL_ASYNC_POOL_SIZE', 20),
+            pool_recycle=int(config.get('MYSQL_POOL_RECYCLE', 3600)),
+            cursorclass=aiomysql.DictCursor,
+            autocommit=True,
+        )
+
+    async def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            await self._pool.wait_closed()
+            self._pool = None
+
+    async def fetchone(self, query, args=None):
+        async with self._pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, args)
+                return await cursor.fetchone()
+
+    async def fetchall(self, query, args=None):
+        async with self._pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, args)
+                return list(await cursor.fetchall())
+
+    def stats(self):
+        if self._pool is None:
+            return {'open': False}
+        return {
+            'open': True,
+            'size': self._pool.size,
+            'free': self._pool.freesize,
+            'max_size': self._pool.maxsize,
+        }
+
+
+adb = AsyncMySQLPool()
@@ -0,0 +1,169 @@
+#------------------------------------------------------------
+# Async handlers of the read-only routes
+#
+# Each handler mirrors the Flask view of the same path and runs the
+# very same query (the *_QUERY constants of the blueprints), so both
+# serving modes return identical bodies. A handler gets the query
+# string args and the URL variables and returns (body, status).
+#------------------------------------------------------------
+import logging
+
+from werkzeug.routing import Map, Rule
+
+from backend.aio.db import adb
+from backend.hr import hr_routes
+from backend.maintenance_staff import maintenance_staff_routes
+from backend.pagination import CursorError, keyset_condition, order_clause, page_args, page_response
+from backend.school_admin import school_admin_routes
+from backend.student import student_routes
+
+logger = logging.getLogger(__name__)
+
+# endpoint name -> async handler
+HANDLERS = {}
+# endpoints that can also stream an export; those requests go to Flask
+EXPORTABLE = set()
+
+url_map = Map()
+
+
+def route(rule, exportable=False):
+    def decorator(handler):
+        endpoint = f'{handler.__module__}.{handler.__name__}'
+        url_map.add(Rule(rule, endpoint=endpoint, methods=['GET']))
+        HANDLERS[endpoint] = handler
+        if exportable:
+            EXPORTABLE.add(endpoint)
+        return handler
+    return decorator
+
+
+async def _page(query, sort_keys, params, args, cursor_fields, hidden=()):
+    """One keyset page of `query`, a template with {keyset} and {order}"""
+    limit, after = page_args(sort_keys, args=args)
+    keyset, keyset_params = keyset_condition(sort_keys, after)
+    rows = await adb.fetchall(query.format(keyset=keyset, order=order_clause(sort_keys)),
+                              (*params, *keyset_params, limit + 1))
+    return page_response(rows, limit, cursor_fields, hidden=hidden)
+
+
+#------------------------------------------------------------
+# Student
+@route('/student/info/<int:user_id>')
+async def student_info(args, user_id):
+    student_info = await adb.fetchone(student_routes.STUDENT_INFO_QUERY, (user_id,))
+    if not student_info:
+        return {'error': 'Student not found'}, 404
+    return student_info, 200
+
+
+@route('/student/<int:user_id>/dashboard')
+async def student_dashboard(args, user_id):
+    dashboard = await adb.fetchone(student_routes.DASHBOARD_QUERY, (user_id,))
+    if not dashboard:
+        return {'error': 'Student not found'}, 404
+    return dashboard, 200
+
+
+@route('/student/<int:user_id>/metrics')
+async def student_metrics(args, user_id):
+    dashboard = await adb.fetchone(student_routes.DASHBOARD_QUERY, (user_id,))
+    if not dashboard:
+        return {'error': 'Student not found'}, 404
+    return {
+        'active_applications': dashboard['active_applications'],
+        'resume_versions': dashboard['resume_versions'],
+        'latest_coop': dashboard['latest_coop'],
+    }, 200
+
+
+@route('/student/<int:user_id>/resume')
+async def student_resume(args, user_id):
+    resume = await adb.fetchone(student_routes.CURRENT_RESUME_QUERY, (user_id,))
+    if not resume:
+        return {'message': 'No resume found for this student'}, 404
+    return resume, 200
+
+
+@route('/student/<int:user_id>/applications/active')
+async def student_active_applications(args, user_id):
+    applications = await adb.fetchall(student_routes.ACTIVE_APPLICATIONS_QUERY, (user_id,))
+    if not applications:
+        return {'message': 'No active applications found.'}, 404
+    return applications, 200
+
+
+@route('/student/<int:user_id>/applications/history')
+async def student_application_history(args, user_id):
+    return await _page(student_routes.HISTORY_QUERY, student_routes.HISTORY_SORT,
+                       (user_id,), args, ('sent_on', 'application_id')), 200
+
+
+@route('/student/<int:user_id>/applications/positions')
+async def student_available_positions(args, user_id):
+    return await _page(student_routes.POSITIONS_QUERY, student_routes.POSITIONS_SORT,
+                       (), args, ('posted_date', 'position_id')), 200
+
+
+#------------------------------------------------------------
+# HR
+@route('/hr/internships', exportable=True)
+async def hr_internships(args):
+    return await _page(hr_routes.INTERNSHIPS_QUERY + ' LIMIT %s', hr_routes.INTERNSHIPS_SORT,
+                       (), args, ('posted_date', 'position_id')), 200
+
+
+@route('/hr/applications', exportable=True)
+async def hr_applications(args):
+    status = args.get('status')
+    if status and status != 'all':
+        status_filter, params = 'ca.status = %s AND', (status,)
+    else:
+        status_filter, params = '', ()
+    # fill in the status filter, keep {keyset} / {order} for _page
+    query = hr_routes.APPLICATIONS_QUERY.format(status_filter=status_filter,
+                                                keyset='{keyset}', order='{order}')
+    return await _page(query + ' LIMIT %s', hr_routes.APPLICATIONS_SORT,
+                       params, args, ('application_id',)), 200
+
+
+@route('/hr/analytics/positions')
+async def hr_position_analytics(args):
+    return await adb.fetchall(hr_routes.ANALYTICS_QUERY), 200
+
+
+#------------------------------------------------------------
+# School admin
+@route('/school_admin/students/<int:user_id>/grades')
+async def school_admin_grades(args, user_id):
+    return await adb.fetchall(school_admin_routes.GRADES_QUERY, (user_id,)), 200
+
+
+@route('/school_admin/students/<int:user_id>/coops')
+async def school_admin_coops(args, user_id):
+    return await adb.fetchall(school_admin_routes.COOPS_QUERY, (user_id,)), 200
+
+
+#------------------------------------------------------------
+# Maintenance staff
+@route('/maintenance_staff/alerts', exportable=True)
+async def maintenance_alerts(args):
+    return await _page(maintenance_staff_routes.ALERTS_QUERY + ' LIMIT %s',
+                       maintenance_staff_routes.ALERTS_SORT, (), args,
+                       ('severity', 'alert_id'), hidden=('alert_id',)), 200
+
+
+@route('/maintenance_staff/databases')
+async def maintenance_databases(args):
+    return await adb.fetchall(maintenance_staff_routes.DATABASES_QUERY), 200
+
+
+async def dispatch(endpoint, args, view_args):
+    """Run the handler of `endpoint`; errors map to the Flask views' responses"""
+    try:
+        return await HANDLERS[endpoint](args, **view_args)
+    except CursorError as e:
+        return {'error': str(e)}, 400
+    except Exception as e:
+        logger.error(f'Error in {endpoint}: {str(e)}')
+        return {'error': str(e)}, 500
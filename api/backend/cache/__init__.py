@@ -0,0 +1,201 @@
+#------------------------------------------------------------
+# Response cache for read-heavy GET routes
+#
+#   @hr_bp.route('/internships', methods=['GET'])
+#   @cache.cached(tags=('positions', 'application_counts'))
+#   def get_internships(): ...
+#
+# Responses are keyed by path and query string and stored with their
+# tags; the write routes call cache.invalidate(<tag>) after committing.
+#
+# Every tag also has a version stamp that invalidate() replaces.
+# cache.conditional(tags=...) derives ETag / Last-Modified from the
+# stamps of a route's tags and answers 304 Not Modified before the view
+# (and MySQL) runs. cached() routes get this automatically.
+#------------------------------------------------------------
+import datetime
+import functools
+import hashlib
+import threading
+import time
+from urllib.parse import urlencode
+
+from flask import current_app, make_response, request
+
+from backend.cache.backends import CachedResponse, LRUBackend, RedisBackend
+
+
+class ResponseCache:
+    """
+    Flask extension holding the configured backend (CACHE_BACKEND = lru,
+    redis or none; lru only for a single server process). Backend errors are logged and treated as misses so a
+    cache outage never fails a request.
+    """
+
+    def __init__(self, app=None):
+        self._counters = {'hits': 0, 'misses': 0, 'stores': 0, 'invalidations': 0,
+                          'not_modified': 0, 'errors': 0}
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('CACHE_BACKEND', 'lru')
+        app.config.setdefault('CACHE_DEFAULT_TTL', 60)
+        app.config.setdefault('CACHE_MAX_ENTRIES', 1024)
+        app.config.setdefault('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+
+        app.config.setdefault('SERVER_PROCESSES', 1)
+
+        kind = app.config['CACHE_BACKEND']
+        if kind == 'lru' and app.config['SERVER_PROCESSES'] > 1:
+            # invalidate() only reaches the process it runs in, so every
+            # other worker would serve stale entries until the TTL runs out
+            raise ValueError(f"CACHE_BACKEND=lru keeps a separate cache in each of the "
+                             f"{app.config['SERVER_PROCESSES']} server processes; use redis or none")
+        if kind == 'lru':
+            backend = LRUBackend(max_entries=app.config['CACHE_MAX_ENTRIES'],
+                                 default_ttl=app.config['CACHE_DEFAULT_TTL'])
+        elif kind == 'redis':
+            backend = RedisBackend(app.config['CACHE_REDIS_URL'],
+                                   default_ttl=app.config['CACHE_DEFAULT_TTL'])
+        elif kind == 'none':
+            backend = None
+        else:
+            raise ValueError(f'unknown CACHE_BACKEND: {kind}')
+        app.extensions['response_cache'] = backend
+
+    @property
+    def backend(self):
+        return current_app.extensions.get('response_cache')
+
+    def _count(self, counter):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def _call(self, method, *args, **kwargs):
+        try:
+            return getattr(self.backend, method)(*args, **kwargs)
+        except Exception as e:
+            self._count('errors')
+            current_app.logger.warning(f'response cache {method} failed: {str(e)}')
+            return None
+
+    @staticmethod
+    def _request_key(base):
+        args = sorted(request.args.items(multi=True))
+        key = f'{base}?{urlencode(args)}' if args else base
+        # the same URL has other representations (e.g. NDJSON exports)
+        accept = request.headers.get('Accept', '*/*')
+        return key if accept in ('*/*', 'application/json') else f'{key}|{accept}'
+
+    def conditional(self, tags):
+        """
+        Add ETag and Last-Modified to successful GET responses of a view
+        whose data only changes when one of `tags` is invalidated, and
+        answer If-None-Match / If-Modified-Since with 304.
+        """
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(*args, **kwargs):
+                if self.backend is None or request.method != 'GET':
+                    return view(*args, **kwargs)
+
+                stamps = self._call('versions', [tag.format(**kwargs) for tag in tags])
+                if not stamps:
+                    return view(*args, **kwargs)
+
+                tokens = ','.join(stamp.token for stamp in stamps)
+                etag = hashlib.sha1(f'{self._request_key(request.path)}|{tokens}'.encode('utf-8')).hexdigest()
+                modified_at = int(max(stamp.modified_at for stamp in stamps))
+                last_modified = datetime.datetime.fromtimestamp(modified_at, datetime.timezone.utc)
+                # Last-Modified has whole seconds: while the stamp's second
+                # is still running, a write later in that second would keep
+                # the same value, so it is neither sent nor compared
+                settled = modified_at < int(time.time())
+
+                # If-Modified-Since only counts when no ETag was sent
+                if request.if_none_match:
+                    not_modified = request.if_none_match.contains_weak(etag)
+                else:
+                    not_modified = (settled and request.if_modified_since is not None
+                                    and request.if_modified_since >= last_modified)
+
+                if not_modified:
+                    self._count('not_modified')
+                    response = make_response('', 304)
+                else:
+                    response = make_response(view(*args, **kwargs))
+                    if response.status_code != 200:
+                        return response
+
+                response.set_etag(etag, weak=True)
+                if settled:
+                    response.last_modified = last_modified
+                return response
+            return wrapper
+        return decorator
+
+    def cached(self, tags=(), ttl=None, key=None):
+        """
+        Cache successful (200) responses of a GET view, which also
+        becomes conditional on the same tags. Tags may refer to the view
+        arguments, e.g. 'student:{user_id}'. `key` replaces the request
+        path in the cache key for views whose response does not depend
+        on every path argument.
+        """
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(*args, **kwargs):
+                if self.backend is None or request.method != 'GET':
+                    return view(*args, **kwargs)
+
+                cache_key = self._request_key(key.format(**kwargs) if key else request.path)
+                hit = self._call('get', cache_key)
+                if hit is not None:
+                    self._count('hits')
+                    response = make_response(hit.body, hit.status)
+                    response.headers['Content-Type'] = hit.content_type
+                    response.headers['X-Cache'] = 'HIT'
+                    return response
+
+                self._count('misses')
+                response = make_response(view(*args, **kwargs))
+                if response.status_code == 200 and not (response.direct_passthrough or response.is_streamed):
+                    entry = CachedResponse(response.status_code, response.content_type,
+                                           response.get_data())
+                    view_tags = [tag.format(**kwargs) for tag in tags]
+                    self._call('set', cache_key, entry, view_tags, ttl)
+                    self._count('stores')
+                response.headers['X-Cache'] = 'MISS'
+                return response
+            return self.conditional(tags)(wrapper)
+        return decorator
+
+    def invalidate(self, *tags):
+        """Drop every cached response stored with any of `tags` and bump their versions"""
+        if self.backend is None:
+            return 0
+        self._count('invalidations')
+        return self._call('invalidate', *tags) or 0
+
+    def clear(self):
+        """Drop every cached response and version stamp (e.g. after a bulk load)"""
+        if self.backend is None:
+            return
+        self._count('invalidations')
+        self._call('clear')
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 4) if lookups else None
+        if self.backend is None:
+            stats['backend'] = 'none'
+        else:
+            stats.update(self._call('stats') or {})
+        return stats
+
+
+cache = ResponseCache()
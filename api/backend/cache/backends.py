@@ -0,0 +1,224 @@
+#------------------------------------------------------------
+# Storage backends for the response cache
+#
+# Both backends store CachedResponse values under a string key, remember
+# which tags each key was stored with, and drop every key of a tag on
+# invalidate(). They also keep version stamps, (token, modified_at), that
+# back the ETag and Last-Modified headers: invalidate() writes a stamp
+# for each of its tags, and a tag that has none shares the epoch stamp
+# clear() starts. Reads never add stamps, so only tags that were written
+# since the last clear() take space.
+#------------------------------------------------------------
+import json
+import secrets
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+CachedResponse = namedtuple('CachedResponse', ('status', 'content_type', 'body'))
+Stamp = namedtuple('Stamp', ('token', 'modified_at'))
+
+
+def _new_stamp():
+    return Stamp(secrets.token_hex(8), time.time())
+
+
+class LRUBackend:
+    """
+    In-process cache holding at most `max_entries` responses. The least
+    recently used entry is evicted first, and entries older than their
+    TTL are dropped when they are next read.
+
+    Every worker process has its own copy, so an invalidation only
+    reaches the worker that handled the write; other workers keep
+    serving their entry until its TTL runs out, which is why
+    ResponseCache only allows it with a single server process.
+    """
+
+    name = 'lru'
+
+    def __init__(self, max_entries=1024, default_ttl=60):
+        if max_entries < 1:
+            raise ValueError('max_entries must be at least 1')
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+
+        self._entries = OrderedDict()   # key -> (expires_at, tags, value)
+        self._tags = {}                 # tag -> set of keys
+        self._stamps = {}               # tag -> Stamp
+        self._epoch = _new_stamp()
+        self._lock = threading.Lock()
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                self._expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def set(self, key, value, tags=(), ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, tuple(tags), value)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def versions(self, tags):
+        with self._lock:
+            return [self._stamps.get(tag, self._epoch) for tag in tags]
+
+    def invalidate(self, *tags):
+        removed = 0
+        with self._lock:
+            for tag in tags:
+                self._stamps[tag] = _new_stamp()
+                for key in self._tags.pop(tag, ()):
+                    if key in self._entries:
+                        self._remove(key)
+                        removed += 1
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self._stamps.clear()
+            self._epoch = _new_stamp()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': self.name,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'tags': len(self._tags),
+                'evictions': self._evictions,
+                'expirations': self._expirations,
+            }
+
+    def _remove(self, key):
+        _, tags, _ = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class RedisBackend:
+    """
+    Cache shared by every worker process (and every API container) through
+    Redis. A tag is a Redis set of the keys stored with it, so an
+    invalidation from any worker is seen by all of them. Size and
+    eviction are left to the server's maxmemory policy.
+    """
+
+    name = 'redis'
+
+    def __init__(self, url, default_ttl=60, prefix='susy:cache:'):
+        # only needed when this backend is selected
+        import redis
+
+        self.default_ttl = default_ttl
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+
+    def _key(self, key):
+        return f'{self.prefix}r:{key}'
+
+    def _tag(self, tag):
+        return f'{self.prefix}t:{tag}'
+
+    @property
+    def _versions_key(self):
+        return f'{self.prefix}v'
+
+    @property
+    def _epoch_key(self):
+        return f'{self.prefix}e'
+
+    @staticmethod
+    def _encode_stamp(stamp):
+        return f'{stamp.token}:{stamp.modified_at}'
+
+    @staticmethod
+    def _decode_stamp(raw):
+        token, _, modified_at = raw.decode('utf-8').partition(':')
+        return Stamp(token, float(modified_at))
+
+    def get(self, key):
+        raw = self._client.get(self._key(key))
+        if raw is None:
+            return None
+        header, _, body = raw.partition(b'\n')
+        status, content_type = json.loads(header)
+        return CachedResponse(status, content_type, body)
+
+    def set(self, key, value, tags=(), ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        raw = json.dumps([value.status, value.content_type]).encode('utf-8') + b'\n' + value.body
+
+        pipe = self._client.pipeline(transaction=False)
+        pipe.set(self._key(key), raw, ex=ttl)
+        for tag in tags:
+            pipe.sadd(self._tag(tag), key)
+            # a tag set has to outlive every key it lists
+            pipe.expire(self._tag(tag), ttl, gt=True)
+            pipe.expire(self._tag(tag), ttl, nx=True)
+        pipe.execute()
+
+    def versions(self, tags):
+        raw = self._client.hmget(self._versions_key, tags)
+        if any(value is None for value in raw):
+            # tags never invalidated share the epoch; the first reader of
+            # an empty Redis starts it, SET NX keeps readers agreeing on one
+            pipe = self._client.pipeline(transaction=False)
+            pipe.set(self._epoch_key, self._encode_stamp(_new_stamp()), nx=True)
+            pipe.get(self._epoch_key)
+            _, epoch = pipe.execute()
+            raw = [epoch if value is None else value for value in raw]
+        return [self._decode_stamp(value) for value in raw]
+
+    def invalidate(self, *tags):
+        if tags:
+            self._client.hset(self._versions_key, mapping={
+                tag: self._encode_stamp(_new_stamp()) for tag in tags
+            })
+        removed = 0
+        for tag in tags:
+            pipe = self._client.pipeline(transaction=True)
+            pipe.smembers(self._tag(tag))
+            pipe.delete(self._tag(tag))
+            keys, _ = pipe.execute()
+            if keys:
+                removed += self._client.delete(*(self._key(k.decode('utf-8')) for k in keys))
+        return removed
+
+    def clear(self):
+        for key in self._client.scan_iter(match=f'{self.prefix}*'):
+            if key.decode('utf-8') != self._epoch_key:
+                self._client.delete(key)
+        # a new epoch, so no tag keeps the ETag it had before
+        self._client.set(self._epoch_key, self._encode_stamp(_new_stamp()))
+
+    def stats(self):
+        info = self._client.info('stats')
+        return {
+            'backend': self.name,
+            'evictions': info.get('evicted_keys', 0),
+            'expirations': info.get('expired_keys', 0),
+        }
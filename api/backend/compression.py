@@ -0,0 +1,66 @@
+#------------------------------------------------------------
+# Negotiated response compression
+#
+# Responses of at least COMPRESS_MIN_SIZE bytes are compressed with
+# brotli (when the Brotli package is installed) or gzip, whichever the
+# client's Accept-Encoding prefers. Streamed responses are left alone.
+#------------------------------------------------------------
+import gzip
+import time
+
+from flask import current_app, request
+
+from backend import request_metrics
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'text/')
+
+
+def _encodings():
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+
+def _compressible(response):
+    if response.status_code < 200 or response.status_code in (204, 304):
+        return False
+    if response.direct_passthrough or response.is_streamed:
+        return False
+    if 'Content-Encoding' in response.headers:
+        return False
+    mimetype = response.mimetype or ''
+    return any(mimetype.startswith(t) for t in COMPRESSIBLE_TYPES)
+
+
+def compress_response(response):
+    if not _compressible(response):
+        return response
+    response.vary.add('Accept-Encoding')
+
+    body = response.get_data()
+    if len(body) < current_app.config['COMPRESS_MIN_SIZE']:
+        return response
+    encoding = request.accept_encodings.best_match(_encodings())
+    if encoding is None:
+        return response
+
+    started = time.perf_counter()
+    if encoding == 'br':
+        body = brotli.compress(body, quality=current_app.config['COMPRESS_BR_QUALITY'])
+    else:
+        body = gzip.compress(body, compresslevel=current_app.config['COMPRESS_GZIP_LEVEL'], mtime=0)
+    request_metrics.add_timing('compress', time.perf_counter() - started)
+
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def init_app(app):
+    app.config.setdefault('COMPRESS_MIN_SIZE', 1024)
+    app.config.setdefault('COMPRESS_GZIP_LEVEL', 6)
+    app.config.setdefault('COMPRESS_BR_QUALITY', 4)
+    app.after_request(compress_response)
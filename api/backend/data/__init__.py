@@ -0,0 +1,112 @@
+#------------------------------------------------------------
+# Named SQL statements for every database engine
+#
+#   STUDENT_INFO_QUERY = define('student.info', '''
+#       SELECT ... WHERE s.user_id = %s
+#   ''')
+#
+# Each statement the API runs is defined once, by name, next to the
+# code that runs it. A Query is its MySQL text (a str, so PyMySQL,
+# aiomysql and the query log take it as it is) and also carries the
+# text for the embedded SQLite engine (backend.data.sqlite). Without an
+# explicit `sqlite=` text, SQLite runs the MySQL text minus FOR UPDATE
+# [SKIP LOCKED]; a locking read there takes the database write lock
+# instead. Statements using MySQL-only syntax (CURDATE(), INTERVAL,
+# ON DUPLICATE KEY, UPDATE ... JOIN, GROUP_CONCAT ... SEPARATOR, ...)
+# pass their SQLite equivalent. The few with none (the job worker's
+# GET_LOCK slots) pass sqlite=MYSQL_ONLY and raise DialectError there.
+#
+# Both texts use PyMySQL's %s placeholders (%% for a literal %); the
+# SQLite cursor turns them into ? when it runs the statement.
+# Query.format() and + build a statement for both engines at once, so
+# templates keep working: a fragment that is itself a Query is
+# substituted by its own SQLite text.
+#
+# DB_ENGINE picks the engine of the app (backend.db_connection), and
+# `python -m backend.data plans` EXPLAINs every named query on it so
+# plans can be compared across engines.
+#------------------------------------------------------------
+import re
+
+DIALECTS = ('mysql', 'sqlite')
+
+# name -> Query, for every define()d statement
+QUERIES = {}
+
+LOCKING_READ = re.compile(r'(?:^|\s+)FOR\s+UPDATE(?:\s+SKIP\s+LOCKED)?\b', re.I)
+
+# sqlite= of a statement that has no SQLite equivalent
+MYSQL_ONLY = object()
+
+
+class DialectError(ValueError):
+    """A statement has no text for the engine asked to run it"""
+
+
+class Query(str):
+    """A SQL statement: its MySQL text, plus .name and .sqlite"""
+
+    def __new__(cls, name, mysql, sqlite=None):
+        query = super().__new__(cls, mysql)
+        query.name = name
+        query._sqlite = sqlite
+        return query
+
+    @property
+    def mysql(self):
+        return str(self)
+
+    @property
+    def mysql_only(self):
+        return self._sqlite is MYSQL_ONLY
+
+    @property
+    def sqlite(self):
+        if self.mysql_only:
+            raise DialectError(f'query {self.name!r} only runs on MySQL')
+        return self._sqlite if self._sqlite is not None else LOCKING_READ.sub('', self.mysql)
+
+    def text(self, dialect):
+        return self.sqlite if dialect == 'sqlite' else self.mysql
+
+    def format(self, **fragments):
+        if self.mysql_only:
+            return Query(self.name, self.mysql.format(**fragments), MYSQL_ONLY)
+        return Query(self.name, self.mysql.format(**fragments),
+                     self.sqlite.format(**{key: sqlite_text(value) for key, value in fragments.items()}))
+
+    def __add__(self, other):
+        if self.mysql_only:
+            return Query(self.name, self.mysql + str(other), MYSQL_ONLY)
+        return Query(self.name, self.mysql + str(other), self.sqlite + sqlite_text(other))
+
+
+def define(name, mysql, sqlite=None):
+    """Register and return the statement `name` (`mysql` may be a Query built from others)"""
+    if sqlite is None and isinstance(mysql, Query):
+        sqlite = mysql._sqlite
+    if name in QUERIES:
+        raise ValueError(f'query {name!r} is already defined')
+    query = QUERIES[name] = Query(name, mysql, sqlite)
+    return query
+
+
+def sqlite_text(statement):
+    """The SQLite text of a Query, or of a plain MySQL statement / fragment"""
+    if isinstance(statement, Query):
+        return statement.sqlite
+    return LOCKING_READ.sub('', str(statement))
+
+
+def statement_text(statement, dialect):
+    return sqlite_text(statement) if dialect == 'sqlite' else str(statement)
+
+
+def locks_rows(statement):
+    """Whether the MySQL text of `statement` is a locking read"""
+    return LOCKING_READ.search(str(statement)) is not None
+
+
+def query_name(statement):
+    """The name of a Query, None for a plain string"""
+    return getattr(statement, 'name', None)
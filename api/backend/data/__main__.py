@@ -0,0 +1,103 @@
+###
+# Data layer command line
+#
+#   DB_ENGINE=sqlite python -m backend.data plans --output plans-sqlite.json
+#   python -m backend.data plans --output plans-mysql.json
+#   python -m backend.data compare plans-mysql.json plans-sqlite.json
+#   python -m backend.data queries
+###
+import argparse
+import datetime
+import json
+import sys
+
+from backend.data import QUERIES, plans
+
+
+def _define_queries():
+    """Import the modules that define() the named queries"""
+    # rest_entry imports the blueprints and, through them, the rest
+    import backend.jobs.worker  # noqa: F401
+    import backend.rest_entry  # noqa: F401
+
+
+def _plans(output):
+    from backend.db_connection import db
+    from backend.rest_entry import create_app
+
+    _define_queries()
+    app = create_app()
+    with app.app_context():
+        conn = db.get_db()
+        found, unsampled = plans.samples(db.dialect)
+        report = {
+            'engine': db.dialect,
+            'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+            'plans': {key: plans.explain(conn, statement, params) for key, statement, params in found},
+            'unsampled': unsampled,
+        }
+        conn.rollback()
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"wrote {len(report['plans'])} plans ({report['engine']}) to {output}")
+    else:
+        for key, steps in report['plans'].items():
+            print(f'{key}\n    {plans.summary(steps)}')
+    for name in unsampled:
+        reason = 'MySQL only' if QUERIES[name].mysql_only else 'template fields without a sample'
+        print(f'NO PLAN  {name}: {reason}')
+    return 0
+
+
+def _compare(first_path, second_path):
+    with open(first_path) as f:
+        first = json.load(f)
+    with open(second_path) as f:
+        second = json.load(f)
+
+    rows = plans.compare(first, second)
+    for row in rows:
+        mark = '*' if row['differs'] else ' '
+        print(f"{mark} {row['query']}")
+        print(f"      {first['engine']:7} {row['plans'][0]}")
+        print(f"      {second['engine']:7} {row['plans'][1]}")
+    differing = sum(row['differs'] for row in rows)
+    print(f'{differing} of {len(rows)} queries reach a table differently (*)')
+    return 1 if differing else 0
+
+
+def _queries():
+    for name, query in sorted(QUERIES.items()):
+        if query.mysql_only:
+            dialect = 'mysql only'
+        else:
+            dialect = 'mysql+sqlite' if query._sqlite is not None else 'portable'
+        print(f'{name:48} {dialect}')
+    print(f'{len(QUERIES)} queries')
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m backend.data')
+    commands = parser.add_subparsers(dest='command', required=True)
+    plan = commands.add_parser('plans', help="EXPLAIN every named query on the app's engine (DB_ENGINE)")
+    plan.add_argument('--output', metavar='FILE', help='write the plans as JSON instead of printing them')
+    compare = commands.add_parser('compare', help='line up two plan files; exit 1 when a table is reached differently')
+    compare.add_argument('first')
+    compare.add_argument('second')
+    commands.add_parser('queries', help='list the named queries and whether they have a SQLite text')
+    args = parser.parse_args(argv)
+
+    if args.command == 'plans':
+        return _plans(args.output)
+    if args.command == 'compare':
+        return _compare(args.first, args.second)
+
+    _define_queries()
+    return _queries()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,179 @@
+#------------------------------------------------------------
+# Query plans in the same shape on both engines
+#
+# explain() runs EXPLAIN (MySQL) or EXPLAIN QUERY PLAN (SQLite) and
+# returns one step per table access, {'table', 'access', 'index',
+# 'rows', 'detail'}, where access is one of
+#
+#   search      index lookup or range (MySQL const / eq_ref / ref /
+#               range, SQLite SEARCH)
+#   index scan  every entry of an index, in index order
+#   scan        every row of the table
+#   sort        filesort / temporary table or B-tree for ORDER BY,
+#               GROUP BY or DISTINCT
+#   other       subqueries, co-routines, materialization (SQLite)
+#
+# `python -m backend.data plans` writes the plans of every named query
+# (backend.data.QUERIES, see samples()) on the app's engine and
+# `compare` lines up two such files, e.g. one per engine.
+#------------------------------------------------------------
+import re
+import string
+
+from pymysql.cursors import DictCursor
+
+from backend.data import QUERIES, sqlite_text
+
+_MYSQL_ACCESS = {'ALL': 'scan', 'index': 'index scan'}
+_SQLITE_STEP = re.compile(
+    r'^(SCAN|SEARCH) (\S+)(?: AS \S+)?(?: USING (?:(?:COVERING )?INDEX (\S+)|(INTEGER PRIMARY KEY|PRIMARY KEY)))?')
+
+
+def dialect_of(conn):
+    return getattr(conn, 'dialect', 'mysql')
+
+
+def _mysql_steps(rows):
+    steps = []
+    for row in rows:
+        extra = row.get('Extra') or ''
+        kind = row.get('type')
+        steps.append({
+            'table': row.get('table'),
+            'access': _MYSQL_ACCESS.get(kind, 'search') if kind else 'other',
+            'index': row.get('key'),
+            'rows': row.get('rows'),
+            'detail': f'type={kind} {extra}'.strip(),
+        })
+        if 'Using filesort' in extra or 'Using temporary' in extra:
+            steps.append({'table': row.get('table'), 'access': 'sort', 'index': None,
+                          'rows': None, 'detail': extra})
+    return steps
+
+
+def _sqlite_steps(rows):
+    steps = []
+    for row in rows:
+        detail = row['detail']
+        match = _SQLITE_STEP.match(detail)
+        if match:
+            verb, table, index, primary = match.groups()
+            if verb == 'SEARCH':
+                access = 'search'
+            else:
+                access = 'index scan' if index or primary else 'scan'
+            steps.append({'table': table, 'access': access,
+                          'index': index or ('PRIMARY' if primary else None),
+                          'rows': None, 'detail': detail})
+        elif detail.startswith('USE TEMP B-TREE'):
+            steps.append({'table': None, 'access': 'sort', 'index': None, 'rows': None, 'detail': detail})
+        else:
+            steps.append({'table': None, 'access': 'other', 'index': None, 'rows': None, 'detail': detail})
+    return steps
+
+
+# template fields of the queries outside the route blueprints, filled
+# as their callers fill them for two ids
+TEMPLATE_SAMPLES = {
+    'projections.adjust_position_counters': {'changes': 'application_count = application_count + %s'},
+    'projections.adjust_position_counters_bulk': {
+        'changes': 'application_count = application_count + CASE position_id WHEN %s THEN %s WHEN %s THEN %s END',
+        'placeholders': '%s, %s',
+    },
+    'projections.adjust_pending_bulk': {'cases': 'WHEN %s THEN %s WHEN %s THEN %s', 'placeholders': '%s, %s'},
+    'projections.upsert_current_applications': {'placeholders': '(%s, %s), (%s, %s)'},
+}
+DEFAULT_FRAGMENTS = {'placeholders': '%s, %s'}
+
+_PLACEHOLDER = re.compile(r'%[%s]')
+
+
+def _fields(statement):
+    return {field for _, field, _, _ in string.Formatter().parse(str(statement)) if field}
+
+
+def _sample(name, query):
+    """`query` with its template fields filled and 1 for every %s, or None"""
+    fragments = dict(DEFAULT_FRAGMENTS, **TEMPLATE_SAMPLES.get(name, {}))
+    if not _fields(query) <= set(fragments):
+        return None
+    if _fields(query):
+        query = query.format(**{field: fragments[field] for field in _fields(query)})
+    return query, (1,) * _PLACEHOLDER.findall(str(query)).count('%s')
+
+
+def samples(dialect='mysql'):
+    """
+    ([(key, statement, params)], [unsampled names]) for every named
+    query. Route queries come filled in the way their handlers run them
+    (explain_check.route_queries()), keyed by name, or by name and route
+    when a handler runs the query in several shapes. Other queries get
+    1 for each %s and TEMPLATE_SAMPLES for their template fields; those
+    with unknown fields, or none for `dialect`, are unsampled.
+    """
+    from backend.migrations.explain_check import route_queries
+
+    by_name = {}
+    for route, statement, params, _ in route_queries():
+        by_name.setdefault(statement.name, []).append((route, statement, params))
+
+    found, unsampled = [], []
+    for name, query in sorted(QUERIES.items()):
+        if dialect == 'sqlite' and query.mysql_only:
+            unsampled.append(name)
+        elif name in by_name:
+            routes = by_name[name]
+            found += [(name if len(routes) == 1 else f'{name} ({route})', statement, params)
+                      for route, statement, params in routes]
+        else:
+            sample = _sample(name, query)
+            if sample is None:
+                unsampled.append(name)
+            else:
+                found.append((name, *sample))
+    return found, unsampled
+
+
+def explain(conn, statement, params=None):
+    """Plan steps of `statement` on the engine of `conn`"""
+    if dialect_of(conn) == 'sqlite':
+        from backend.data.sqlite import SQLiteCursor
+
+        # a plain cursor, so the EXPLAIN itself is not timed or logged
+        cursor = SQLiteCursor(conn)
+        cursor.execute('EXPLAIN QUERY PLAN ' + sqlite_text(statement), params or None)
+        return _sqlite_steps(cursor.fetchall())
+
+    cursor = conn.cursor(DictCursor)
+    cursor.execute('EXPLAIN ' + str(statement), params or None)
+    return _mysql_steps(cursor.fetchall())
+
+
+def summary(steps):
+    """One line per plan, e.g. 'ca search idx_current_application_status, a search PRIMARY'"""
+    return ', '.join(' '.join(str(part) for part in (step['table'] or '', step['access'], step['index'] or '')
+                              if part).strip() for step in steps)
+
+
+def access_by_table(steps):
+    return sorted({(step['table'], step['access']) for step in steps
+                   if step['table'] and step['access'] != 'sort'})
+
+
+def compare(first, second):
+    """
+    Line up two plan files ({'engine': ..., 'plans': {query: steps}}):
+    one row per query found in both, with whether any table is reached
+    differently (a scan on one side, a search on the other, ...)
+    """
+    rows = []
+    for key, steps in first['plans'].items():
+        other = second['plans'].get(key)
+        if other is None:
+            continue
+        rows.append({
+            'query': key,
+            'plans': (summary(steps), summary(other)),
+            'differs': access_by_table(steps) != access_by_table(other),
+        })
+    return rows
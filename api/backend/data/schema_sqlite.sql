@@ -0,0 +1,312 @@
+-- SQLite schema of the embedded engine (DB_ENGINE=sqlite)
+--
+-- The MySQL schema (database-files/susy_baka_db.sql) after every
+-- migration up to 0009_job_queue: same tables, columns and indexes,
+-- with ENUMs as CHECK constraints and AUTO_INCREMENT keys as INTEGER
+-- PRIMARY KEY. InnoDB indexes every foreign key that no other index
+-- starts with; those indexes are spelled out at the end. Update this
+-- file together with each new migration.
+
+CREATE TABLE IF NOT EXISTS user (
+    user_id INTEGER PRIMARY KEY,
+    full_name VARCHAR(100) NOT NULL,
+    email VARCHAR(100) UNIQUE NOT NULL,
+    role VARCHAR(20) NOT NULL
+        CHECK (role IN ('Student', 'School_Admin', 'HR_Manager', 'Maintenance_Staff')),
+    dob DATE,
+    gender VARCHAR(10) CHECK (gender IN ('Male', 'Female', 'Other'))
+);
+
+CREATE TABLE IF NOT EXISTS school_admin (
+    admin_id INTEGER PRIMARY KEY,
+    user_id INT UNIQUE NOT NULL,
+    full_name VARCHAR(100) NOT NULL,
+    hire_date DATE,
+    FOREIGN KEY (user_id) REFERENCES user(user_id)
+        ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS grade_record (
+    grade_id INTEGER PRIMARY KEY,
+    student_id INT NOT NULL,
+    course_name VARCHAR(100) NOT NULL,
+    grade DECIMAL(3, 2) CHECK (grade >= 0.0 AND grade <= 4.0),
+    recorded_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+    recorded_by INT,
+    FOREIGN KEY (recorded_by) REFERENCES school_admin(admin_id)
+        ON DELETE SET NULL ON UPDATE CASCADE,
+    FOREIGN KEY (student_id) REFERENCES user(user_id)
+        ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS co_op_record (
+    co_op_id INTEGER PRIMARY KEY,
+    student_id INT NOT NULL,
+    company_name VARCHAR(100) NOT NULL,
+    start_date DATE NOT NULL,
+    end_date DATE NOT NULL,
+    approved_by INT,
+    FOREIGN KEY (approved_by) REFERENCES school_admin(admin_id)
+        ON DELETE SET NULL ON UPDATE CASCADE,
+    FOREIGN KEY (student_id) REFERENCES user(user_id)
+        ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS student (
+    user_id INTEGER PRIMARY KEY,
+    full_name VARCHAR(100) NOT NULL,
+    email VARCHAR(100) UNIQUE NOT NULL,
+    pending_applications INT NOT NULL DEFAULT 0,
+    resume_versions INT NOT NULL DEFAULT 0,
+    FOREIGN KEY (user_id) REFERENCES user(user_id)
+        ON DELETE RESTRICT ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS resume_section (
+    section_hash CHAR(64) PRIMARY KEY,
+    content TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS resume (
+    resume_id INTEGER PRIMARY KEY,
+    user_id INT NOT NULL,
+    time_uploaded TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    doc_name VARCHAR(255),
+    education TEXT,
+    co_op TEXT,
+    skills_hash CHAR(64) NULL,
+    projects_hash CHAR(64) NULL,
+    FOREIGN KEY (user_id) REFERENCES student(user_id)
+        ON DELETE CASCADE ON UPDATE CASCADE,
+    FOREIGN KEY (skills_hash) REFERENCES resume_section(section_hash),
+    FOREIGN KEY (projects_hash) REFERENCES resume_section(section_hash)
+);
+
+CREATE TABLE IF NOT EXISTS current_resume (
+    user_id INTEGER PRIMARY KEY,
+    resume_id INT NOT NULL UNIQUE,
+    time_uploaded TIMESTAMP NULL,
+    FOREIGN KEY (user_id) REFERENCES student(user_id)
+        ON DELETE CASCADE ON UPDATE CASCADE,
+    FOREIGN KEY (resume_id) REFERENCES resume(resume_id)
+        ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS suggestion (
+    suggestion_id INTEGER PRIMARY KEY,
+    resume_id INT,
+    time_created TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    suggestion_text TEXT,
+    FOREIGN KEY (resume_id) REFERENCES resume(resume_id)
+        ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS resume_latest_suggestion (
+    resume_id INTEGER PRIMARY KEY,
+    suggestion_id INT NOT NULL,
+    suggestion_text TEXT,
+    time_created TIMESTAMP NULL,
+    FOREIGN KEY (resume_id) REFERENCES resume(resume_id)
+        ON DELETE CASCADE ON UPDATE CASCADE,
+    FOREIGN KEY (suggestion_id) REFERENCES suggestion(suggestion_id)
+        ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS hr_manager (
+    hr_id INTEGER PRIMARY KEY,
+    full_name VARCHAR(100) NOT NULL,
+    email VARCHAR(100) NOT NULL UNIQUE,
+    user_id INT NOT NULL UNIQUE,
+    company_name VARCHAR(100) NOT NULL,
+    FOREIGN KEY (user_id) REFERENCES user(user_id)
+        ON DELETE RESTRICT ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS internship_position (
+    position_id INTEGER PRIMARY KEY,
+    hr_id INT NOT NULL,
+    title VARCHAR(100) NOT NULL,
+    description TEXT,
+    requirements TEXT,
+    status VARCHAR(10) NOT NULL CHECK (status IN ('Active', 'Inactive')),
+    posted_date DATE NOT NULL,
+    application_count INT NOT NULL DEFAULT 0,
+    pending_count INT NOT NULL DEFAULT 0,
+    accepted_count INT NOT NULL DEFAULT 0,
+    rejected_count INT NOT NULL DEFAULT 0,
+    FOREIGN KEY (hr_id) REFERENCES hr_manager(hr_id)
+        ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS application (
+    application_id INTEGER PRIMARY KEY,
+    user_id INT,
+    position_id INT,
+    sent_on DATE DEFAULT NULL,
+    status VARCHAR(10) NOT NULL CHECK (status IN ('Pending', 'Accepted', 'Rejected')),
+    FOREIGN KEY (user_id) REFERENCES student(user_id)
+        ON DELETE CASCADE ON UPDATE CASCADE,
+    FOREIGN KEY (position_id) REFERENCES internship_position(position_id)
+        ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS current_application (
+    user_id INT NOT NULL,
+    position_id INT NOT NULL,
+    application_id INT NOT NULL UNIQUE,
+    status VARCHAR(10) NOT NULL CHECK (status IN ('Pending', 'Accepted', 'Rejected')),
+    sent_on DATE DEFAULT NULL,
+    PRIMARY KEY (user_id, position_id),
+    FOREIGN KEY (application_id) REFERENCES application(application_id)
+        ON DELETE CASCADE ON UPDATE CASCADE,
+    FOREIGN KEY (user_id) REFERENCES student(user_id)
+        ON DELETE CASCADE ON UPDATE CASCADE,
+    FOREIGN KEY (position_id) REFERENCES internship_position(position_id)
+        ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS maintenance_staff (
+    staff_id INTEGER PRIMARY KEY,
+    user_id INT NOT NULL UNIQUE,
+    full_name VARCHAR(100) NOT NULL,
+    FOREIGN KEY (user_id) REFERENCES user(user_id)
+        ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS database_info (
+    database_id INTEGER PRIMARY KEY,
+    staff_id INT NOT NULL,
+    name VARCHAR(100),
+    version VARCHAR(20),
+    type VARCHAR(50),
+    last_update DATE,
+    FOREIGN KEY (staff_id) REFERENCES maintenance_staff(staff_id)
+        ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS data_alteration_history (
+    alteration_id INTEGER PRIMARY KEY,
+    alteration_type VARCHAR(100),
+    alteration_date DATE,
+    database_id INT NOT NULL,
+    FOREIGN KEY (database_id) REFERENCES database_info(database_id)
+        ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS backup_history (
+    backup_id INTEGER PRIMARY KEY,
+    type VARCHAR(50),
+    backup_date DATE,
+    backup_type VARCHAR(100),
+    details VARCHAR(255),
+    database_id INT NOT NULL,
+    FOREIGN KEY (database_id) REFERENCES database_info(database_id)
+        ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS alert_history (
+    alert_id INTEGER PRIMARY KEY,
+    metrics VARCHAR(255),
+    alerts VARCHAR(255),
+    severity VARCHAR(255),
+    database_id INT NOT NULL,
+    FOREIGN KEY (database_id) REFERENCES database_info(database_id)
+        ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS update_history (
+    update_type VARCHAR(100),
+    update_date DATE,
+    details VARCHAR(255),
+    database_id INT NOT NULL,
+    FOREIGN KEY (database_id) REFERENCES database_info(database_id)
+        ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS internship_analytics (
+    position_id INT,
+    num_internships INT,
+    average_apps INT,
+    database_id INT NOT NULL,
+    FOREIGN KEY (database_id) REFERENCES database_info(database_id)
+        ON DELETE CASCADE ON UPDATE CASCADE,
+    FOREIGN KEY (position_id) REFERENCES internship_position(position_id)
+        ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS resume_sync_queue (
+    user_id INTEGER PRIMARY KEY,
+    queued_at TIMESTAMP NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now')),
+    FOREIGN KEY (user_id) REFERENCES student(user_id)
+        ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS job (
+    job_id INTEGER PRIMARY KEY,
+    job_type VARCHAR(64) NOT NULL,
+    payload JSON NULL,
+    priority INT NOT NULL DEFAULT 0,
+    status VARCHAR(10) NOT NULL DEFAULT 'queued'
+        CHECK (status IN ('queued', 'running', 'succeeded', 'failed')),
+    attempts INT NOT NULL DEFAULT 0,
+    max_attempts INT NOT NULL DEFAULT 5,
+    run_after TIMESTAMP NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now')),
+    locked_by VARCHAR(128) NULL,
+    locked_until TIMESTAMP NULL,
+    last_error TEXT NULL,
+    result JSON NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now')),
+    started_at TIMESTAMP NULL,
+    finished_at TIMESTAMP NULL
+);
+
+-- 0001_hot_query_indexes
+CREATE INDEX IF NOT EXISTS idx_application_user_status_sent ON application (user_id, status, sent_on);
+CREATE INDEX IF NOT EXISTS idx_application_position_status ON application (position_id, status);
+CREATE INDEX IF NOT EXISTS idx_application_status_user_position_sent
+    ON application (status, user_id, position_id, sent_on);
+CREATE INDEX IF NOT EXISTS idx_internship_position_status_posted ON internship_position (status, posted_date);
+CREATE INDEX IF NOT EXISTS idx_resume_user_uploaded ON resume (user_id, time_uploaded);
+CREATE INDEX IF NOT EXISTS idx_resume_uploaded ON resume (time_uploaded);
+CREATE INDEX IF NOT EXISTS idx_suggestion_resume_created ON suggestion (resume_id, time_created);
+CREATE INDEX IF NOT EXISTS idx_grade_record_student_recorded ON grade_record (student_id, recorded_date);
+CREATE INDEX IF NOT EXISTS idx_co_op_record_student_start ON co_op_record (student_id, start_date);
+CREATE INDEX IF NOT EXISTS idx_co_op_record_student_end ON co_op_record (student_id, end_date);
+CREATE INDEX IF NOT EXISTS idx_user_role ON user (role);
+CREATE INDEX IF NOT EXISTS idx_backup_history_date ON backup_history (backup_date);
+CREATE INDEX IF NOT EXISTS idx_data_alteration_history_date ON data_alteration_history (alteration_date);
+CREATE INDEX IF NOT EXISTS idx_alert_history_severity ON alert_history (severity);
+CREATE INDEX IF NOT EXISTS idx_database_info_last_update ON database_info (last_update);
+
+-- 0002_history_row_ids
+CREATE INDEX IF NOT EXISTS idx_internship_position_posted ON internship_position (posted_date);
+
+-- 0004_current_application
+CREATE INDEX IF NOT EXISTS idx_application_user_position_sent ON application (user_id, position_id, sent_on);
+CREATE INDEX IF NOT EXISTS idx_current_application_status ON current_application (status, application_id);
+
+-- 0007_resume_versions
+CREATE INDEX IF NOT EXISTS idx_current_resume_uploaded ON current_resume (time_uploaded, resume_id);
+
+-- 0008_resume_sync_queue
+CREATE INDEX IF NOT EXISTS idx_resume_sync_queued ON resume_sync_queue (queued_at);
+
+-- 0009_job_queue
+CREATE INDEX IF NOT EXISTS idx_job_claim ON job (status, job_type, priority, run_after);
+CREATE INDEX IF NOT EXISTS idx_job_lease ON job (status, locked_until);
+
+-- foreign key indexes InnoDB adds by itself
+CREATE INDEX IF NOT EXISTS idx_grade_record_recorded_by ON grade_record (recorded_by);
+CREATE INDEX IF NOT EXISTS idx_co_op_record_approved_by ON co_op_record (approved_by);
+CREATE INDEX IF NOT EXISTS idx_resume_skills_hash ON resume (skills_hash);
+CREATE INDEX IF NOT EXISTS idx_resume_projects_hash ON resume (projects_hash);
+CREATE INDEX IF NOT EXISTS idx_internship_position_hr ON internship_position (hr_id);
+CREATE INDEX IF NOT EXISTS idx_current_application_position ON current_application (position_id);
+CREATE INDEX IF NOT EXISTS idx_resume_latest_suggestion_suggestion ON resume_latest_suggestion (suggestion_id);
+CREATE INDEX IF NOT EXISTS idx_database_info_staff ON database_info (staff_id);
+CREATE INDEX IF NOT EXISTS idx_data_alteration_history_database ON data_alteration_history (database_id);
+CREATE INDEX IF NOT EXISTS idx_backup_history_database ON backup_history (database_id);
+CREATE INDEX IF NOT EXISTS idx_alert_history_database ON alert_history (database_id);
+CREATE INDEX IF NOT EXISTS idx_update_history_database ON update_history (database_id);
+CREATE INDEX IF NOT EXISTS idx_internship_analytics_database ON internship_analytics (database_id);
+CREATE INDEX IF NOT EXISTS idx_internship_analytics_position ON internship_analytics (position_id);
@@ -0,0 +1,337 @@
+#------------------------------------------------------------
+# Embedded SQLite engine (DB_ENGINE=sqlite)
+#
+# Runs the API on one SQLite file (SQLITE_DATABASE) inside the process,
+# with no database server, for benchmarks, demos and development. The
+# schema is schema_sqlite.sql, the SQLite version of the migrated
+# MySQL schema; it is created when the file has no tables yet and
+# backend.datagen fills it.
+#
+# Connections are pooled per process like MySQLPool's. Their cursors
+# run the SQLite text of each statement (backend.data.Query) with ?
+# placeholders, buffer the rows as dicts like PyMySQL's DictCursor and
+# return DATE, DATETIME, TIMESTAMP and DECIMAL columns as date,
+# datetime and Decimal values. A locking read (FOR UPDATE in the MySQL
+# text) first starts the transaction with BEGIN IMMEDIATE: SQLite has
+# no row locks, so it takes the database write lock instead.
+#------------------------------------------------------------
+import datetime
+import decimal
+import functools
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from flask import g
+
+from backend import request_metrics
+from backend.data import locks_rows, sqlite_text
+
+SCHEMA = os.path.join(os.path.dirname(__file__), 'schema_sqlite.sql')
+
+_PLACEHOLDER = re.compile(r'%([s%])')
+
+
+def _date(value):
+    text = value.decode()
+    try:
+        return datetime.date.fromisoformat(text[:10])
+    except ValueError:
+        return text
+
+
+def _datetime(value):
+    text = value.decode()
+    try:
+        return datetime.datetime.fromisoformat(text)
+    except ValueError:
+        return text
+
+
+def _decimal(value):
+    try:
+        return decimal.Decimal(value.decode())
+    except decimal.InvalidOperation:
+        return value.decode()
+
+
+sqlite3.register_converter('DATE', _date)
+sqlite3.register_converter('DATETIME', _datetime)
+sqlite3.register_converter('TIMESTAMP', _datetime)
+sqlite3.register_converter('DECIMAL', _decimal)
+sqlite3.register_adapter(datetime.date, datetime.date.isoformat)
+sqlite3.register_adapter(datetime.datetime, lambda value: value.isoformat(sep=' '))
+sqlite3.register_adapter(decimal.Decimal, str)
+
+
+@functools.lru_cache(maxsize=4096)
+def qmark(sql):
+    """PyMySQL's %s / %% placeholders as SQLite's ? / %"""
+    return _PLACEHOLDER.sub(lambda match: '?' if match.group(1) == 's' else '%', sql)
+
+
+def _dict_row(cursor, row):
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+def _params(args):
+    if args is None:
+        return ()
+    if isinstance(args, (tuple, list)):
+        return tuple(args)
+    if isinstance(args, dict):
+        return args
+    return (args,)
+
+
+class SQLiteCursor:
+    """DB-API cursor over a SQLiteConnection, PyMySQL DictCursor style"""
+
+    # set per app by SQLiteDatabase, like the instrumented MySQL cursor
+    record_metrics = False
+    query_log = None
+
+    def __init__(self, connection, buffered=True):
+        self.connection = connection
+        self._cursor = connection.raw.cursor()
+        self._buffered = buffered
+        self._rows = None
+        self._next = 0
+        self.rowcount = -1
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def _sql(self, query, args):
+        # like PyMySQL, only a statement with arguments has placeholders
+        sql = sqlite_text(query)
+        return qmark(sql) if args is not None else sql
+
+    def execute(self, query, args=None):
+        raw = self.connection.raw
+        if locks_rows(query) and not raw.in_transaction:
+            raw.execute('BEGIN IMMEDIATE')
+        started = time.perf_counter()
+        failed = True
+        try:
+            self._cursor.execute(self._sql(query, args), _params(args))
+            self._rows, self._next = None, 0
+            if self._cursor.description is not None and self._buffered:
+                self._rows = self._cursor.fetchall()
+                self.rowcount = len(self._rows)
+            else:
+                self.rowcount = self._cursor.rowcount
+            failed = False
+            return self.rowcount
+        finally:
+            if self.record_metrics or self.query_log is not None:
+                self._record(query, args, time.perf_counter() - started, failed)
+
+    def executemany(self, query, args):
+        rows = [_params(row) for row in args]
+        started = time.perf_counter()
+        failed = True
+        try:
+            self._cursor.executemany(self._sql(query, args), rows)
+            self._rows, self._next = None, 0
+            self.rowcount = self._cursor.rowcount
+            failed = False
+            return self.rowcount
+        finally:
+            # one statement; the first row stands in for the slow-query EXPLAIN
+            if self.record_metrics or self.query_log is not None:
+                self._record(query, rows[0] if rows else None, time.perf_counter() - started, failed)
+
+    def _record(self, query, args, seconds, failed):
+        rows = self.rowcount if not failed and self.description is not None else 0
+        if self.record_metrics:
+            request_metrics.record_query(seconds, rows)
+        if self.query_log is not None and not failed:
+            self.query_log.record(self, query, args, seconds, rows)
+
+    def fetchone(self):
+        if self._rows is None:
+            return self._cursor.fetchone()
+        if self._next >= len(self._rows):
+            return None
+        self._next += 1
+        return self._rows[self._next - 1]
+
+    def fetchmany(self, size=1):
+        if self._rows is None:
+            return self._cursor.fetchmany(size)
+        rows = self._rows[self._next:self._next + size]
+        self._next += len(rows)
+        return rows
+
+    def fetchall(self):
+        if self._rows is None:
+            return self._cursor.fetchall()
+        rows = self._rows[self._next:]
+        self._next = len(self._rows)
+        return rows
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """The connection db.get_db() returns on the SQLite engine"""
+
+    dialect = 'sqlite'
+
+    def __init__(self, path, cursorclass=SQLiteCursor, timeout=30.0):
+        self.raw = sqlite3.connect(path, timeout=timeout, detect_types=sqlite3.PARSE_DECLTYPES,
+                                   check_same_thread=False)
+        self.raw.row_factory = _dict_row
+        self.raw.execute('PRAGMA foreign_keys = ON')
+        if path != ':memory:':
+            # readers do not block the writer
+            self.raw.execute('PRAGMA journal_mode = WAL')
+            self.raw.execute('PRAGMA synchronous = NORMAL')
+        self.cursorclass = cursorclass
+
+    def cursor(self, cursorclass=None):
+        # cursorclass (a PyMySQL cursor class) is accepted and ignored
+        return self.cursorclass(self)
+
+    @property
+    def in_transaction(self):
+        return self.raw.in_transaction
+
+    def commit(self):
+        self.raw.commit()
+
+    def rollback(self):
+        self.raw.rollback()
+
+    def close(self):
+        self.raw.close()
+
+
+def connect(path, timeout=30.0):
+    """A SQLiteConnection on `path`, creating the schema in a new database"""
+    conn = SQLiteConnection(path, timeout=timeout)
+    create_schema(conn)
+    return conn
+
+
+def create_schema(conn):
+    """Create the tables of schema_sqlite.sql unless the database has them"""
+    if conn.raw.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'user'").fetchone():
+        return False
+    with open(SCHEMA) as f:
+        conn.raw.executescript(f.read())
+    return True
+
+
+class SQLiteDatabase:
+    """
+    Flask extension for the SQLite engine, with the interface of
+    MySQLPool: get_db() checks a connection out for the app context.
+    Settings: SQLITE_DATABASE (path of the file) and SQLITE_TIMEOUT
+    (seconds a writer waits for the lock).
+    """
+
+    dialect = 'sqlite'
+
+    def __init__(self, app, query_log=None):
+        app.config.setdefault('SQLITE_DATABASE', 'susy_baka.sqlite3')
+        app.config.setdefault('SQLITE_TIMEOUT', 30.0)
+        self.path = app.config['SQLITE_DATABASE']
+        self.timeout = app.config['SQLITE_TIMEOUT']
+        self.cursorclass = type('SQLiteCursor', (SQLiteCursor,), {
+            'record_metrics': bool(app.config.get('METRICS_ENABLED')),
+            'query_log': query_log,
+        })
+        self._lock = threading.Lock()
+        self._idle = []
+        self._pid = os.getpid()
+        self._counters = {'connections': 0, 'checked_out': 0}
+
+        conn = self._connect()
+        if create_schema(conn):
+            app.logger.info(f'created the SQLite schema in {self.path}')
+        self.release(conn)
+
+        app.extensions['sqlite'] = self
+        app.teardown_appcontext(self.teardown_request)
+
+    def _connect(self):
+        conn = SQLiteConnection(self.path, cursorclass=self.cursorclass, timeout=self.timeout)
+        with self._lock:
+            self._counters['connections'] += 1
+        return conn
+
+    def acquire(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                # connections opened before a fork stay with the parent
+                self._idle, self._pid = [], os.getpid()
+                self._counters['connections'] = 0
+            conn = self._idle.pop() if self._idle else None
+            self._counters['checked_out'] += 1
+        if conn is None:
+            conn = self._connect()
+        return conn
+
+    def release(self, conn, discard=False):
+        """Hand a connection back, rolling back what it left uncommitted"""
+        try:
+            conn.rollback()
+        except sqlite3.Error:
+            discard = True
+        with self._lock:
+            self._counters['checked_out'] = max(0, self._counters['checked_out'] - 1)
+            if not discard and self._pid == os.getpid():
+                self._idle.append(conn)
+                return
+            self._counters['connections'] -= 1
+        conn.close()
+
+    def get_db(self):
+        if 'sqlite_conn' not in g:
+            g.sqlite_conn = self.acquire()
+        return g.sqlite_conn
+
+    def teardown_request(self, exception):
+        conn = g.pop('sqlite_conn', None)
+        if conn is not None:
+            self.release(conn)
+
+    def export_cursor(self, query, params):
+        """Unbuffered cursor over `query` on a connection of its own, and its release(finished)"""
+        conn = self.acquire()
+        try:
+            cursor = self.cursorclass(conn, buffered=False)
+            cursor.execute(query, params)
+        except Exception:
+            self.release(conn, discard=True)
+            raise
+
+        def release(finished):
+            cursor.close()
+            self.release(conn, discard=not finished)
+        return cursor, release
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters, engine=self.dialect, database=self.path, idle=len(self._idle))
+
+    def dispose(self):
+        """Close the idle connections"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._counters['connections'] -= len(idle)
+        for conn in idle:
+            conn.close()
@@ -0,0 +1,509 @@
+#------------------------------------------------------------
+# Synthetic data at production scale
+#
+#   python -m backend.datagen --profile production --truncate
+#
+# Builds students, HR managers across many companies, positions,
+# applications, multi-version resumes with suggestions, grades,
+# non-overlapping co-ops and maintenance history on top of the
+# migrated schema. Every table is drawn from its own numpy stream
+# seeded with (seed, table, chunk), so a given seed and profile always
+# produce the same rows, whatever else changed.
+#
+# Rows go in as multi-row INSERTs (PyMySQL executemany) with explicit
+# ids, with foreign key and unique checks off for the session and one
+# commit per chunk of students. No triggers remain on these tables
+# (0008), so the derived tables (current_resume, current_application,
+# resume_latest_suggestion) are written directly and the counters and
+# resume sections are rebuilt with backend.projections afterwards.
+# On the embedded SQLite engine the session switches become PRAGMA
+# foreign_keys (SQLite has no unique-check switch) and TRUNCATE a
+# DELETE.
+#------------------------------------------------------------
+import datetime
+import hashlib
+import logging
+import math
+import time
+
+import numpy as np
+
+from backend.data import define
+from backend.datagen import vocab
+from backend.projections import GPA_COURSE, rebuild_counters, rebuild_resume_sections
+
+logger = logging.getLogger(__name__)
+
+PROFILES = {
+    'small': {
+        'students': 2_000, 'companies': 60, 'hr_managers': 120, 'positions': 400,
+        'applications': 40_000, 'school_admins': 10, 'maintenance_staff': 5, 'databases': 8,
+        'alerts': 2_000, 'backups': 1_000, 'alterations': 1_000,
+    },
+    'medium': {
+        'students': 20_000, 'companies': 400, 'hr_managers': 800, 'positions': 2_000,
+        'applications': 500_000, 'school_admins': 25, 'maintenance_staff': 10, 'databases': 20,
+        'alerts': 20_000, 'backups': 10_000, 'alterations': 10_000,
+    },
+    'production': {
+        'students': 200_000, 'companies': 2_000, 'hr_managers': 4_000, 'positions': 20_000,
+        'applications': 5_000_000, 'school_admins': 50, 'maintenance_staff': 20, 'databases': 40,
+        'alerts': 200_000, 'backups': 50_000, 'alterations': 50_000,
+    },
+}
+
+# per-student averages (the same at every scale)
+GRADES_PER_STUDENT = 8
+RESUME_SHARE = 0.92             # students with at least one resume
+SUGGESTIONS_PER_VERSION = 0.6
+
+# students per generation chunk and commit; fixed so the output does
+# not depend on it
+STUDENT_CHUNK = 2_000
+HISTORY_CHUNK = 50_000
+SYNC_BATCH = 1_000
+
+HISTORY_DAYS = 3 * 365
+
+# emptied by --truncate (children first; schema_migrations and job stay)
+TABLES = (
+    'resume_sync_queue', 'current_application', 'application', 'resume_latest_suggestion',
+    'suggestion', 'current_resume', 'resume', 'resume_section', 'grade_record', 'co_op_record',
+    'internship_analytics', 'internship_position', 'hr_manager', 'student', 'school_admin',
+    'alert_history', 'backup_history', 'data_alteration_history', 'update_history',
+    'database_info', 'maintenance_staff', 'user',
+)
+
+# rng stream per generated table
+STREAMS = ('companies', 'hr', 'positions', 'admins', 'staff', 'databases', 'students',
+           'resumes', 'grades', 'coops', 'applications', 'alerts', 'backups', 'alterations')
+
+
+def scaled_counts(profile='small', scale=1.0, **overrides):
+    """Row counts of `profile` times `scale`, with explicit overrides"""
+    counts = {name: max(1, int(round(count * scale))) for name, count in PROFILES[profile].items()}
+    counts.update({name: value for name, value in overrides.items() if value is not None})
+    return counts
+
+
+def _zipf_weights(n, exponent, rng):
+    """Popularity weights 1/rank^exponent, assigned to the n items in random order"""
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    rng.shuffle(weights)
+    return weights / weights.sum()
+
+
+class Generator:
+    """Generates and loads one dataset; see generate()"""
+
+    def __init__(self, conn, counts, seed=42, as_of=datetime.date(2024, 12, 1), progress=None):
+        self.conn = conn
+        self.cursor = conn.cursor()
+        self.counts = counts
+        self.seed = seed
+        self.as_of = as_of
+        self.progress = progress or logger.info
+        self.inserted = {}
+
+        # day numbers count from `epoch`; today is day HISTORY_DAYS
+        self.epoch = as_of - datetime.timedelta(days=HISTORY_DAYS)
+        self.today = HISTORY_DAYS
+        self._dates = [(self.epoch + datetime.timedelta(days=day)).isoformat()
+                       for day in range(HISTORY_DAYS + 1)]
+        self._section_hashes = set()
+
+    # ------------------------------------------------------------
+    # helpers
+    def rng(self, stream, chunk=0):
+        return np.random.default_rng([self.seed, STREAMS.index(stream), chunk])
+
+    def date(self, day):
+        return self._dates[min(max(int(day), 0), self.today)]
+
+    def timestamp(self, day, seconds):
+        seconds = int(seconds)
+        return f'{self.date(day)} {seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}'
+
+    def next_id(self, table, column):
+        self.cursor.execute(f'SELECT COALESCE(MAX({column}), 0) AS last_id FROM {table}')
+        return self.cursor.fetchone()['last_id'] + 1
+
+    def insert(self, table, columns, rows):
+        """Multi-row INSERT of `rows` (PyMySQL batches them up to max_stmt_length)"""
+        if not rows:
+            return
+        placeholders = ', '.join(['%s'] * len(columns))
+        self.cursor.executemany(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows)
+        self.inserted[table] = self.inserted.get(table, 0) + len(rows)
+
+    def _names(self, rng, n):
+        first = rng.integers(len(vocab.FIRST_NAMES), size=n)
+        last = rng.integers(len(vocab.LAST_NAMES), size=n)
+        return [(vocab.FIRST_NAMES[f], vocab.LAST_NAMES[l]) for f, l in zip(first.tolist(), last.tolist())]
+
+    def _users(self, rng, user_ids, role, domain, dob_years):
+        """user rows for `user_ids`; returns their (first, last) names"""
+        names = self._names(rng, len(user_ids))
+        dob = rng.integers(365 * dob_years[0], 365 * dob_years[1], size=len(user_ids))
+        gender = rng.choice(len(vocab.GENDERS), size=len(user_ids), p=(0.48, 0.48, 0.04))
+        self.insert('user', ('user_id', 'full_name', 'email', 'role', 'dob', 'gender'), [
+            (user_id, f'{first} {last}', f'{first.lower()}.{last.lower()}{user_id}@{domain}', role,
+             (self.as_of - datetime.timedelta(days=int(age))).isoformat(), vocab.GENDERS[g])
+            for user_id, (first, last), age, g in zip(user_ids, names, dob.tolist(), gender.tolist())
+        ])
+        return names
+
+    # ------------------------------------------------------------
+    # staff, companies and positions
+    def staff(self):
+        counts = self.counts
+        user_id = self.next_id('user', 'user_id')
+
+        # school admins
+        rng = self.rng('admins')
+        first_admin = self.next_id('school_admin', 'admin_id')
+        self.admin_ids = list(range(first_admin, first_admin + counts['school_admins']))
+        user_ids = list(range(user_id, user_id + counts['school_admins']))
+        user_id += len(user_ids)
+        names = self._users(rng, user_ids, 'School_Admin', 'school.edu', (30, 65))
+        hired = rng.integers(30, 3650, size=len(user_ids))
+        self.insert('school_admin', ('admin_id', 'user_id', 'full_name', 'hire_date'), [
+            (admin_id, uid, f'{first} {last}', (self.as_of - datetime.timedelta(days=int(days))).isoformat())
+            for admin_id, uid, (first, last), days in zip(self.admin_ids, user_ids, names, hired.tolist())
+        ])
+
+        # maintenance staff and their databases
+        rng = self.rng('staff')
+        first_staff = self.next_id('maintenance_staff', 'staff_id')
+        self.staff_ids = list(range(first_staff, first_staff + counts['maintenance_staff']))
+        user_ids = list(range(user_id, user_id + counts['maintenance_staff']))
+        user_id += len(user_ids)
+        names = self._users(rng, user_ids, 'Maintenance_Staff', 'internmatch.com', (22, 60))
+        self.insert('maintenance_staff', ('staff_id', 'user_id', 'full_name'), [
+            (staff_id, uid, f'{first} {last}')
+            for staff_id, uid, (first, last) in zip(self.staff_ids, user_ids, names)
+        ])
+
+        rng = self.rng('databases')
+        first_db = self.next_id('database_info', 'database_id')
+        self.database_ids = list(range(first_db, first_db + counts['databases']))
+        self.insert('database_info', ('database_id', 'staff_id', 'name', 'version', 'type', 'last_update'), [
+            (database_id, self.staff_ids[n % len(self.staff_ids)],
+             f'{vocab.DATABASE_NAMES[n % len(vocab.DATABASE_NAMES)]}{n // len(vocab.DATABASE_NAMES) or ""}',
+             f'{rng.integers(1, 9)}.{rng.integers(0, 10)}',
+             vocab.DATABASE_TYPES[int(rng.integers(len(vocab.DATABASE_TYPES)))],
+             self.date(self.today - rng.integers(0, 365)))
+            for n, database_id in enumerate(self.database_ids)
+        ])
+
+        # companies and their HR managers (a few companies employ most of them)
+        rng = self.rng('companies')
+        companies = list(vocab.KNOWN_COMPANIES)
+        generated = [f'{prefix} {suffix}'
+                     for prefix in vocab.COMPANY_PREFIXES for suffix in vocab.COMPANY_SUFFIXES]
+        n = 0
+        while len(companies) < counts['companies']:
+            name = generated[n % len(generated)]
+            companies.append(name if n < len(generated) else f'{name} {n // len(generated) + 1}')
+            n += 1
+        self.companies = companies[:counts['companies']]
+        self.company_weights = _zipf_weights(len(self.companies), 1.0, rng)
+
+        rng = self.rng('hr')
+        first_hr = self.next_id('hr_manager', 'hr_id')
+        self.hr_ids = list(range(first_hr, first_hr + counts['hr_managers']))
+        user_ids = list(range(user_id, user_id + counts['hr_managers']))
+        user_id += len(user_ids)
+        employer = rng.choice(len(self.companies), size=len(user_ids), p=self.company_weights)
+        names = self._names(rng, len(user_ids))
+        domains = [self.companies[c].lower().replace(' ', '') + '.com' for c in employer.tolist()]
+        dob = rng.integers(365 * 24, 365 * 60, size=len(user_ids))
+        gender = rng.choice(len(vocab.GENDERS), size=len(user_ids), p=(0.48, 0.48, 0.04))
+        self.insert('user', ('user_id', 'full_name', 'email', 'role', 'dob', 'gender'), [
+            (uid, f'{first} {last}', f'{first.lower()}.{last.lower()}{uid}@{domain}', 'HR_Manager',
+             (self.as_of - datetime.timedelta(days=int(age))).isoformat(), vocab.GENDERS[g])
+            for uid, (first, last), domain, age, g in zip(user_ids, names, domains, dob.tolist(), gender.tolist())
+        ])
+        self.insert('hr_manager', ('hr_id', 'full_name', 'email', 'user_id', 'company_name'), [
+            (hr_id, f'{first} {last}', f'{first.lower()}.{last.lower()}{uid}@{domain}', uid, self.companies[c])
+            for hr_id, uid, (first, last), domain, c
+            in zip(self.hr_ids, user_ids, names, domains, employer.tolist())
+        ])
+
+        self.first_student_user = user_id
+        self.conn.commit()
+        self.progress(f"staff: {counts['school_admins']} admins, {counts['maintenance_staff']} staff, "
+                      f"{counts['hr_managers']} HR managers at {len(self.companies)} companies")
+
+    def positions(self):
+        rng = self.rng('positions')
+        n = self.counts['positions']
+        first_position = self.next_id('internship_position', 'position_id')
+        self.position_ids = np.arange(first_position, first_position + n)
+        hr = rng.choice(len(self.hr_ids), size=n, p=_zipf_weights(len(self.hr_ids), 0.7, rng))
+        self.posted_day = self.today - rng.integers(0, 730, size=n)
+        age = self.today - self.posted_day
+        active = rng.random(n) < np.where(age < 180, 0.85, 0.25)
+        title = rng.integers(len(vocab.POSITION_TITLES), size=n)
+        detail = rng.integers(len(vocab.POSITION_DETAILS), size=n)
+        self.insert('internship_position',
+                    ('position_id', 'hr_id', 'title', 'description', 'requirements', 'status', 'posted_date'), [
+            (position_id, self.hr_ids[h], vocab.POSITION_TITLES[t], *vocab.POSITION_DETAILS[d],
+             'Active' if a else 'Inactive', self.date(day))
+            for position_id, h, t, d, a, day in zip(self.position_ids.tolist(), hr.tolist(), title.tolist(),
+                                                    detail.tolist(), active.tolist(), self.posted_day.tolist())
+        ])
+        # popular positions draw most applications
+        self.position_weights = _zipf_weights(n, 0.9, rng)
+        self.conn.commit()
+        self.progress(f'positions: {n}')
+
+    # ------------------------------------------------------------
+    # students and everything per student
+    def students(self):
+        total = self.counts['students']
+        self.next_resume_id = self.next_id('resume', 'resume_id')
+        self.next_suggestion_id = self.next_id('suggestion', 'suggestion_id')
+        self.next_application_id = self.next_id('application', 'application_id')
+        applications_per_student = self.counts['applications'] / total
+
+        started = time.monotonic()
+        for chunk, start in enumerate(range(0, total, STUDENT_CHUNK)):
+            user_ids = list(range(self.first_student_user + start,
+                                  self.first_student_user + min(start + STUDENT_CHUNK, total)))
+            names = self._users(self.rng('students', chunk), user_ids, 'Student', 'student.com', (18, 26))
+            self.insert('student', ('user_id', 'full_name', 'email'), [
+                (uid, f'{first} {last}', f'{first.lower()}.{last.lower()}{uid}@student.com')
+                for uid, (first, last) in zip(user_ids, names)
+            ])
+            self._resumes(chunk, user_ids, names)
+            self._grades(chunk, user_ids)
+            self._coops(chunk, user_ids)
+            self._applications(chunk, user_ids, applications_per_student)
+            for batch in range(0, len(user_ids), SYNC_BATCH):
+                rebuild_resume_sections(self.cursor, user_ids[batch:batch + SYNC_BATCH])
+            self.conn.commit()
+
+            done = start + len(user_ids)
+            elapsed = time.monotonic() - started
+            self.progress(f"students: {done}/{total}, applications: {self.inserted.get('application', 0)} "
+                          f"({elapsed:.0f}s, ~{elapsed / done * (total - done):.0f}s left)")
+
+    def _resumes(self, chunk, user_ids, names):
+        rng = self.rng('resumes', chunk)
+        sections, resumes, current, suggestions, latest = [], [], [], [], []
+
+        def section(content):
+            digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+            if digest not in self._section_hashes:
+                self._section_hashes.add(digest)
+                sections.append((digest, content))
+            return digest
+
+        has_resume = rng.random(len(user_ids)) < RESUME_SHARE
+        versions = np.minimum(rng.geometric(0.55, size=len(user_ids)), 6)
+        for user_id, (first, last), has, count in zip(user_ids, names, has_resume.tolist(), versions.tolist()):
+            if not has:
+                continue
+            day = self.today - int(rng.integers(30, 700))
+            skills = projects = None
+            for version in range(1, count + 1):
+                if skills is None or rng.random() < 0.5:
+                    picked = rng.choice(len(vocab.SKILLS), size=int(rng.integers(3, 7)), replace=False)
+                    skills = section(', '.join(vocab.SKILLS[s] for s in sorted(picked.tolist())))
+                if projects is None or rng.random() < 0.4:
+                    picked = rng.choice(len(vocab.PROJECTS), size=int(rng.integers(1, 4)), replace=False)
+                    projects = section('; '.join(vocab.PROJECTS[p] for p in picked.tolist()))
+                uploaded = self.timestamp(day, rng.integers(8 * 3600, 23 * 3600))
+                resume_id = self.next_resume_id
+                self.next_resume_id += 1
+                resumes.append((resume_id, user_id, uploaded,
+                                f'resume_{first.lower()}_{last.lower()}_v{version}.pdf', skills, projects))
+
+                suggestion_day = day
+                for _ in range(int(rng.poisson(SUGGESTIONS_PER_VERSION))):
+                    suggestion_day = min(suggestion_day + int(rng.integers(0, 5)), self.today)
+                    advice = rng.choice(len(vocab.SUGGESTION_ADVICE), size=2, replace=False).tolist()
+                    text = ' '.join((vocab.SUGGESTION_OPENERS[int(rng.integers(len(vocab.SUGGESTION_OPENERS)))],
+                                     *(vocab.SUGGESTION_ADVICE[a] for a in advice)))
+                    created = self.timestamp(suggestion_day, rng.integers(8 * 3600, 23 * 3600))
+                    suggestions.append((self.next_suggestion_id, resume_id, created, text))
+                    latest_row = (resume_id, self.next_suggestion_id, text, created)
+                    self.next_suggestion_id += 1
+                if suggestions and suggestions[-1][1] == resume_id:
+                    latest.append(latest_row)
+
+                if version == count:
+                    current.append((user_id, resume_id, uploaded))
+                else:
+                    day = min(day + int(rng.integers(1, 120)), self.today)
+
+        self.insert('resume_section', ('section_hash', 'content'), sections)
+        self.insert('resume', ('resume_id', 'user_id', 'time_uploaded', 'doc_name',
+                               'skills_hash', 'projects_hash'), resumes)
+        self.insert('current_resume', ('user_id', 'resume_id', 'time_uploaded'), current)
+        self.insert('suggestion', ('suggestion_id', 'resume_id', 'time_created', 'suggestion_text'), suggestions)
+        self.insert('resume_latest_suggestion',
+                    ('resume_id', 'suggestion_id', 'suggestion_text', 'time_created'), latest)
+
+    def _grades(self, chunk, user_ids):
+        rng = self.rng('grades', chunk)
+        rows = []
+        counts = np.minimum(rng.poisson(GRADES_PER_STUDENT, size=len(user_ids)), len(vocab.COURSES))
+        for user_id, count in zip(user_ids, counts.tolist()):
+            courses = rng.choice(len(vocab.COURSES), size=count, replace=False).tolist()
+            grades = np.clip(rng.normal(3.2, 0.45, size=count), 0, 4).round(2).tolist()
+            days = np.sort(self.today - rng.integers(0, HISTORY_DAYS, size=count)).tolist()
+            admins = rng.integers(len(self.admin_ids), size=count).tolist()
+            rows += [(user_id, vocab.COURSES[c], g, self.timestamp(d, 12 * 3600), self.admin_ids[a])
+                     for c, g, d, a in zip(courses, grades, days, admins)]
+            # the GPA row the resume education line is built from; some
+            # students have an older one too (the newest grade_id wins)
+            gpa = float(np.clip(rng.normal(3.3, 0.35), 2.0, 4.0).round(2))
+            for n in range(int(rng.random() < 0.3), -1, -1):
+                rows.append((user_id, GPA_COURSE, round(max(gpa - 0.1 * n, 0), 2),
+                             self.timestamp(self.today - 180 * n, 12 * 3600),
+                             self.admin_ids[int(rng.integers(len(self.admin_ids)))]))
+        self.insert('grade_record', ('student_id', 'course_name', 'grade', 'recorded_date', 'recorded_by'), rows)
+
+    def _coops(self, chunk, user_ids):
+        rng = self.rng('coops', chunk)
+        rows = []
+        counts = rng.choice(4, size=len(user_ids), p=(0.35, 0.35, 0.2, 0.1))
+        for user_id, count in zip(user_ids, counts.tolist()):
+            # consecutive terms with a gap, so co-ops never overlap
+            day = self.today - int(rng.integers(300, HISTORY_DAYS))
+            for _ in range(count):
+                end = day + int(rng.integers(90, 181))
+                if end > self.today:
+                    break
+                company = int(rng.choice(len(self.companies), p=self.company_weights))
+                rows.append((user_id, self.companies[company], self.date(day), self.date(end),
+                             self.admin_ids[int(rng.integers(len(self.admin_ids)))]))
+                day = end + int(rng.integers(30, 200))
+        self.insert('co_op_record', ('student_id', 'company_name', 'start_date', 'end_date', 'approved_by'), rows)
+
+    def _applications(self, chunk, user_ids, per_student):
+        rng = self.rng('applications', chunk)
+        # heavy-tailed number of applications per student with the given mean
+        sigma = 1.0
+        counts = rng.poisson(rng.lognormal(math.log(per_student) - sigma ** 2 / 2, sigma, size=len(user_ids)))
+        users = np.repeat(np.array(user_ids), counts)
+        n = len(users)
+        if not n:
+            return
+        positions = rng.choice(len(self.position_ids), size=n, p=self.position_weights)
+        sent = np.minimum(self.posted_day[positions] + rng.integers(0, 60, size=n), self.today)
+        # recent applications are mostly still pending
+        pending = rng.random(n) < np.exp(-(self.today - sent) / 60)
+        accepted = rng.random(n) < 0.12
+        status = np.where(pending, 0, np.where(accepted, 1, 2))
+
+        order = np.argsort(sent, kind='stable')
+        users, positions, sent, status = users[order], positions[order], sent[order], status[order]
+        ids = np.arange(self.next_application_id, self.next_application_id + n)
+        self.next_application_id += n
+        position_ids = self.position_ids[positions]
+
+        names = ('Pending', 'Accepted', 'Rejected')
+        dates = self._dates
+        self.insert('application', ('application_id', 'user_id', 'position_id', 'sent_on', 'status'), [
+            (a, u, p, dates[d], names[s])
+            for a, u, p, d, s in zip(ids.tolist(), users.tolist(), position_ids.tolist(),
+                                     sent.tolist(), status.tolist())
+        ])
+
+        # newest application per (student, position); ids follow sent_on
+        last = np.lexsort((ids, users, position_ids))
+        pair_user, pair_position = users[last], position_ids[last]
+        newest = np.append((pair_user[1:] != pair_user[:-1]) | (pair_position[1:] != pair_position[:-1]), True)
+        keep = last[newest]
+        self.insert('current_application', ('user_id', 'position_id', 'application_id', 'status', 'sent_on'), [
+            (u, p, a, names[s], dates[d])
+            for u, p, a, s, d in zip(users[keep].tolist(), position_ids[keep].tolist(), ids[keep].tolist(),
+                                     status[keep].tolist(), sent[keep].tolist())
+        ])
+
+    # ------------------------------------------------------------
+    # maintenance history
+    def history(self):
+        counts = self.counts
+        databases = len(self.database_ids)
+        for table, stream, columns, total in (
+                ('alert_history', 'alerts', ('metrics', 'alerts', 'severity', 'database_id'), counts['alerts']),
+                ('backup_history', 'backups',
+                 ('type', 'backup_date', 'backup_type', 'details', 'database_id'), counts['backups']),
+                ('data_alteration_history', 'alterations',
+                 ('alteration_type', 'alteration_date', 'database_id'), counts['alterations'])):
+            for chunk, start in enumerate(range(0, total, HISTORY_CHUNK)):
+                rng = self.rng(stream, chunk)
+                n = min(HISTORY_CHUNK, total - start)
+                database = rng.integers(databases, size=n).tolist()
+                days = (self.today - rng.integers(0, HISTORY_DAYS, size=n)).tolist()
+                if table == 'alert_history':
+                    kinds = rng.integers(len(vocab.ALERT_TYPES), size=n).tolist()
+                    severity = rng.choice(len(vocab.SEVERITIES), size=n, p=(0.6, 0.3, 0.1)).tolist()
+                    rows = [(*vocab.ALERT_TYPES[k], vocab.SEVERITIES[s], self.database_ids[d])
+                            for k, s, d in zip(kinds, severity, database)]
+                elif table == 'backup_history':
+                    kinds = (rng.random(n) < 0.8).astype(int).tolist()
+                    rows = [(vocab.BACKUP_TYPES[k][0], self.date(day), vocab.BACKUP_TYPES[k][1],
+                             'Regular scheduled backup', self.database_ids[d])
+                            for k, day, d in zip(kinds, days, database)]
+                else:
+                    kinds = rng.integers(len(vocab.ALTERATION_TYPES), size=n).tolist()
+                    rows = [(vocab.ALTERATION_TYPES[k], self.date(day), self.database_ids[d])
+                            for k, day, d in zip(kinds, days, database)]
+                self.insert(table, columns, rows)
+                self.conn.commit()
+        self.progress(f"history: {counts['alerts']} alerts, {counts['backups']} backups, "
+                      f"{counts['alterations']} alterations")
+
+
+CHECKS_OFF_QUERY = define('datagen.checks_off', 'SET SESSION foreign_key_checks = 0, unique_checks = 0',
+                          sqlite='PRAGMA foreign_keys = OFF')
+CHECKS_ON_QUERY = define('datagen.checks_on', 'SET SESSION foreign_key_checks = 1, unique_checks = 1',
+                         sqlite='PRAGMA foreign_keys = ON')
+TRUNCATE_QUERY = define('datagen.truncate', 'TRUNCATE TABLE {table}', sqlite='DELETE FROM {table}')
+ANALYZE_QUERY = define('datagen.analyze', 'ANALYZE TABLE {table}', sqlite='ANALYZE {table}')
+
+
+def truncate(conn):
+    """Empty every table the generator writes (schema_migrations and job are kept)"""
+    cursor = conn.cursor()
+    cursor.execute(CHECKS_OFF_QUERY)
+    try:
+        for table in TABLES:
+            cursor.execute(TRUNCATE_QUERY.format(table=table))
+        conn.commit()
+    finally:
+        cursor.execute(CHECKS_ON_QUERY)
+
+
+def generate(conn, counts, seed=42, as_of=datetime.date(2024, 12, 1), progress=None):
+    """
+    Load one dataset of `counts` rows (see scaled_counts) after the
+    existing rows and return the number of rows inserted per table.
+    """
+    generator = Generator(conn, counts, seed=seed, as_of=as_of, progress=progress)
+    cursor = conn.cursor()
+    cursor.execute(CHECKS_OFF_QUERY)
+    try:
+        generator.staff()
+        generator.positions()
+        generator.students()
+        generator.history()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.execute(CHECKS_ON_QUERY)
+
+    generator.progress('rebuilding application and resume counters')
+    rebuild_counters(conn)
+    for table in ('user', 'student', 'resume', 'application', 'current_application',
+                  'internship_position', 'grade_record', 'co_op_record', 'suggestion'):
+        cursor.execute(ANALYZE_QUERY.format(table=table))
+        cursor.fetchall()
+    return generator.inserted
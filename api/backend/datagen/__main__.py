@@ -0,0 +1,52 @@
+###
+# Synthetic data command line
+#
+#   python -m backend.datagen --profile production --truncate
+#   python -m backend.datagen --profile small --scale 0.5 --seed 7
+#   python -m backend.datagen --students 50000 --applications 2000000
+###
+import argparse
+import datetime
+import sys
+import time
+
+from backend.cache import cache
+from backend.datagen import PROFILES, generate, scaled_counts, truncate
+from backend.db_connection import db
+from backend.rest_entry import create_app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m backend.datagen')
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='small')
+    parser.add_argument('--scale', type=float, default=1.0, help='multiply every count of the profile')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--as-of', type=datetime.date.fromisoformat, default=datetime.date(2024, 12, 1),
+                        help="the dataset's today (YYYY-MM-DD)")
+    parser.add_argument('--truncate', action='store_true',
+                        help='empty the data tables first, so ids start at 1')
+    for name in PROFILES['small']:
+        parser.add_argument('--' + name.replace('_', '-'), dest=name, type=int, metavar='N')
+    args = parser.parse_args(argv)
+
+    counts = scaled_counts(args.profile, args.scale,
+                           **{name: getattr(args, name) for name in PROFILES['small']})
+    print(', '.join(f'{name}={count}' for name, count in counts.items()))
+
+    app = create_app()
+    with app.app_context():
+        conn = db.get_db()
+        started = time.monotonic()
+        if args.truncate:
+            truncate(conn)
+        inserted = generate(conn, counts, seed=args.seed, as_of=args.as_of, progress=print)
+        cache.clear()
+
+    for table, rows in sorted(inserted.items()):
+        print(f'{table:28} {rows:>10}')
+    print(f'{sum(inserted.values())} rows in {time.monotonic() - started:.0f}s')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
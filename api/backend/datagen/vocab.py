@@ -0,0 +1,125 @@
+#------------------------------------------------------------
+# Word lists the synthetic data is built from (see backend.datagen)
+#------------------------------------------------------------
+
+FIRST_NAMES = (
+    'Alice', 'Bob', 'Charlie', 'Diana', 'Edward', 'Fiona', 'George', 'Helen', 'Ivan', 'Julia',
+    'Kevin', 'Laura', 'Michael', 'Nina', 'Oscar', 'Paula', 'Quinn', 'Rachel', 'Samuel', 'Tina',
+    'Umar', 'Vera', 'William', 'Xin', 'Yara', 'Zane', 'Aisha', 'Bruno', 'Chen', 'Dmitri',
+    'Elena', 'Farah', 'Gabriel', 'Hana', 'Isaac', 'Jin', 'Kofi', 'Lucia', 'Mateo', 'Noor',
+    'Omar', 'Priya', 'Ravi', 'Sofia', 'Tariq', 'Uma', 'Victor', 'Wei', 'Yusuf', 'Zoe',
+)
+
+LAST_NAMES = (
+    'Johnson', 'Smith', 'Brown', 'Prince', 'Norton', 'Apple', 'Banks', 'Carter', 'Garcia', 'Miller',
+    'Davis', 'Rodriguez', 'Martinez', 'Hernandez', 'Lopez', 'Wilson', 'Anderson', 'Thomas', 'Taylor',
+    'Moore', 'Jackson', 'Martin', 'Lee', 'Perez', 'Thompson', 'White', 'Harris', 'Sanchez', 'Clark',
+    'Lewis', 'Robinson', 'Walker', 'Young', 'Allen', 'King', 'Wright', 'Scott', 'Torres', 'Nguyen',
+    'Hill', 'Flores', 'Green', 'Adams', 'Nelson', 'Baker', 'Hall', 'Rivera', 'Campbell', 'Mitchell',
+    'Zhang', 'Wang', 'Li', 'Kim', 'Patel', 'Singh', 'Khan', 'Okafor', 'Silva', 'Rossi', 'Novak',
+)
+
+GENDERS = ('Male', 'Female', 'Other')
+
+# real companies from the seed; the rest are generated as prefix + suffix
+KNOWN_COMPANIES = (
+    'Google', 'Amazon', 'Microsoft', 'Apple', 'Meta', 'Adobe', 'LinkedIn', 'Salesforce',
+    'Twitter', 'Uber', 'Oracle', 'IBM', 'Intel', 'Airbnb',
+)
+COMPANY_PREFIXES = (
+    'Tech', 'Byte', 'Data', 'Cloud', 'Smart', 'Digital', 'Next', 'Agile', 'Web', 'Quantum',
+    'Blue', 'Bright', 'Code', 'Cyber', 'Deep', 'Future', 'Green', 'Hyper', 'Iron', 'Nova',
+)
+COMPANY_SUFFIXES = (
+    'Start Solutions', 'Craft Solutions', 'Flow Systems', 'Mind Tech', 'Code Inc', 'Frontiers',
+    'Gen Software', 'Dynamics', 'Labs', 'Works', 'Analytics', 'Networks', 'Logic', 'Forge',
+)
+
+POSITION_TITLES = (
+    'Software Developer Intern', 'Frontend Developer Intern', 'Backend Developer Intern',
+    'Data Analyst Intern', 'Data Engineer Intern', 'Mobile Developer Intern',
+    'DevOps Engineer Intern', 'QA Engineer Intern', 'Machine Learning Intern',
+    'Cloud Engineer Intern', 'Security Engineer Intern', 'Database Engineer Intern',
+    'Product Manager Intern', 'UX Designer Intern', 'Site Reliability Intern',
+)
+POSITION_DETAILS = (
+    ('Develop and maintain web applications', 'Java, Spring Boot, SQL'),
+    ('Create responsive user interfaces', 'React, TypeScript, CSS'),
+    ('Analyze business metrics and create reports', 'Python, SQL, Tableau'),
+    ('Develop mobile applications', 'Swift, Kotlin, Flutter'),
+    ('Maintain CI/CD pipelines', 'Docker, Kubernetes, Jenkins'),
+    ('Test software applications', 'Selenium, JUnit, TestNG'),
+    ('Build and train ML models', 'Python, TensorFlow, PyTorch'),
+    ('Manage cloud infrastructure', 'AWS, Azure, GCP'),
+    ('Implement security measures', 'Network Security, Cryptography'),
+    ('Design and optimize databases', 'MySQL, MongoDB, PostgreSQL'),
+    ('Build data pipelines for analytics', 'Python, Spark, Airflow'),
+    ('Improve service reliability and monitoring', 'Linux, Prometheus, Go'),
+)
+
+SKILLS = (
+    'Python', 'Java', 'C++', 'JavaScript', 'TypeScript', 'Go', 'Rust', 'Ruby', 'PHP', 'Kotlin',
+    'Swift', 'React', 'Angular', 'Vue.js', 'Node.js', 'Django', 'Flask', 'Spring Boot', 'SQL',
+    'MongoDB', 'PostgreSQL', 'MySQL', 'Redis', 'Docker', 'Kubernetes', 'AWS', 'GCP', 'Azure',
+    'TensorFlow', 'PyTorch', 'Pandas', 'Spark', 'Git', 'Linux', 'GraphQL', 'Figma',
+)
+
+PROJECTS = (
+    'Developed a Personal Finance Tracker App',
+    'Built a Machine Learning Model for Sentiment Analysis',
+    'Designed a Collaborative Team Task Management System',
+    'Implemented an E-commerce Platform with Payment Integration',
+    'Created a Social Media Platform for Hobby Communities',
+    'Optimized a Blog Website for SEO and Scalability',
+    'Built a Real-time Chat Application with WebSockets',
+    'Developed a Course Scheduling Assistant',
+    'Created a Recipe Recommendation Engine',
+    'Implemented a Distributed Key-Value Store',
+    'Built a Fitness Tracking Mobile App',
+    'Designed a Campus Event Discovery Platform',
+)
+
+COURSES = (
+    'Fundamentals of Computer Science', 'Object-Oriented Design', 'Discrete Structures',
+    'Algorithms and Data', 'Computer Systems', 'Database Design', 'Networks and Distributed Systems',
+    'Programming Languages', 'Software Engineering', 'Machine Learning', 'Artificial Intelligence',
+    'Computer Graphics', 'Web Development', 'Mobile App Development', 'Information Retrieval',
+    'Theory of Computation', 'Cryptography', 'Human Computer Interaction', 'Linear Algebra',
+    'Calculus I', 'Calculus II', 'Probability and Statistics', 'Technical Writing', 'Physics I',
+    'Physics II', 'Microeconomics', 'Ethics in Technology', 'Operating Systems', 'Compilers',
+    'Computer Vision', 'Natural Language Processing', 'Cloud Computing',
+)
+
+SUGGESTION_OPENERS = (
+    'Your GPA is competitive.',
+    'Strong technical foundation.',
+    'Good balance of front-end and back-end skills.',
+    'Consider tailoring this resume to each position.',
+    'Your internship experience stands out.',
+)
+SUGGESTION_ADVICE = (
+    'Quantify the impact of your projects with concrete metrics.',
+    'Detail the specific technologies you used in each role.',
+    'Highlight cross-team collaboration and ownership.',
+    'Move your strongest project to the top of the section.',
+    'Add performance or scalability numbers where you can.',
+    'Mention the size of the user base your work reached.',
+    'Keep each bullet point to a single line where possible.',
+)
+
+DATABASE_NAMES = ('StudentDB', 'ApplicationDB', 'ResumeDB', 'UserDB', 'AnalyticsDB',
+                  'AuditDB', 'SearchDB', 'ReportingDB')
+DATABASE_TYPES = ('MySQL', 'PostgreSQL', 'MongoDB', 'Redis')
+
+ALERT_TYPES = (
+    ('System Performance', 'Performance threshold exceeded'),
+    ('CPU Usage', 'CPU usage above 90%'),
+    ('Disk Space', 'Disk usage above 85%'),
+    ('Replication Lag', 'Replica more than 30s behind'),
+    ('Connections', 'Connection limit nearly reached'),
+    ('Slow Queries', 'Slow query rate above threshold'),
+)
+SEVERITIES = ('Low', 'Medium', 'High')
+
+ALTERATION_TYPES = ('Schema Update', 'Data Migration', 'Index Rebuild', 'Column Rename', 'Data Cleanup')
+BACKUP_TYPES = (('Full', 'Weekly'), ('Incremental', 'Daily'))
@@ -1,10 +1,189 @@
 #------------------------------------------------------------
 # This file creates a shared DB connection resource
 #------------------------------------------------------------
-from flaskext.mysql import MySQL
-from pymysql import cursors
+from flask import current_app, g
+from pymysql.cursors import DictCursor, SSDictCursor
 
+from backend.db_connection.cursors import instrumented_cursor
+from backend.db_connection.pool import ConnectionPool, PoolTimeout
+from backend.db_connection.query_log import QueryLog
 
-# the parameter instructs the connection to return data 
-# as a dictionary object. 
-db = MySQL(cursorclass=cursors.DictCursor)
\ No newline at end of file
+ENGINES = ('mysql', 'sqlite')
+
+
+class MySQLPool:
+    """
+    Drop-in replacement for flaskext.mysql.MySQL backed by a connection
+    pool. Route handlers keep calling db.get_db(); the first call in a
+    request checks a connection out of the pool and it is handed back
+    when the app context tears down.
+    """
+
+    dialect = 'mysql'
+
+    def __init__(self, app=None, cursorclass=DictCursor):
+        self.cursorclass = cursorclass
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('MYSQL_DATABASE_HOST', 'localhost')
+        app.config.setdefault('MYSQL_DATABASE_PORT', 3306)
+        app.config.setdefault('MYSQL_DATABASE_USER', None)
+        app.config.setdefault('MYSQL_DATABASE_PASSWORD', None)
+        app.config.setdefault('MYSQL_DATABASE_DB', None)
+        app.config.setdefault('MYSQL_DATABASE_CHARSET', 'utf8mb4')
+        app.config.setdefault('MYSQL_POOL_SIZE', 10)
+        app.config.setdefault('MYSQL_POOL_MAX_OVERFLOW', 10)
+        app.config.setdefault('MYSQL_POOL_TIMEOUT', 30)
+        app.config.setdefault('MYSQL_POOL_IDLE_TIMEOUT', 300)
+        app.config.setdefault('MYSQL_POOL_RECYCLE', 3600)
+        app.config.setdefault('MYSQL_POOL_PRE_PING', True)
+
+        # time every statement for /metrics and / or the query log
+        cursorclass = self.cursorclass
+        record_metrics = bool(app.config.get('METRICS_ENABLED'))
+        query_log = app.extensions.get('query_log')
+        if (record_metrics or query_log is not None) and cursorclass is DictCursor:
+            cursorclass = instrumented_cursor(record_metrics, query_log)
+
+        connect_args = {
+            'host': app.config['MYSQL_DATABASE_HOST'],
+            'port': app.config['MYSQL_DATABASE_PORT'],
+            'user': app.config['MYSQL_DATABASE_USER'],
+            'password': app.config['MYSQL_DATABASE_PASSWORD'],
+            'database': app.config['MYSQL_DATABASE_DB'],
+            'charset': app.config['MYSQL_DATABASE_CHARSET'],
+            'cursorclass': cursorclass,
+        }
+        pool = ConnectionPool(
+            connect_args,
+            size=app.config['MYSQL_POOL_SIZE'],
+            max_overflow=app.config['MYSQL_POOL_MAX_OVERFLOW'],
+            timeout=app.config['MYSQL_POOL_TIMEOUT'],
+            idle_timeout=app.config['MYSQL_POOL_IDLE_TIMEOUT'],
+            recycle=app.config['MYSQL_POOL_RECYCLE'],
+            pre_ping=app.config['MYSQL_POOL_PRE_PING'],
+        )
+        app.extensions['mysql_pool'] = pool
+        app.teardown_appcontext(self.teardown_request)
+
+    @property
+    def pool(self):
+        return current_app.extensions['mysql_pool']
+
+    def get_db(self):
+        """Connection bound to the current app context (checked out lazily)"""
+        if 'mysql_pooled' not in g:
+            g.mysql_pooled = self.pool.acquire()
+        return g.mysql_pooled.conn
+
+    def teardown_request(self, exception):
+        pooled = g.pop('mysql_pooled', None)
+        if pooled is not None:
+            self.pool.release(pooled)
+
+    def export_cursor(self, query, params):
+        """
+        Unbuffered server-side cursor (SSDictCursor) over `query` on a
+        pooled connection of its own, and release(finished) to hand the
+        connection back (closed unless the rows were read to the end)
+        """
+        pool = self.pool
+        pooled = pool.acquire()
+        try:
+            cursor = pooled.conn.cursor(SSDictCursor)
+            cursor.execute(query, params)
+        except Exception:
+            pool.release(pooled, discard=True)
+            raise
+
+        def release(finished):
+            if finished:
+                cursor.close()
+            pool.release(pooled, discard=not finished)
+        return cursor, release
+
+    def stats(self):
+        return self.pool.stats()
+
+    def dispose(self):
+        self.pool.dispose()
+
+
+class Database:
+    """
+    The app's database engine, picked by DB_ENGINE: 'mysql' (MySQLPool,
+    the default) or 'sqlite' (backend.data.sqlite, an embedded file
+    that needs no server). Both hand out connections whose cursors run
+    the backend.data named queries in their own dialect.
+    """
+
+    def __init__(self, app=None, cursorclass=DictCursor):
+        self.cursorclass = cursorclass
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('DB_ENGINE', 'mysql')
+        app.config.setdefault('QUERY_LOG_ENABLED', False)
+        app.config.setdefault('QUERY_LOG_SLOW_MS', 200)
+        app.config.setdefault('QUERY_LOG_N_PLUS_ONE', 10)
+        app.config.setdefault('QUERY_LOG_EXAMINE_RATE', 0.0)
+        app.config.setdefault('QUERY_LOG_MAX_FINGERPRINTS', 1000)
+
+        name = app.config['DB_ENGINE']
+        if name not in ENGINES:
+            raise ValueError(f"DB_ENGINE must be one of {', '.join(ENGINES)}, not {name!r}")
+
+        query_log = None
+        if app.config['QUERY_LOG_ENABLED']:
+            query_log = QueryLog(
+                slow_ms=app.config['QUERY_LOG_SLOW_MS'],
+                n_plus_one=app.config['QUERY_LOG_N_PLUS_ONE'],
+                examine_rate=app.config['QUERY_LOG_EXAMINE_RATE'],
+                max_fingerprints=app.config['QUERY_LOG_MAX_FINGERPRINTS'],
+            )
+            app.extensions['query_log'] = query_log
+            app.teardown_request(query_log.end_request)
+
+        if name == 'sqlite':
+            from backend.data.sqlite import SQLiteDatabase
+            engine = SQLiteDatabase(app, query_log=query_log)
+        else:
+            engine = MySQLPool(app, cursorclass=self.cursorclass)
+        app.extensions['db'] = engine
+
+    @property
+    def engine(self):
+        """MySQLPool or SQLiteDatabase of the current app"""
+        return current_app.extensions['db']
+
+    @property
+    def dialect(self):
+        return self.engine.dialect
+
+    @property
+    def pool(self):
+        """The MySQL connection pool (MySQL engine only)"""
+        return current_app.extensions['mysql_pool']
+
+    def get_db(self):
+        """Connection bound to the current app context (checked out lazily)"""
+        return self.engine.get_db()
+
+    def export_cursor(self, query, params):
+        return self.engine.export_cursor(query, params)
+
+    def stats(self):
+        return self.engine.stats()
+
+    @property
+    def query_log(self):
+        """The app's QueryLog, None unless QUERY_LOG_ENABLED"""
+        return current_app.extensions.get('query_log')
+
+
+# the parameter instructs the connection to return data
+# as a dictionary object.
+db = Database(cursorclass=DictCursor)
@@ -0,0 +1,43 @@
+#------------------------------------------------------------
+# Instrumented cursor
+#
+# Used instead of the plain DictCursor when METRICS_ENABLED or
+# QUERY_LOG_ENABLED is set: every statement reports its duration and
+# row count to backend.request_metrics (per-request totals for
+# /metrics) and / or to the app's QueryLog (slow-query log and N+1
+# detector, see query_log.py).
+#------------------------------------------------------------
+import time
+
+from pymysql import cursors
+
+from backend import request_metrics
+
+
+class InstrumentedDictCursor(cursors.DictCursor):
+
+    # set per app by instrumented_cursor()
+    record_metrics = True
+    query_log = None
+
+    def execute(self, query, args=None):
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = super().execute(query, args)
+            failed = False
+            return result
+        finally:
+            seconds = time.perf_counter() - started
+            # rows of a result set; writes only count as a statement
+            rows = self.rowcount if not failed and self.description is not None else 0
+            if self.record_metrics:
+                request_metrics.record_query(seconds, rows)
+            if self.query_log is not None and not failed:
+                self.query_log.record(self, query, args, seconds, rows)
+
+
+def instrumented_cursor(record_metrics, query_log):
+    """InstrumentedDictCursor reporting to the given sinks"""
+    return type('InstrumentedDictCursor', (InstrumentedDictCursor,),
+                {'record_metrics': record_metrics, 'query_log': query_log})
@@ -0,0 +1,230 @@
+#------------------------------------------------------------
+# A small bounded, thread-safe pool of PyMySQL connections
+#------------------------------------------------------------
+import threading
+import time
+from collections import deque
+
+import pymysql
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection could be checked out within the timeout"""
+
+
+class _PooledConnection:
+    """Book-keeping wrapper around one raw PyMySQL connection"""
+
+    __slots__ = ('conn', 'created_at', 'last_used')
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class ConnectionPool:
+    """
+    Keeps up to `size` idle connections around and allows up to
+    `max_overflow` extra connections under load. Callers that find the
+    pool exhausted wait up to `timeout` seconds for a connection to be
+    returned before PoolTimeout is raised.
+
+    Idle connections older than `idle_timeout` seconds (or created more
+    than `recycle` seconds ago) are closed instead of being handed out,
+    and with `pre_ping` enabled every checkout pings the server first so
+    a connection dropped by MySQL's wait_timeout is replaced transparently.
+    """
+
+    def __init__(self, connect_args, size=10, max_overflow=10, timeout=30,
+                 idle_timeout=300, recycle=3600, pre_ping=True):
+        if size < 1:
+            raise ValueError('pool size must be at least 1')
+        self.connect_args = dict(connect_args)
+        self.size = size
+        self.max_overflow = max(max_overflow, 0)
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._open = 0
+        self._checked_out = 0
+        self._waiting = 0
+
+        # counters exposed through stats()
+        self._checkouts = 0
+        self._connects = 0
+        self._discards = 0
+        self._timeouts = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+
+    # ------------------------------------------------------------
+    # connection lifecycle
+    def _connect(self):
+        conn = pymysql.connect(**self.connect_args)
+        with self._lock:
+            self._connects += 1
+        return _PooledConnection(conn)
+
+    def _close(self, pooled):
+        try:
+            pooled.conn.close()
+        except Exception:
+            pass
+
+    def _is_stale(self, pooled, now):
+        if self.recycle and now - pooled.created_at > self.recycle:
+            return True
+        if self.idle_timeout and now - pooled.last_used > self.idle_timeout:
+            return True
+        return False
+
+    def _is_alive(self, pooled):
+        try:
+            pooled.conn.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    # ------------------------------------------------------------
+    # checkout / checkin
+    def acquire(self):
+        """Check a connection out of the pool, waiting if it is exhausted"""
+        started = time.monotonic()
+        deadline = None if self.timeout is None else started + self.timeout
+
+        while True:
+            pooled = None
+            create = False
+            with self._available:
+                while not self._idle and self._open >= self.size + self.max_overflow:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeout(
+                            f'no connection available within {self.timeout}s '
+                            f'(size={self.size}, max_overflow={self.max_overflow})'
+                        )
+                    self._waiting += 1
+                    try:
+                        self._available.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+
+                if self._idle:
+                    pooled = self._idle.pop()
+                else:
+                    # reserve the slot now, open the socket outside the lock
+                    self._open += 1
+                    create = True
+
+            if create:
+                try:
+                    pooled = self._connect()
+                except Exception:
+                    with self._available:
+                        self._open -= 1
+                        self._available.notify()
+                    raise
+            elif self._is_stale(pooled, time.monotonic()) or \
+                    (self.pre_ping and not self._is_alive(pooled)):
+                self._close(pooled)
+                with self._available:
+                    self._open -= 1
+                    self._discards += 1
+                continue
+
+            waited = time.monotonic() - started
+            with self._lock:
+                self._checked_out += 1
+                self._checkouts += 1
+                self._wait_time_total += waited
+                self._wait_time_max = max(self._wait_time_max, waited)
+            return pooled
+
+    def release(self, pooled, discard=False):
+        """
+        Return a connection; any open transaction is rolled back first.
+        With `discard` the connection is closed instead, e.g. when an
+        unbuffered result was abandoned half-read.
+        """
+        reusable = not discard
+        if reusable:
+            try:
+                pooled.conn.rollback()
+            except Exception:
+                reusable = False
+        pooled.last_used = time.monotonic()
+
+        with self._available:
+            self._checked_out -= 1
+            if reusable and len(self._idle) < self.size:
+                self._idle.append(pooled)
+                pooled = None
+            else:
+                self._open -= 1
+                if not reusable:
+                    self._discards += 1
+            self._available.notify()
+
+        if pooled is not None:
+            self._close(pooled)
+
+    def prefill(self, count):
+        """Open up to `count` idle connections ahead of the first request"""
+        count = min(count, self.size)
+        opened = []
+        try:
+            for _ in range(count):
+                with self._lock:
+                    if self._open >= self.size:
+                        break
+                    self._open += 1
+                try:
+                    opened.append(self._connect())
+                except Exception:
+                    with self._lock:
+                        self._open -= 1
+                    raise
+        finally:
+            with self._available:
+                self._idle.extend(opened)
+                self._available.notify(len(opened))
+        return len(opened)
+
+    def dispose(self):
+        """Close every idle connection (checked-out ones close on release)"""
+        with self._available:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._open -= len(idle)
+        for pooled in idle:
+            self._close(pooled)
+
+    # ------------------------------------------------------------
+    # monitoring
+    def stats(self):
+        """Snapshot of pool usage for monitoring"""
+        with self._lock:
+            return {
+                'size': self.size,
+                'max_overflow': self.max_overflow,
+                'open': self._open,
+                'idle': len(self._idle),
+                'checked_out': self._checked_out,
+                'overflow': max(self._open - self.size, 0),
+                'waiting': self._waiting,
+                'checkouts': self._checkouts,
+                'connects': self._connects,
+                'discards': self._discards,
+                'timeouts': self._timeouts,
+                'wait_time_total': round(self._wait_time_total, 6),
+                'wait_time_avg': round(self._wait_time_total / self._checkouts, 6)
+                                 if self._checkouts else 0.0,
+                'wait_time_max': round(self._wait_time_max, 6),
+            }
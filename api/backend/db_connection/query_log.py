@@ -0,0 +1,212 @@
+#------------------------------------------------------------
+# Slow-query log and N+1 detector
+#
+# With QUERY_LOG_ENABLED the pool's cursors report every statement
+# here. Statements are grouped by fingerprint: the SQL with comments,
+# literals and placeholders replaced by ? and value lists collapsed,
+# e.g.
+#
+#   select * from application where user_id = ? and status in (?+)
+#
+# Per fingerprint we keep the call count, timings, rows returned and
+# (for slow and sampled statements) rows examined, read from
+# performance_schema (MySQL only). A statement slower than
+# QUERY_LOG_SLOW_MS is logged with its plan (backend.data.plans, on
+# either engine), and a request that runs one
+# fingerprint more than QUERY_LOG_N_PLUS_ONE times is logged as an
+# N+1 pattern. The summary (GET /maintenance_staff/queries) names the
+# backend.data statement behind each fingerprint and covers the worker
+# process that serves it.
+#------------------------------------------------------------
+import functools
+import hashlib
+import logging
+import random
+import re
+import threading
+from collections import Counter
+
+from flask import g, has_request_context, request
+from pymysql import cursors
+
+from backend.data import plans, query_name
+logger = logging.getLogger(__name__)
+
+OTHER = '(other)'
+MAX_ROUTES = 10
+
+_STRINGS = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\"")
+_COMMENTS = re.compile(r'/\*.*?\*/|--[^\n]*', re.S)
+_PLACEHOLDERS = re.compile(r'%\(\w+\)s|%s')
+_NUMBERS = re.compile(r'(?<![\w.])-?\d+(?:\.\d+)?(?:e[+-]?\d+)?\b', re.I)
+_LISTS = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_ROWS = re.compile(r'\(\?\+\)(?:\s*,\s*\(\?\+\))+')
+_SPACE = re.compile(r'\s+')
+
+# ?sort= of the summary -> summary field
+SORT_KEYS = {'total': 'total_ms', 'mean': 'mean_ms', 'max': 'max_ms', 'count': 'count',
+             'rows': 'rows_returned', 'slow': 'slow', 'n_plus_one': 'n_plus_one_requests'}
+
+_EXPLAINABLE = ('select', 'update', 'delete', 'insert', 'replace', 'with')
+
+
+@functools.lru_cache(maxsize=4096)
+def fingerprint(statement):
+    """Normalized form of a statement, identical for every set of values"""
+    if isinstance(statement, bytes):
+        statement = statement.decode('utf-8', 'replace')
+    text = _STRINGS.sub('?', statement)
+    text = _COMMENTS.sub(' ', text)
+    text = _PLACEHOLDERS.sub('?', text)
+    text = _NUMBERS.sub('?', text)
+    text = _LISTS.sub('(?+)', text)
+    text = _ROWS.sub('(?+)', text)
+    return _SPACE.sub(' ', text).strip().lower()
+
+
+def _route():
+    if not has_request_context():
+        return None
+    rule = request.url_rule
+    return f'{request.method} {rule.rule if rule is not None else request.path}'
+
+
+class _Stats:
+
+    __slots__ = ('name', 'count', 'total', 'max', 'rows', 'examined', 'examined_samples',
+                 'slow', 'n_plus_one', 'routes')
+
+    def __init__(self, name=None):
+        self.name = name
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.examined = 0
+        self.examined_samples = 0
+        self.slow = 0
+        self.n_plus_one = 0
+        self.routes = set()
+
+
+class QueryLog:
+    """Per-process statement statistics; see the module comment"""
+
+    def __init__(self, slow_ms=200, n_plus_one=10, examine_rate=0.0, max_fingerprints=1000):
+        self.slow_seconds = slow_ms / 1000
+        self.n_plus_one = n_plus_one
+        self.examine_rate = examine_rate
+        self.max_fingerprints = max_fingerprints
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------
+    # recording (called by the instrumented cursor)
+    def record(self, cursor, query, args, seconds, rows):
+        key = fingerprint(query)
+        slow = seconds >= self.slow_seconds
+        examined = None
+        if slow or (self.examine_rate and random.random() < self.examine_rate):
+            examined = self._rows_examined(cursor.connection)
+        if slow:
+            self._log_slow(cursor.connection, key, query, args, seconds, rows, examined)
+
+        route = _route()
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                if len(self._stats) >= self.max_fingerprints:
+                    key = OTHER
+                stats = self._stats.setdefault(key, _Stats(query_name(query) if key != OTHER else None))
+            stats.count += 1
+            stats.total += seconds
+            stats.max = max(stats.max, seconds)
+            stats.rows += rows
+            if examined is not None:
+                stats.examined += examined
+                stats.examined_samples += 1
+            if slow:
+                stats.slow += 1
+            if route is not None and len(stats.routes) < MAX_ROUTES:
+                stats.routes.add(route)
+
+        if has_request_context():
+            g.setdefault('query_fingerprints', Counter())[key] += 1
+
+    def end_request(self, exception=None):
+        """teardown_request hook: report fingerprints repeated N+1 style"""
+        counts = g.pop('query_fingerprints', None)
+        if not counts:
+            return
+        repeated = [(key, n) for key, n in counts.items() if n > self.n_plus_one]
+        if not repeated:
+            return
+        route = _route()
+        with self._lock:
+            for key, _ in repeated:
+                if key in self._stats:
+                    self._stats[key].n_plus_one += 1
+        for key, n in repeated:
+            logger.warning(f'possible N+1: {route} ran {n} times: {key}')
+
+    def _rows_examined(self, conn):
+        """Rows examined by the statement that just ran on `conn`"""
+        if plans.dialect_of(conn) != 'mysql':
+            return None
+        try:
+            cursor = conn.cursor(cursors.DictCursor)
+            cursor.execute('''
+                SELECT ROWS_EXAMINED AS examined
+                FROM performance_schema.events_statements_history
+                WHERE THREAD_ID = PS_CURRENT_THREAD_ID()
+                ORDER BY EVENT_ID DESC
+                LIMIT 1
+            ''')
+            row = cursor.fetchone()
+            return int(row['examined']) if row else None
+        except Exception as e:
+            logger.debug(f'rows examined unavailable: {str(e)}')
+            return None
+
+    def _log_slow(self, conn, key, query, args, seconds, rows, examined):
+        plan = ''
+        if key.split(' ', 1)[0] in _EXPLAINABLE:
+            try:
+                plan = '\n' + '\n'.join(
+                    f"  {step['table']}: {step['access']} key={step['index']} "
+                    f"rows={step['rows']} {step['detail']}"
+                    for step in plans.explain(conn, query, args))
+            except Exception as e:
+                plan = f'\n  (no plan: {str(e)})'
+        logger.warning(f'slow query {seconds * 1000:.1f} ms, {rows} rows returned, '
+                       f'{examined if examined is not None else "?"} examined '
+                       f'({_route() or "no request"}): {key}{plan}')
+
+    # ------------------------------------------------------------
+    # reporting
+    def summary(self, sort='total', limit=50):
+        """Per-fingerprint statistics, the most expensive first"""
+        rows = []
+        with self._lock:
+            for key, stats in self._stats.items():
+                rows.append({
+                    'id': hashlib.sha1(key.encode('utf-8')).hexdigest()[:12],
+                    'name': stats.name,
+                    'fingerprint': key,
+                    'count': stats.count,
+                    'total_ms': round(stats.total * 1000, 3),
+                    'mean_ms': round(stats.total * 1000 / stats.count, 3),
+                    'max_ms': round(stats.max * 1000, 3),
+                    'rows_returned': stats.rows,
+                    'rows_examined_avg': round(stats.examined / stats.examined_samples, 1)
+                                         if stats.examined_samples else None,
+                    'slow': stats.slow,
+                    'n_plus_one_requests': stats.n_plus_one,
+                    'routes': sorted(stats.routes),
+                })
+        rows.sort(key=lambda row: row[SORT_KEYS[sort]], reverse=True)
+        return rows[:limit]
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
@@ -0,0 +1,97 @@
+#------------------------------------------------------------
+# Streamed NDJSON / CSV exports of list endpoints
+#
+# A list endpoint streams its whole result, in its usual order and
+# without pagination, when asked for ?format=ndjson / ?format=csv or
+# with an `Accept: application/x-ndjson` / `Accept: text/csv` header.
+# Rows come from an unbuffered cursor on a connection of its own
+# (db.export_cursor: SSDictCursor on MySQL, a lazy SQLite cursor on the
+# embedded engine), so memory stays flat whatever the row count.
+#------------------------------------------------------------
+import csv
+import io
+
+from flask import Response, request
+
+from backend.db_connection import db
+from backend.json_provider import dumps_bytes
+
+BATCH_SIZE = 500
+
+FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+class ExportError(ValueError):
+    """Raised for an unknown export format"""
+
+
+def export_format():
+    """'ndjson' or 'csv' when the request asks for an export, else None"""
+    fmt = request.args.get('format')
+    if fmt:
+        fmt = fmt.lower()
+        if fmt == 'json':
+            return None
+        if fmt not in FORMATS:
+            raise ExportError(f'Unsupported format: {fmt}')
+        return fmt
+
+    accepted = {mimetype for mimetype, _ in request.accept_mimetypes}
+    for fmt, mimetype in FORMATS.items():
+        if mimetype in accepted:
+            return fmt
+    return None
+
+
+def _ndjson(cursor, rows):
+    while rows:
+        yield b''.join(dumps_bytes(row) + b'\n' for row in rows)
+        rows = cursor.fetchmany(BATCH_SIZE)
+
+
+def _csv(cursor, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([column[0] for column in cursor.description])
+    while rows:
+        writer.writerows(['' if value is None else value for value in row.values()] for row in rows)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+        rows = cursor.fetchmany(BATCH_SIZE)
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def stream_export(query, params, fmt, name):
+    """
+    Run `query` on a dedicated connection and stream its rows as
+    `fmt`. SQL errors surface here, before the response starts; a client
+    that disconnects mid-export gets its connection closed rather than
+    drained.
+    """
+    cursor, release = db.export_cursor(query, params)
+    try:
+        first = cursor.fetchmany(BATCH_SIZE)
+    except Exception:
+        release(False)
+        raise
+
+    def generate():
+        finished = False
+        try:
+            if fmt == 'csv':
+                yield from _csv(cursor, first)
+            else:
+                yield from _ndjson(cursor, first)
+            finished = True
+        finally:
+            release(finished)
+
+    return Response(generate(), mimetype=FORMATS[fmt], headers={
+        'Content-Disposition': f'attachment; filename="{name}.{fmt}"',
+        'X-Accel-Buffering': 'no',
+    })
@@ -1,5 +1,13 @@
 from flask import Blueprint, request, jsonify, make_response
+from backend.cache import cache
+from backend.data import define
 from backend.db_connection import db
+from backend.export import ExportError, export_format, stream_export
+from backend.pagination import CursorError, NULLABLE, keyset_condition, order_clause, page_args, page_response
+from backend.projections import (STATUS_COUNTERS, adjust_application_counters,
+                                 adjust_application_counters_bulk, refresh_current_application,
+                                 refresh_current_applications, refresh_latest_suggestion)
+from backend.resume_store import RESUME_COLUMNS, RESUME_SECTIONS
 import logging
 from datetime import datetime
 
@@ -7,32 +15,52 @@ hr_bp = Blueprint('hr', __name__)
 logger = logging.getLogger(__name__)
 
 # Position Management Routes
+INTERNSHIPS_SORT = [('ip.posted_date', 'DESC'), ('ip.position_id', 'DESC')]
+INTERNSHIPS_QUERY = define('hr.internships', '''
+    SELECT ip.*
+    FROM internship_position ip
+    WHERE {keyset}
+    ORDER BY {order}
+''')
+
 @hr_bp.route('/internships', methods=['GET'])
+@cache.cached(tags=('positions', 'application_counts'))
 def get_internships():
-    """Get all internship positions with application counts"""
+    """Get internship positions with application counts, one page at a time"""
     try:
+        fmt = export_format()
+        limit, after = (None, None) if fmt else page_args(INTERNSHIPS_SORT)
+        keyset, keyset_params = keyset_condition(INTERNSHIPS_SORT, after)
+
+        query = INTERNSHIPS_QUERY.format(keyset=keyset, order=order_clause(INTERNSHIPS_SORT))
+        if fmt:
+            return stream_export(query, keyset_params, fmt, 'internships')
+
         cursor = db.get_db().cursor()
-        cursor.execute('''
-            SELECT ip.*, COUNT(a.application_id) as application_count
-            FROM internship_position ip
-            LEFT JOIN application a ON ip.position_id = a.position_id
-            GROUP BY ip.position_id, ip.title, ip.description, ip.requirements, 
-                     ip.status, ip.posted_date, ip.hr_id
-        ''')
-        positions = cursor.fetchall()
-        return make_response(jsonify(positions), 200)
+        cursor.execute(query + ' LIMIT %s', (*keyset_params, limit + 1))
+        page = page_response(cursor.fetchall(), limit, ('posted_date', 'position_id'))
+        return make_response(jsonify(page), 200)
+    except (CursorError, ExportError) as e:
+        return make_response(jsonify({'error': str(e)}), 400)
     except Exception as e:
         logger.error(f"Error getting internships: {str(e)}")
         return make_response(jsonify({'error': str(e)}), 500)
 
+ADD_INTERNSHIP_QUERY = define('hr.add_internship', '''
+    INSERT INTO internship_position
+    (hr_id, title, description, requirements, status, posted_date)
+    VALUES (%s, %s, %s, %s, %s, CURDATE())
+''', sqlite='''
+    INSERT INTO internship_position
+    (hr_id, title, description, requirements, status, posted_date)
+    VALUES (%s, %s, %s, %s, %s, date('now'))
+''')
+
 @hr_bp.route('/internships', methods=['POST'])
 def add_internship():
     """Add a new internship position"""
     try:
         position_info = request.json
-        query = '''INSERT INTO internship_position 
-                   (hr_id, title, description, requirements, status, posted_date)
-                   VALUES (%s, %s, %s, %s, %s, CURDATE())'''
         data = (
             position_info['hr_id'],
             position_info['title'],
@@ -41,59 +69,60 @@ def add_internship():
             position_info['status']
         )
         cursor = db.get_db().cursor()
-        cursor.execute(query, data)
+        cursor.execute(ADD_INTERNSHIP_QUERY, data)
         db.get_db().commit()
+        cache.invalidate('positions')
         return make_response(jsonify({'message': 'Position added successfully'}), 201)
     except Exception as e:
         db.get_db().rollback()
         logger.error(f"Error adding internship: {str(e)}")
         return make_response(jsonify({'error': str(e)}), 500)
 
+POSITION_APPLICATIONS_QUERY = define('hr.position_applications', '''
+    SELECT application_count
+    FROM internship_position
+    WHERE position_id = %s
+''')
+
+DEACTIVATE_INTERNSHIP_QUERY = define('hr.deactivate_internship', '''
+    UPDATE internship_position
+    SET status = 'Inactive'
+    WHERE position_id = %s
+''')
+
+DELETE_INTERNSHIP_QUERY = define('hr.delete_internship', '''
+    DELETE FROM internship_position
+    WHERE position_id = %s
+''')
+
 @hr_bp.route('/internships/<int:position_id>', methods=['DELETE'])
 def delete_internship(position_id):
     """Delete an internship position"""
     try:
         cursor = db.get_db().cursor()
         
-        # Check if position exists and belongs to the HR manager
-        cursor.execute('''
-            SELECT COUNT(*) as count 
-            FROM internship_position 
-            WHERE position_id = %s
-        ''', (position_id,))
+        # Check if position exists and whether it has applications
+        cursor.execute(POSITION_APPLICATIONS_QUERY, (position_id,))
         result = cursor.fetchone()
         
-        if not result or result['count'] == 0:
+        if not result:
             logger.error(f"Position {position_id} not found")
             return make_response(jsonify({'error': 'Position not found'}), 404)
         
-        # Check for existing applications
-        cursor.execute('''
-            SELECT COUNT(*) as app_count 
-            FROM application 
-            WHERE position_id = %s
-        ''', (position_id,))
-        app_result = cursor.fetchone()
-        
         # If there are applications, perform soft delete by updating status
-        if app_result['app_count'] > 0:
+        if result['application_count'] > 0:
             logger.info(f"Position {position_id} has applications, performing soft delete")
-            cursor.execute('''
-                UPDATE internship_position 
-                SET status = 'Inactive'
-                WHERE position_id = %s
-            ''', (position_id,))
+            cursor.execute(DEACTIVATE_INTERNSHIP_QUERY, (position_id,))
             db.get_db().commit()
+            cache.invalidate('positions')
             return make_response(jsonify({
                 'message': 'Position deactivated due to existing applications'
             }), 200)
         
         # If no applications, perform hard delete
-        cursor.execute('''
-            DELETE FROM internship_position 
-            WHERE position_id = %s
-        ''', (position_id,))
+        cursor.execute(DELETE_INTERNSHIP_QUERY, (position_id,))
         db.get_db().commit()
+        cache.invalidate('positions', 'application_counts')
         
         logger.info(f"Position {position_id} deleted successfully")
         return make_response(jsonify({'message': 'Position deleted successfully'}), 200)
@@ -104,75 +133,98 @@ def delete_internship(position_id):
         return make_response(jsonify({'error': str(e)}), 500)
 
 # Application Management Routes
+APPLICATIONS_SORT = [('ca.application_id', 'DESC')]
+# current_application holds the newest application of each pair,
+# indexed by (status, application_id)
+APPLICATIONS_QUERY = define('hr.applications', '''
+    SELECT a.*, s.full_name, s.email, ip.title as position_title
+    FROM current_application ca
+    JOIN application a ON a.application_id = ca.application_id
+    JOIN student s ON ca.user_id = s.user_id
+    JOIN internship_position ip ON ca.position_id = ip.position_id
+    WHERE {status_filter} {keyset}
+    ORDER BY {order}
+''')
+
 @hr_bp.route('/applications', methods=['GET'])
+@cache.conditional(tags=('applications',))
 def get_applications():
-    """Get applications with optional status filter"""
+    """Get the current application per (student, position), optionally by status"""
     try:
         status = request.args.get('status')
-        cursor = db.get_db().cursor()
-        
+        fmt = export_format()
+        limit, after = (None, None) if fmt else page_args(APPLICATIONS_SORT)
+        keyset, keyset_params = keyset_condition(APPLICATIONS_SORT, after)
+
         if status and status != "all":
-            query = '''
-                WITH RankedApplications AS (
-                    SELECT a.*,
-                           ROW_NUMBER() OVER (PARTITION BY a.user_id, a.position_id 
-                                            ORDER BY a.sent_on DESC) as rn
-                    FROM application a
-                    WHERE a.status = %s
-                )
-                SELECT DISTINCT ra.*, s.full_name, s.email, ip.title as position_title
-                FROM RankedApplications ra
-                JOIN student s ON ra.user_id = s.user_id
-                JOIN internship_position ip ON ra.position_id = ip.position_id
-                WHERE ra.rn = 1
-            '''
-            cursor.execute(query, (status,))
+            status_filter, params = 'ca.status = %s AND', [status]
         else:
-            query = '''
-                WITH RankedApplications AS (
-                    SELECT a.*,
-                           ROW_NUMBER() OVER (PARTITION BY a.user_id, a.position_id 
-                                            ORDER BY a.sent_on DESC) as rn
-                    FROM application a
-                )
-                SELECT DISTINCT ra.*, s.full_name, s.email, ip.title as position_title
-                FROM RankedApplications ra
-                JOIN student s ON ra.user_id = s.user_id
-                JOIN internship_position ip ON ra.position_id = ip.position_id
-                WHERE ra.rn = 1
-            '''
-            cursor.execute(query)
+            status_filter, params = '', []
+
+        query = APPLICATIONS_QUERY.format(status_filter=status_filter, keyset=keyset,
+                                          order=order_clause(APPLICATIONS_SORT))
+        if fmt:
+            return stream_export(query, params, fmt, 'applications')
+
+        cursor = db.get_db().cursor()
+        cursor.execute(query + ' LIMIT %s', (*params, *keyset_params, limit + 1))
             
-        applications = cursor.fetchall()
-        return make_response(jsonify(applications), 200)
+        page = page_response(cursor.fetchall(), limit, ('application_id',))
+        return make_response(jsonify(page), 200)
+    except (CursorError, ExportError) as e:
+        return make_response(jsonify({'error': str(e)}), 400)
     except Exception as e:
         logger.error(f"Error getting applications: {str(e)}")
         return make_response(jsonify({'error': str(e)}), 500)
 
+LOCK_APPLICATION_QUERY = define('hr.lock_application', '''
+    SELECT status, user_id, position_id
+    FROM application
+    WHERE application_id = %s
+    FOR UPDATE
+''')
+
+UPDATE_STATUS_QUERY = define('hr.update_status', '''
+    UPDATE application
+    SET status = %s,
+        sent_on = CURRENT_TIMESTAMP
+    WHERE application_id = %s
+''')
+
+APPLICATION_QUERY = define('hr.application', '''
+    SELECT a.*, s.full_name, ip.title as position_title
+    FROM application a
+    JOIN student s ON a.user_id = s.user_id
+    JOIN internship_position ip ON a.position_id = ip.position_id
+    WHERE a.application_id = %s
+''')
+
 @hr_bp.route('/applications/<int:application_id>', methods=['PUT'])
 def update_application_status(application_id):
     """Update application status"""
     try:
         status = request.json['status']
+        if status not in STATUS_COUNTERS:
+            return make_response(jsonify({'error': f'Invalid status: {status}'}), 400)
         logger.info(f"Updating application {application_id} to status: {status}")
         
         cursor = db.get_db().cursor()
-        cursor.execute('''
-            UPDATE application 
-            SET status = %s,
-                sent_on = CURRENT_TIMESTAMP
-            WHERE application_id = %s
-        ''', (status, application_id))
+        cursor.execute(LOCK_APPLICATION_QUERY, (application_id,))
+        current = cursor.fetchone()
+        if not current:
+            db.get_db().rollback()
+            logger.error(f"Application {application_id} not found")
+            return make_response(jsonify({'error': 'Application not found'}), 404)
+
+        cursor.execute(UPDATE_STATUS_QUERY, (status, application_id))
+        adjust_application_counters(cursor, current['user_id'], current['position_id'],
+                                    current['status'], status)
+        refresh_current_application(cursor, current['user_id'], current['position_id'])
         db.get_db().commit()
+        cache.invalidate('applications', 'application_counts', f"student:{current['user_id']}")
         
         # Verify update
-        cursor.execute('''
-            SELECT a.*, s.full_name, ip.title as position_title
-            FROM application a
-            JOIN student s ON a.user_id = s.user_id
-            JOIN internship_position ip ON a.position_id = ip.position_id
-            WHERE a.application_id = %s
-        ''', (application_id,))
+        cursor.execute(APPLICATION_QUERY, (application_id,))
         
         result = cursor.fetchone()
         if result:
@@ -189,6 +241,128 @@ def update_application_status(application_id):
         logger.error(f"Error updating application: {str(e)}")
         return make_response(jsonify({'error': str(e)}), 500)
 
+MAX_BULK_UPDATES = 1000
+
+LOCK_APPLICATIONS_QUERY = define('hr.lock_applications', '''
+    SELECT application_id, user_id, position_id, status
+    FROM application
+    WHERE application_id IN ({placeholders})
+    FOR UPDATE
+''')
+
+LOCK_POSITION_APPLICATIONS_QUERY = define('hr.lock_position_applications', '''
+    SELECT application_id, user_id, position_id, status
+    FROM application
+    WHERE position_id = %s {status_filter}
+    LIMIT %s
+    FOR UPDATE
+''')
+
+BULK_UPDATE_STATUS_QUERY = define('hr.bulk_update_status', '''
+    UPDATE application
+    SET status = CASE application_id {cases} END,
+        sent_on = CURRENT_TIMESTAMP
+    WHERE application_id IN ({placeholders})
+''')
+
+@hr_bp.route('/applications/bulk-status', methods=['POST'])
+def bulk_update_application_status():
+    """
+    Update many application statuses in one transaction. The body is
+    either {"updates": [{"application_id": 1, "status": "Accepted"}, ...]}
+    or a filter, {"position_id": 3, "from_status": "Pending",
+    "status": "Rejected"}. Returns one result per application.
+    """
+    try:
+        data = request.json or {}
+        cursor = db.get_db().cursor()
+        results = {}
+
+        if 'updates' in data:
+            updates = data['updates']
+            if not isinstance(updates, list) or len(updates) > MAX_BULK_UPDATES:
+                return make_response(jsonify({
+                    'error': f'updates must be a list of at most {MAX_BULK_UPDATES} items'
+                }), 400)
+            targets = {}
+            for item in updates:
+                if not isinstance(item, dict) or not isinstance(item.get('application_id'), int):
+                    return make_response(jsonify({'error': 'Each update needs an integer application_id'}), 400)
+                application_id, status = item['application_id'], item.get('status')
+                if status not in STATUS_COUNTERS:
+                    targets.pop(application_id, None)
+                    results[application_id] = {'application_id': application_id,
+                                               'result': 'invalid', 'error': f'Invalid status: {status}'}
+                    continue
+                targets[application_id] = status
+                results.pop(application_id, None)
+
+            rows = []
+            if targets:
+                placeholders = ', '.join(['%s'] * len(targets))
+                cursor.execute(LOCK_APPLICATIONS_QUERY.format(placeholders=placeholders), tuple(targets))
+                rows = cursor.fetchall()
+        else:
+            status = data.get('status')
+            position_id = data.get('position_id')
+            if status not in STATUS_COUNTERS or not isinstance(position_id, int):
+                return make_response(jsonify({'error': 'Provide updates, or position_id and a valid status'}), 400)
+            from_status = data.get('from_status')
+            if from_status is not None and from_status not in STATUS_COUNTERS:
+                return make_response(jsonify({'error': f'Invalid from_status: {from_status}'}), 400)
+
+            query = LOCK_POSITION_APPLICATIONS_QUERY.format(
+                status_filter='AND status = %s' if from_status else '')
+            cursor.execute(query, (position_id, *([from_status] if from_status else []), MAX_BULK_UPDATES + 1))
+            rows = cursor.fetchall()
+            if len(rows) > MAX_BULK_UPDATES:
+                db.get_db().rollback()
+                return make_response(jsonify({
+                    'error': f'filter matches more than {MAX_BULK_UPDATES} applications'
+                }), 400)
+            targets = {row['application_id']: status for row in rows}
+
+        found = {row['application_id']: row for row in rows}
+        for application_id in targets:
+            if application_id not in found:
+                results[application_id] = {'application_id': application_id, 'result': 'not_found'}
+
+        if found:
+            ids = sorted(found)
+            cases = ' '.join(['WHEN %s THEN %s'] * len(ids))
+            placeholders = ', '.join(['%s'] * len(ids))
+            cursor.execute(BULK_UPDATE_STATUS_QUERY.format(cases=cases, placeholders=placeholders),
+                           (*[v for i in ids for v in (i, targets[i])], *ids))
+
+            adjust_application_counters_bulk(cursor, [
+                (row['user_id'], row['position_id'], row['status'], targets[row['application_id']])
+                for row in rows
+            ])
+            refresh_current_applications(cursor, [(row['user_id'], row['position_id']) for row in rows])
+        db.get_db().commit()
+
+        if found:
+            cache.invalidate('applications', 'application_counts',
+                             *{f"student:{row['user_id']}" for row in rows})
+        for application_id, row in found.items():
+            results[application_id] = {'application_id': application_id, 'result': 'updated',
+                                       'previous_status': row['status'], 'status': targets[application_id]}
+
+        logger.info(f"Bulk status update: {len(found)} updated, {len(results) - len(found)} skipped")
+        return make_response(jsonify({
+            'updated': len(found),
+            'results': list(results.values())
+        }), 200)
+    except Exception as e:
+        db.get_db().rollback()
+        logger.error(f"Error in bulk status update: {str(e)}")
+        return make_response(jsonify({'error': str(e)}), 500)
+
+DELETE_APPLICATION_QUERY = define('hr.delete_application', '''
+    DELETE FROM application
+    WHERE application_id = %s
+''')
+
 @hr_bp.route('/applications/<int:application_id>', methods=['DELETE'])
 def delete_application(application_id):
     """Delete an application"""
@@ -196,11 +370,7 @@ def delete_application(application_id):
         cursor = db.get_db().cursor()
         
         # Check if application exists
-        cursor.execute('''
-            SELECT status 
-            FROM application 
-            WHERE application_id = %s
-        ''', (application_id,))
+        cursor.execute(LOCK_APPLICATION_QUERY, (application_id,))
         result = cursor.fetchone()
         
         if not result:
@@ -214,11 +384,12 @@ def delete_application(application_id):
                 'error': 'Cannot delete processed applications'
             }), 400)
         
-        cursor.execute('''
-            DELETE FROM application 
-            WHERE application_id = %s
-        ''', (application_id,))
+        cursor.execute(DELETE_APPLICATION_QUERY, (application_id,))
+        adjust_application_counters(cursor, result['user_id'], result['position_id'],
+                                    result['status'], None)
+        refresh_current_application(cursor, result['user_id'], result['position_id'])
         db.get_db().commit()
+        cache.invalidate('applications', 'application_counts', f"student:{result['user_id']}")
         
         logger.info(f"Application {application_id} deleted successfully")
         return make_response(jsonify({'message': 'Application deleted successfully'}), 200)
@@ -229,28 +400,88 @@ def delete_application(application_id):
         return make_response(jsonify({'error': str(e)}), 500)
 
 # Resume Management Routes
+RESUMES_SORT = [('cr.time_uploaded', 'DESC', NULLABLE), ('cr.resume_id', 'DESC')]
+SUGGESTION_PREVIEW_CHARS = 280
+_RESUMES = '''
+    SELECT r.resume_id, r.user_id, r.doc_name, r.time_uploaded,
+           s.full_name, s.email,
+           ls.suggestion_id AS latest_suggestion_id,
+           {preview} AS latest_suggestion,
+           ls.time_created AS latest_suggestion_at
+    FROM current_resume cr
+    JOIN resume r ON r.resume_id = cr.resume_id
+    JOIN student s ON cr.user_id = s.user_id
+    LEFT JOIN resume_latest_suggestion ls ON ls.resume_id = cr.resume_id
+    WHERE {{keyset}}
+    ORDER BY {{order}}
+'''
+# SQLite has no LEFT()
+RESUMES_QUERY = define('hr.resumes', _RESUMES.format(preview='LEFT(ls.suggestion_text, %s)'),
+                       sqlite=_RESUMES.format(preview='substr(ls.suggestion_text, 1, %s)'))
+
 @hr_bp.route('/resumes', methods=['GET'])
+@cache.conditional(tags=('resumes',))
 def get_resumes():
-    """Get all resumes with student information"""
+    """Get a summary of each student's current resume, one page at a time"""
     try:
+        fmt = export_format()
+        limit, after = (None, None) if fmt else page_args(RESUMES_SORT)
+        keyset, keyset_params = keyset_condition(RESUMES_SORT, after)
+
+        query = RESUMES_QUERY.format(keyset=keyset, order=order_clause(RESUMES_SORT))
+        if fmt:
+            return stream_export(query, (SUGGESTION_PREVIEW_CHARS,), fmt, 'resumes')
+
         cursor = db.get_db().cursor()
-        cursor.execute('''
-            SELECT r.*, s.full_name, s.email,
-                   (SELECT suggestion_text 
-                    FROM suggestion 
-                    WHERE resume_id = r.resume_id 
-                    ORDER BY time_created DESC 
-                    LIMIT 1) as latest_suggestion
-            FROM resume r
-            JOIN student s ON r.user_id = s.user_id
-            ORDER BY r.time_uploaded DESC
-        ''')
-        resumes = cursor.fetchall()
-        return make_response(jsonify(resumes), 200)
+        cursor.execute(query + ' LIMIT %s', (SUGGESTION_PREVIEW_CHARS, *keyset_params, limit + 1))
+        page = page_response(cursor.fetchall(), limit, ('time_uploaded', 'resume_id'))
+        return make_response(jsonify(page), 200)
+    except (CursorError, ExportError) as e:
+        return make_response(jsonify({'error': str(e)}), 400)
     except Exception as e:
         logger.error(f"Error getting resumes: {str(e)}")
         return make_response(jsonify({'error': str(e)}), 500)
 
+RESUME_DETAIL_QUERY = define('hr.resume_detail', f'''
+    SELECT {RESUME_COLUMNS}, s.full_name, s.email,
+           ls.suggestion_id AS latest_suggestion_id,
+           ls.suggestion_text AS latest_suggestion,
+           ls.time_created AS latest_suggestion_at
+    FROM resume r
+    JOIN student s ON r.user_id = s.user_id
+    {RESUME_SECTIONS}
+    LEFT JOIN resume_latest_suggestion ls ON ls.resume_id = r.resume_id
+    WHERE r.resume_id = %s
+''')
+
+@hr_bp.route('/resumes/<int:resume_id>', methods=['GET'])
+@cache.conditional(tags=('resumes',))
+def get_resume_detail(resume_id):
+    """Get one resume with every section and its latest suggestion"""
+    try:
+        cursor = db.get_db().cursor()
+        cursor.execute(RESUME_DETAIL_QUERY, (resume_id,))
+        resume = cursor.fetchone()
+
+        if not resume:
+            return make_response(jsonify({'error': 'Resume not found'}), 404)
+        return make_response(jsonify(resume), 200)
+    except Exception as e:
+        logger.error(f"Error getting resume {resume_id}: {str(e)}")
+        return make_response(jsonify({'error': str(e)}), 500)
+
+SUGGESTION_OWNER_QUERY = define('hr.suggestion_owner', '''
+    SELECT r.user_id
+    FROM suggestion s
+    JOIN resume r ON r.resume_id = s.resume_id
+    WHERE s.suggestion_id = %s AND s.resume_id = %s
+''')
+
+DELETE_SUGGESTION_QUERY = define('hr.delete_suggestion', '''
+    DELETE FROM suggestion
+    WHERE suggestion_id = %s
+''')
+
 @hr_bp.route('/resumes/<int:resume_id>/suggestions/<int:suggestion_id>', methods=['DELETE'])
 def delete_suggestion(resume_id, suggestion_id):
     """Delete a resume suggestion"""
@@ -258,22 +489,17 @@ def delete_suggestion(resume_id, suggestion_id):
         cursor = db.get_db().cursor()
         
         # Check if suggestion exists and belongs to the resume
-        cursor.execute('''
-            SELECT COUNT(*) as count 
-            FROM suggestion 
-            WHERE suggestion_id = %s AND resume_id = %s
-        ''', (suggestion_id, resume_id))
+        cursor.execute(SUGGESTION_OWNER_QUERY, (suggestion_id, resume_id))
         result = cursor.fetchone()
         
-        if not result or result['count'] == 0:
+        if not result:
             logger.error(f"Suggestion {suggestion_id} not found for resume {resume_id}")
             return make_response(jsonify({'error': 'Suggestion not found'}), 404)
         
-        cursor.execute('''
-            DELETE FROM suggestion 
-            WHERE suggestion_id = %s
-        ''', (suggestion_id,))
+        cursor.execute(DELETE_SUGGESTION_QUERY, (suggestion_id,))
+        refresh_latest_suggestion(cursor, resume_id)
         db.get_db().commit()
+        cache.invalidate('resumes', f"student:{result['user_id']}")
         
         logger.info(f"Suggestion {suggestion_id} deleted successfully")
         return make_response(jsonify({'message': 'Suggestion deleted successfully'}), 200)
@@ -284,49 +510,57 @@ def delete_suggestion(resume_id, suggestion_id):
         return make_response(jsonify({'error': str(e)}), 500)
 
 # Analytics Routes
+ANALYTICS_QUERY = define('hr.analytics', '''
+    SELECT 
+        ip.position_id,
+        ip.title,
+        ip.application_count as total_applications,
+        ip.accepted_count as accepted,
+        ip.rejected_count as rejected,
+        ip.pending_count as pending
+    FROM internship_position ip
+''')
+
 @hr_bp.route('/analytics/positions', methods=['GET'])
+@cache.cached(tags=('positions', 'application_counts'))
 def get_position_analytics():
     """Get analytics for internship positions"""
     try:
         cursor = db.get_db().cursor()
-        cursor.execute('''
-            SELECT 
-                ip.position_id,
-                ip.title,
-                COUNT(a.application_id) as total_applications,
-                SUM(CASE WHEN a.status = 'Accepted' THEN 1 ELSE 0 END) as accepted,
-                SUM(CASE WHEN a.status = 'Rejected' THEN 1 ELSE 0 END) as rejected,
-                SUM(CASE WHEN a.status = 'Pending' THEN 1 ELSE 0 END) as pending
-            FROM internship_position ip
-            LEFT JOIN application a ON ip.position_id = a.position_id
-            GROUP BY ip.position_id, ip.title
-        ''')
+        cursor.execute(ANALYTICS_QUERY)
         analytics = cursor.fetchall()
         return make_response(jsonify(analytics), 200)
     except Exception as e:
         logger.error(f"Error getting analytics: {str(e)}")
         return make_response(jsonify({'error': str(e)}), 500)
 
+RESUME_OWNER_QUERY = define('hr.resume_owner',
+                            'SELECT resume_id, user_id FROM resume WHERE resume_id = %s')
+
+ADD_SUGGESTION_QUERY = define('hr.add_suggestion', '''
+    INSERT INTO suggestion (resume_id, suggestion_text, time_created)
+    VALUES (%s, %s, CURRENT_TIMESTAMP)
+''')
+
 @hr_bp.route('/resumes/<int:resume_id>/suggestions', methods=['POST'])
 def add_suggestion(resume_id):
     """Add a new suggestion to a resume"""
     try:
         cursor = db.get_db().cursor()
         
-        cursor.execute('SELECT * FROM resume WHERE resume_id = %s', (resume_id,))
-        if not cursor.fetchone():
+        cursor.execute(RESUME_OWNER_QUERY, (resume_id,))
+        resume = cursor.fetchone()
+        if not resume:
             return make_response(jsonify({'error': 'Resume not found'}), 404)
         
         suggestion_text = request.json.get('suggestion_text')
         if not suggestion_text:
             return make_response(jsonify({'error': 'Suggestion text is required'}), 400)
             
-        query = '''
-            INSERT INTO suggestion (resume_id, suggestion_text, time_created)
-            VALUES (%s, %s, CURRENT_TIMESTAMP)
-        '''
-        cursor.execute(query, (resume_id, suggestion_text))
+        cursor.execute(ADD_SUGGESTION_QUERY, (resume_id, suggestion_text))
+        refresh_latest_suggestion(cursor, resume_id)
         db.get_db().commit()
+        cache.invalidate('resumes', f"student:{resume['user_id']}")
         
         return make_response(jsonify({'message': 'Suggestion added successfully'}), 201)
     except Exception as e:
@@ -0,0 +1,105 @@
+#------------------------------------------------------------
+# Background jobs
+#
+#   @register('counters.reconcile', concurrency=1, max_attempts=3)
+#   def reconcile_counters(payload): ...
+#
+#   job_id = enqueue(cursor, 'counters.reconcile', priority=10)
+#
+# A job is a row of the `job` table, so it survives restarts and needs
+# no broker besides MySQL. worker_app.py runs the worker process
+# (backend.jobs.worker): it claims ready jobs by priority, runs their
+# handler inside an app context with the payload dict and stores the
+# (JSON) result. Handlers commit their own writes; anything left
+# uncommitted is rolled back. Failed jobs are retried with exponential
+# backoff until max_attempts. `concurrency` caps how many jobs of a type
+# run at once across every worker process.
+#------------------------------------------------------------
+import json
+import logging
+from collections import namedtuple
+
+from backend.data import define
+
+logger = logging.getLogger(__name__)
+
+JobType = namedtuple('JobType', ('name', 'handler', 'concurrency', 'max_attempts',
+                                 'timeout', 'priority'))
+
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_TIMEOUT = 300       # seconds without a worker heartbeat before a claimed job is requeued
+
+JOB_STATUSES = ('queued', 'running', 'succeeded', 'failed')
+
+# job type name -> JobType
+JOB_TYPES = {}
+
+ENQUEUE_QUERY = define('jobs.enqueue', '''
+    INSERT INTO job (job_type, payload, priority, max_attempts, run_after)
+    VALUES (%s, %s, %s, %s, NOW(6) + INTERVAL %s SECOND)
+''', sqlite='''
+    INSERT INTO job (job_type, payload, priority, max_attempts, run_after)
+    VALUES (%s, %s, %s, %s, strftime('%%Y-%%m-%%d %%H:%%M:%%f', 'now', '+' || %s || ' seconds'))
+''')
+
+GET_JOB_QUERY = define('jobs.get_job', '''
+    SELECT job_id, job_type, payload, priority, status, attempts, max_attempts,
+           run_after, locked_by, last_error, result, created_at, started_at, finished_at
+    FROM job
+    WHERE job_id = %s
+''')
+
+
+class JobError(ValueError):
+    """Unknown job type or invalid job parameters"""
+
+
+def register(name, concurrency=1, max_attempts=DEFAULT_MAX_ATTEMPTS,
+             timeout=DEFAULT_TIMEOUT, priority=0):
+    """Register the decorated function as the handler of job type `name`"""
+    if concurrency < 1:
+        raise ValueError('concurrency must be at least 1')
+
+    def decorator(handler):
+        JOB_TYPES[name] = JobType(name, handler, concurrency, max_attempts, timeout, priority)
+        return handler
+    return decorator
+
+
+def enqueue(cursor, job_type, payload=None, priority=None, delay=0, max_attempts=None):
+    """
+    Queue a job on the caller's cursor (it starts once the caller
+    commits) and return its id. Higher priorities run first.
+    """
+    spec = JOB_TYPES.get(job_type)
+    if spec is None:
+        raise JobError(f'unknown job type: {job_type}')
+    if delay < 0:
+        raise JobError('delay must not be negative')
+
+    cursor.execute(ENQUEUE_QUERY, (
+        job_type,
+        json.dumps(payload, default=str) if payload is not None else None,
+        spec.priority if priority is None else priority,
+        spec.max_attempts if max_attempts is None else max_attempts,
+        delay,
+    ))
+    return cursor.lastrowid
+
+
+def decode_job(row):
+    """A job row with its JSON columns decoded"""
+    for column in ('payload', 'result'):
+        if isinstance(row.get(column), (str, bytes)):
+            row[column] = json.loads(row[column])
+    return row
+
+
+def get_job(cursor, job_id):
+    cursor.execute(GET_JOB_QUERY, (job_id,))
+    row = cursor.fetchone()
+    return decode_job(row) if row else None
+
+
+# registers the built-in job types
+from backend.jobs import tasks
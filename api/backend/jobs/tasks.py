@@ -0,0 +1,40 @@
+#------------------------------------------------------------
+# Built-in job types
+#
+# Maintenance work that used to need a shell in the API container (see
+# backend.projections and backend.migrations) and can now be queued
+# with POST /maintenance_staff/jobs.
+#------------------------------------------------------------
+from backend.cache import cache
+from backend.db_connection import db
+from backend.jobs import register
+from backend.migrations import explain_check
+from backend.projections import enqueue_all_resume_sync, rebuild_counters
+from backend.projections.resume_sync import drain
+
+
+@register('counters.reconcile', concurrency=1, max_attempts=3)
+def reconcile_counters(payload):
+    """Rebuild the application and resume counters"""
+    drift = rebuild_counters(db.get_db())
+    cache.invalidate('application_counts', 'student_counters')
+    return drift
+
+
+@register('resumes.sync', concurrency=2, max_attempts=5)
+def sync_resumes(payload):
+    """Drain the resume sync queue; {"all": true} queues every student first"""
+    conn = db.get_db()
+    if payload.get('all'):
+        enqueue_all_resume_sync(conn.cursor())
+        conn.commit()
+    return {'students': drain(conn, payload.get('batch_size', 200))}
+
+
+@register('queries.explain', concurrency=1, max_attempts=1, priority=-10)
+def explain_queries(payload):
+    """EXPLAIN every registered route query and report full table scans"""
+    min_rows = payload.get('min_rows', explain_check.DEFAULT_MIN_ROWS)
+    queries = explain_check.route_queries()
+    problems = explain_check.check_plans(db.get_db(), min_rows=min_rows, queries=queries)
+    return {'queries': len(queries), 'problems': problems, 'unchecked': explain_check.unchecked(queries)}
@@ -0,0 +1,355 @@
+#------------------------------------------------------------
+# Job worker (run by worker_app.py)
+#
+# Each worker thread loops: requeue jobs whose lease ran out, pick the
+# job types with ready jobs (highest priority first), take a free
+# concurrency slot of the type and claim one of its jobs.
+#
+# A slot is a MySQL named lock, job:<type>:<n> for n < concurrency,
+# held on the thread's connection while the job runs. The limit thus
+# holds across every worker process, and the server frees the slot by
+# itself if a worker dies mid-job; its job is requeued once its lease
+# (the type's timeout) has passed. The job statements have SQLite texts,
+# but the slots do not, so the worker itself needs MySQL.
+#
+# While a handler runs, a heartbeat thread extends the lease every
+# JOB_HEARTBEAT_INTERVAL seconds on a connection of its own, so the
+# timeout bounds how long a dead worker keeps a job, not how long a job
+# may run. Every write after the claim checks that the job is still
+# running under this worker; if the lease was lost anyway (e.g. the
+# worker stalled past it) the job belongs to whoever claimed it next.
+#------------------------------------------------------------
+import json
+import logging
+import os
+import random
+import signal
+import socket
+import threading
+
+from backend.data import MYSQL_ONLY, define
+from backend.db_connection import db
+from backend.jobs import JOB_TYPES
+
+logger = logging.getLogger(__name__)
+
+LOCK_PREFIX = 'susy:job'
+
+# SQLite has no NOW(6) / INTERVAL; timestamps are the text that
+# strftime() writes, like jobs.enqueue (%% once the statement has args)
+_SQLITE_NOW = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+_SQLITE_NOW_ARGS = "strftime('%%Y-%%m-%%d %%H:%%M:%%f', 'now')"
+_SQLITE_IN_SECONDS = "strftime('%%Y-%%m-%%d %%H:%%M:%%f', 'now', '+' || %s || ' seconds')"
+
+REQUEUE_EXPIRED_QUERY = define('jobs.requeue_expired', '''
+    UPDATE job
+    SET status = IF(attempts >= max_attempts, 'failed', 'queued'),
+        finished_at = IF(attempts >= max_attempts, NOW(6), NULL),
+        last_error = 'lease expired before the job finished',
+        locked_by = NULL,
+        locked_until = NULL
+    WHERE status = 'running' AND locked_until < NOW(6)
+''', sqlite=f'''
+    UPDATE job
+    SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'queued' END,
+        finished_at = CASE WHEN attempts >= max_attempts THEN {_SQLITE_NOW} END,
+        last_error = 'lease expired before the job finished',
+        locked_by = NULL,
+        locked_until = NULL
+    WHERE status = 'running' AND locked_until < {_SQLITE_NOW}
+''')
+
+READY_TYPES_QUERY = define('jobs.ready_types', '''
+    SELECT job_type, MAX(priority) AS priority
+    FROM job
+    WHERE status = 'queued' AND run_after <= NOW(6)
+    GROUP BY job_type
+    ORDER BY priority DESC
+''', sqlite=f'''
+    SELECT job_type, MAX(priority) AS priority
+    FROM job
+    WHERE status = 'queued' AND run_after <= {_SQLITE_NOW}
+    GROUP BY job_type
+    ORDER BY priority DESC
+''')
+
+# concurrency slots are MySQL named locks; SQLite has nothing alike
+ACQUIRE_SLOT_QUERY = define('jobs.acquire_slot', 'SELECT GET_LOCK(%s, 0) AS locked', sqlite=MYSQL_ONLY)
+RELEASE_SLOT_QUERY = define('jobs.release_slot', 'SELECT RELEASE_LOCK(%s)', sqlite=MYSQL_ONLY)
+
+NEXT_JOB_QUERY = define('jobs.next_job', '''
+    SELECT job_id, job_type, payload, attempts, max_attempts
+    FROM job
+    WHERE status = 'queued' AND job_type = %s AND run_after <= NOW(6)
+    ORDER BY priority DESC, run_after, job_id
+    LIMIT 1
+    FOR UPDATE SKIP LOCKED
+''', sqlite=f'''
+    SELECT job_id, job_type, payload, attempts, max_attempts
+    FROM job
+    WHERE status = 'queued' AND job_type = %s AND run_after <= {_SQLITE_NOW_ARGS}
+    ORDER BY priority DESC, run_after, job_id
+    LIMIT 1
+''')
+
+CLAIM_QUERY = define('jobs.claim', '''
+    UPDATE job
+    SET status = 'running',
+        attempts = attempts + 1,
+        locked_by = %s,
+        locked_until = NOW(6) + INTERVAL %s SECOND,
+        started_at = NOW(6)
+    WHERE job_id = %s
+''', sqlite=f'''
+    UPDATE job
+    SET status = 'running',
+        attempts = attempts + 1,
+        locked_by = %s,
+        locked_until = {_SQLITE_IN_SECONDS},
+        started_at = {_SQLITE_NOW_ARGS}
+    WHERE job_id = %s
+''')
+
+EXTEND_LEASE_QUERY = define('jobs.extend_lease', '''
+    UPDATE job
+    SET locked_until = NOW(6) + INTERVAL %s SECOND
+    WHERE job_id = %s AND locked_by = %s AND status = 'running'
+''', sqlite=f'''
+    UPDATE job
+    SET locked_until = {_SQLITE_IN_SECONDS}
+    WHERE job_id = %s AND locked_by = %s AND status = 'running'
+''')
+
+SUCCEED_QUERY = define('jobs.succeed', '''
+    UPDATE job
+    SET status = 'succeeded', result = %s, last_error = NULL,
+        locked_by = NULL, locked_until = NULL, finished_at = NOW(6)
+    WHERE job_id = %s AND locked_by = %s AND status = 'running'
+''', sqlite=f'''
+    UPDATE job
+    SET status = 'succeeded', result = %s, last_error = NULL,
+        locked_by = NULL, locked_until = NULL, finished_at = {_SQLITE_NOW_ARGS}
+    WHERE job_id = %s AND locked_by = %s AND status = 'running'
+''')
+
+FAIL_QUERY = define('jobs.fail', '''
+    UPDATE job
+    SET status = 'failed', last_error = %s,
+        locked_by = NULL, locked_until = NULL, finished_at = NOW(6)
+    WHERE job_id = %s AND locked_by = %s AND status = 'running'
+''', sqlite=f'''
+    UPDATE job
+    SET status = 'failed', last_error = %s,
+        locked_by = NULL, locked_until = NULL, finished_at = {_SQLITE_NOW_ARGS}
+    WHERE job_id = %s AND locked_by = %s AND status = 'running'
+''')
+
+RETRY_QUERY = define('jobs.retry', '''
+    UPDATE job
+    SET status = 'queued', last_error = %s,
+        locked_by = NULL, locked_until = NULL,
+        run_after = NOW(6) + INTERVAL %s SECOND
+    WHERE job_id = %s AND locked_by = %s AND status = 'running'
+''', sqlite=f'''
+    UPDATE job
+    SET status = 'queued', last_error = %s,
+        locked_by = NULL, locked_until = NULL,
+        run_after = {_SQLITE_IN_SECONDS}
+    WHERE job_id = %s AND locked_by = %s AND status = 'running'
+''')
+
+
+def requeue_expired(conn):
+    """Put running jobs whose lease has expired back in the queue (or fail them)"""
+    cursor = conn.cursor()
+    cursor.execute(REQUEUE_EXPIRED_QUERY)
+    requeued = cursor.rowcount
+    conn.commit()
+    return requeued
+
+
+def ready_types(conn):
+    """Registered job types with ready jobs, the most urgent first"""
+    cursor = conn.cursor()
+    cursor.execute(READY_TYPES_QUERY)
+    rows = cursor.fetchall()
+    conn.commit()
+    return [row['job_type'] for row in rows if row['job_type'] in JOB_TYPES]
+
+
+def acquire_slot(conn, job_type):
+    """Take a free concurrency slot of `job_type`; returns the lock name or None"""
+    cursor = conn.cursor()
+    for slot in range(JOB_TYPES[job_type].concurrency):
+        name = f'{LOCK_PREFIX}:{job_type}:{slot}'
+        cursor.execute(ACQUIRE_SLOT_QUERY, (name,))
+        if cursor.fetchone()['locked']:
+            return name
+    return None
+
+
+def release_slot(conn, name):
+    cursor = conn.cursor()
+    cursor.execute(RELEASE_SLOT_QUERY, (name,))
+    cursor.fetchall()
+
+
+def claim(conn, job_type, worker_id):
+    """Mark the next ready job of `job_type` running and return it, or None"""
+    cursor = conn.cursor()
+    cursor.execute(NEXT_JOB_QUERY, (job_type,))
+    job = cursor.fetchone()
+    if job is None:
+        conn.rollback()
+        return None
+
+    cursor.execute(CLAIM_QUERY, (worker_id, JOB_TYPES[job_type].timeout, job['job_id']))
+    conn.commit()
+    job['attempts'] += 1
+    job['locked_by'] = worker_id
+    job['payload'] = json.loads(job['payload']) if job['payload'] else {}
+    return job
+
+
+def extend_lease(conn, job):
+    """Push the lease of a running job one timeout ahead; False if it was lost"""
+    cursor = conn.cursor()
+    cursor.execute(EXTEND_LEASE_QUERY, (JOB_TYPES[job['job_type']].timeout, job['job_id'], job['locked_by']))
+    extended = cursor.rowcount > 0
+    conn.commit()
+    return extended
+
+
+def backoff_seconds(attempts, base, maximum):
+    """Exponential backoff with jitter for the retry after `attempts` failures"""
+    delay = min(base * 2 ** (attempts - 1), maximum)
+    return round(delay * random.uniform(0.5, 1.0), 3)
+
+
+def finish(conn, job, result=None, error=None, backoff=(5, 600)):
+    """
+    Record the outcome of a claimed job. Returns False (and records
+    nothing) when the job is no longer running under this worker.
+    """
+    cursor = conn.cursor()
+    owner = (job['job_id'], job['locked_by'])
+    if error is None:
+        cursor.execute(SUCCEED_QUERY, (json.dumps(result, default=str), *owner))
+    elif job['attempts'] >= job['max_attempts']:
+        cursor.execute(FAIL_QUERY, (error, *owner))
+    else:
+        cursor.execute(RETRY_QUERY, (error, backoff_seconds(job['attempts'], *backoff), *owner))
+    recorded = cursor.rowcount > 0
+    conn.commit()
+    if not recorded:
+        logger.warning(f"job {job['job_id']} ({job['job_type']}): lease lost before it finished, "
+                       f"outcome not recorded")
+    return recorded
+
+
+class Worker:
+    """
+    Runs `threads` job loops in this process until SIGTERM / SIGINT.
+    Settings: JOB_POLL_INTERVAL, JOB_HEARTBEAT_INTERVAL, JOB_BACKOFF_BASE
+    and JOB_BACKOFF_MAX (seconds).
+    """
+
+    def __init__(self, app, threads=4):
+        self.app = app
+        self.threads = threads
+        self.poll_interval = app.config.get('JOB_POLL_INTERVAL', 1.0)
+        self.heartbeat_interval = app.config.get('JOB_HEARTBEAT_INTERVAL', 15)
+        self.backoff = (app.config.get('JOB_BACKOFF_BASE', 5), app.config.get('JOB_BACKOFF_MAX', 600))
+        self.name = f'{socket.gethostname()}:{os.getpid()}'
+        self._stop = threading.Event()
+
+    def run(self):
+        signal.signal(signal.SIGTERM, lambda *_: self.stop())
+        signal.signal(signal.SIGINT, lambda *_: self.stop())
+
+        workers = [threading.Thread(target=self._loop, name=f'job-worker-{n}')
+                   for n in range(self.threads)]
+        for thread in workers:
+            thread.start()
+        logger.info(f'job worker {self.name}: {self.threads} thread(s), '
+                    f'job types {", ".join(sorted(JOB_TYPES))}')
+        if self.app.config.get('CACHE_BACKEND') == 'lru':
+            logger.warning(f'job worker {self.name}: CACHE_BACKEND=lru is private to this process, '
+                           f'so jobs cannot invalidate the API cache; use redis')
+        for thread in workers:
+            # join with a timeout so the main thread keeps handling signals
+            while thread.is_alive():
+                thread.join(1)
+
+    def stop(self):
+        logger.info(f'job worker {self.name}: stopping after the running jobs')
+        self._stop.set()
+
+    def _loop(self):
+        worker_id = f'{self.name}:{threading.current_thread().name}'
+        while not self._stop.is_set():
+            try:
+                with self.app.app_context():
+                    ran = self.run_once(db.get_db(), worker_id)
+            except Exception as e:
+                logger.error(f'job worker {worker_id}: {str(e)}')
+                ran = False
+            if not ran:
+                self._stop.wait(self.poll_interval)
+
+    def run_once(self, conn, worker_id):
+        """Claim and run at most one job; returns whether one ran"""
+        requeue_expired(conn)
+        for job_type in ready_types(conn):
+            slot = acquire_slot(conn, job_type)
+            if slot is None:
+                continue
+            try:
+                job = claim(conn, job_type, worker_id)
+                if job is None:
+                    continue
+                self._execute(conn, job)
+                return True
+            finally:
+                release_slot(conn, slot)
+        return False
+
+    def _heartbeat(self, job, done):
+        """Extend the lease of `job` until `done` is set or the lease is lost"""
+        spec = JOB_TYPES[job['job_type']]
+        # at least three beats per lease, so one slow beat does not lose it
+        interval = min(self.heartbeat_interval, spec.timeout / 3)
+        while not done.wait(interval):
+            try:
+                # an app context of its own: the handler's connection is busy
+                with self.app.app_context():
+                    if not extend_lease(db.get_db(), job):
+                        logger.warning(f"job {job['job_id']} ({spec.name}): lease lost while running")
+                        return
+            except Exception as e:
+                logger.error(f"job {job['job_id']} ({spec.name}) heartbeat: {str(e)}")
+
+    def _execute(self, conn, job):
+        spec = JOB_TYPES[job['job_type']]
+        logger.info(f"job {job['job_id']} ({spec.name}) attempt {job['attempts']} started")
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job, done),
+                                     name=f"job-heartbeat-{job['job_id']}", daemon=True)
+        heartbeat.start()
+        try:
+            result = spec.handler(job['payload'])
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"job {job['job_id']} ({spec.name}) failed: {str(e)}")
+            error = str(e)
+        else:
+            conn.rollback()
+            error = None
+        finally:
+            done.set()
+            heartbeat.join()
+
+        if error is not None:
+            finish(conn, job, error=error, backoff=self.backoff)
+        elif finish(conn, job, result=result):
+            logger.info(f"job {job['job_id']} ({spec.name}) succeeded")
@@ -0,0 +1,50 @@
+#------------------------------------------------------------
+# JSON provider backed by orjson
+#
+# Replaces Flask's json module based provider for jsonify() and
+# request.json. Dates and datetimes are written as ISO-8601 strings
+# ('2024-11-05', '2024-11-05T14:30:00') instead of RFC 1123, and
+# Decimal values (e.g. grades) as strings, as before.
+#------------------------------------------------------------
+import decimal
+import time
+
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+from backend import request_metrics
+
+OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj):
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    # dataclasses, UUIDs, ... as Flask serializes them
+    return DefaultJSONProvider.default(obj)
+
+
+def dumps_bytes(obj):
+    """Serialize `obj` to UTF-8 JSON bytes the way API responses are"""
+    return orjson.dumps(obj, default=_default, option=OPTIONS)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider using orjson unless json-module options are passed"""
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return dumps_bytes(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        started = time.perf_counter()
+        body = dumps_bytes(obj)
+        request_metrics.add_timing('serialize', time.perf_counter() - started)
+        return self._app.response_class(body, mimetype=self.mimetype)
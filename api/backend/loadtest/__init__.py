@@ -0,0 +1,299 @@
+#------------------------------------------------------------
+# Load test with role-based traffic
+#
+#   python -m backend.loadtest --url http://localhost:4000 \
+#          --rate student=20 --rate hr=2 --duration 300 --output run.json
+#
+# Sessions of each role arrive open-loop: a Poisson process at the
+# given rate (sessions per second), however slowly the API answers.
+# A session signs in, renders its role's home page and then a random
+# walk of pages (scenarios.ROLES), with exponential think times
+# between renders. Requests are reported per endpoint (method and
+# route template) and per page: count, throughput, p50/p95/p99
+# latency and error rate (5xx and transport errors; 4xx are counted
+# by status only). Runs are written as JSON and can be compared with
+# --compare.
+#------------------------------------------------------------
+import asyncio
+import gzip
+import json
+import random
+import time
+from urllib.parse import urlencode, urlsplit
+
+from backend.loadtest.client import percentile, read_response
+from backend.loadtest.scenarios import PAGE_NAMES, ROLES
+
+DEFAULT_RATES = {'student': 5.0, 'hr': 1.0, 'admin': 0.5, 'maintenance': 0.2}
+
+
+class Recorder:
+    """Latencies and outcomes per endpoint and per page"""
+
+    def __init__(self):
+        self.measuring = False
+        self.endpoints = {}
+        self.pages = {}
+
+    @staticmethod
+    def _entry(table, name):
+        entry = table.get(name)
+        if entry is None:
+            entry = table[name] = {'latencies': [], 'errors': 0, 'not_modified': 0,
+                                   'bytes': 0, 'status': {}}
+        return entry
+
+    def request(self, endpoint, seconds, status, size):
+        if not self.measuring:
+            return
+        entry = self._entry(self.endpoints, endpoint)
+        entry['latencies'].append(seconds)
+        entry['bytes'] += size
+        key = str(status) if status is not None else 'error'
+        entry['status'][key] = entry['status'].get(key, 0) + 1
+        if status is None or status >= 500:
+            entry['errors'] += 1
+        elif status == 304:
+            entry['not_modified'] += 1
+
+    def page(self, name, seconds, failed):
+        if not self.measuring:
+            return
+        entry = self._entry(self.pages, name)
+        entry['latencies'].append(seconds)
+        if failed:
+            entry['errors'] += 1
+
+    def totals(self):
+        total = {'latencies': [], 'errors': 0, 'not_modified': 0, 'bytes': 0, 'status': {}}
+        for entry in self.endpoints.values():
+            total['latencies'] += entry['latencies']
+            for key in ('errors', 'not_modified', 'bytes'):
+                total[key] += entry[key]
+            for status, count in entry['status'].items():
+                total['status'][status] = total['status'].get(status, 0) + count
+        return total
+
+
+class Session:
+    """
+    One signed-in user: a keep-alive connection to the API and, like
+    the Streamlit api client, the ETag and body of each GET it made
+    """
+
+    def __init__(self, test, role, user_id):
+        self.test = test
+        self.role = role
+        self.user_id = user_id
+        self.rng = random.Random(test.rng.random())
+        self.failed = False
+        self._etags = {}
+        self._reader = self._writer = None
+
+    def student_id(self):
+        return self.rng.choice(self.test.student_ids)
+
+    def act(self):
+        """Whether the user presses a button (a write) on this render"""
+        return self.test.write_probability > 0 and self.rng.random() < self.test.write_probability
+
+    async def get(self, template, params=None, **path):
+        return await self.request('GET', template, params=params, **path)
+
+    async def put(self, template, body, **path):
+        return await self.request('PUT', template, body=body, **path)
+
+    async def post(self, template, body, **path):
+        return await self.request('POST', template, body=body, **path)
+
+    async def request(self, method, template, params=None, body=None, **path):
+        """Parsed JSON body of the response, or None when it failed"""
+        target = template.format(**path) + (f'?{urlencode(params)}' if params else '')
+        url = self.test.url
+        headers = [f'Host: {url.hostname}:{url.port or 80}', 'Accept: application/json',
+                   'Accept-Encoding: gzip']
+        cached = self._etags.get(target) if method == 'GET' else None
+        if cached:
+            headers.append(f'If-None-Match: {cached[0]}')
+        payload = b''
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers += ['Content-Type: application/json', f'Content-Length: {len(payload)}']
+
+        started = time.perf_counter()
+        try:
+            if self._writer is None:
+                self._reader, self._writer = await asyncio.open_connection(url.hostname, url.port or 80)
+            self._writer.write(f'{method} {target} HTTP/1.1\r\n'.encode()
+                               + '\r\n'.join(headers).encode() + b'\r\n\r\n' + payload)
+            await self._writer.drain()
+            status, content, response_headers = await read_response(self._reader)
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            self.test.recorder.request(f'{method} {template}', time.perf_counter() - started, None, 0)
+            self.close()
+            self.failed = True
+            return None
+        self.test.recorder.request(f'{method} {template}', time.perf_counter() - started,
+                                   status, len(content))
+        if response_headers.get('connection', '').lower() == 'close':
+            self.close()
+
+        if status == 304 and cached:
+            return cached[1]
+        if status >= 500:
+            self.failed = True
+        if status >= 400:
+            return None
+        if response_headers.get('content-encoding') == 'gzip':
+            content = gzip.decompress(content)
+        try:
+            data = json.loads(content) if content else None
+        except ValueError:
+            return None
+        if method == 'GET' and 'etag' in response_headers:
+            self._etags[target] = (response_headers['etag'], data)
+        return data
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+
+class LoadTest:
+
+    def __init__(self, url, rates, student_ids, pages=6, think=5.0, write_probability=0.1,
+                 max_sessions=2000, seed=1):
+        self.url = urlsplit(url)
+        self.rates = {role: rate for role, rate in rates.items() if rate > 0}
+        self.student_ids = student_ids
+        self.pages = pages
+        self.think = think
+        self.write_probability = write_probability
+        self.max_sessions = max_sessions
+        self.rng = random.Random(seed)
+        self.recorder = Recorder()
+        self.sessions = {'started': 0, 'completed': 0, 'failed': 0, 'dropped': 0, 'cancelled': 0}
+        self.last_error = None
+        self._active = set()
+
+    async def _render(self, session, page):
+        started = time.perf_counter()
+        session.failed = False
+        await page(session)
+        self.recorder.page(PAGE_NAMES[page], time.perf_counter() - started, session.failed)
+
+    async def _session(self, role_name):
+        role = ROLES[role_name]
+        session = Session(self, role_name, self.rng.choice(self.student_ids))
+        pages, weights = zip(*role.pages)
+        try:
+            if role.home is not None:
+                await self._render(session, role.home)
+            # geometric number of page views with mean self.pages
+            while True:
+                await asyncio.sleep(session.rng.expovariate(1 / self.think) if self.think else 0)
+                await self._render(session, session.rng.choices(pages, weights)[0])
+                if session.rng.random() < 1 / self.pages:
+                    break
+            self.sessions['completed'] += 1
+        except (KeyError, TypeError, ValueError) as e:
+            # a response without the fields the page needs
+            self.sessions['failed'] += 1
+            self.last_error = f'{role_name} session: {e!r}'
+        finally:
+            session.close()
+
+    async def _arrivals(self, role, rate, until):
+        while True:
+            await asyncio.sleep(self.rng.expovariate(rate))
+            if time.monotonic() >= until:
+                return
+            if len(self._active) >= self.max_sessions:
+                if self.recorder.measuring:
+                    self.sessions['dropped'] += 1
+                continue
+            self.sessions['started'] += 1
+            task = asyncio.ensure_future(self._session(role))
+            self._active.add(task)
+            task.add_done_callback(self._active.discard)
+
+    async def run(self, duration, warmup=0, drain=30):
+        """Generate load for warmup + duration seconds and return the report"""
+        started = time.monotonic()
+        until = started + warmup + duration
+        arrivals = [asyncio.ensure_future(self._arrivals(role, rate, until))
+                    for role, rate in self.rates.items()]
+        if warmup:
+            await asyncio.sleep(warmup)
+        self.recorder.measuring = True
+        measured = time.monotonic()
+        await asyncio.gather(*arrivals)
+        elapsed = time.monotonic() - measured
+
+        # requests after the window are not recorded; let the sessions
+        # in flight finish, then give up on the rest
+        self.recorder.measuring = False
+        if self._active:
+            _, pending = await asyncio.wait(set(self._active), timeout=drain)
+            for task in pending:
+                task.cancel()
+            self.sessions['cancelled'] = len(pending)
+        return self.report(elapsed)
+
+    def report(self, elapsed):
+        return {
+            'config': {
+                'url': self.url.geturl(), 'rates': self.rates, 'students': len(self.student_ids),
+                'pages_per_session': self.pages, 'think_seconds': self.think,
+                'write_probability': self.write_probability, 'max_sessions': self.max_sessions,
+            },
+            'started_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'seconds': round(elapsed, 3),
+            'sessions': dict(self.sessions),
+            'last_error': self.last_error,
+            'totals': summarize(self.recorder.totals(), elapsed),
+            'endpoints': {name: summarize(entry, elapsed)
+                          for name, entry in sorted(self.recorder.endpoints.items())},
+            'pages': {name: summarize(entry, elapsed) for name, entry in sorted(self.recorder.pages.items())},
+        }
+
+
+def summarize(entry, elapsed):
+    latencies = sorted(entry['latencies'])
+    count = len(latencies)
+    return {
+        'count': count,
+        'throughput': round(count / elapsed, 2) if elapsed else None,
+        'p50_ms': _ms(percentile(latencies, 50)),
+        'p95_ms': _ms(percentile(latencies, 95)),
+        'p99_ms': _ms(percentile(latencies, 99)),
+        'max_ms': _ms(latencies[-1] if latencies else None),
+        'errors': entry['errors'],
+        'error_rate': round(entry['errors'] / count, 4) if count else 0.0,
+        'not_modified': entry['not_modified'],
+        'bytes': entry['bytes'],
+        'status': dict(sorted(entry['status'].items())),
+    }
+
+
+def compare(baseline, current):
+    """Per-endpoint change of p95, throughput and error rate between two reports"""
+    rows = []
+    for section in ('endpoints', 'pages'):
+        for name, now in current[section].items():
+            before = baseline.get(section, {}).get(name)
+            if not before or not before['count'] or not now['count']:
+                continue
+            rows.append({
+                'name': name,
+                'p95_ms': (before['p95_ms'], now['p95_ms']),
+                'p95_change': round(now['p95_ms'] / before['p95_ms'] - 1, 3) if before['p95_ms'] else None,
+                'throughput': (before['throughput'], now['throughput']),
+                'error_rate': (before['error_rate'], now['error_rate']),
+            })
+    return rows
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 2) if seconds is not None else None
@@ -0,0 +1,94 @@
+###
+# Load test command line
+#
+#   python -m backend.loadtest --url http://localhost:4000 --students 1-30 \
+#          --rate student=20 --rate hr=2 --duration 300 --output run.json
+#   python -m backend.loadtest ... --output run2.json --compare run.json
+###
+import argparse
+import asyncio
+import json
+import sys
+
+from backend.loadtest import DEFAULT_RATES, LoadTest, compare
+from backend.loadtest.client import parse_ids
+from backend.loadtest.scenarios import ROLES
+
+
+def _rate(spec):
+    role, _, rate = spec.partition('=')
+    if role not in ROLES:
+        raise argparse.ArgumentTypeError(f"unknown role {role!r} (one of {', '.join(ROLES)})")
+    return role, float(rate)
+
+
+def _print_report(report):
+    totals = report['totals']
+    print(f"{report['seconds']:.0f}s, sessions {report['sessions']}")
+    print(f"{'endpoint / page':<58} {'count':>7} {'req/s':>7} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'errors':>7} {'304':>6}")
+    for section in ('endpoints', 'pages'):
+        for name, r in report[section].items():
+            print(f"{name:<58} {r['count']:>7} {r['throughput'] or 0:>7} {r['p50_ms'] or 0:>8} "
+                  f"{r['p95_ms'] or 0:>8} {r['p99_ms'] or 0:>8} {r['errors']:>7} {r['not_modified']:>6}")
+        print()
+    print(f"total: {totals['count']} requests, {totals['throughput']} req/s, p95 {totals['p95_ms']} ms, "
+          f"error rate {totals['error_rate']:.2%}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m backend.loadtest',
+                                     description='Open-loop load test with Streamlit role traffic')
+    parser.add_argument('--url', default='http://localhost:4000')
+    parser.add_argument('--rate', type=_rate, action='append', metavar='ROLE=SESSIONS_PER_SECOND',
+                        help=f"new sessions per second of a role (repeatable; default "
+                             f"{', '.join(f'{role}={rate}' for role, rate in DEFAULT_RATES.items())})")
+    parser.add_argument('--students', default='1-30', help='student ids, e.g. 1-200000 or 3,7,9')
+    parser.add_argument('--duration', type=float, default=60, help='measured seconds')
+    parser.add_argument('--warmup', type=float, default=10, help='unmeasured seconds before')
+    parser.add_argument('--drain', type=float, default=30,
+                        help='seconds to let open sessions finish after the run')
+    parser.add_argument('--pages', type=float, default=6, help='mean page views per session')
+    parser.add_argument('--think', type=float, default=5, help='mean think time between pages (s)')
+    parser.add_argument('--write-probability', type=float, default=0.1,
+                        help='chance a page with a button presses it (a write) per render')
+    parser.add_argument('--read-only', action='store_true', help='never write (same as --write-probability 0)')
+    parser.add_argument('--max-sessions', type=int, default=2000,
+                        help='open sessions at most; later arrivals are dropped and counted')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='results JSON of an earlier run to compare with')
+    parser.add_argument('--max-error-rate', type=float,
+                        help='exit with 1 when the overall error rate is higher')
+    parser.add_argument('--json', action='store_true', help='print the results as JSON')
+    args = parser.parse_args(argv)
+
+    test = LoadTest(args.url, dict(args.rate) if args.rate else DEFAULT_RATES, parse_ids(args.students),
+                    pages=args.pages, think=args.think,
+                    write_probability=0 if args.read_only else args.write_probability,
+                    max_sessions=args.max_sessions, seed=args.seed)
+    report = asyncio.run(test.run(args.duration, warmup=args.warmup, drain=args.drain))
+
+    if args.compare:
+        with open(args.compare) as f:
+            report['comparison'] = {'baseline': args.compare, 'changes': compare(json.load(f), report)}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+        for row in report.get('comparison', {}).get('changes', []):
+            change = f"{row['p95_change']:+.1%}" if row['p95_change'] is not None else 'n/a'
+            print(f"{row['name']:<58} p95 {row['p95_ms'][0]} -> {row['p95_ms'][1]} ms ({change}), "
+                  f"{row['throughput'][0]} -> {row['throughput'][1]} req/s")
+
+    if args.max_error_rate is not None and report['totals']['error_rate'] > args.max_error_rate:
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,45 @@
+#------------------------------------------------------------
+# Minimal asyncio HTTP/1.1 client pieces shared by the load test and
+# the serving mode benchmark (backend.aio.benchmark). Standard
+# library only, so the load generator runs without the API's
+# dependencies.
+#------------------------------------------------------------
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a sorted list"""
+    if not values:
+        return None
+    rank = max(1, round(pct / 100 * len(values)))
+    return values[min(rank, len(values)) - 1]
+
+
+async def read_response(reader):
+    """Status, body and (lower-cased) headers of one HTTP/1.1 response"""
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split()[1])
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        chunks = []
+        while True:
+            chunk_size = int((await reader.readline()).split(b';')[0], 16)
+            chunks.append((await reader.readexactly(chunk_size + 2))[:chunk_size])
+            if chunk_size == 0:
+                break
+        return status, b''.join(chunks), headers
+    body = await reader.readexactly(int(headers.get('content-length', 0)))
+    return status, body, headers
+
+
+def parse_ids(spec):
+    """Ids from a range (1-500) or list (3,7,9)"""
+    if '-' in spec:
+        low, high = spec.split('-', 1)
+        return list(range(int(low), int(high) + 1))
+    return [int(user_id) for user_id in spec.split(',')]
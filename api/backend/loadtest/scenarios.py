@@ -0,0 +1,171 @@
+#------------------------------------------------------------
+# Role scenarios for the load test
+#
+# Each page function replays the API calls one render of the
+# Streamlit page of the same name makes (app/src/pages). Streamlit runs
+# every tab of a page on each render, so a page issues all of its
+# tabs' requests, and the shared api client revalidates GETs with
+# If-None-Match (Session does the same). Pages with buttons sometimes
+# press one (Session.act) and render again, like st.rerun() does.
+#------------------------------------------------------------
+import datetime
+from collections import namedtuple
+
+PAGE_SIZE = 50   # app/src/modules/pagination.py
+SKILLS = ('Python', 'Java', 'SQL', 'React', 'Docker', 'AWS', 'Go', 'Rust', 'GraphQL', 'Redis')
+
+Role = namedtuple('Role', ('home', 'pages'))
+
+
+def _items(body):
+    """Items of a page response ({"items": [...]}) or a plain list"""
+    if isinstance(body, dict):
+        return body.get('items') or []
+    return body or []
+
+
+#------------------------------------------------------------
+# Student
+async def student_home(s):
+    """00_Student_Home"""
+    await s.get('/student/{user_id}/dashboard', user_id=s.user_id)
+
+
+async def student_personal_info(s):
+    """01_Student_PersonalInfo"""
+    await s.get('/student/info/{user_id}', user_id=s.user_id)
+    await s.get('/student/{user_id}/grades', user_id=s.user_id)
+    await s.get('/student/{user_id}/coops', user_id=s.user_id)
+
+
+async def student_resume_manager(s):
+    """02_Student_ResumeManager"""
+    resume = await s.get('/student/{user_id}/resume', user_id=s.user_id)
+    await s.get('/student/{user_id}/resume/versions', user_id=s.user_id)
+    await s.get('/student/{user_id}/resume', user_id=s.user_id)
+    await s.get('/student/{user_id}/resume/suggestions', user_id=s.user_id)
+
+    if isinstance(resume, dict) and resume.get('doc_name') and s.act():
+        await s.put('/student/{user_id}/resume', {
+            'doc_name': resume['doc_name'],
+            'skills': ', '.join(s.rng.sample(SKILLS, 4)),
+            'projects': resume.get('projects') or '',
+        }, user_id=s.user_id)
+        await student_resume_manager(s)
+
+
+async def student_applications(s):
+    """03_Student_Applications"""
+    page = {'limit': PAGE_SIZE}
+    await s.get('/student/{user_id}/applications/active', user_id=s.user_id)
+    await s.get('/student/{user_id}/applications/history', page, user_id=s.user_id)
+    await s.get('/student/{user_id}/applications/positions', page, user_id=s.user_id)
+    positions = _items(await s.get('/student/{user_id}/applications/positions', page, user_id=s.user_id))
+    await s.get('/student/{user_id}/applications/active', user_id=s.user_id)
+
+    if positions and s.act():
+        await s.post('/student/{user_id}/applications', {
+            'position_id': s.rng.choice(positions)['position_id'],
+            'sent_on': datetime.date.today().isoformat(),
+        }, user_id=s.user_id)
+        await student_applications(s)
+
+
+#------------------------------------------------------------
+# HR manager
+async def hr_position_manager(s):
+    """41_HR_PositionManager"""
+    await s.get('/hr/internships', {'limit': PAGE_SIZE})
+    await s.get('/hr/analytics/positions')
+
+
+async def hr_application_review(s):
+    """42_HR_ApplicationReview"""
+    pending = _items(await s.get('/hr/applications', {'status': 'Pending', 'limit': PAGE_SIZE}))
+    await s.get('/hr/analytics/positions')
+    await s.get('/hr/applications', {'limit': PAGE_SIZE})
+    await s.get('/hr/analytics/positions')
+
+    if pending and s.act():
+        await s.put('/hr/applications/{application_id}',
+                    {'status': s.rng.choice(('Accepted', 'Rejected'))},
+                    application_id=s.rng.choice(pending)['application_id'])
+        await hr_application_review(s)
+
+
+async def hr_resume_screen(s):
+    """43_HR_ResumeScreen"""
+    resumes = _items(await s.get('/hr/resumes', {'limit': PAGE_SIZE}))
+    if resumes:
+        await s.get('/hr/resumes/{resume_id}', resume_id=s.rng.choice(resumes)['resume_id'])
+
+
+#------------------------------------------------------------
+# School admin (looks up one student per page view)
+async def admin_student_records(s):
+    """21_Admin_StudentRecords"""
+    await s.get('/school_admin/students/{user_id}/grades', user_id=s.student_id())
+
+
+async def admin_grade_manager(s):
+    """22_Admin_GradeManager"""
+    user_id = s.student_id()
+    grades = await s.get('/school_admin/students/{user_id}/grades', user_id=user_id)
+
+    if grades and s.act():
+        grade = s.rng.choice(grades)
+        await s.put('/school_admin/students/{user_id}/grades/{grade_id}', {
+            'course_name': grade['course_name'],
+            'grade': round(min(4.0, float(grade['grade']) + 0.1), 2),
+        }, user_id=user_id, grade_id=grade['grade_id'])
+        await s.get('/school_admin/students/{user_id}/grades', user_id=user_id)
+
+
+async def admin_coop_approval(s):
+    """23_Admin_CoopApproval"""
+    await s.get('/school_admin/students/{user_id}/coops', user_id=s.student_id())
+
+
+#------------------------------------------------------------
+# Maintenance staff
+async def maintenance_alert_monitor(s):
+    """61_Alert_Monitor"""
+    await s.get('/maintenance_staff/alerts', {'limit': PAGE_SIZE})
+
+
+async def maintenance_alterations(s):
+    """62_Data_Alteration_Manager"""
+    await s.get('/maintenance_staff/alterations', {'limit': PAGE_SIZE})
+
+
+async def maintenance_backups(s):
+    """63_Backup_History"""
+    await s.get('/maintenance_staff/backups', {'limit': PAGE_SIZE})
+
+
+# home page and (page, weight) choices for the rest of a session; the
+# HR, admin and maintenance home pages make no API calls
+ROLES = {
+    'student': Role(student_home, ((student_home, 2), (student_personal_info, 2),
+                                   (student_resume_manager, 2), (student_applications, 4))),
+    'hr': Role(None, ((hr_position_manager, 2), (hr_application_review, 5), (hr_resume_screen, 3))),
+    'admin': Role(None, ((admin_student_records, 4), (admin_grade_manager, 3), (admin_coop_approval, 3))),
+    'maintenance': Role(None, ((maintenance_alert_monitor, 5), (maintenance_alterations, 2),
+                               (maintenance_backups, 3))),
+}
+
+PAGE_NAMES = {
+    student_home: '00_Student_Home',
+    student_personal_info: '01_Student_PersonalInfo',
+    student_resume_manager: '02_Student_ResumeManager',
+    student_applications: '03_Student_Applications',
+    hr_position_manager: '41_HR_PositionManager',
+    hr_application_review: '42_HR_ApplicationReview',
+    hr_resume_screen: '43_HR_ResumeScreen',
+    admin_student_records: '21_Admin_StudentRecords',
+    admin_grade_manager: '22_Admin_GradeManager',
+    admin_coop_approval: '23_Admin_CoopApproval',
+    maintenance_alert_monitor: '61_Alert_Monitor',
+    maintenance_alterations: '62_Data_Alteration_Manager',
+    maintenance_backups: '63_Backup_History',
+}
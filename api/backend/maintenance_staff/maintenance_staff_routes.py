@@ -1,39 +1,70 @@
 from flask import Blueprint, request, jsonify, make_response, current_app
+from backend.cache import cache
+from backend.data import define
 from backend.db_connection import db
+from backend.db_connection.query_log import SORT_KEYS
+from backend.export import ExportError, export_format, stream_export
+from backend.jobs import JOB_STATUSES, JOB_TYPES, JobError, enqueue, get_job
+from backend.pagination import CursorError, NULLABLE, keyset_condition, order_clause, page_args, page_response
+from backend.projections.resume_sync import resume_sync
 
 maintenance_staff = Blueprint('maintenance_staff', __name__)
 
 #------------------------------------------------------------
 # Get all alerts
+ALERTS_SORT = [('ah.severity', 'DESC', NULLABLE), ('ah.alert_id', 'DESC')]
+ALERTS_QUERY = define('maintenance.alerts', '''
+    SELECT 
+        ah.alert_id,
+        ah.database_id,
+        ah.metrics, 
+        ah.alerts, 
+        ah.severity,
+        di.name AS database_name, 
+        di.version AS db_version
+    FROM alert_history ah
+    JOIN database_info di ON ah.database_id = di.database_id
+    WHERE {keyset}
+    ORDER BY {order}
+''')
+
 @maintenance_staff.route('/alerts', methods=['GET'])
+@cache.conditional(tags=('alerts',))
 def get_alerts():
-    """Fetch all alert history"""
+    """Fetch alert history, one page at a time"""
     try:
+        fmt = export_format()
+        limit, after = (None, None) if fmt else page_args(ALERTS_SORT)
+        keyset, keyset_params = keyset_condition(ALERTS_SORT, after)
+
+        query = ALERTS_QUERY.format(keyset=keyset, order=order_clause(ALERTS_SORT))
+        if fmt:
+            return stream_export(query, keyset_params, fmt, 'alerts')
+
         cursor = db.get_db().cursor()
-        cursor.execute('''
-            SELECT 
-                ah.database_id,
-                ah.metrics, 
-                ah.alerts, 
-                ah.severity,
-                di.name AS database_name, 
-                di.version AS db_version
-            FROM alert_history ah
-            JOIN database_info di ON ah.database_id = di.database_id
-            ORDER BY ah.severity DESC
-        ''')
-        alerts = cursor.fetchall()
-        
-        if not alerts:
-            return make_response(jsonify([]), 200)
+        cursor.execute(query + ' LIMIT %s', (*keyset_params, limit + 1))
+        page = page_response(cursor.fetchall(), limit, ('severity', 'alert_id'), hidden=('alert_id',))
             
-        return make_response(jsonify(alerts), 200)
+        return make_response(jsonify(page), 200)
+    except (CursorError, ExportError) as e:
+        return make_response(jsonify({'error': str(e)}), 400)
     except Exception as e:
         current_app.logger.error(f"Error in get_alerts: {str(e)}")
         return make_response(jsonify({'error': str(e)}), 500)
 
 #------------------------------------------------------------
 # Update an alert
+ALERT_EXISTS_QUERY = define('maintenance.alert_exists', '''
+    SELECT database_id FROM alert_history
+    WHERE database_id = %s
+''')
+
+UPDATE_ALERT_QUERY = define('maintenance.update_alert', '''
+    UPDATE alert_history
+    SET metrics = %s, alerts = %s, severity = %s
+    WHERE database_id = %s
+''')
+
 @maintenance_staff.route('/alerts/<int:alert_id>', methods=['PUT'])
 def update_alert(alert_id):
     """Update an alert"""
@@ -42,25 +73,19 @@ def update_alert(alert_id):
         alert_data = request.json
 
         # 检查记录是否存在
-        cursor.execute('''
-            SELECT database_id FROM alert_history 
-            WHERE database_id = %s
-        ''', (alert_id,))
+        cursor.execute(ALERT_EXISTS_QUERY, (alert_id,))
         if not cursor.fetchone():
             return make_response(jsonify({'error': 'Alert not found'}), 404)
 
         # 更新记录
-        cursor.execute('''
-            UPDATE alert_history 
-            SET metrics = %s, alerts = %s, severity = %s
-            WHERE database_id = %s
-        ''', (
+        cursor.execute(UPDATE_ALERT_QUERY, (
             alert_data['metrics'],
             alert_data['alerts'],
             alert_data['severity'],
             alert_id
         ))
         db.get_db().commit()
+        cache.invalidate('alerts')
         return make_response(jsonify({'message': 'Alert updated successfully'}), 200)
     except Exception as e:
         db.get_db().rollback()
@@ -69,35 +94,60 @@ def update_alert(alert_id):
 
 #------------------------------------------------------------
 # Get all backups
+BACKUPS_SORT = [('bh.backup_date', 'DESC', NULLABLE), ('bh.backup_id', 'DESC')]
+BACKUPS_QUERY = define('maintenance.backups', '''
+    SELECT 
+        bh.backup_id,
+        bh.database_id,
+        bh.type, 
+        bh.backup_date, 
+        bh.details,
+        di.name AS database_name, 
+        di.version AS db_version
+    FROM backup_history bh
+    JOIN database_info di ON bh.database_id = di.database_id
+    WHERE {keyset}
+    ORDER BY {order}
+''')
+
 @maintenance_staff.route('/backups', methods=['GET'])
+@cache.conditional(tags=('backups',))
 def get_backups():
-    """Fetch all backup history"""
+    """Fetch backup history, one page at a time"""
     try:
+        fmt = export_format()
+        limit, after = (None, None) if fmt else page_args(BACKUPS_SORT)
+        keyset, keyset_params = keyset_condition(BACKUPS_SORT, after)
+
+        query = BACKUPS_QUERY.format(keyset=keyset, order=order_clause(BACKUPS_SORT))
+        if fmt:
+            return stream_export(query, keyset_params, fmt, 'backups')
+
         cursor = db.get_db().cursor()
-        cursor.execute('''
-            SELECT 
-                bh.database_id,
-                bh.type, 
-                bh.backup_date, 
-                bh.details,
-                di.name AS database_name, 
-                di.version AS db_version
-            FROM backup_history bh
-            JOIN database_info di ON bh.database_id = di.database_id
-            ORDER BY bh.backup_date DESC
-        ''')
-        backups = cursor.fetchall()
-        
-        if not backups:
-            return make_response(jsonify([]), 200)
+        cursor.execute(query + ' LIMIT %s', (*keyset_params, limit + 1))
+        # backup_id only drives the cursor; PUT/DELETE still address rows by database_id
+        page = page_response(cursor.fetchall(), limit, ('backup_date', 'backup_id'), hidden=('backup_id',))
             
-        return make_response(jsonify(backups), 200)
+        return make_response(jsonify(page), 200)
+    except (CursorError, ExportError) as e:
+        return make_response(jsonify({'error': str(e)}), 400)
     except Exception as e:
         current_app.logger.error(f"Error in get_backups: {str(e)}")
         return make_response(jsonify({'error': str(e)}), 500)
 
 #------------------------------------------------------------
 # Update a backup
+BACKUP_EXISTS_QUERY = define('maintenance.backup_exists', '''
+    SELECT database_id FROM backup_history
+    WHERE database_id = %s
+''')
+
+UPDATE_BACKUP_QUERY = define('maintenance.update_backup', '''
+    UPDATE backup_history
+    SET type = %s, backup_date = %s, details = %s
+    WHERE database_id = %s
+''')
+
 @maintenance_staff.route('/backups/<int:backup_id>', methods=['PUT'])
 def update_backup(backup_id):
     """Update a backup record"""
@@ -106,25 +156,19 @@ def update_backup(backup_id):
         backup_data = request.json
 
         # 检查记录是否存在
-        cursor.execute('''
-            SELECT database_id FROM backup_history 
-            WHERE database_id = %s
-        ''', (backup_id,))
+        cursor.execute(BACKUP_EXISTS_QUERY, (backup_id,))
         if not cursor.fetchone():
             return make_response(jsonify({'error': 'Backup not found'}), 404)
 
         # 更新记录
-        cursor.execute('''
-            UPDATE backup_history 
-            SET type = %s, backup_date = %s, details = %s
-            WHERE database_id = %s
-        ''', (
+        cursor.execute(UPDATE_BACKUP_QUERY, (
             backup_data['type'],
             backup_data['backup_date'],
             backup_data['details'],
             backup_id
         ))
         db.get_db().commit()
+        cache.invalidate('backups')
         return make_response(jsonify({'message': 'Backup updated successfully'}), 200)
     except Exception as e:
         db.get_db().rollback()
@@ -133,34 +177,58 @@ def update_backup(backup_id):
 
 #------------------------------------------------------------
 # Get all alterations
+ALTERATIONS_SORT = [('dah.alteration_date', 'DESC', NULLABLE), ('dah.alteration_id', 'DESC')]
+ALTERATIONS_QUERY = define('maintenance.alterations', '''
+    SELECT 
+        dah.alteration_id,
+        dah.database_id,
+        dah.alteration_type, 
+        dah.alteration_date,
+        di.name AS database_name, 
+        di.version AS db_version
+    FROM data_alteration_history dah
+    JOIN database_info di ON dah.database_id = di.database_id
+    WHERE {keyset}
+    ORDER BY {order}
+''')
+
 @maintenance_staff.route('/alterations', methods=['GET'])
+@cache.conditional(tags=('alterations',))
 def get_alterations():
-    """Fetch all data alteration history"""
+    """Fetch data alteration history, one page at a time"""
     try:
+        fmt = export_format()
+        limit, after = (None, None) if fmt else page_args(ALTERATIONS_SORT)
+        keyset, keyset_params = keyset_condition(ALTERATIONS_SORT, after)
+
+        query = ALTERATIONS_QUERY.format(keyset=keyset, order=order_clause(ALTERATIONS_SORT))
+        if fmt:
+            return stream_export(query, keyset_params, fmt, 'alterations')
+
         cursor = db.get_db().cursor()
-        cursor.execute('''
-            SELECT 
-                dah.database_id,
-                dah.alteration_type, 
-                dah.alteration_date,
-                di.name AS database_name, 
-                di.version AS db_version
-            FROM data_alteration_history dah
-            JOIN database_info di ON dah.database_id = di.database_id
-            ORDER BY dah.alteration_date DESC
-        ''')
-        alterations = cursor.fetchall()
-        
-        if not alterations:
-            return make_response(jsonify([]), 200)
+        cursor.execute(query + ' LIMIT %s', (*keyset_params, limit + 1))
+        page = page_response(cursor.fetchall(), limit, ('alteration_date', 'alteration_id'), hidden=('alteration_id',))
             
-        return make_response(jsonify(alterations), 200)
+        return make_response(jsonify(page), 200)
+    except (CursorError, ExportError) as e:
+        return make_response(jsonify({'error': str(e)}), 400)
     except Exception as e:
         current_app.logger.error(f"Error in get_alterations: {str(e)}")
         return make_response(jsonify({'error': str(e)}), 500)
 
 #------------------------------------------------------------
 # Update an alteration
+ALTERATION_EXISTS_QUERY = define('maintenance.alteration_exists', '''
+    SELECT database_id FROM data_alteration_history
+    WHERE database_id = %s
+''')
+
+UPDATE_ALTERATION_QUERY = define('maintenance.update_alteration', '''
+    UPDATE data_alteration_history
+    SET alteration_type = %s, alteration_date = %s
+    WHERE database_id = %s
+''')
+
 @maintenance_staff.route('/alterations/<int:alteration_id>', methods=['PUT'])
 def update_alteration(alteration_id):
     """Update a data alteration"""
@@ -169,24 +237,18 @@ def update_alteration(alteration_id):
         alteration_data = request.json
 
         # 检查记录是否存在
-        cursor.execute('''
-            SELECT database_id FROM data_alteration_history 
-            WHERE database_id = %s
-        ''', (alteration_id,))
+        cursor.execute(ALTERATION_EXISTS_QUERY, (alteration_id,))
         if not cursor.fetchone():
             return make_response(jsonify({'error': 'Alteration not found'}), 404)
 
         # 更新记录
-        cursor.execute('''
-            UPDATE data_alteration_history 
-            SET alteration_type = %s, alteration_date = %s
-            WHERE database_id = %s
-        ''', (
+        cursor.execute(UPDATE_ALTERATION_QUERY, (
             alteration_data['alteration_type'],
             alteration_data['alteration_date'],
             alteration_id
         ))
         db.get_db().commit()
+        cache.invalidate('alterations')
         return make_response(jsonify({'message': 'Alteration updated successfully'}), 200)
     except Exception as e:
         db.get_db().rollback()
@@ -194,6 +256,14 @@ def update_alteration(alteration_id):
         return make_response(jsonify({'error': str(e)}), 500)
     
 # 在 maintenance_staff_routes.py 中添加
+ADD_ALTERATION_QUERY = define('maintenance.add_alteration', '''
+    INSERT INTO data_alteration_history
+    (database_id, alteration_type, alteration_date)
+    VALUES (%s, %s, %s)
+''')
+
+DELETE_ALTERATION_QUERY = define('maintenance.delete_alteration',
+                                 'DELETE FROM data_alteration_history WHERE database_id = %s')
 
 @maintenance_staff.route('/alterations', methods=['POST'])
 def add_alteration():
@@ -202,17 +272,13 @@ def add_alteration():
         alteration_data = request.json
         cursor = db.get_db().cursor()
         
-        query = '''
-            INSERT INTO data_alteration_history 
-            (database_id, alteration_type, alteration_date)
-            VALUES (%s, %s, %s)
-        '''
-        cursor.execute(query, (
+        cursor.execute(ADD_ALTERATION_QUERY, (
             alteration_data['database_id'],
             alteration_data['alteration_type'],
             alteration_data['alteration_date']
         ))
         db.get_db().commit()
+        cache.invalidate('alterations')
         return make_response(jsonify({'message': 'Alteration added successfully'}), 200)
     except Exception as e:
         db.get_db().rollback()
@@ -226,19 +292,32 @@ def delete_alteration(alteration_id):
         cursor = db.get_db().cursor()
         
         # 检查记录是否存在
-        cursor.execute('SELECT database_id FROM data_alteration_history WHERE database_id = %s', (alteration_id,))
+        cursor.execute(ALTERATION_EXISTS_QUERY, (alteration_id,))
         if not cursor.fetchone():
             return make_response(jsonify({'error': 'Alteration not found'}), 404)
             
         # 删除记录
-        cursor.execute('DELETE FROM data_alteration_history WHERE database_id = %s', (alteration_id,))
+        cursor.execute(DELETE_ALTERATION_QUERY, (alteration_id,))
         db.get_db().commit()
+        cache.invalidate('alterations')
         return make_response(jsonify({'message': 'Alteration deleted successfully'}), 200)
     except Exception as e:
         db.get_db().rollback()
         current_app.logger.error(f"Error in delete_alteration: {str(e)}")
         return make_response(jsonify({'error': str(e)}), 500)
     
+DATABASE_EXISTS_QUERY = define('maintenance.database_exists',
+                               'SELECT database_id FROM database_info WHERE database_id = %s')
+
+ADD_BACKUP_QUERY = define('maintenance.add_backup', '''
+    INSERT INTO backup_history
+    (database_id, type, backup_date, details)
+    VALUES (%s, %s, %s, %s)
+''')
+
+DELETE_BACKUP_QUERY = define('maintenance.delete_backup',
+                             'DELETE FROM backup_history WHERE database_id = %s')
+
 @maintenance_staff.route('/backups', methods=['POST'])
 def add_backup():
     """Add a new backup record."""
@@ -246,23 +325,18 @@ def add_backup():
         backup_data = request.json
         cursor = db.get_db().cursor()
         # 先检查 database_id 是否存在
-        cursor.execute('SELECT database_id FROM database_info WHERE database_id = %s', 
-                      (backup_data['database_id'],))
+        cursor.execute(DATABASE_EXISTS_QUERY, (backup_data['database_id'],))
         if not cursor.fetchone():
             return make_response(jsonify({'error': 'Database not found'}), 404)
             
-        query = '''
-            INSERT INTO backup_history 
-            (database_id, type, backup_date, details)
-            VALUES (%s, %s, %s, %s)
-        '''
-        cursor.execute(query, (
+        cursor.execute(ADD_BACKUP_QUERY, (
             backup_data['database_id'],
             backup_data['type'],
             backup_data['backup_date'],
             backup_data['details']
         ))
         db.get_db().commit()
+        cache.invalidate('backups')
         return make_response(jsonify({'message': 'Backup created successfully'}), 200)
     except Exception as e:
         db.get_db().rollback()
@@ -275,43 +349,185 @@ def delete_backup(backup_id):
     try:
         cursor = db.get_db().cursor()
         # 检查记录是否存在
-        cursor.execute('SELECT database_id FROM backup_history WHERE database_id = %s', 
-                      (backup_id,))
+        cursor.execute(BACKUP_EXISTS_QUERY, (backup_id,))
         if not cursor.fetchone():
             return make_response(jsonify({'error': 'Backup not found'}), 404)
             
-        cursor.execute('DELETE FROM backup_history WHERE database_id = %s', (backup_id,))
+        cursor.execute(DELETE_BACKUP_QUERY, (backup_id,))
         db.get_db().commit()
+        cache.invalidate('backups')
         return make_response(jsonify({'message': 'Backup deleted successfully'}), 200)
     except Exception as e:
         db.get_db().rollback()
         current_app.logger.error(f"Error in delete_backup: {str(e)}")
         return make_response(jsonify({'error': str(e)}), 500)
 
+DATABASES_QUERY = define('maintenance.databases', '''
+    SELECT 
+        di.database_id, di.name, di.version, di.type, di.last_update
+    FROM database_info di
+    ORDER BY di.last_update DESC
+''')
+
 @maintenance_staff.route('/databases', methods=['GET'])
+@cache.cached(tags=('databases',), ttl=300)
 def get_databases():
     """Fetch all database information."""
     try:
         cursor = db.get_db().cursor()
-        query = '''
-            SELECT 
-                di.database_id, di.name, di.version, di.type, di.last_update
-            FROM database_info di
-            ORDER BY di.last_update DESC
-        '''
-        cursor.execute(query)
-        rows = cursor.fetchall()
-        databases = []
-        for row in rows:
-            databases.append({
-                "database_id": row[0],
-                "name": row[1],
-                "version": row[2],
-                "type": row[3],
-                "last_update": row[4]
-            })
+        cursor.execute(DATABASES_QUERY)
+        databases = cursor.fetchall()
         return make_response(jsonify(databases), 200)
     except Exception as e:
         current_app.logger.error(f"Error in get_databases: {str(e)}")
         return make_response(jsonify({'error': str(e)}), 500)
-    
\ No newline at end of file
+    
+#------------------------------------------------------------
+# Connection pool statistics
+@maintenance_staff.route('/pool', methods=['GET'])
+def get_pool_stats():
+    """Report connection pool usage (checked-out, waiting, wait time)"""
+    try:
+        return make_response(jsonify(db.stats()), 200)
+    except Exception as e:
+        current_app.logger.error(f"Error in get_pool_stats: {str(e)}")
+        return make_response(jsonify({'error': str(e)}), 500)
+
+#------------------------------------------------------------
+# Response cache statistics
+@maintenance_staff.route('/cache', methods=['GET'])
+def get_cache_stats():
+    """Report response cache hits, misses and evictions (per worker for lru)"""
+    try:
+        return make_response(jsonify(cache.stats()), 200)
+    except Exception as e:
+        current_app.logger.error(f"Error in get_cache_stats: {str(e)}")
+        return make_response(jsonify({'error': str(e)}), 500)
+
+#------------------------------------------------------------
+# Resume sync queue and worker statistics
+RESUME_SYNC_QUEUE_QUERY = define('maintenance.resume_sync_queue', '''
+    SELECT COUNT(*) AS queued, MIN(queued_at) AS oldest_queued_at
+    FROM resume_sync_queue
+''')
+
+@maintenance_staff.route('/resume-sync', methods=['GET'])
+def get_resume_sync_stats():
+    """Report the resume sync queue backlog and this worker's sync thread"""
+    try:
+        cursor = db.get_db().cursor()
+        cursor.execute(RESUME_SYNC_QUEUE_QUERY)
+        stats = cursor.fetchone()
+        stats.update(resume_sync.stats())
+        return make_response(jsonify(stats), 200)
+    except Exception as e:
+        current_app.logger.error(f"Error in get_resume_sync_stats: {str(e)}")
+        return make_response(jsonify({'error': str(e)}), 500)
+
+#------------------------------------------------------------
+# Per-fingerprint SQL statistics (slow-query log / N+1 detector)
+@maintenance_staff.route('/queries', methods=['GET'])
+def get_query_stats():
+    """Report this worker's statements by fingerprint, ?sort=total|mean|max|count|rows|slow|n_plus_one"""
+    try:
+        query_log = db.query_log
+        if query_log is None:
+            return make_response(jsonify({'enabled': False, 'queries': []}), 200)
+
+        sort = request.args.get('sort', 'total')
+        if sort not in SORT_KEYS:
+            return make_response(jsonify({'error': f'Unsupported sort: {sort}'}), 400)
+        limit = request.args.get('limit', 50, type=int)
+        return make_response(jsonify({
+            'enabled': True,
+            'slow_ms': query_log.slow_seconds * 1000,
+            'n_plus_one_threshold': query_log.n_plus_one,
+            'queries': query_log.summary(sort=sort, limit=limit),
+        }), 200)
+    except Exception as e:
+        current_app.logger.error(f"Error in get_query_stats: {str(e)}")
+        return make_response(jsonify({'error': str(e)}), 500)
+
+@maintenance_staff.route('/queries', methods=['DELETE'])
+def reset_query_stats():
+    """Clear this worker's statement statistics"""
+    if db.query_log is not None:
+        db.query_log.reset()
+    return make_response(jsonify({'message': 'Query statistics cleared'}), 200)
+
+#------------------------------------------------------------
+# Background jobs
+JOBS_SORT = [('j.job_id', 'DESC')]
+JOBS_QUERY = define('maintenance.jobs', '''
+    SELECT j.job_id, j.job_type, j.priority, j.status, j.attempts, j.max_attempts,
+           j.run_after, j.last_error, j.created_at, j.started_at, j.finished_at
+    FROM job j
+    WHERE {filters}
+    ORDER BY {order}
+    LIMIT %s
+''')
+
+@maintenance_staff.route('/jobs', methods=['GET'])
+def get_jobs():
+    """List background jobs, newest first, optionally by ?status= and ?job_type="""
+    try:
+        limit, after = page_args(JOBS_SORT)
+        keyset, keyset_params = keyset_condition(JOBS_SORT, after)
+
+        filters, params = [], []
+        status = request.args.get('status')
+        if status:
+            if status not in JOB_STATUSES:
+                return make_response(jsonify({'error': f'status must be one of {", ".join(JOB_STATUSES)}'}), 400)
+            filters.append('j.status = %s')
+            params.append(status)
+        job_type = request.args.get('job_type')
+        if job_type:
+            filters.append('j.job_type = %s')
+            params.append(job_type)
+
+        cursor = db.get_db().cursor()
+        cursor.execute(JOBS_QUERY.format(filters=' AND '.join(filters + [keyset]),
+                                         order=order_clause(JOBS_SORT)),
+                       (*params, *keyset_params, limit + 1))
+        page = page_response(cursor.fetchall(), limit, ('job_id',))
+        return make_response(jsonify(page), 200)
+    except CursorError as e:
+        return make_response(jsonify({'error': str(e)}), 400)
+    except Exception as e:
+        current_app.logger.error(f"Error in get_jobs: {str(e)}")
+        return make_response(jsonify({'error': str(e)}), 500)
+
+
+@maintenance_staff.route('/jobs', methods=['POST'])
+def create_job():
+    """
+    Queue a background job: {"job_type": ..., "payload": {...},
+    "priority": n, "delay": seconds}. Answers 202 with the job id.
+    """
+    try:
+        data = request.json or {}
+        cursor = db.get_db().cursor()
+        job_id = enqueue(cursor, data.get('job_type'), data.get('payload') or {},
+                         priority=data.get('priority'), delay=data.get('delay', 0))
+        db.get_db().commit()
+        return make_response(jsonify({'job_id': job_id, 'status': 'queued'}), 202)
+    except JobError as e:
+        return make_response(jsonify({'error': str(e), 'job_types': sorted(JOB_TYPES)}), 400)
+    except Exception as e:
+        db.get_db().rollback()
+        current_app.logger.error(f"Error in create_job: {str(e)}")
+        return make_response(jsonify({'error': str(e)}), 500)
+
+
+@maintenance_staff.route('/jobs/<int:job_id>', methods=['GET'])
+def get_job_status(job_id):
+    """Status, attempts, last error and result of one job"""
+    try:
+        job = get_job(db.get_db().cursor(), job_id)
+        if not job:
+            return make_response(jsonify({'error': 'Job not found'}), 404)
+        return make_response(jsonify(job), 200)
+    except Exception as e:
+        current_app.logger.error(f"Error in get_job_status: {str(e)}")
+        return make_response(jsonify({'error': str(e)}), 500)
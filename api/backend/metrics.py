@@ -0,0 +1,113 @@
+#------------------------------------------------------------
+# Prometheus metrics (GET /metrics)
+#
+# With METRICS_ENABLED every request records, labelled by blueprint
+# and route rule (e.g. /student/<int:user_id>/dashboard):
+#   http_request_duration_seconds      latency histogram
+#   http_requests_total                count by status code
+#   http_request_sql_statements        SQL statements per request
+#   http_request_db_seconds            time spent in SQL per request
+#   http_request_db_rows_total         rows returned by SQL
+#   http_response_size_bytes           body size (after compression)
+# plus the connection pool gauges db_pool_*.
+#
+# Under gunicorn the workers share their values through files in
+# PROMETHEUS_MULTIPROC_DIR (set up by gunicorn.conf.py), so a scrape
+# of any worker returns the totals of all of them. When disabled no
+# hook is installed and /metrics does not exist.
+#------------------------------------------------------------
+import os
+import time
+
+from flask import Response, current_app, g, request
+
+from backend import request_metrics
+
+LATENCY_BUCKETS = (.005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+POOL_STATES = ('open', 'idle', 'checked_out', 'waiting')
+
+ROUTE_LABELS = ('blueprint', 'route', 'method')
+
+
+class Metrics:
+
+    def __init__(self):
+        self._metrics = None
+
+    def init_app(self, app):
+        app.config.setdefault('METRICS_ENABLED', False)
+        app.config.setdefault('METRICS_PATH', '/metrics')
+        if not app.config['METRICS_ENABLED']:
+            return
+
+        if self._metrics is None:
+            self._metrics = self._create()
+        app.extensions['metrics'] = self
+        # after_request hooks run in reverse registration order: init
+        # this first so the final (compressed) body is measured
+        app.after_request(self._record)
+        app.add_url_rule(app.config['METRICS_PATH'], 'metrics', self.scrape)
+
+    def _create(self):
+        # imported here: prometheus_client reads PROMETHEUS_MULTIPROC_DIR
+        # at import, and a disabled app should not load it at all
+        from prometheus_client import Counter, Gauge, Histogram
+
+        return {
+            'latency': Histogram('http_request_duration_seconds', 'Request latency',
+                                 ROUTE_LABELS, buckets=LATENCY_BUCKETS),
+            'requests': Counter('http_requests_total', 'Requests by status code',
+                                ROUTE_LABELS + ('status',)),
+            'statements': Histogram('http_request_sql_statements', 'SQL statements per request',
+                                    ROUTE_LABELS, buckets=STATEMENT_BUCKETS),
+            'db_time': Histogram('http_request_db_seconds', 'Time spent in SQL per request',
+                                 ROUTE_LABELS, buckets=LATENCY_BUCKETS),
+            'rows': Counter('http_request_db_rows', 'Rows returned by SQL', ROUTE_LABELS),
+            'size': Histogram('http_response_size_bytes', 'Response body size',
+                              ROUTE_LABELS, buckets=SIZE_BUCKETS),
+            'pool': Gauge('db_pool_connections', 'Connection pool usage', ('state',),
+                          multiprocess_mode='livesum'),
+            'pool_timeouts': Gauge('db_pool_timeouts', 'Checkouts that timed out',
+                                   multiprocess_mode='livesum'),
+        }
+
+    def _record(self, response):
+        started = g.get('request_started')
+        if started is None:
+            return response
+        metrics = self._metrics
+        rule = request.url_rule
+        labels = (request.blueprint or '', rule.rule if rule is not None else 'unmatched',
+                  request.method)
+        metrics['latency'].labels(*labels).observe(time.perf_counter() - started)
+        metrics['requests'].labels(*labels, str(response.status_code)).inc()
+        statements, rows, seconds = request_metrics.query_stats()
+        metrics['statements'].labels(*labels).observe(statements)
+        if statements:
+            metrics['db_time'].labels(*labels).observe(seconds)
+            metrics['rows'].labels(*labels).inc(rows)
+        if not response.is_streamed:
+            metrics['size'].labels(*labels).observe(response.calculate_content_length() or 0)
+
+        pool = current_app.extensions.get('mysql_pool')
+        if pool is not None:
+            stats = pool.stats()
+            for state in POOL_STATES:
+                metrics['pool'].labels(state).set(stats[state])
+            metrics['pool_timeouts'].set(stats['timeouts'])
+        return response
+
+    def scrape(self):
+        from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest
+
+        registry = REGISTRY
+        if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+            from prometheus_client import multiprocess
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+
+metrics = Metrics()
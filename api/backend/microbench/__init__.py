@@ -0,0 +1,559 @@
+#------------------------------------------------------------
+# Per-handler micro-benchmarks
+#
+#   python -m backend.microbench --profiles small,medium
+#
+# Each profile gets its own database next to the configured one
+# (<DB_NAME>_bench_<profile>): the tables are cloned from DB_NAME
+# (already migrated) and filled by backend.datagen with a fixed seed.
+# It is built once and reused while its profile and seed match. With
+# --engine sqlite the database is an embedded SQLite file instead
+# (bench_<profile>.sqlite3 in --sqlite-dir), so the benchmarks need no
+# MySQL server; its baselines are baselines/<profile>-sqlite.json.
+#
+# Each handler in CASES is called in-process through the Flask test
+# client of a create_app() pointed at that database, with the response
+# cache off, so the SQL runs every time. Writes (every method but GET)
+# run with the connection's commit() turned into a no-op, and the pool
+# rolls their transaction back when the request ends: every iteration
+# sees the same data and the database stays as provisioned, but write
+# latencies leave out the COMMIT itself. Per handler we keep the
+# latency distribution, the SQL statements and rows per request (from
+# backend.request_metrics), the peak Python allocation during a
+# request (tracemalloc, in a separate pass) and the response size.
+# Results are compared with the baselines checked in under
+# baselines/<profile>.json. Routes of the app without a case are listed
+# in the report (`uncovered`).
+#------------------------------------------------------------
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+from collections import namedtuple
+
+import pymysql
+from flask import g, request
+from pymysql import cursors
+
+from backend import datagen, request_metrics
+from backend.data import sqlite
+from backend.db_connection import db
+from backend.jobs import enqueue
+from backend.loadtest.client import percentile
+from backend.rest_entry import create_app
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), 'baselines')
+DEFAULT_THRESHOLD = 0.25
+ENGINES = ('mysql', 'sqlite')
+
+# name, method, path template, body template: a dict sent as JSON, a
+# string sent as text/csv, or None; {student}, {resume}, {grade}, ...
+# are filled from fixtures()
+Case = namedtuple('Case', ('name', 'method', 'path', 'body'))
+
+# rows of the CSV the grade import case uploads
+IMPORT_ROWS = 200
+
+CASES = (
+    # student
+    Case('student.info', 'GET', '/student/info/{student}', None),
+    Case('student.grades', 'GET', '/student/{student}/grades', None),
+    Case('student.coops', 'GET', '/student/{coop_student}/coops', None),
+    Case('student.dashboard', 'GET', '/student/{student}/dashboard', None),
+    Case('student.metrics', 'GET', '/student/{student}/metrics', None),
+    Case('student.resume', 'GET', '/student/{student}/resume', None),
+    Case('student.resume_versions', 'GET', '/student/{student}/resume/versions', None),
+    Case('student.resume_suggestions', 'GET', '/student/{suggestion_student}/resume/suggestions', None),
+    Case('student.applications_active', 'GET', '/student/{student}/applications/active', None),
+    Case('student.applications_history', 'GET', '/student/{student}/applications/history?limit=50', None),
+    Case('student.applications_positions', 'GET', '/student/{student}/applications/positions?limit=50', None),
+    # unchanged content: locks and compares the current version, writes nothing
+    Case('student.update_resume_unchanged', 'PUT', '/student/{student}/resume',
+         {'skills': '{skills}', 'projects': '{projects}'}),
+    Case('student.update_resume', 'PUT', '/student/{student}/resume',
+         {'skills': '{skills} (microbench)', 'projects': '{projects}'}),
+    Case('student.add_application', 'POST', '/student/{student}/applications',
+         {'position_id': '{position}', 'sent_on': '2024-01-01'}),
+    Case('student.delete_application', 'DELETE', '/student/{student}/applications/{application}', None),
+    # hr
+    Case('hr.internships', 'GET', '/hr/internships?limit=50', None),
+    Case('hr.applications', 'GET', '/hr/applications?limit=50', None),
+    Case('hr.applications_pending', 'GET', '/hr/applications?status=Pending&limit=50', None),
+    Case('hr.resumes', 'GET', '/hr/resumes?limit=50', None),
+    Case('hr.resume', 'GET', '/hr/resumes/{resume}', None),
+    Case('hr.analytics_positions', 'GET', '/hr/analytics/positions', None),
+    Case('hr.add_internship', 'POST', '/hr/internships',
+         {'hr_id': '{hr}', 'title': 'Microbench Intern', 'description': 'microbench',
+          'requirements': 'microbench', 'status': 'Active'}),
+    # the position has applications: the soft delete
+    Case('hr.delete_internship', 'DELETE', '/hr/internships/{busiest_position}', None),
+    Case('hr.update_application', 'PUT', '/hr/applications/{application}', {'status': 'Accepted'}),
+    Case('hr.bulk_status', 'POST', '/hr/applications/bulk-status',
+         {'position_id': '{busiest_position}', 'from_status': 'Pending', 'status': 'Rejected'}),
+    Case('hr.delete_application', 'DELETE', '/hr/applications/{application}', None),
+    Case('hr.add_suggestion', 'POST', '/hr/resumes/{resume}/suggestions',
+         {'suggestion_text': 'Quantify the impact of each project.'}),
+    Case('hr.delete_suggestion', 'DELETE', '/hr/resumes/{suggestion_resume}/suggestions/{suggestion}', None),
+    # school_admin
+    Case('school_admin.students', 'GET', '/school_admin/students?limit=50', None),
+    Case('school_admin.grades', 'GET', '/school_admin/students/{student}/grades', None),
+    Case('school_admin.coops', 'GET', '/school_admin/students/{coop_student}/coops', None),
+    # the same values again: an idempotent UPDATE plus the resume sync enqueue
+    Case('school_admin.update_grade', 'PUT', '/school_admin/students/{student}/grades/{grade}',
+         {'course_name': '{course_name}', 'grade': '{grade_value}'}),
+    Case('school_admin.add_grade', 'POST', '/school_admin/students/{student}/grades',
+         {'course_name': 'Microbench 101', 'grade': 3.5, 'recorded_by': '{admin}'}),
+    Case('school_admin.delete_grade', 'DELETE', '/school_admin/students/{student}/grades/{grade}', None),
+    Case('school_admin.add_coop', 'POST', '/school_admin/students/{student}/coops',
+         {'company_name': 'Microbench Inc', 'start_date': '2024-01-01', 'end_date': '2024-06-30'}),
+    Case('school_admin.update_coop', 'PUT', '/school_admin/students/{coop_student}/coops/{coop}',
+         {'company_name': '{company_name}', 'start_date': '{start_date}', 'end_date': '{end_date}'}),
+    Case('school_admin.delete_coop', 'DELETE', '/school_admin/students/{coop_student}/coops/{coop}', None),
+    Case('school_admin.import_grades', 'POST', '/school_admin/grades/import?recorded_by={admin}',
+         '{grade_csv}'),
+    # maintenance_staff
+    Case('maintenance_staff.alerts', 'GET', '/maintenance_staff/alerts?limit=50', None),
+    Case('maintenance_staff.backups', 'GET', '/maintenance_staff/backups?limit=50', None),
+    Case('maintenance_staff.alterations', 'GET', '/maintenance_staff/alterations?limit=50', None),
+    Case('maintenance_staff.databases', 'GET', '/maintenance_staff/databases', None),
+    Case('maintenance_staff.jobs', 'GET', '/maintenance_staff/jobs', None),
+    Case('maintenance_staff.job', 'GET', '/maintenance_staff/jobs/{job}', None),
+    Case('maintenance_staff.pool', 'GET', '/maintenance_staff/pool', None),
+    Case('maintenance_staff.cache', 'GET', '/maintenance_staff/cache', None),
+    Case('maintenance_staff.queries', 'GET', '/maintenance_staff/queries', None),
+    Case('maintenance_staff.resume_sync', 'GET', '/maintenance_staff/resume-sync', None),
+    Case('maintenance_staff.update_alert', 'PUT', '/maintenance_staff/alerts/{alert}',
+         {'metrics': '{alert_metrics}', 'alerts': '{alert_alerts}', 'severity': '{alert_severity}'}),
+    Case('maintenance_staff.add_backup', 'POST', '/maintenance_staff/backups',
+         {'database_id': '{database}', 'type': 'Full', 'backup_date': '2024-01-01', 'details': 'microbench'}),
+    Case('maintenance_staff.update_backup', 'PUT', '/maintenance_staff/backups/{backup}',
+         {'type': '{backup_type}', 'backup_date': '{backup_date}', 'details': '{backup_details}'}),
+    Case('maintenance_staff.delete_backup', 'DELETE', '/maintenance_staff/backups/{backup}', None),
+    Case('maintenance_staff.add_alteration', 'POST', '/maintenance_staff/alterations',
+         {'database_id': '{database}', 'alteration_type': 'Schema', 'alteration_date': '2024-01-01'}),
+    Case('maintenance_staff.update_alteration', 'PUT', '/maintenance_staff/alterations/{alteration}',
+         {'alteration_type': '{alteration_type}', 'alteration_date': '{alteration_date}'}),
+    Case('maintenance_staff.delete_alteration', 'DELETE', '/maintenance_staff/alterations/{alteration}', None),
+    # a job far in the future, so no worker picks it up
+    Case('maintenance_staff.create_job', 'POST', '/maintenance_staff/jobs',
+         {'job_type': 'counters.reconcile', 'delay': 86400}),
+    # resets the in-process statistics only
+    Case('maintenance_staff.reset_queries', 'DELETE', '/maintenance_staff/queries', None),
+)
+
+# environment of the benchmarked app (besides DB_ENGINE and DB_NAME / DB_SQLITE_PATH)
+APP_ENV = {
+    'CACHE_BACKEND': 'none',
+    'METRICS_ENABLED': 'true',      # the cursors count statements for query_stats()
+    'QUERY_LOG_ENABLED': 'false',
+    'RESUME_SYNC_WORKER': 'false',
+    'DB_POOL_SIZE': '2',
+}
+
+
+#------------------------------------------------------------
+# database
+def _connect(database=None, engine='mysql'):
+    if engine == 'sqlite':
+        return sqlite.connect(database)
+    return pymysql.connect(host=os.getenv('DB_HOST').strip(), port=int(os.getenv('DB_PORT').strip()),
+                           user=os.getenv('DB_USER').strip(), password=os.getenv('MYSQL_ROOT_PASSWORD').strip(),
+                           database=database, charset='utf8mb4', cursorclass=cursors.DictCursor)
+
+
+def bench_database(profile):
+    return f"{os.getenv('DB_NAME').strip()}_bench_{profile}"
+
+
+def sqlite_database(profile, directory=None):
+    return os.path.join(directory or tempfile.gettempdir(), f'bench_{profile}.sqlite3')
+
+
+def _dataset_matches(cursor, table, profile, seed):
+    cursor.execute(f'SELECT profile, seed FROM {table}')
+    return cursor.fetchone() == {'profile': profile, 'seed': seed}
+
+
+def provision_sqlite(profile, seed=42, rebuild=False, progress=print, directory=None):
+    """Create (or reuse) the SQLite benchmark file of `profile` and return its path"""
+    path = sqlite_database(profile, directory)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if not rebuild and os.path.exists(path):
+        conn = sqlite.connect(path)
+        try:
+            if _dataset_matches(conn.cursor(), 'bench_dataset', profile, seed):
+                return path
+        except Exception:
+            pass    # no bench_dataset table yet
+        finally:
+            conn.close()
+
+    progress(f'provisioning {path} ({profile}, seed {seed})')
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    conn = sqlite.connect(path)
+    try:
+        datagen.generate(conn, datagen.scaled_counts(profile), seed=seed, progress=progress)
+        cursor = conn.cursor()
+        cursor.execute('CREATE TABLE bench_dataset (profile VARCHAR(32), seed INT)')
+        cursor.execute('INSERT INTO bench_dataset VALUES (%s, %s)', (profile, seed))
+        conn.commit()
+        return path
+    finally:
+        conn.close()
+
+
+def provision(profile, seed=42, rebuild=False, progress=print, engine='mysql', sqlite_dir=None):
+    """
+    Create (or reuse) the benchmark database of `profile` and return
+    its name (its path on the sqlite engine). The MySQL schema is
+    cloned table by table from DB_NAME, so it matches whatever
+    migrations that database has.
+    """
+    if engine == 'sqlite':
+        return provision_sqlite(profile, seed=seed, rebuild=rebuild, progress=progress,
+                                directory=sqlite_dir)
+
+    source, target = os.getenv('DB_NAME').strip(), bench_database(profile)
+    conn = _connect()
+    try:
+        cursor = conn.cursor()
+        if not rebuild:
+            try:
+                if _dataset_matches(cursor, f'`{target}`.bench_dataset', profile, seed):
+                    return target
+            except pymysql.err.ProgrammingError:
+                pass    # no such database or table yet
+
+        progress(f'provisioning {target} ({profile}, seed {seed})')
+        cursor.execute(f'CREATE DATABASE IF NOT EXISTS `{target}`')
+        cursor.execute(f"SHOW FULL TABLES FROM `{source}` WHERE Table_type = 'BASE TABLE'")
+        tables = [next(iter(row.values())) for row in cursor.fetchall()]
+        cursor.execute(f'USE `{target}`')
+        cursor.execute('SET SESSION foreign_key_checks = 0')
+        for table in tables:
+            cursor.execute(f'SHOW CREATE TABLE `{source}`.`{table}`')
+            create = cursor.fetchone()['Create Table']
+            cursor.execute(f'DROP TABLE IF EXISTS `{table}`')
+            cursor.execute(create)
+        cursor.execute('SET SESSION foreign_key_checks = 1')
+        cursor.execute(f'INSERT INTO schema_migrations SELECT * FROM `{source}`.schema_migrations')
+        cursor.execute('DROP TABLE IF EXISTS bench_dataset')
+        conn.commit()
+
+        datagen.generate(conn, datagen.scaled_counts(profile), seed=seed, progress=progress)
+        cursor.execute('CREATE TABLE bench_dataset (profile VARCHAR(32), seed INT)')
+        cursor.execute('INSERT INTO bench_dataset VALUES (%s, %s)', (profile, seed))
+        conn.commit()
+        return target
+    finally:
+        conn.close()
+
+
+def _first(cursor, query, params=()):
+    cursor.execute(query, params)
+    row = cursor.fetchone()
+    if row is None:
+        raise RuntimeError(f'the benchmark database has no rows for: {" ".join(query.split())}')
+    return row
+
+
+def fixtures(database, engine='mysql'):
+    """
+    Ids the cases are run with: the student with the most pending
+    applications among those with a resume and grades (the heaviest
+    dashboard), their resume, one of their grades and one of their
+    pending applications, the position with the most pending
+    applications, a student with co-ops, a suggestion on a current
+    resume and the first row of every other table a write case
+    touches. Adds one job when the database has none, for the job
+    status case.
+    """
+    conn = _connect(database, engine)
+    try:
+        cursor = conn.cursor()
+        student = _first(cursor, '''
+            SELECT s.user_id, cr.resume_id
+            FROM student s
+            JOIN current_resume cr ON cr.user_id = s.user_id
+            WHERE EXISTS (SELECT 1 FROM grade_record g WHERE g.student_id = s.user_id)
+            ORDER BY s.pending_applications DESC, s.user_id
+            LIMIT 1
+        ''')
+        grade = _first(cursor, '''
+            SELECT g.grade_id, g.course_name, g.grade
+            FROM grade_record g
+            WHERE g.student_id = %s
+            ORDER BY g.grade_id
+            LIMIT 1
+        ''', (student['user_id'],))
+        sections = _first(cursor, '''
+            SELECT sk.content AS skills, pj.content AS projects
+            FROM resume r
+            LEFT JOIN resume_section sk ON sk.section_hash = r.skills_hash
+            LEFT JOIN resume_section pj ON pj.section_hash = r.projects_hash
+            WHERE r.resume_id = %s
+        ''', (student['resume_id'],))
+        application = _first(cursor, '''
+            SELECT application_id, position_id
+            FROM application
+            WHERE user_id = %s AND status = 'Pending'
+            ORDER BY application_id
+            LIMIT 1
+        ''', (student['user_id'],))
+        busiest = _first(cursor, '''
+            SELECT position_id
+            FROM internship_position
+            ORDER BY pending_count DESC, position_id
+            LIMIT 1
+        ''')
+        hr = _first(cursor, 'SELECT MIN(hr_id) AS hr_id FROM hr_manager')
+        admin = _first(cursor, 'SELECT MIN(admin_id) AS admin_id FROM school_admin')
+        # the newest suggestion of a current resume, so the student's list is not empty
+        suggestion = _first(cursor, '''
+            SELECT ls.suggestion_id, ls.resume_id, cr.user_id
+            FROM resume_latest_suggestion ls
+            JOIN current_resume cr ON cr.resume_id = ls.resume_id
+            ORDER BY cr.user_id
+            LIMIT 1
+        ''')
+        coop = _first(cursor, '''
+            SELECT co_op_id, student_id, company_name, start_date, end_date
+            FROM co_op_record
+            ORDER BY co_op_id
+            LIMIT 1
+        ''')
+        alert = _first(cursor, 'SELECT alert_id, metrics, alerts, severity FROM alert_history ORDER BY alert_id LIMIT 1')
+        backup = _first(cursor, '''
+            SELECT backup_id, database_id, type, backup_date, details
+            FROM backup_history
+            ORDER BY backup_id
+            LIMIT 1
+        ''')
+        alteration = _first(cursor, '''
+            SELECT alteration_id, alteration_type, alteration_date
+            FROM data_alteration_history
+            ORDER BY alteration_id
+            LIMIT 1
+        ''')
+
+        cursor.execute('SELECT MIN(job_id) AS job_id FROM job')
+        job_id = cursor.fetchone()['job_id']
+        if job_id is None:
+            job_id = enqueue(cursor, 'counters.reconcile', delay=86400)
+            conn.commit()
+
+        grade_csv = 'student_id,course_name,grade\n' + ''.join(
+            f"{student['user_id']},Microbench {n:03d},{n % 400 / 100:.2f}\n" for n in range(IMPORT_ROWS))
+        return {
+            'student': student['user_id'], 'resume': student['resume_id'],
+            'grade': grade['grade_id'], 'course_name': grade['course_name'], 'grade_value': float(grade['grade']),
+            'skills': sections['skills'] or '', 'projects': sections['projects'] or '',
+            'application': application['application_id'], 'position': application['position_id'],
+            'busiest_position': busiest['position_id'], 'hr': hr['hr_id'], 'admin': admin['admin_id'],
+            'suggestion': suggestion['suggestion_id'], 'suggestion_resume': suggestion['resume_id'],
+            'suggestion_student': suggestion['user_id'],
+            'coop': coop['co_op_id'], 'coop_student': coop['student_id'], 'company_name': coop['company_name'],
+            'start_date': str(coop['start_date']), 'end_date': str(coop['end_date']),
+            'alert': alert['alert_id'], 'alert_metrics': alert['metrics'] or '',
+            'alert_alerts': alert['alerts'] or '', 'alert_severity': alert['severity'] or '',
+            'database': backup['database_id'], 'backup': backup['backup_id'], 'backup_type': backup['type'] or '',
+            'backup_date': str(backup['backup_date']), 'backup_details': backup['details'] or '',
+            'alteration': alteration['alteration_id'], 'alteration_type': alteration['alteration_type'] or '',
+            'alteration_date': str(alteration['alteration_date']),
+            'job': job_id, 'grade_csv': grade_csv,
+        }
+    finally:
+        conn.close()
+
+
+def create_bench_app(database, engine='mysql'):
+    """create_app() on the benchmark database, without the response cache"""
+    if engine == 'sqlite':
+        os.environ.update(APP_ENV, DB_ENGINE=engine, DB_SQLITE_PATH=database)
+    else:
+        os.environ.update(APP_ENV, DB_ENGINE=engine, DB_NAME=database)
+    app = create_app()
+    app.config['TESTING'] = True
+
+    @app.before_request
+    def _hold_commits():
+        # the engine rolls back whatever is left uncommitted on release
+        if request.method != 'GET':
+            g.microbench_conn = db.get_db()
+            g.microbench_conn.commit = lambda: None
+
+    @app.after_request
+    def _keep_query_stats(response):
+        app.extensions['microbench_stats'] = request_metrics.query_stats()
+        return response
+
+    # registered after the engine's, so it runs before the connection goes back
+    @app.teardown_appcontext
+    def _release_commits(exception):
+        conn = g.pop('microbench_conn', None)
+        if conn is not None:
+            del conn.commit
+
+    return app
+
+
+def uncovered(app, cases=CASES, values=None):
+    """'METHOD /rule' of every blueprint route of `app` that no case calls"""
+    adapter = app.url_map.bind('localhost')
+    covered = set()
+    for case in cases:
+        path = case.path.format(**values) if values else case.path
+        covered.add((adapter.match(path.split('?')[0], method=case.method)[0], case.method))
+    return sorted(f'{method} {rule.rule}'
+                  for rule in app.url_map.iter_rules() if '.' in rule.endpoint
+                  for method in rule.methods - {'HEAD', 'OPTIONS'}
+                  if (rule.endpoint, method) not in covered)
+
+
+#------------------------------------------------------------
+# measuring
+def _body(template, values):
+    """Fill a body template; a value that is exactly one placeholder keeps its type"""
+    if isinstance(template, str):
+        return template.format(**values)
+    body = {}
+    for key, value in template.items():
+        if not isinstance(value, str):
+            body[key] = value
+        elif value.startswith('{') and value.endswith('}') and value[1:-1] in values:
+            body[key] = values[value[1:-1]]
+        else:
+            body[key] = value.format(**values)
+    return body
+
+
+def run_case(app, client, case, values, iterations=50, warmup=5, alloc_iterations=10):
+    path = case.path.format(**values)
+    body = _body(case.body, values) if case.body else None
+    headers = {'Accept-Encoding': 'identity'}
+
+    def call():
+        if isinstance(body, str):
+            return client.open(path, method=case.method, data=body, content_type='text/csv',
+                               headers=headers)
+        return client.open(path, method=case.method, json=body, headers=headers)
+
+    for _ in range(warmup):
+        call()
+
+    latencies, statements, rows, db_seconds, sizes, statuses = [], [], [], [], [], set()
+    for _ in range(iterations):
+        started = time.perf_counter()
+        response = call()
+        latencies.append(time.perf_counter() - started)
+        count, row_count, seconds = app.extensions.get('microbench_stats', (0, 0, 0.0))
+        statements.append(count)
+        rows.append(row_count)
+        db_seconds.append(seconds)
+        sizes.append(len(response.get_data()))
+        statuses.add(response.status_code)
+
+    # allocations in a separate pass: tracing slows every allocation down
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(alloc_iterations):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            call()
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        'method': case.method,
+        'path': case.path,
+        'status': sorted(statuses),
+        'iterations': iterations,
+        'p50_ms': _ms(percentile(latencies, 50)),
+        'p95_ms': _ms(percentile(latencies, 95)),
+        'p99_ms': _ms(percentile(latencies, 99)),
+        'mean_ms': _ms(statistics.fmean(latencies)),
+        'stdev_ms': _ms(statistics.pstdev(latencies)),
+        'sql_statements': max(statements),
+        'sql_rows': max(rows),
+        'db_ms': _ms(statistics.median(db_seconds)),
+        'alloc_peak_kib': round(statistics.median(peaks) / 1024, 1) if peaks else None,
+        'response_bytes': max(sizes),
+    }
+
+
+def run_profile(profile, cases=CASES, seed=42, rebuild=False, iterations=50, warmup=5, progress=print,
+                engine='mysql', sqlite_dir=None):
+    database = provision(profile, seed=seed, rebuild=rebuild, progress=progress,
+                         engine=engine, sqlite_dir=sqlite_dir)
+    values = fixtures(database, engine)
+    app = create_bench_app(database, engine)
+    results = {}
+    with app.test_client() as client:
+        for case in cases:
+            results[case.name] = run_case(app, client, case, values, iterations=iterations, warmup=warmup)
+            progress(f"{profile:<10} {case.name:<40} p50 {results[case.name]['p50_ms']:>8} ms, "
+                     f"{results[case.name]['sql_statements']} statements")
+    app.extensions['db'].dispose()
+    return {
+        'profile': profile,
+        'engine': engine,
+        'seed': seed,
+        'counts': datagen.scaled_counts(profile),
+        'fixtures': {key: value for key, value in values.items() if not isinstance(value, str)},
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'cases': results,
+        'uncovered': uncovered(app, values=values),
+    }
+
+
+#------------------------------------------------------------
+# baselines
+# metric -> kind of comparison (relative with the threshold, or any increase)
+COMPARED = {
+    'p50_ms': 'relative',
+    'p95_ms': 'relative',
+    'alloc_peak_kib': 'relative',
+    'response_bytes': 'relative',
+    'sql_statements': 'increase',
+}
+
+
+def baseline_path(profile, engine='mysql'):
+    name = profile if engine == 'mysql' else f'{profile}-{engine}'
+    return os.path.join(BASELINE_DIR, f'{name}.json')
+
+
+def failed_reads(report):
+    """(case, statuses) of the GET cases that answered anything but 2xx"""
+    return [(name, result['status']) for name, result in report['cases'].items()
+            if result['method'] == 'GET' and any(not 200 <= status < 300 for status in result['status'])]
+
+
+def regressions(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """(case, metric, baseline value, current value) for every metric that got worse"""
+    found = []
+    for name, now in current['cases'].items():
+        before = baseline['cases'].get(name)
+        if before is None:
+            continue
+        if now['status'] != before['status']:
+            found.append((name, 'status', before['status'], now['status']))
+        for metric, kind in COMPARED.items():
+            old, new = before.get(metric), now.get(metric)
+            if old is None or new is None:
+                continue
+            if kind == 'increase' and new > old:
+                found.append((name, metric, old, new))
+            elif kind == 'relative' and old > 0 and new > old * (1 + threshold):
+                found.append((name, metric, old, new))
+    return found
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 3) if seconds is not None else None
@@ -0,0 +1,102 @@
+###
+# Micro-benchmark command line
+#
+#   python -m backend.microbench --profiles small,medium
+#   python -m backend.microbench --profiles small --update-baseline
+#   python -m backend.microbench --case student. --iterations 200
+#   python -m backend.microbench --engine sqlite --profiles small
+###
+import argparse
+import json
+import os
+import sys
+
+from backend.datagen import PROFILES
+from backend.microbench import (CASES, DEFAULT_THRESHOLD, ENGINES, baseline_path, failed_reads,
+                                regressions, run_profile)
+
+
+def _profiles(spec):
+    profiles = [name.strip() for name in spec.split(',') if name.strip()]
+    unknown = [name for name in profiles if name not in PROFILES]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown profile(s): {', '.join(unknown)}")
+    return profiles
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m backend.microbench',
+                                     description='Benchmark every route handler in-process')
+    parser.add_argument('--profiles', type=_profiles, default=['small'],
+                        help=f"comma separated datagen profiles ({', '.join(PROFILES)})")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--engine', choices=ENGINES, default=os.getenv('DB_ENGINE') or 'mysql',
+                        help='database engine to benchmark on (default: DB_ENGINE or mysql)')
+    parser.add_argument('--sqlite-dir', help='directory of the SQLite benchmark files (default: the temp dir)')
+    parser.add_argument('--rebuild', action='store_true', help='provision the benchmark databases again')
+    parser.add_argument('--case', action='append', dest='cases',
+                        help='only cases whose name starts with this (repeatable)')
+    parser.add_argument('--iterations', type=int, default=50, help='timed requests per case')
+    parser.add_argument('--warmup', type=int, default=5, help='untimed requests per case first')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='relative increase reported as a regression')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='write the results as the new baselines instead of comparing')
+    parser.add_argument('--output', help='also write all results to this JSON file')
+    args = parser.parse_args(argv)
+
+    cases = [case for case in CASES
+             if not args.cases or any(case.name.startswith(prefix) for prefix in args.cases)]
+    results, found, failed = {}, [], []
+    for profile in args.profiles:
+        report = run_profile(profile, cases, seed=args.seed, rebuild=args.rebuild,
+                             iterations=args.iterations, warmup=args.warmup,
+                             engine=args.engine, sqlite_dir=args.sqlite_dir)
+        results[profile] = report
+        path = baseline_path(profile, args.engine)
+
+        # a read that errors or 404s times the error path, not the route
+        bad = failed_reads(report)
+        failed.extend((profile, name, statuses) for name, statuses in bad)
+        if args.update_baseline and bad:
+            print(f'not writing {path}: {len(bad)} GET case(s) did not answer 2xx')
+            continue
+        if args.update_baseline:
+            if os.path.exists(path) and args.cases:
+                # keep the baselines of the cases that were not run
+                with open(path) as f:
+                    report = dict(report, cases=dict(json.load(f)['cases'], **report['cases']))
+            with open(path, 'w') as f:
+                json.dump(report, f, indent=2, sort_keys=True)
+                f.write('\n')
+            print(f'wrote {path}')
+            continue
+
+        if not os.path.exists(path):
+            print(f'no baseline for {profile} ({path}); run with --update-baseline first')
+            continue
+        with open(path) as f:
+            baseline = json.load(f)
+        if baseline['seed'] != report['seed'] or baseline['counts'] != report['counts']:
+            print(f'baseline for {profile} was made with another dataset; comparing anyway')
+        for name, metric, old, new in regressions(baseline, report, args.threshold):
+            found.append((profile, name, metric, old, new))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    for profile, name, metric, old, new in found:
+        print(f'REGRESSION  {profile:<10} {name:<40} {metric:<15} {old} -> {new}')
+    for profile, name, statuses in failed:
+        print(f'BAD STATUS  {profile:<10} {name:<40} {statuses}')
+    for route in sorted({route for report in results.values() for route in report['uncovered']}):
+        print(f'NO CASE     {route}')
+    if not args.update_baseline:
+        print(f"{sum(len(r['cases']) for r in results.values())} case(s) run, {len(found)} regression(s) "
+              f'(threshold {args.threshold:.0%})')
+    return 1 if found or failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,53 @@
+###
+# Migration command line
+#
+#   python -m backend.migrations upgrade
+#   python -m backend.migrations status
+#   python -m backend.migrations check [--min-rows N]
+###
+import argparse
+import sys
+
+from backend.db_connection import db
+from backend.migrations import explain_check, runner
+from backend.rest_entry import create_app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m backend.migrations')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('upgrade', help='apply pending migrations')
+    commands.add_parser('status', help='list migrations and when they were applied')
+    check = commands.add_parser('check', help='EXPLAIN route queries and fail on full table scans')
+    check.add_argument('--min-rows', type=int, default=explain_check.DEFAULT_MIN_ROWS,
+                       help='only report scans of tables with at least this many rows')
+    args = parser.parse_args(argv)
+
+    app = create_app()
+    with app.app_context():
+        conn = db.get_db()
+
+        if args.command == 'upgrade':
+            applied = runner.upgrade(conn)
+            print(f"applied {len(applied)} migration(s): {', '.join(applied) or '-'}")
+            return 0
+
+        if args.command == 'status':
+            for migration in runner.status(conn):
+                applied_at = migration['applied_at'] or 'pending'
+                print(f"{migration['version']}  {migration['name']:<40} {applied_at}")
+            return 0
+
+        queries = explain_check.route_queries()
+        problems = explain_check.check_plans(conn, min_rows=args.min_rows, queries=queries)
+        for problem in problems:
+            print(f"FULL SCAN  {problem['route']}: {problem['table']} "
+                  f"(~{problem['rows']} rows, possible keys: {problem['possible_keys']})")
+        for name in explain_check.unchecked(queries):
+            print(f'UNCHECKED  {name}: no sample in explain_check.route_queries()')
+        print(f"{len(queries)} queries checked, {len(problems)} full scan(s)")
+        return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,202 @@
+#------------------------------------------------------------
+# EXPLAIN every registered route query and flag full table scans
+#
+# A scan (EXPLAIN type = ALL) is only reported when the table holds at
+# least `min_rows` rows, so the check is meaningful against a production
+# sized database and silent against the seed data. Queries that list a
+# whole table on purpose name that table in `scan_ok`.
+#
+# The statements are the blueprints' define()d queries themselves,
+# filled in the way their handlers fill them (first page, sample ids),
+# so the check cannot drift from the SQL the routes run. A query a
+# blueprint defines without an entry here is listed by unchecked().
+#
+# The check itself reads MySQL's EXPLAIN and information_schema;
+# `python -m backend.data plans` EXPLAINs the same queries on either
+# engine.
+#------------------------------------------------------------
+import logging
+
+from backend.data import QUERIES
+from backend.pagination import keyset_condition, order_clause
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_ROWS = 1000
+
+# define() name prefixes of the route blueprints
+ROUTE_NAMESPACES = ('student.', 'hr.', 'school_admin.', 'maintenance.')
+
+
+def _first_page(statement, sort, **fragments):
+    """A keyset-paginated list query as its handler runs it for the first page"""
+    keyset, _ = keyset_condition(sort, None)
+    return statement.format(keyset=keyset, order=order_clause(sort), **fragments)
+
+
+def route_queries():
+    """
+    (route, statement, params, scan_ok) for every query the route
+    handlers run
+    """
+    # imported here: the blueprints define() their queries on import
+    from backend.hr import hr_routes as hr
+    from backend.maintenance_staff import maintenance_staff_routes as maintenance
+    from backend.school_admin import school_admin_routes as school_admin
+    from backend.student import student_routes as student
+
+    page = 51
+    return [
+        # ---------------- student ----------------
+        ('GET /student/info/<id>', student.STUDENT_INFO_QUERY, (1,), ()),
+        ('GET /student/<id>/grades', student.GRADES_QUERY, (1,), ('school_admin',)),
+        ('GET /student/<id>/coops', student.COOPS_QUERY, (1,), ()),
+        ('GET /student/<id>/dashboard', student.DASHBOARD_QUERY, (1,), ()),
+        ('GET /student/<id>/resume', student.CURRENT_RESUME_QUERY, (1,), ()),
+        ('GET /student/<id>/resume/versions', student.RESUME_VERSIONS_QUERY, (1,), ()),
+        ('GET /student/<id>/resume/suggestions', student.SUGGESTIONS_QUERY, (1,), ()),
+        ('GET /student/<id>/applications/active', student.ACTIVE_APPLICATIONS_QUERY, (1,), ()),
+        ('GET /student/<id>/applications/history',
+         _first_page(student.HISTORY_QUERY, student.HISTORY_SORT), (1, page), ()),
+        ('GET /student/<id>/applications/positions',
+         _first_page(student.POSITIONS_QUERY, student.POSITIONS_SORT), (page,), ('hr_manager',)),
+        ('POST /student/<id>/applications', student.ADD_APPLICATION_QUERY,
+         (1, 1, '2024-01-01', 'Pending'), ()),
+        ('DELETE /student/<id>/applications/<id> (lock)', student.LOCK_APPLICATION_QUERY, (1, 1), ()),
+        ('DELETE /student/<id>/applications/<id>', student.DELETE_APPLICATION_QUERY, (1, 1), ()),
+
+        # ---------------- hr ----------------
+        ('GET /hr/internships',
+         _first_page(hr.INTERNSHIPS_QUERY, hr.INTERNSHIPS_SORT) + ' LIMIT %s', (page,), ()),
+        ('POST /hr/internships', hr.ADD_INTERNSHIP_QUERY, (1, 'Intern', '', '', 'Active'), ()),
+        ('DELETE /hr/internships/<id> (application check)', hr.POSITION_APPLICATIONS_QUERY, (1,), ()),
+        ('DELETE /hr/internships/<id> (deactivate)', hr.DEACTIVATE_INTERNSHIP_QUERY, (1,), ()),
+        ('DELETE /hr/internships/<id>', hr.DELETE_INTERNSHIP_QUERY, (1,), ()),
+        ('GET /hr/applications?status=',
+         _first_page(hr.APPLICATIONS_QUERY, hr.APPLICATIONS_SORT, status_filter='ca.status = %s AND')
+         + ' LIMIT %s', ('Pending', page), ()),
+        ('GET /hr/applications',
+         _first_page(hr.APPLICATIONS_QUERY, hr.APPLICATIONS_SORT, status_filter='') + ' LIMIT %s',
+         (page,), ()),
+        ('PUT /hr/applications/<id> (lock)', hr.LOCK_APPLICATION_QUERY, (1,), ()),
+        ('PUT /hr/applications/<id>', hr.UPDATE_STATUS_QUERY, ('Accepted', 1), ()),
+        ('PUT /hr/applications/<id> (result)', hr.APPLICATION_QUERY, (1,), ()),
+        ('POST /hr/applications/bulk-status (ids)',
+         hr.LOCK_APPLICATIONS_QUERY.format(placeholders='%s, %s'), (1, 2), ()),
+        ('POST /hr/applications/bulk-status (position)',
+         hr.LOCK_POSITION_APPLICATIONS_QUERY.format(status_filter='AND status = %s'),
+         (1, 'Pending', hr.MAX_BULK_UPDATES + 1), ()),
+        ('POST /hr/applications/bulk-status',
+         hr.BULK_UPDATE_STATUS_QUERY.format(cases='WHEN %s THEN %s WHEN %s THEN %s', placeholders='%s, %s'),
+         (1, 'Accepted', 2, 'Rejected', 1, 2), ()),
+        ('DELETE /hr/applications/<id>', hr.DELETE_APPLICATION_QUERY, (1,), ()),
+        ('GET /hr/resumes', _first_page(hr.RESUMES_QUERY, hr.RESUMES_SORT) + ' LIMIT %s',
+         (hr.SUGGESTION_PREVIEW_CHARS, page), ()),
+        ('GET /hr/resumes/<id>', hr.RESUME_DETAIL_QUERY, (1,), ()),
+        ('DELETE /hr/resumes/<id>/suggestions/<id> (owner)', hr.SUGGESTION_OWNER_QUERY, (1, 1), ()),
+        ('DELETE /hr/resumes/<id>/suggestions/<id>', hr.DELETE_SUGGESTION_QUERY, (1,), ()),
+        ('GET /hr/analytics/positions', hr.ANALYTICS_QUERY, (), ('internship_position',)),
+        ('POST /hr/resumes/<id>/suggestions (owner)', hr.RESUME_OWNER_QUERY, (1,), ()),
+        ('POST /hr/resumes/<id>/suggestions', hr.ADD_SUGGESTION_QUERY, (1, 'text'), ()),
+
+        # ---------------- school_admin ----------------
+        ('GET /school_admin/students',
+         _first_page(school_admin.STUDENTS_QUERY, school_admin.STUDENTS_SORT), (page,), ()),
+        ('GET /school_admin/students (grades)',
+         school_admin.STUDENT_GRADES_QUERY.format(placeholders='%s, %s'), (1, 2), ()),
+        ('GET /school_admin/students (co-ops)',
+         school_admin.STUDENT_COOPS_QUERY.format(placeholders='%s, %s'), (1, 2), ()),
+        ('GET /school_admin/students/<id>/grades', school_admin.GRADES_QUERY, (1,), ()),
+        ('POST /school_admin/students/<id>/grades', school_admin.ADD_GRADE_QUERY,
+         (1, 'Databases', 3.5, 1), ()),
+        ('PUT /school_admin/students/<id>/grades/<id>', school_admin.UPDATE_GRADE_QUERY,
+         ('Databases', 3.5, 1, 1), ()),
+        ('DELETE /school_admin/students/<id>/grades/<id>', school_admin.DELETE_GRADE_QUERY, (1, 1), ()),
+        ('GET /school_admin/students/<id>/coops', school_admin.COOPS_QUERY, (1,), ()),
+        ('POST /school_admin/students/<id>/coops', school_admin.ADD_COOP_QUERY,
+         (1, 'Acme', '2024-01-01', '2024-06-30'), ()),
+        ('PUT /school_admin/students/<id>/coops/<id>', school_admin.UPDATE_COOP_QUERY,
+         ('Acme', '2024-01-01', '2024-06-30', 1, 1), ()),
+        ('DELETE /school_admin/students/<id>/coops/<id>', school_admin.DELETE_COOP_QUERY, (1, 1), ()),
+
+        # ---------------- maintenance_staff ----------------
+        ('GET /maintenance_staff/alerts',
+         _first_page(maintenance.ALERTS_QUERY, maintenance.ALERTS_SORT) + ' LIMIT %s', (page,), ()),
+        ('PUT /maintenance_staff/alerts/<id> (exists)', maintenance.ALERT_EXISTS_QUERY, (1,), ()),
+        ('PUT /maintenance_staff/alerts/<id>', maintenance.UPDATE_ALERT_QUERY,
+         ('cpu', 'high load', 'High', 1), ()),
+        ('GET /maintenance_staff/backups',
+         _first_page(maintenance.BACKUPS_QUERY, maintenance.BACKUPS_SORT) + ' LIMIT %s', (page,), ()),
+        ('PUT /maintenance_staff/backups/<id> (exists)', maintenance.BACKUP_EXISTS_QUERY, (1,), ()),
+        ('PUT /maintenance_staff/backups/<id>', maintenance.UPDATE_BACKUP_QUERY,
+         ('Full', '2024-01-01', 'nightly', 1), ()),
+        ('POST /maintenance_staff/backups (database)', maintenance.DATABASE_EXISTS_QUERY, (1,), ()),
+        ('POST /maintenance_staff/backups', maintenance.ADD_BACKUP_QUERY,
+         (1, 'Full', '2024-01-01', 'nightly'), ()),
+        ('DELETE /maintenance_staff/backups/<id>', maintenance.DELETE_BACKUP_QUERY, (1,), ()),
+        ('GET /maintenance_staff/alterations',
+         _first_page(maintenance.ALTERATIONS_QUERY, maintenance.ALTERATIONS_SORT) + ' LIMIT %s',
+         (page,), ()),
+        ('PUT /maintenance_staff/alterations/<id> (exists)', maintenance.ALTERATION_EXISTS_QUERY, (1,), ()),
+        ('PUT /maintenance_staff/alterations/<id>', maintenance.UPDATE_ALTERATION_QUERY,
+         ('Schema', '2024-01-01', 1), ()),
+        ('POST /maintenance_staff/alterations', maintenance.ADD_ALTERATION_QUERY,
+         (1, 'Schema', '2024-01-01'), ()),
+        ('DELETE /maintenance_staff/alterations/<id>', maintenance.DELETE_ALTERATION_QUERY, (1,), ()),
+        ('GET /maintenance_staff/databases', maintenance.DATABASES_QUERY, (), ('database_info',)),
+        ('GET /maintenance_staff/resume-sync', maintenance.RESUME_SYNC_QUEUE_QUERY, (),
+         ('resume_sync_queue',)),
+        ('GET /maintenance_staff/jobs?status=',
+         maintenance.JOBS_QUERY.format(filters='j.status = %s AND ' + keyset_condition(maintenance.JOBS_SORT, None)[0],
+                                       order=order_clause(maintenance.JOBS_SORT)),
+         ('failed', page), ()),
+    ]
+
+
+def unchecked(queries=None):
+    """Names of route blueprint queries that route_queries() does not EXPLAIN"""
+    checked = {statement.name for _, statement, _, _ in (queries or route_queries())}
+    return sorted(name for name in QUERIES
+                  if name.startswith(ROUTE_NAMESPACES) and name not in checked)
+
+
+def table_sizes(cursor):
+    """Estimated row count per table in the current schema"""
+    cursor.execute('''
+        SELECT TABLE_NAME AS table_name, TABLE_ROWS AS table_rows
+        FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE()
+    ''')
+    return {row['table_name']: row['table_rows'] or 0 for row in cursor.fetchall()}
+
+
+def check_plans(conn, min_rows=DEFAULT_MIN_ROWS, queries=None):
+    """
+    EXPLAIN every query (by default route_queries()) and return a list
+    of problems, one dict per full scan of a table with at least
+    `min_rows` rows. An empty list means every plan passed.
+    """
+    if queries is None:
+        queries = route_queries()
+    cursor = conn.cursor()
+    sizes = table_sizes(cursor)
+    problems = []
+
+    for route, sql, params, scan_ok in queries:
+        cursor.execute('EXPLAIN ' + sql, params or None)
+        for row in cursor.fetchall():
+            table = row.get('table') or ''
+            # derived tables and CTEs (<derived2>) are reported through their source
+            if table.startswith('<') or table in scan_ok:
+                continue
+            if row.get('type') == 'ALL' and sizes.get(table, 0) >= min_rows:
+                problems.append({
+                    'route': route,
+                    'table': table,
+                    'rows': row.get('rows'),
+                    'possible_keys': row.get('possible_keys'),
+                    'extra': row.get('Extra'),
+                })
+                logger.warning(f'full table scan of {table} in {route} (~{row.get("rows")} rows)')
+    conn.rollback()
+    return problems
@@ -0,0 +1,139 @@
+#------------------------------------------------------------
+# Versioned schema migrations
+#
+# Every file in versions/ named <version>_<name>.sql is applied once,
+# in version order, and recorded in the schema_migrations table.
+#------------------------------------------------------------
+import hashlib
+import logging
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+VERSIONS_DIR = os.path.join(os.path.dirname(__file__), 'versions')
+LOCK_NAME = 'schema_migrations'
+LOCK_TIMEOUT = 60
+
+_FILENAME = re.compile(r'^(\d+)_([\w\-]+)\.sql$')
+
+
+class MigrationError(Exception):
+    """Raised when a migration file is invalid or fails to apply"""
+
+
+def available_migrations(directory=VERSIONS_DIR):
+    """List of (version, name, path) sorted by version"""
+    migrations = []
+    for filename in os.listdir(directory):
+        match = _FILENAME.match(filename)
+        if match:
+            migrations.append((match.group(1), match.group(2), os.path.join(directory, filename)))
+    migrations.sort(key=lambda m: int(m[0]))
+    versions = [m[0] for m in migrations]
+    if len(set(versions)) != len(versions):
+        raise MigrationError(f'duplicate migration versions in {directory}')
+    return migrations
+
+
+def split_statements(sql):
+    """Split a migration script on `;` line endings, dropping comments"""
+    statements, current = [], []
+    for line in sql.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith('--'):
+            continue
+        current.append(line)
+        if stripped.endswith(';'):
+            statements.append('\n'.join(current).rstrip().rstrip(';'))
+            current = []
+    if current:
+        statements.append('\n'.join(current))
+    return statements
+
+
+def _checksum(sql):
+    return hashlib.sha256(sql.encode('utf-8')).hexdigest()
+
+
+def ensure_table(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version VARCHAR(32) PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            checksum CHAR(64) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+def applied_migrations(cursor):
+    cursor.execute('SELECT version, name, checksum, applied_at FROM schema_migrations ORDER BY version')
+    return {row['version']: row for row in cursor.fetchall()}
+
+
+def status(conn, directory=VERSIONS_DIR):
+    """Every known migration with its applied timestamp (or None)"""
+    cursor = conn.cursor()
+    ensure_table(cursor)
+    applied = applied_migrations(cursor)
+    conn.commit()
+    result = []
+    for version, name, path in available_migrations(directory):
+        row = applied.get(version)
+        result.append({
+            'version': version,
+            'name': name,
+            'applied_at': row['applied_at'] if row else None,
+        })
+    return result
+
+
+def upgrade(conn, directory=VERSIONS_DIR):
+    """
+    Apply all pending migrations. A MySQL named lock keeps several
+    workers starting at once from applying the same migration twice.
+    Returns the list of versions that were applied.
+    """
+    cursor = conn.cursor()
+    cursor.execute('SELECT GET_LOCK(%s, %s) AS locked', (LOCK_NAME, LOCK_TIMEOUT))
+    if not cursor.fetchone()['locked']:
+        raise MigrationError('could not acquire the schema migration lock')
+
+    applied_now = []
+    try:
+        ensure_table(cursor)
+        applied = applied_migrations(cursor)
+        conn.commit()
+
+        for version, name, path in available_migrations(directory):
+            with open(path, encoding='utf-8') as f:
+                sql = f.read()
+            checksum = _checksum(sql)
+
+            if version in applied:
+                if applied[version]['checksum'] != checksum:
+                    logger.warning(f'migration {version}_{name} changed after it was applied')
+                continue
+
+            logger.info(f'applying migration {version}_{name}')
+            # DDL auto-commits in MySQL, so a failed migration has to be
+            # fixed forward; the version is only recorded once every
+            # statement succeeded.
+            for statement in split_statements(sql):
+                try:
+                    cursor.execute(statement)
+                except Exception as e:
+                    conn.rollback()
+                    raise MigrationError(f'migration {version}_{name} failed: {str(e)}') from e
+            cursor.execute('''
+                INSERT INTO schema_migrations (version, name, checksum)
+                VALUES (%s, %s, %s)
+            ''', (version, name, checksum))
+            conn.commit()
+            applied_now.append(version)
+    finally:
+        cursor.execute('SELECT RELEASE_LOCK(%s)', (LOCK_NAME,))
+        cursor.fetchall()
+
+    return applied_now
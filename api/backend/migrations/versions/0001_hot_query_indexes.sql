@@ -0,0 +1,58 @@
+-- Composite indexes for the predicates and ORDER BY clauses used by the
+-- student, hr, school_admin and maintenance_staff route modules.
+
+-- student: active / history / metrics  (user_id = ? AND status ... ORDER BY sent_on)
+CREATE INDEX idx_application_user_status_sent
+    ON application (user_id, status, sent_on);
+
+-- hr: application counts and analytics per position, soft-delete check
+CREATE INDEX idx_application_position_status
+    ON application (position_id, status);
+
+-- hr: latest application per (student, position), optionally by status
+CREATE INDEX idx_application_status_user_position_sent
+    ON application (status, user_id, position_id, sent_on);
+
+-- student: available positions  (status = 'Active' ORDER BY posted_date)
+CREATE INDEX idx_internship_position_status_posted
+    ON internship_position (status, posted_date);
+
+-- student: current resume / info  (user_id = ? ORDER BY time_uploaded DESC)
+CREATE INDEX idx_resume_user_uploaded
+    ON resume (user_id, time_uploaded);
+
+-- hr: resume list  (ORDER BY time_uploaded DESC)
+CREATE INDEX idx_resume_uploaded
+    ON resume (time_uploaded);
+
+-- hr: latest suggestion per resume, student: suggestions for a resume
+CREATE INDEX idx_suggestion_resume_created
+    ON suggestion (resume_id, time_created);
+
+-- student + school_admin: grades for a student  (ORDER BY recorded_date)
+CREATE INDEX idx_grade_record_student_recorded
+    ON grade_record (student_id, recorded_date);
+
+-- student + school_admin: co-op history  (ORDER BY start_date / end_date)
+CREATE INDEX idx_co_op_record_student_start
+    ON co_op_record (student_id, start_date);
+
+CREATE INDEX idx_co_op_record_student_end
+    ON co_op_record (student_id, end_date);
+
+-- school_admin: roster  (role = 'Student')
+CREATE INDEX idx_user_role
+    ON user (role);
+
+-- maintenance_staff: history lists
+CREATE INDEX idx_backup_history_date
+    ON backup_history (backup_date);
+
+CREATE INDEX idx_data_alteration_history_date
+    ON data_alteration_history (alteration_date);
+
+CREATE INDEX idx_alert_history_severity
+    ON alert_history (severity);
+
+CREATE INDEX idx_database_info_last_update
+    ON database_info (last_update);
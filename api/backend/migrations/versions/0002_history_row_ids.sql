@@ -0,0 +1,17 @@
+-- The history tables have no primary key, so there is no stable
+-- tie-breaker for keyset pagination. Give each row a surrogate id.
+-- (InnoDB secondary indexes carry the primary key, so the sort indexes
+-- from 0001 now cover (sort column, id) without being rebuilt.)
+
+ALTER TABLE alert_history
+    ADD COLUMN alert_id INT AUTO_INCREMENT PRIMARY KEY FIRST;
+
+ALTER TABLE backup_history
+    ADD COLUMN backup_id INT AUTO_INCREMENT PRIMARY KEY FIRST;
+
+ALTER TABLE data_alteration_history
+    ADD COLUMN alteration_id INT AUTO_INCREMENT PRIMARY KEY FIRST;
+
+-- hr: position list  (ORDER BY posted_date DESC, position_id DESC)
+CREATE INDEX idx_internship_position_posted
+    ON internship_position (posted_date);
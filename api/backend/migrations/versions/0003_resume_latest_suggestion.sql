@@ -0,0 +1,25 @@
+-- Snapshot of the newest suggestion per resume, kept current by the hr
+-- suggestion routes, so the resume list no longer runs a correlated
+-- subquery per row.
+
+CREATE TABLE resume_latest_suggestion (
+    resume_id INT PRIMARY KEY,
+    suggestion_id INT NOT NULL,
+    suggestion_text TEXT,
+    time_created TIMESTAMP NULL,
+    FOREIGN KEY (resume_id) REFERENCES resume(resume_id)
+        ON DELETE CASCADE ON UPDATE CASCADE,
+    FOREIGN KEY (suggestion_id) REFERENCES suggestion(suggestion_id)
+        ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+INSERT INTO resume_latest_suggestion (resume_id, suggestion_id, suggestion_text, time_created)
+SELECT ranked.resume_id, ranked.suggestion_id, ranked.suggestion_text, ranked.time_created
+FROM (
+    SELECT s.resume_id, s.suggestion_id, s.suggestion_text, s.time_created,
+           ROW_NUMBER() OVER (PARTITION BY s.resume_id
+                              ORDER BY s.time_created DESC, s.suggestion_id DESC) AS rn
+    FROM suggestion s
+    WHERE s.resume_id IS NOT NULL
+) ranked
+WHERE ranked.rn = 1;
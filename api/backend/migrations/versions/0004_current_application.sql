@@ -0,0 +1,34 @@
+-- Latest application per (student, position), maintained by the
+-- application write routes, so HR review no longer ranks the whole
+-- application table with ROW_NUMBER() on every request.
+
+CREATE INDEX idx_application_user_position_sent
+    ON application (user_id, position_id, sent_on);
+
+CREATE TABLE current_application (
+    user_id INT NOT NULL,
+    position_id INT NOT NULL,
+    application_id INT NOT NULL,
+    status ENUM('Pending', 'Accepted', 'Rejected') NOT NULL,
+    sent_on DATE DEFAULT NULL,
+    PRIMARY KEY (user_id, position_id),
+    UNIQUE KEY uq_current_application_id (application_id),
+    KEY idx_current_application_status (status, application_id),
+    FOREIGN KEY (application_id) REFERENCES application(application_id)
+        ON DELETE CASCADE ON UPDATE CASCADE,
+    FOREIGN KEY (user_id) REFERENCES student(user_id)
+        ON DELETE CASCADE ON UPDATE CASCADE,
+    FOREIGN KEY (position_id) REFERENCES internship_position(position_id)
+        ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+INSERT INTO current_application (user_id, position_id, application_id, status, sent_on)
+SELECT ranked.user_id, ranked.position_id, ranked.application_id, ranked.status, ranked.sent_on
+FROM (
+    SELECT a.user_id, a.position_id, a.application_id, a.status, a.sent_on,
+           ROW_NUMBER() OVER (PARTITION BY a.user_id, a.position_id
+                              ORDER BY a.sent_on DESC, a.application_id DESC) AS rn
+    FROM application a
+    WHERE a.user_id IS NOT NULL AND a.position_id IS NOT NULL
+) ranked
+WHERE ranked.rn = 1;
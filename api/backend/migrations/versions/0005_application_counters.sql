@@ -0,0 +1,45 @@
+-- Application counters kept on the rows they describe, maintained by
+-- the application write routes (backend/projections) and rebuilt by
+-- `python -m backend.projections reconcile`.
+
+ALTER TABLE internship_position
+    ADD COLUMN application_count INT NOT NULL DEFAULT 0,
+    ADD COLUMN pending_count INT NOT NULL DEFAULT 0,
+    ADD COLUMN accepted_count INT NOT NULL DEFAULT 0,
+    ADD COLUMN rejected_count INT NOT NULL DEFAULT 0;
+
+ALTER TABLE student
+    ADD COLUMN pending_applications INT NOT NULL DEFAULT 0,
+    ADD COLUMN resume_versions INT NOT NULL DEFAULT 0;
+
+UPDATE internship_position ip
+JOIN (
+    SELECT position_id,
+           COUNT(*) AS total,
+           SUM(status = 'Pending') AS pending,
+           SUM(status = 'Accepted') AS accepted,
+           SUM(status = 'Rejected') AS rejected
+    FROM application
+    GROUP BY position_id
+) c ON c.position_id = ip.position_id
+SET ip.application_count = c.total,
+    ip.pending_count = c.pending,
+    ip.accepted_count = c.accepted,
+    ip.rejected_count = c.rejected;
+
+UPDATE student s
+JOIN (
+    SELECT user_id, COUNT(*) AS pending
+    FROM application
+    WHERE status = 'Pending'
+    GROUP BY user_id
+) p ON p.user_id = s.user_id
+SET s.pending_applications = p.pending;
+
+UPDATE student s
+JOIN (
+    SELECT user_id, COUNT(*) AS versions
+    FROM resume
+    GROUP BY user_id
+) r ON r.user_id = s.user_id
+SET s.resume_versions = r.versions;
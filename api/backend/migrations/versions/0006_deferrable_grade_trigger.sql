@@ -0,0 +1,21 @@
+-- Let bulk grade imports skip the per-row resume sync.
+--
+-- The insert trigger rewrote every resume of the student for each
+-- 'Computer Science Major GPA' row. A session that sets
+-- @defer_resume_sync = 1 now skips it and calls
+-- projections.refresh_resume_education() once per student afterwards.
+-- The body is a single statement so this file needs no DELIMITER.
+
+DROP TRIGGER IF EXISTS update_resume_after_grade_change;
+
+CREATE TRIGGER update_resume_after_grade_change
+AFTER INSERT ON grade_record
+FOR EACH ROW
+UPDATE resume r
+SET education = CONCAT(
+    'Bachelor of Science in Computer Science, GPA: ',
+    FORMAT(NEW.grade, 2)
+)
+WHERE r.user_id = NEW.student_id
+  AND NEW.course_name = 'Computer Science Major GPA'
+  AND @defer_resume_sync IS NULL;
@@ -0,0 +1,86 @@
+-- Append-only resume versions.
+--
+-- Every resume edit inserts a new resume row and re-points
+-- current_resume at it, so earlier versions are kept as they were.
+-- The student-written sections (skills, projects) move to
+-- resume_section, stored once per SHA-256 of their content; versions
+-- that keep a section unchanged share its row. education and co_op stay
+-- on the version row and the grade triggers now only touch the current
+-- version.
+
+CREATE TABLE resume_section (
+    section_hash CHAR(64) PRIMARY KEY,
+    content TEXT NOT NULL
+);
+
+INSERT INTO resume_section (section_hash, content)
+SELECT SHA2(skills, 256), skills FROM resume WHERE skills IS NOT NULL
+UNION
+SELECT SHA2(projects, 256), projects FROM resume WHERE projects IS NOT NULL;
+
+ALTER TABLE resume
+    ADD COLUMN skills_hash CHAR(64) NULL,
+    ADD COLUMN projects_hash CHAR(64) NULL;
+
+UPDATE resume
+SET skills_hash = SHA2(skills, 256),
+    projects_hash = SHA2(projects, 256);
+
+ALTER TABLE resume
+    DROP COLUMN skills,
+    DROP COLUMN projects,
+    ADD CONSTRAINT fk_resume_skills FOREIGN KEY (skills_hash)
+        REFERENCES resume_section(section_hash),
+    ADD CONSTRAINT fk_resume_projects FOREIGN KEY (projects_hash)
+        REFERENCES resume_section(section_hash);
+
+CREATE TABLE current_resume (
+    user_id INT PRIMARY KEY,
+    resume_id INT NOT NULL,
+    time_uploaded TIMESTAMP NULL,
+    UNIQUE KEY uq_current_resume_id (resume_id),
+    KEY idx_current_resume_uploaded (time_uploaded, resume_id),
+    FOREIGN KEY (user_id) REFERENCES student(user_id)
+        ON DELETE CASCADE ON UPDATE CASCADE,
+    FOREIGN KEY (resume_id) REFERENCES resume(resume_id)
+        ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+INSERT INTO current_resume (user_id, resume_id, time_uploaded)
+SELECT ranked.user_id, ranked.resume_id, ranked.time_uploaded
+FROM (
+    SELECT r.user_id, r.resume_id, r.time_uploaded,
+           ROW_NUMBER() OVER (PARTITION BY r.user_id
+                              ORDER BY r.time_uploaded DESC, r.resume_id DESC) AS rn
+    FROM resume r
+) ranked
+WHERE ranked.rn = 1;
+
+DROP TRIGGER IF EXISTS update_resume_after_grade_change;
+
+CREATE TRIGGER update_resume_after_grade_change
+AFTER INSERT ON grade_record
+FOR EACH ROW
+UPDATE resume r
+JOIN current_resume cr ON cr.resume_id = r.resume_id
+SET r.education = CONCAT(
+    'Bachelor of Science in Computer Science, GPA: ',
+    FORMAT(NEW.grade, 2)
+)
+WHERE cr.user_id = NEW.student_id
+  AND NEW.course_name = 'Computer Science Major GPA'
+  AND @defer_resume_sync IS NULL;
+
+DROP TRIGGER IF EXISTS update_resume_grade_on_update;
+
+CREATE TRIGGER update_resume_grade_on_update
+AFTER UPDATE ON grade_record
+FOR EACH ROW
+UPDATE resume r
+JOIN current_resume cr ON cr.resume_id = r.resume_id
+SET r.education = CONCAT(
+    'Bachelor of Science in Computer Science, GPA: ',
+    FORMAT(NEW.grade, 2)
+)
+WHERE cr.user_id = NEW.student_id
+  AND NEW.course_name = 'Computer Science Major GPA';
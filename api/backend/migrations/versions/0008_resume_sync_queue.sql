@@ -0,0 +1,34 @@
+-- Resume sections derived from school records (co_op, education) are
+-- rebuilt by the API's resume sync worker instead of by triggers.
+--
+-- The co-op triggers re-ran GROUP_CONCAT and rewrote the student's
+-- resumes inside every admin write. Admin writes now only upsert the
+-- student into resume_sync_queue; the worker takes queued students in
+-- batches, rebuilds co_op and education of their current resume once
+-- per student however many changes were queued, and deletes the rows.
+--
+-- This supersedes the @defer_resume_sync grade trigger of 0006/0007:
+-- it is dropped below, grade writes (bulk imports included) only queue
+-- the student, and projections.refresh_resume_education() is gone.
+
+CREATE TABLE resume_sync_queue (
+    user_id INT PRIMARY KEY,
+    queued_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    KEY idx_resume_sync_queued (queued_at),
+    FOREIGN KEY (user_id) REFERENCES student(user_id)
+        ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+DROP TRIGGER IF EXISTS update_resume_after_coop_change;
+
+DROP TRIGGER IF EXISTS update_resume_after_coop_update;
+
+DROP TRIGGER IF EXISTS update_resume_after_coop_delete;
+
+DROP TRIGGER IF EXISTS update_resume_after_grade_change;
+
+DROP TRIGGER IF EXISTS update_resume_grade_on_update;
+
+-- rebuild every current resume once with the new rules
+INSERT INTO resume_sync_queue (user_id)
+SELECT user_id FROM current_resume;
@@ -0,0 +1,23 @@
+-- Durable queue for background jobs (backend/jobs), run by the worker
+-- process in worker_app.py. A job is claimed with FOR UPDATE SKIP
+-- LOCKED, so any number of worker processes can share the table.
+
+CREATE TABLE job (
+    job_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    job_type VARCHAR(64) NOT NULL,
+    payload JSON NULL,
+    priority INT NOT NULL DEFAULT 0,
+    status ENUM('queued', 'running', 'succeeded', 'failed') NOT NULL DEFAULT 'queued',
+    attempts INT NOT NULL DEFAULT 0,
+    max_attempts INT NOT NULL DEFAULT 5,
+    run_after TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    locked_by VARCHAR(128) NULL,
+    locked_until TIMESTAMP(6) NULL,
+    last_error TEXT NULL,
+    result JSON NULL,
+    created_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    started_at TIMESTAMP(6) NULL,
+    finished_at TIMESTAMP(6) NULL,
+    KEY idx_job_claim (status, job_type, priority, run_after),
+    KEY idx_job_lease (status, locked_until)
+);
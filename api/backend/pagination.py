@@ -0,0 +1,153 @@
+#------------------------------------------------------------
+# Keyset (cursor) pagination shared by the list endpoints
+#
+# A page is requested with ?limit=N&cursor=<token>. The cursor is an
+# opaque token holding the sort-key values of the last row of the
+# previous page, so the next page is an index range scan starting right
+# after that row instead of an OFFSET that re-reads everything before it.
+# Sort keys on nullable columns are marked NULLABLE so rows with a NULL
+# key are paged through too (NULL sorts first ascending, last descending).
+#------------------------------------------------------------
+import base64
+import datetime
+import decimal
+import json
+
+from flask import request
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+# third element of a sort key whose column may hold NULL
+NULLABLE = 'nullable'
+
+
+class CursorError(ValueError):
+    """Raised for a malformed cursor or limit"""
+
+
+def _plain(value):
+    if isinstance(value, datetime.datetime):
+        return value.isoformat(sep=' ')
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    return value
+
+
+def encode_cursor(values):
+    raw = json.dumps([_plain(v) for v in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token, size):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except Exception:
+        raise CursorError('Invalid cursor')
+    if not isinstance(values, list) or len(values) != size:
+        raise CursorError('Invalid cursor')
+    return values
+
+
+def page_args(sort_keys, default_limit=DEFAULT_LIMIT, args=None):
+    """
+    Read `limit` and `cursor` from the query string (`args`, by default
+    the current Flask request's).
+    Returns (limit, cursor_values) where cursor_values is None on the
+    first page.
+    """
+    if args is None:
+        args = request.args
+    try:
+        limit = int(args.get('limit', default_limit))
+    except ValueError:
+        raise CursorError('limit must be an integer')
+    if limit < 1:
+        raise CursorError('limit must be positive')
+    limit = min(limit, MAX_LIMIT)
+
+    token = args.get('cursor')
+    values = decode_cursor(token, len(sort_keys)) if token else None
+    return limit, values
+
+
+def _sort_key(key):
+    """(column, direction, nullable) of a sort key given as a 2- or 3-tuple"""
+    column, direction, *flags = key
+    return column, direction, NULLABLE in flags
+
+
+def _equal(column, nullable, value, params):
+    if nullable and value is None:
+        return f'{column} IS NULL'
+    params.append(value)
+    return f'{column} = %s'
+
+
+def _after(column, direction, nullable, value, params):
+    """Condition for rows after `value` on one key, None when there are none"""
+    # NULL sorts before every value on MySQL and SQLite: first in ASC,
+    # last in DESC order
+    if nullable and value is None:
+        return None if direction == 'DESC' else f'{column} IS NOT NULL'
+    params.append(value)
+    if direction == 'DESC':
+        return f'({column} < %s OR {column} IS NULL)' if nullable else f'{column} < %s'
+    return f'{column} > %s'
+
+
+def keyset_condition(sort_keys, values):
+    """
+    SQL condition selecting rows strictly after `values` in the order
+    given by sort_keys, a list of (column, 'ASC' | 'DESC') or
+    (column, 'ASC' | 'DESC', NULLABLE) for a column that may hold NULL.
+    Returns (sql, params); an always-true condition on the first page.
+    """
+    if values is None:
+        return '1 = 1', []
+
+    keys = [_sort_key(key) for key in sort_keys]
+    clauses, params = [], []
+    for i, (column, direction, nullable) in enumerate(keys):
+        clause_params = []
+        parts = [_equal(prev_column, prev_nullable, prev_value, clause_params)
+                 for (prev_column, _, prev_nullable), prev_value in zip(keys[:i], values[:i])]
+        after = _after(column, direction, nullable, values[i], clause_params)
+        if after is None:
+            continue
+        parts.append(after)
+        clauses.append('(' + ' AND '.join(parts) + ')')
+        params.extend(clause_params)
+    if not clauses:
+        return '1 = 0', []
+    return '(' + ' OR '.join(clauses) + ')', params
+
+
+def order_clause(sort_keys):
+    return ', '.join(f'{column} {direction}' for column, direction, _ in map(_sort_key, sort_keys))
+
+
+def page_response(rows, limit, cursor_fields, hidden=()):
+    """
+    Build {'items': [...], 'next_cursor': token | None} from up to
+    limit + 1 fetched rows (the extra row only signals another page).
+    `cursor_fields` are the row keys holding the sort-key values and
+    `hidden` lists keys that were selected only for the cursor.
+    """
+    rows = list(rows)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more and rows:
+        next_cursor = encode_cursor([rows[-1][field] for field in cursor_fields])
+
+    if hidden:
+        for row in rows:
+            for field in hidden:
+                row.pop(field, None)
+
+    return {'items': rows, 'next_cursor': next_cursor}
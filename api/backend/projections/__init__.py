@@ -0,0 +1,406 @@
+#------------------------------------------------------------
+# Denormalized read tables and counters kept current by the write routes
+#
+# Each helper runs on the caller's cursor so the projection changes in
+# the same transaction as the write that caused it. rebuild_counters()
+# recomputes the counters from scratch (python -m backend.projections).
+#------------------------------------------------------------
+import logging
+
+from backend.data import define
+
+logger = logging.getLogger(__name__)
+
+# internship_position counter per application status
+STATUS_COUNTERS = {
+    'Pending': 'pending_count',
+    'Accepted': 'accepted_count',
+    'Rejected': 'rejected_count',
+}
+
+# grade_record course whose grade is copied into resume.education
+GPA_COURSE = 'Computer Science Major GPA'
+
+# current_application is upserted, not deleted and re-inserted: two
+# concurrent writes for the same pair could deadlock between the DELETE
+# and the INSERT or both insert it. A deleted application has already
+# taken its row along (ON DELETE CASCADE), so the upsert only has to
+# re-point the pair at the newest application left.
+_UPSERT_CURRENT_APPLICATION = {
+    'mysql': '''
+    ON DUPLICATE KEY UPDATE application_id = {source}.application_id,
+                            status = {source}.status, sent_on = {source}.sent_on
+''',
+    'sqlite': '''
+    ON CONFLICT (user_id, position_id) DO UPDATE
+    SET application_id = excluded.application_id, status = excluded.status, sent_on = excluded.sent_on
+''',
+}
+
+UPSERT_CURRENT_APPLICATION_QUERY = define('projections.upsert_current_application', '''
+    INSERT INTO current_application (user_id, position_id, application_id, status, sent_on)
+    SELECT latest.user_id, latest.position_id, latest.application_id, latest.status, latest.sent_on
+    FROM (
+        SELECT user_id, position_id, application_id, status, sent_on
+        FROM application
+        WHERE user_id = %s AND position_id = %s
+        ORDER BY sent_on DESC, application_id DESC
+        LIMIT 1
+    ) latest
+''' + _UPSERT_CURRENT_APPLICATION['mysql'].format(source='latest'), sqlite='''
+    INSERT INTO current_application (user_id, position_id, application_id, status, sent_on)
+    SELECT user_id, position_id, application_id, status, sent_on
+    FROM application
+    WHERE user_id = %s AND position_id = %s
+    ORDER BY sent_on DESC, application_id DESC
+    LIMIT 1
+''' + _UPSERT_CURRENT_APPLICATION['sqlite'])
+
+# {placeholders}: one (%s, %s) per pair; SQLite wants row values in VALUES
+_RANKED_APPLICATIONS = '''
+    INSERT INTO current_application (user_id, position_id, application_id, status, sent_on)
+    SELECT ranked.user_id, ranked.position_id, ranked.application_id, ranked.status, ranked.sent_on
+    FROM (
+        SELECT a.user_id, a.position_id, a.application_id, a.status, a.sent_on,
+               ROW_NUMBER() OVER (PARTITION BY a.user_id, a.position_id
+                                  ORDER BY a.sent_on DESC, a.application_id DESC) AS rn
+        FROM application a
+        WHERE (a.user_id, a.position_id) IN ({pairs})
+    ) ranked
+    WHERE ranked.rn = 1
+'''
+UPSERT_CURRENT_APPLICATIONS_QUERY = define(
+    'projections.upsert_current_applications',
+    _RANKED_APPLICATIONS.replace('{pairs}', '{placeholders}')
+    + _UPSERT_CURRENT_APPLICATION['mysql'].format(source='ranked'),
+    sqlite=_RANKED_APPLICATIONS.replace('{pairs}', 'VALUES {placeholders}')
+    + _UPSERT_CURRENT_APPLICATION['sqlite'])
+
+DELETE_LATEST_SUGGESTION_QUERY = define('projections.delete_latest_suggestion', '''
+    DELETE FROM resume_latest_suggestion
+    WHERE resume_id = %s
+''')
+
+INSERT_LATEST_SUGGESTION_QUERY = define('projections.insert_latest_suggestion', '''
+    INSERT INTO resume_latest_suggestion (resume_id, suggestion_id, suggestion_text, time_created)
+    SELECT resume_id, suggestion_id, suggestion_text, time_created
+    FROM suggestion
+    WHERE resume_id = %s
+    ORDER BY time_created DESC, suggestion_id DESC
+    LIMIT 1
+''')
+
+ENQUEUE_RESUME_SYNC_QUERY = define('projections.enqueue_resume_sync', '''
+    INSERT INTO resume_sync_queue (user_id)
+    SELECT s.user_id FROM student s WHERE s.user_id IN ({placeholders})
+    ON DUPLICATE KEY UPDATE user_id = resume_sync_queue.user_id
+''', sqlite='''
+    INSERT INTO resume_sync_queue (user_id)
+    SELECT s.user_id FROM student s WHERE s.user_id IN ({placeholders})
+    ON CONFLICT DO NOTHING
+''')
+
+ENQUEUE_ALL_RESUME_SYNC_QUERY = define('projections.enqueue_all_resume_sync', '''
+    INSERT INTO resume_sync_queue (user_id)
+    SELECT cr.user_id FROM current_resume cr
+    ON DUPLICATE KEY UPDATE user_id = resume_sync_queue.user_id
+''', sqlite='''
+    INSERT INTO resume_sync_queue (user_id)
+    SELECT cr.user_id FROM current_resume cr WHERE true
+    ON CONFLICT DO NOTHING
+''')
+
+# SQLite has no DATE_FORMAT: 'Jan 2024' from the month's slice of a string
+_SQLITE_MONTH = ("substr('JanFebMarAprMayJunJulAugSepOctNovDec', 3 * strftime('%%m', {date}) - 2, 3)"
+                 " || ' ' || strftime('%%Y', {date})")
+
+REBUILD_RESUME_SECTIONS_QUERY = define('projections.rebuild_resume_sections', '''
+    UPDATE resume r
+    JOIN current_resume cr ON cr.resume_id = r.resume_id
+    LEFT JOIN (
+        SELECT c.student_id,
+               GROUP_CONCAT(
+                   CONCAT(c.company_name, ' (',
+                          DATE_FORMAT(c.start_date, '%%b %%Y'), ' - ',
+                          DATE_FORMAT(c.end_date, '%%b %%Y'), ')')
+                   ORDER BY c.start_date DESC
+                   SEPARATOR '; '
+               ) AS co_op
+        FROM co_op_record c
+        WHERE c.student_id IN ({placeholders})
+        GROUP BY c.student_id
+    ) coops ON coops.student_id = cr.user_id
+    LEFT JOIN (
+        SELECT g.student_id, g.grade,
+               ROW_NUMBER() OVER (PARTITION BY g.student_id ORDER BY g.grade_id DESC) AS rn
+        FROM grade_record g
+        WHERE g.student_id IN ({placeholders}) AND g.course_name = %s
+    ) gpa ON gpa.student_id = cr.user_id AND gpa.rn = 1
+    SET r.co_op = COALESCE(coops.co_op, 'No internship experience'),
+        r.education = COALESCE(
+            CONCAT('Bachelor of Science in Computer Science, GPA: ', FORMAT(gpa.grade, 2)),
+            r.education)
+    WHERE cr.user_id IN ({placeholders})
+''', sqlite=f'''
+    UPDATE resume
+    SET co_op = COALESCE(coops.co_op, 'No internship experience'),
+        education = COALESCE(
+            CASE WHEN gpa.grade IS NOT NULL
+                 THEN 'Bachelor of Science in Computer Science, GPA: ' || printf('%%.2f', gpa.grade)
+            END,
+            resume.education)
+    FROM current_resume cr
+    LEFT JOIN (
+        -- group_concat() keeps the order of the rows it reads
+        SELECT o.student_id, group_concat(o.entry, '; ') AS co_op
+        FROM (
+            SELECT c.student_id,
+                   c.company_name || ' (' || {_SQLITE_MONTH.format(date='c.start_date')}
+                   || ' - ' || {_SQLITE_MONTH.format(date='c.end_date')} || ')' AS entry
+            FROM co_op_record c
+            WHERE c.student_id IN ({{placeholders}})
+            ORDER BY c.student_id, c.start_date DESC
+        ) o
+        GROUP BY o.student_id
+    ) coops ON coops.student_id = cr.user_id
+    LEFT JOIN (
+        SELECT g.student_id, g.grade,
+               ROW_NUMBER() OVER (PARTITION BY g.student_id ORDER BY g.grade_id DESC) AS rn
+        FROM grade_record g
+        WHERE g.student_id IN ({{placeholders}}) AND g.course_name = %s
+    ) gpa ON gpa.student_id = cr.user_id AND gpa.rn = 1
+    WHERE cr.resume_id = resume.resume_id AND cr.user_id IN ({{placeholders}})
+''')
+
+# {changes}: one `column = column + %s` per counter that moves
+ADJUST_POSITION_COUNTERS_QUERY = define('projections.adjust_position_counters', '''
+    UPDATE internship_position
+    SET {changes}
+    WHERE position_id = %s
+''')
+
+ADJUST_PENDING_QUERY = define('projections.adjust_pending', '''
+    UPDATE student
+    SET pending_applications = pending_applications + %s
+    WHERE user_id = %s
+''')
+
+ADJUST_POSITION_COUNTERS_BULK_QUERY = define('projections.adjust_position_counters_bulk', '''
+    UPDATE internship_position
+    SET {changes}
+    WHERE position_id IN ({placeholders})
+''')
+
+ADJUST_PENDING_BULK_QUERY = define('projections.adjust_pending_bulk', '''
+    UPDATE student
+    SET pending_applications = pending_applications + CASE user_id {cases} END
+    WHERE user_id IN ({placeholders})
+''')
+
+# SQLite has no UPDATE ... JOIN: both rebuilds update from a derived
+# table and, like MySQL's affected rows, count only the drifted rows
+REBUILD_POSITION_COUNTERS_QUERY = define('projections.rebuild_position_counters', '''
+    UPDATE internship_position ip
+    LEFT JOIN (
+        SELECT position_id,
+               COUNT(*) AS total,
+               SUM(status = 'Pending') AS pending,
+               SUM(status = 'Accepted') AS accepted,
+               SUM(status = 'Rejected') AS rejected
+        FROM application
+        GROUP BY position_id
+    ) c ON c.position_id = ip.position_id
+    SET ip.application_count = COALESCE(c.total, 0),
+        ip.pending_count = COALESCE(c.pending, 0),
+        ip.accepted_count = COALESCE(c.accepted, 0),
+        ip.rejected_count = COALESCE(c.rejected, 0)
+''', sqlite='''
+    UPDATE internship_position
+    SET application_count = c.total,
+        pending_count = c.pending,
+        accepted_count = c.accepted,
+        rejected_count = c.rejected
+    FROM (
+        SELECT ip.position_id,
+               COUNT(a.application_id) AS total,
+               COALESCE(SUM(a.status = 'Pending'), 0) AS pending,
+               COALESCE(SUM(a.status = 'Accepted'), 0) AS accepted,
+               COALESCE(SUM(a.status = 'Rejected'), 0) AS rejected
+        FROM internship_position ip
+        LEFT JOIN application a ON a.position_id = ip.position_id
+        GROUP BY ip.position_id
+    ) c
+    WHERE c.position_id = internship_position.position_id
+      AND (internship_position.application_count, internship_position.pending_count,
+           internship_position.accepted_count, internship_position.rejected_count)
+          != (c.total, c.pending, c.accepted, c.rejected)
+''')
+
+REBUILD_STUDENT_COUNTERS_QUERY = define('projections.rebuild_student_counters', '''
+    UPDATE student s
+    LEFT JOIN (
+        SELECT user_id, COUNT(*) AS pending
+        FROM application
+        WHERE status = 'Pending'
+        GROUP BY user_id
+    ) p ON p.user_id = s.user_id
+    LEFT JOIN (
+        SELECT user_id, COUNT(*) AS versions
+        FROM resume
+        GROUP BY user_id
+    ) r ON r.user_id = s.user_id
+    SET s.pending_applications = COALESCE(p.pending, 0),
+        s.resume_versions = COALESCE(r.versions, 0)
+''', sqlite='''
+    UPDATE student
+    SET pending_applications = c.pending,
+        resume_versions = c.versions
+    FROM (
+        SELECT s.user_id,
+               (SELECT COUNT(*) FROM application a
+                WHERE a.user_id = s.user_id AND a.status = 'Pending') AS pending,
+               (SELECT COUNT(*) FROM resume r WHERE r.user_id = s.user_id) AS versions
+        FROM student s
+    ) c
+    WHERE c.user_id = student.user_id
+      AND (student.pending_applications, student.resume_versions) != (c.pending, c.versions)
+''')
+
+
+def refresh_current_application(cursor, user_id, position_id):
+    """Re-point current_application at the newest application for the pair"""
+    cursor.execute(UPSERT_CURRENT_APPLICATION_QUERY, (user_id, position_id))
+
+
+def refresh_current_applications(cursor, pairs):
+    """refresh_current_application() for many (user_id, position_id) pairs at once"""
+    pairs = sorted(set(pairs))
+    if not pairs:
+        return
+    placeholders = ', '.join(['(%s, %s)'] * len(pairs))
+    params = [value for pair in pairs for value in pair]
+    cursor.execute(UPSERT_CURRENT_APPLICATIONS_QUERY.format(placeholders=placeholders), params)
+
+
+def refresh_latest_suggestion(cursor, resume_id):
+    """Re-point resume_latest_suggestion at the newest suggestion"""
+    cursor.execute(DELETE_LATEST_SUGGESTION_QUERY, (resume_id,))
+    cursor.execute(INSERT_LATEST_SUGGESTION_QUERY, (resume_id,))
+
+
+def enqueue_resume_sync(cursor, user_ids):
+    """
+    Queue students whose co-op or grade records changed. A student that
+    is already queued keeps its place, so any number of changes before
+    the worker runs cost one rebuild (backend.projections.resume_sync).
+    """
+    user_ids = sorted(set(user_ids))
+    if not user_ids:
+        return
+    placeholders = ', '.join(['%s'] * len(user_ids))
+    cursor.execute(ENQUEUE_RESUME_SYNC_QUERY.format(placeholders=placeholders), user_ids)
+
+
+def enqueue_all_resume_sync(cursor):
+    """Queue every student with a resume, e.g. after the rebuild rules changed"""
+    cursor.execute(ENQUEUE_ALL_RESUME_SYNC_QUERY)
+
+
+def rebuild_resume_sections(cursor, user_ids):
+    """
+    Rebuild co_op and education of each student's current resume from
+    co_op_record and the newest GPA grade, in one statement. Students
+    without co-ops get 'No internship experience'; education is left
+    alone when the student has no GPA grade.
+    """
+    user_ids = sorted(set(user_ids))
+    if not user_ids:
+        return 0
+    placeholders = ', '.join(['%s'] * len(user_ids))
+    cursor.execute(REBUILD_RESUME_SECTIONS_QUERY.format(placeholders=placeholders),
+                   (*user_ids, *user_ids, GPA_COURSE, *user_ids))
+    return cursor.rowcount
+
+
+def adjust_application_counters(cursor, user_id, position_id, old_status, new_status):
+    """
+    Move one application between counters: old_status is None for an
+    insert and new_status is None for a delete.
+    """
+    if old_status == new_status:
+        return
+
+    total = (new_status is not None) - (old_status is not None)
+    changes, params = ['application_count = application_count + %s'], [total]
+    for status, delta in ((old_status, -1), (new_status, 1)):
+        if status is not None:
+            column = STATUS_COUNTERS[status]
+            changes.append(f'{column} = {column} + %s')
+            params.append(delta)
+    cursor.execute(ADJUST_POSITION_COUNTERS_QUERY.format(changes=', '.join(changes)),
+                   (*params, position_id))
+
+    pending = (new_status == 'Pending') - (old_status == 'Pending')
+    if pending:
+        cursor.execute(ADJUST_PENDING_QUERY, (pending, user_id))
+
+
+def adjust_application_counters_bulk(cursor, changes):
+    """
+    adjust_application_counters() for many applications at once, given
+    (user_id, position_id, old_status, new_status) tuples. Issues one
+    UPDATE per table whatever the number of changes.
+    """
+    positions, students = {}, {}
+    for user_id, position_id, old_status, new_status in changes:
+        if old_status == new_status:
+            continue
+        deltas = positions.setdefault(position_id, dict.fromkeys(
+            ('application_count', *STATUS_COUNTERS.values()), 0))
+        deltas['application_count'] += (new_status is not None) - (old_status is not None)
+        if old_status is not None:
+            deltas[STATUS_COUNTERS[old_status]] -= 1
+        if new_status is not None:
+            deltas[STATUS_COUNTERS[new_status]] += 1
+        students[user_id] = students.get(user_id, 0) + \
+            (new_status == 'Pending') - (old_status == 'Pending')
+
+    if positions:
+        ids = sorted(positions)
+        changes_sql, params = [], []
+        for column in ('application_count', *STATUS_COUNTERS.values()):
+            cases = ' '.join(['WHEN %s THEN %s'] * len(ids))
+            changes_sql.append(f'{column} = {column} + CASE position_id {cases} END')
+            for position_id in ids:
+                params += [position_id, positions[position_id][column]]
+        placeholders = ', '.join(['%s'] * len(ids))
+        cursor.execute(ADJUST_POSITION_COUNTERS_BULK_QUERY.format(
+            changes=', '.join(changes_sql), placeholders=placeholders), (*params, *ids))
+
+    students = {user_id: delta for user_id, delta in students.items() if delta}
+    if students:
+        ids = sorted(students)
+        cases = ' '.join(['WHEN %s THEN %s'] * len(ids))
+        params = [value for user_id in ids for value in (user_id, students[user_id])]
+        placeholders = ', '.join(['%s'] * len(ids))
+        cursor.execute(ADJUST_PENDING_BULK_QUERY.format(cases=cases, placeholders=placeholders),
+                       (*params, *ids))
+
+
+def rebuild_counters(conn):
+    """
+    Recompute every counter from the source tables and commit. Returns
+    the number of position and student rows whose counters had drifted.
+    """
+    cursor = conn.cursor()
+    cursor.execute(REBUILD_POSITION_COUNTERS_QUERY)
+    positions = cursor.rowcount
+
+    cursor.execute(REBUILD_STUDENT_COUNTERS_QUERY)
+    students = cursor.rowcount
+    conn.commit()
+
+    if positions or students:
+        logger.warning(f'counters drifted: {positions} position(s), {students} student(s) corrected')
+    return {'positions': positions, 'students': students}
+
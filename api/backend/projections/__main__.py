@@ -0,0 +1,43 @@
+###
+# Projection maintenance command line
+#
+#   python -m backend.projections reconcile
+#   python -m backend.projections sync-resumes [--all]
+###
+import argparse
+import sys
+
+from backend.cache import cache
+from backend.db_connection import db
+from backend.projections import enqueue_all_resume_sync, rebuild_counters
+from backend.projections.resume_sync import drain
+from backend.rest_entry import create_app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m backend.projections')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('reconcile', help='rebuild the application and resume counters')
+    sync = commands.add_parser('sync-resumes', help='rebuild the resumes of queued students now')
+    sync.add_argument('--all', action='store_true', help='queue every student with a resume first')
+    args = parser.parse_args(argv)
+
+    app = create_app()
+    with app.app_context():
+        conn = db.get_db()
+        if args.command == 'reconcile':
+            drift = rebuild_counters(conn)
+            cache.invalidate('application_counts', 'student_counters')
+            print(f"corrected {drift['positions']} position(s) and {drift['students']} student(s)")
+            return 0
+
+        if args.all:
+            enqueue_all_resume_sync(conn.cursor())
+            conn.commit()
+        synced = drain(conn, app.config['RESUME_SYNC_BATCH'])
+        print(f'rebuilt the resumes of {synced} student(s)')
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,154 @@
+#------------------------------------------------------------
+# Background worker materializing the school-maintained resume sections
+#
+# Admin grade and co-op writes only queue the student (see
+# enqueue_resume_sync()). Every API worker process runs one thread that
+# polls resume_sync_queue, claims up to RESUME_SYNC_BATCH students with
+# FOR UPDATE SKIP LOCKED (so processes never take the same students),
+# rebuilds their current resumes with one statement, removes them from
+# the queue and invalidates their cached responses.
+#
+# The thread is started by the first request a process serves, so it
+# survives gunicorn's preload + fork, and CLI commands that build the
+# app never start it. `python -m backend.projections sync-resumes`
+# drains the queue by hand.
+#------------------------------------------------------------
+import logging
+import os
+import threading
+
+from flask import current_app
+
+from backend.cache import cache
+from backend.data import define
+from backend.db_connection import db
+from backend.projections import rebuild_resume_sections
+
+logger = logging.getLogger(__name__)
+
+# SQLite has no SKIP LOCKED: the claim takes the database write lock
+CLAIM_QUERY = define('resume_sync.claim', '''
+    SELECT user_id
+    FROM resume_sync_queue
+    ORDER BY queued_at
+    LIMIT %s
+    FOR UPDATE SKIP LOCKED
+''')
+
+DEQUEUE_QUERY = define('resume_sync.dequeue', '''
+    DELETE FROM resume_sync_queue
+    WHERE user_id IN ({placeholders})
+''')
+
+
+def sync_batch(conn, limit):
+    """
+    Rebuild the resumes of up to `limit` queued students and commit.
+    Returns the ids of the students that were processed.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute(CLAIM_QUERY, (limit,))
+        user_ids = [row['user_id'] for row in cursor.fetchall()]
+        if not user_ids:
+            conn.rollback()
+            return []
+
+        rebuild_resume_sections(cursor, user_ids)
+        placeholders = ', '.join(['%s'] * len(user_ids))
+        cursor.execute(DEQUEUE_QUERY.format(placeholders=placeholders), user_ids)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    cache.invalidate('students', 'resumes', *(f'student:{user_id}' for user_id in user_ids))
+    return user_ids
+
+
+def drain(conn, batch_size):
+    """Run sync_batch() until the queue is empty; returns the number of students"""
+    total = 0
+    while True:
+        synced = sync_batch(conn, batch_size)
+        if not synced:
+            return total
+        total += len(synced)
+
+
+class ResumeSyncWorker:
+    """
+    Flask extension owning the per-process sync thread. Settings:
+    RESUME_SYNC_WORKER (start the thread at all), RESUME_SYNC_INTERVAL
+    (seconds between polls of an empty queue) and RESUME_SYNC_BATCH.
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._stop = threading.Event()
+        self._counters = {'batches': 0, 'students': 0, 'errors': 0}
+        self._last_error = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('RESUME_SYNC_WORKER', True)
+        app.config.setdefault('RESUME_SYNC_INTERVAL', 1.0)
+        app.config.setdefault('RESUME_SYNC_BATCH', 200)
+        app.extensions['resume_sync'] = self
+        if app.config['RESUME_SYNC_WORKER']:
+            app.before_request(self._ensure_started)
+
+    def _ensure_started(self):
+        # a thread started before a fork does not exist in the child
+        if self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread.is_alive():
+                return
+            app = current_app._get_current_object()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, args=(app,),
+                                            name='resume-sync', daemon=True)
+            self._pid = os.getpid()
+            self._thread.start()
+
+    def _run(self, app):
+        interval = app.config['RESUME_SYNC_INTERVAL']
+        batch_size = app.config['RESUME_SYNC_BATCH']
+        while not self._stop.is_set():
+            synced = []
+            try:
+                with app.app_context():
+                    synced = sync_batch(db.get_db(), batch_size)
+            except Exception as e:
+                with self._lock:
+                    self._counters['errors'] += 1
+                    self._last_error = str(e)
+                logger.error(f'resume sync failed: {str(e)}')
+            if synced:
+                with self._lock:
+                    self._counters['batches'] += 1
+                    self._counters['students'] += len(synced)
+                # a full batch means more may be waiting
+                if len(synced) == batch_size:
+                    continue
+            self._stop.wait(interval)
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats['running'] = bool(self._thread and self._pid == os.getpid()
+                                    and self._thread.is_alive())
+            stats['last_error'] = self._last_error
+        return stats
+
+
+resume_sync = ResumeSyncWorker()
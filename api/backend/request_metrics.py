@@ -0,0 +1,64 @@
+#------------------------------------------------------------
+# Per-request timings
+#
+# Stages of a request (serialize, compress, ...) report how long they
+# took with add_timing(). The total and every stage are returned in the
+# Server-Timing response header, e.g.
+#
+#   Server-Timing: total;dur=41.20, db;dur=12.60, serialize;dur=3.87
+#
+# With METRICS_ENABLED the connection pool's cursors also report each
+# SQL statement through record_query() (see backend.metrics).
+#------------------------------------------------------------
+import time
+
+from flask import g, has_request_context
+
+
+def add_timing(name, seconds):
+    """Add `seconds` to the named stage of the current request"""
+    if not has_request_context():
+        return
+    timings = g.setdefault('timings', {})
+    timings[name] = timings.get(name, 0.0) + seconds
+
+
+def record_query(seconds, rows):
+    """Count one SQL statement of the current request"""
+    if not has_request_context():
+        return
+    g.sql_statements = g.get('sql_statements', 0) + 1
+    g.sql_rows = g.get('sql_rows', 0) + max(rows, 0)
+    add_timing('db', seconds)
+
+
+def query_stats():
+    """(statements, rows, seconds) of the SQL run so far in this request"""
+    return g.get('sql_statements', 0), g.get('sql_rows', 0), g.get('timings', {}).get('db', 0.0)
+
+
+def timings():
+    """Stage durations (seconds) recorded so far in this request"""
+    return dict(g.get('timings', {}))
+
+
+def _start_timer():
+    g.request_started = time.perf_counter()
+
+
+def _server_timing(response):
+    started = g.get('request_started')
+    if started is None:
+        return response
+    total = time.perf_counter() - started
+    parts = [f'total;dur={total * 1000:.2f}']
+    parts += [f'{name};dur={seconds * 1000:.2f}' for name, seconds in timings().items()]
+    response.headers['Server-Timing'] = ', '.join(parts)
+    return response
+
+
+def init_app(app):
+    # after_request hooks run in reverse registration order, so init this
+    # before anything whose after_request stage should be included
+    app.before_request(_start_timer)
+    app.after_request(_server_timing)
@@ -1,29 +1,156 @@
 from flask import Flask
+from backend import compression, request_metrics
+from backend.metrics import metrics
+from backend.cache import cache
 from backend.db_connection import db
+from backend.json_provider import OrjsonProvider
+from backend.migrations import runner as migrations
+from backend.projections.resume_sync import resume_sync
 from backend.hr.hr_routes import hr_bp 
 from backend.student.student_routes import student
 from backend.school_admin.school_admin_routes import school_admin
 from backend.maintenance_staff.maintenance_staff_routes import maintenance_staff
+import multiprocessing
 import os
+import time
 from dotenv import load_dotenv
 
-def create_app():
-    app = Flask(__name__)
+def server_processes():
+    """Processes serving the API in API_SERVER_MODE (see backend_app.py)"""
+    mode = os.getenv('API_SERVER_MODE', 'development').strip().lower()
+    if mode == 'production':
+        # the default of gunicorn.conf.py
+        return int(os.getenv('GUNICORN_WORKERS') or multiprocessing.cpu_count() * 2 + 1)
+    if mode == 'async':
+        return int(os.getenv('UVICORN_WORKERS') or 1)
+    return 1
+
 
+def configure(app):
     # Load environment variables
     load_dotenv()
 
     # Configure app
     app.config['SECRET_KEY'] = os.getenv('SECRET_KEY')
-    app.config['MYSQL_DATABASE_USER'] = os.getenv('DB_USER').strip()
-    app.config['MYSQL_DATABASE_PASSWORD'] = os.getenv('MYSQL_ROOT_PASSWORD').strip()
-    app.config['MYSQL_DATABASE_HOST'] = os.getenv('DB_HOST').strip()
-    app.config['MYSQL_DATABASE_PORT'] = int(os.getenv('DB_PORT').strip())
-    app.config['MYSQL_DATABASE_DB'] = os.getenv('DB_NAME').strip()
+
+    # Database engine: mysql (the db container) or sqlite (an embedded
+    # file, no server needed; see backend/data)
+    app.config['DB_ENGINE'] = os.getenv('DB_ENGINE', 'mysql').strip().lower()
+    app.config['SQLITE_DATABASE'] = os.getenv('DB_SQLITE_PATH', 'susy_baka.sqlite3').strip()
+    # the MySQL settings may be left unset on the sqlite engine
+    app.config['MYSQL_DATABASE_USER'] = (os.getenv('DB_USER') or '').strip()
+    app.config['MYSQL_DATABASE_PASSWORD'] = (os.getenv('MYSQL_ROOT_PASSWORD') or '').strip()
+    app.config['MYSQL_DATABASE_HOST'] = (os.getenv('DB_HOST') or 'localhost').strip()
+    app.config['MYSQL_DATABASE_PORT'] = int((os.getenv('DB_PORT') or '3306').strip())
+    app.config['MYSQL_DATABASE_DB'] = (os.getenv('DB_NAME') or '').strip()
+
+    # Connection pool settings (sizes are per worker process)
+    app.config['MYSQL_POOL_SIZE'] = int(os.getenv('DB_POOL_SIZE', '10'))
+    app.config['MYSQL_POOL_MAX_OVERFLOW'] = int(os.getenv('DB_POOL_MAX_OVERFLOW', '10'))
+    app.config['MYSQL_POOL_TIMEOUT'] = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+    app.config['MYSQL_POOL_IDLE_TIMEOUT'] = float(os.getenv('DB_POOL_IDLE_TIMEOUT', '300'))
+    app.config['MYSQL_POOL_RECYCLE'] = float(os.getenv('DB_POOL_RECYCLE', '3600'))
+    app.config['MYSQL_POOL_PRE_PING'] = os.getenv('DB_POOL_PRE_PING', 'true').strip().lower() in ('1', 'true', 'yes')
+    # aiomysql pool of the async serving mode (API_SERVER_MODE=async)
+    app.config['MYSQL_ASYNC_POOL_SIZE'] = int(os.getenv('DB_ASYNC_POOL_SIZE', '20'))
+
+    # Response cache (lru = per worker process, redis = shared)
+    app.config['CACHE_BACKEND'] = os.getenv('CACHE_BACKEND', 'lru').strip().lower()
+    # server processes sharing the cache: lru is refused when there are several
+    app.config['SERVER_PROCESSES'] = server_processes()
+    app.config['CACHE_DEFAULT_TTL'] = int(os.getenv('CACHE_DEFAULT_TTL', '60'))
+    app.config['CACHE_MAX_ENTRIES'] = int(os.getenv('CACHE_MAX_ENTRIES', '1024'))
+    app.config['CACHE_REDIS_URL'] = os.getenv('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+
+    # Compress JSON responses of at least this many bytes (gzip / brotli)
+    app.config['COMPRESS_MIN_SIZE'] = int(os.getenv('COMPRESS_MIN_SIZE', '1024'))
+
+    # Prometheus metrics at METRICS_PATH (no overhead when disabled)
+    app.config['METRICS_ENABLED'] = os.getenv('METRICS_ENABLED', 'false').strip().lower() in ('1', 'true', 'yes')
+    app.config['METRICS_PATH'] = os.getenv('METRICS_PATH', '/metrics')
+
+    # Slow-query log and N+1 detector (GET /maintenance_staff/queries)
+    app.config['QUERY_LOG_ENABLED'] = os.getenv('QUERY_LOG_ENABLED', 'false').strip().lower() in ('1', 'true', 'yes')
+    app.config['QUERY_LOG_SLOW_MS'] = float(os.getenv('QUERY_LOG_SLOW_MS', '200'))
+    app.config['QUERY_LOG_N_PLUS_ONE'] = int(os.getenv('QUERY_LOG_N_PLUS_ONE', '10'))
+    app.config['QUERY_LOG_EXAMINE_RATE'] = float(os.getenv('QUERY_LOG_EXAMINE_RATE', '0'))
+    app.config['QUERY_LOG_MAX_FINGERPRINTS'] = int(os.getenv('QUERY_LOG_MAX_FINGERPRINTS', '1000'))
+
+    # Background rebuild of resume co-op / education sections (one thread per worker process)
+    app.config['RESUME_SYNC_WORKER'] = os.getenv('RESUME_SYNC_WORKER', 'true').strip().lower() in ('1', 'true', 'yes')
+    app.config['RESUME_SYNC_INTERVAL'] = float(os.getenv('RESUME_SYNC_INTERVAL', '1.0'))
+    app.config['RESUME_SYNC_BATCH'] = int(os.getenv('RESUME_SYNC_BATCH', '200'))
+
+    # Background job worker (worker_app.py)
+    app.config['JOB_POLL_INTERVAL'] = float(os.getenv('JOB_POLL_INTERVAL', '1.0'))
+    app.config['JOB_BACKOFF_BASE'] = float(os.getenv('JOB_BACKOFF_BASE', '5'))
+    app.config['JOB_BACKOFF_MAX'] = float(os.getenv('JOB_BACKOFF_MAX', '600'))
+
+
+def migrate_on_start_enabled(app):
+    return app.config['DB_ENGINE'] == 'mysql' and \
+        os.getenv('DB_MIGRATE_ON_START', 'false').strip().lower() in ('1', 'true', 'yes')
+
+
+def migrate(app):
+    """
+    Apply pending schema migrations (also available as
+    `python -m backend.migrations upgrade`), retrying while the db
+    container is still initialising
+    """
+    app.logger.info('current_app(): applying schema migrations')
+    attempts = int(os.getenv('DB_MIGRATE_RETRIES', '10'))
+    for attempt in range(1, attempts + 1):
+        try:
+            with app.app_context():
+                applied = migrations.upgrade(db.get_db())
+            app.logger.info(f'current_app(): applied migrations {applied}')
+            return applied
+        except migrations.MigrationError:
+            raise
+        except Exception as e:
+            if attempt == attempts:
+                raise
+            app.logger.warning(f'current_app(): database not ready ({str(e)}), retrying')
+            time.sleep(3)
+
+
+def migrate_before_serving():
+    """
+    DB_MIGRATE_ON_START for the production / async launchers: apply the
+    migrations once, with a connection of their own, and switch the
+    setting off so the server processes that import the app afterwards
+    do not repeat it
+    """
+    app = Flask(__name__)
+    configure(app)
+    if migrate_on_start_enabled(app):
+        db.init_app(app)
+        try:
+            migrate(app)
+        finally:
+            app.extensions['mysql_pool'].dispose()
+    os.environ['DB_MIGRATE_ON_START'] = 'false'
+
+
+def create_app():
+    app = Flask(__name__)
+    app.json = OrjsonProvider(app)
+    configure(app)
 
     # Initialize database
-    app.logger.info('current_app(): starting the database connection')
+    app.logger.info(f"current_app(): starting the {app.config['DB_ENGINE']} database connection pool")
     db.init_app(app)
+    cache.init_app(app)
+    metrics.init_app(app)
+    request_metrics.init_app(app)
+    compression.init_app(app)
+    resume_sync.init_app(app)
+
+    # Apply pending schema migrations; the sqlite engine creates its
+    # migrated schema itself
+    if migrate_on_start_enabled(app):
+        migrate(app)
 
     # Register blueprints
     app.logger.info('current_app(): registering blueprints with Flask app object.')   
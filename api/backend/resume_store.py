@@ -0,0 +1,114 @@
+#------------------------------------------------------------
+# Append-only resume versions
+#
+# A resume edit never updates a resume row: it inserts a new version
+# and re-points current_resume at it. skills and projects live in
+# resume_section keyed by the SHA-256 of their text, so a version only
+# adds a section row when that section actually changed.
+#
+# Reads select RESUME_COLUMNS from `resume r` joined with
+# RESUME_SECTIONS to get the section text back.
+#------------------------------------------------------------
+import hashlib
+
+from backend.data import define
+
+# sections written by the student and stored in resume_section
+SECTIONS = ('skills', 'projects')
+
+RESUME_COLUMNS = '''
+    r.resume_id, r.user_id, r.time_uploaded, r.doc_name,
+    r.education, sk.content AS skills, pj.content AS projects, r.co_op
+'''
+
+RESUME_SECTIONS = '''
+    LEFT JOIN resume_section sk ON sk.section_hash = r.skills_hash
+    LEFT JOIN resume_section pj ON pj.section_hash = r.projects_hash
+'''
+
+
+STORE_SECTION_QUERY = define('resume_store.store_section', '''
+    INSERT INTO resume_section (section_hash, content)
+    VALUES (%s, %s)
+    ON DUPLICATE KEY UPDATE section_hash = section_hash
+''', sqlite='''
+    INSERT INTO resume_section (section_hash, content)
+    VALUES (%s, %s)
+    ON CONFLICT (section_hash) DO NOTHING
+''')
+
+CURRENT_VERSION_QUERY = define('resume_store.current_version', '''
+    SELECT r.resume_id, r.doc_name, r.education, r.co_op, r.skills_hash, r.projects_hash
+    FROM current_resume cr
+    JOIN resume r ON r.resume_id = cr.resume_id
+    WHERE cr.user_id = %s
+''')
+CURRENT_VERSION_FOR_UPDATE_QUERY = define('resume_store.current_version_for_update',
+                                          CURRENT_VERSION_QUERY + 'FOR UPDATE')
+
+INSERT_VERSION_QUERY = define('resume_store.insert_version', '''
+    INSERT INTO resume (user_id, doc_name, education, co_op, skills_hash, projects_hash)
+    VALUES (%s, %s, %s, %s, %s, %s)
+''')
+
+POINT_CURRENT_QUERY = define('resume_store.point_current', '''
+    UPDATE current_resume cr
+    JOIN resume r ON r.resume_id = %s
+    SET cr.resume_id = r.resume_id, cr.time_uploaded = r.time_uploaded
+    WHERE cr.user_id = %s
+''', sqlite='''
+    UPDATE current_resume
+    SET resume_id = r.resume_id, time_uploaded = r.time_uploaded
+    FROM resume r
+    WHERE r.resume_id = %s AND current_resume.user_id = %s
+''')
+
+COUNT_VERSION_QUERY = define('resume_store.count_version', '''
+    UPDATE student
+    SET resume_versions = resume_versions + 1
+    WHERE user_id = %s
+''')
+
+
+def section_hash(content):
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def store_section(cursor, content):
+    """Store a section's text once and return its hash (None for None)"""
+    if content is None:
+        return None
+    digest = section_hash(content)
+    cursor.execute(STORE_SECTION_QUERY, (digest, content))
+    return digest
+
+
+def current_version(cursor, user_id, for_update=False):
+    """The student's current resume row (hashes, not section text), or None"""
+    query = CURRENT_VERSION_FOR_UPDATE_QUERY if for_update else CURRENT_VERSION_QUERY
+    cursor.execute(query, (user_id,))
+    return cursor.fetchone()
+
+
+def create_version(cursor, user_id, current, changes):
+    """
+    Add a version that copies `current` (from current_version()) with
+    `changes` applied: doc_name and/or the SECTIONS, each set to its new
+    text. Returns the new resume_id, or None when nothing changed.
+    """
+    doc_name = changes.get('doc_name', current['doc_name'])
+    hashes = {
+        name: store_section(cursor, changes[name]) if name in changes else current[f'{name}_hash']
+        for name in SECTIONS
+    }
+    if doc_name == current['doc_name'] and all(
+            hashes[name] == current[f'{name}_hash'] for name in SECTIONS):
+        return None
+
+    cursor.execute(INSERT_VERSION_QUERY, (user_id, doc_name, current['education'], current['co_op'],
+          hashes['skills'], hashes['projects']))
+    resume_id = cursor.lastrowid
+
+    cursor.execute(POINT_CURRENT_QUERY, (resume_id, user_id))
+    cursor.execute(COUNT_VERSION_QUERY, (user_id,))
+    return resume_id
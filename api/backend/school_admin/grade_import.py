@@ -0,0 +1,214 @@
+#------------------------------------------------------------
+# Bulk grade import from a CSV upload
+#
+#   student_id,course_name,grade[,recorded_by]
+#
+# The upload is read a row at a time and handled in chunks of
+# CHUNK_SIZE rows: one query per chunk checks that its students and
+# admins exist, the valid rows go in with a single multi-row INSERT and
+# the chunk is committed on its own. Rows that fail are reported by CSV
+# line number and the rest of the file is still imported.
+#
+# Each chunk queues its students for the resume sync worker in the same
+# transaction, so resume.education is rebuilt once per student rather
+# than once per GPA row.
+#------------------------------------------------------------
+import csv
+import io
+import itertools
+import logging
+from decimal import Decimal, InvalidOperation
+
+from backend.data import define
+from backend.projections import enqueue_resume_sync
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 500
+MAX_COURSE_NAME = 100
+REQUIRED_COLUMNS = ('student_id', 'course_name', 'grade')
+
+MIN_GRADE = Decimal('0')
+MAX_GRADE = Decimal('4')
+GRADE_STEP = Decimal('0.01')
+
+EXISTING_STUDENTS_QUERY = define('grade_import.existing_students',
+                                 'SELECT user_id FROM student WHERE user_id IN ({placeholders})')
+EXISTING_ADMINS_QUERY = define('grade_import.existing_admins',
+                               'SELECT admin_id FROM school_admin WHERE admin_id IN ({placeholders})')
+
+INSERT_GRADE_QUERY = define('grade_import.insert_grade', '''
+    INSERT INTO grade_record (student_id, course_name, grade, recorded_by)
+    VALUES (%s, %s, %s, %s)
+''')
+
+
+class GradeImportError(ValueError):
+    """The upload cannot be imported at all (e.g. a missing column)"""
+
+
+def read_csv(stream):
+    """
+    csv.DictReader over a binary stream. Checks the header row and
+    raises GradeImportError when a required column is missing.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    reader = csv.DictReader(text)
+    try:
+        columns = [name.strip() for name in reader.fieldnames or ()]
+    except (csv.Error, UnicodeDecodeError) as e:
+        raise GradeImportError(f'unreadable CSV header: {str(e)}')
+    missing = [name for name in REQUIRED_COLUMNS if name not in columns]
+    if missing:
+        raise GradeImportError(f'missing column(s): {", ".join(missing)}')
+    reader.fieldnames = columns
+    return reader
+
+
+def _positive_int(value, field):
+    try:
+        number = int(str(value).strip())
+    except (TypeError, ValueError):
+        raise ValueError(f'{field} must be an integer')
+    if number < 1:
+        raise ValueError(f'{field} must be positive')
+    return number
+
+
+def parse_row(row, recorded_by=None):
+    """
+    Validate one CSV row and return (student_id, course_name, grade,
+    recorded_by). Raises ValueError with a message for the report.
+    """
+    if None in row:
+        raise ValueError('too many fields')
+
+    student_id = _positive_int(row.get('student_id'), 'student_id')
+
+    course_name = (row.get('course_name') or '').strip()
+    if not course_name:
+        raise ValueError('course_name is empty')
+    if len(course_name) > MAX_COURSE_NAME:
+        raise ValueError(f'course_name is longer than {MAX_COURSE_NAME} characters')
+
+    try:
+        grade = Decimal((row.get('grade') or '').strip())
+    except InvalidOperation:
+        raise ValueError('grade must be a number')
+    if not grade.is_finite() or not MIN_GRADE <= grade <= MAX_GRADE:
+        raise ValueError(f'grade must be between {MIN_GRADE} and {MAX_GRADE}')
+    grade = grade.quantize(GRADE_STEP)
+
+    admin = (row.get('recorded_by') or '').strip() or recorded_by
+    if admin is None:
+        raise ValueError('recorded_by is missing')
+    admin = _positive_int(admin, 'recorded_by')
+
+    return student_id, course_name, grade, admin
+
+
+def _existing(cursor, query, ids):
+    ids = sorted(set(ids))
+    if not ids:
+        return set()
+    placeholders = ', '.join(['%s'] * len(ids))
+    cursor.execute(query.format(placeholders=placeholders), ids)
+    return {next(iter(row.values())) for row in cursor.fetchall()}
+
+
+class _Report:
+    def __init__(self):
+        self.rows = 0
+        self.inserted = 0
+        self.failed = 0
+        self.errors = []
+        self.students = set()
+        self.aborted = False
+
+    def error(self, line, message):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'error': message})
+
+    def as_dict(self):
+        return {
+            'rows': self.rows,
+            'inserted': self.inserted,
+            'failed': self.failed,
+            'errors': self.errors,
+            'errors_truncated': self.failed > len(self.errors),
+            'students': len(self.students),
+            'aborted': self.aborted,
+        }
+
+
+def _numbered_rows(reader, report):
+    """(line, row) pairs; a decoding error ends the import at that line"""
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except (csv.Error, UnicodeDecodeError) as e:
+            report.aborted = True
+            report.error(reader.line_num + 1, f'unreadable CSV: {str(e)}')
+            return
+        yield reader.line_num, row
+
+
+def _import_chunk(conn, cursor, chunk, recorded_by, report):
+    parsed = []
+    for line, row in chunk:
+        report.rows += 1
+        try:
+            parsed.append((line, parse_row(row, recorded_by)))
+        except ValueError as e:
+            report.error(line, str(e))
+
+    students = _existing(cursor, EXISTING_STUDENTS_QUERY, [values[0] for _, values in parsed])
+    admins = _existing(cursor, EXISTING_ADMINS_QUERY, [values[3] for _, values in parsed])
+
+    valid = []
+    for line, values in parsed:
+        if values[0] not in students:
+            report.error(line, f'student {values[0]} does not exist')
+        elif values[3] not in admins:
+            report.error(line, f'school admin {values[3]} does not exist')
+        else:
+            valid.append((line, values))
+    if not valid:
+        return
+
+    try:
+        # PyMySQL sends an executemany() INSERT as multi-row statements
+        cursor.executemany(INSERT_GRADE_QUERY, [values for _, values in valid])
+        enqueue_resume_sync(cursor, [values[0] for _, values in valid])
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        logger.error(f'grade import chunk failed: {str(e)}')
+        for line, _ in valid:
+            report.error(line, f'not imported: {str(e)}')
+        return
+
+    report.inserted += len(valid)
+    report.students.update(values[0] for _, values in valid)
+
+
+def import_grades(conn, reader, recorded_by=None):
+    """
+    Import the rows of a read_csv() reader. `recorded_by` is used for
+    rows without a recorded_by column. Returns (report dict, ids of the
+    students that received grades).
+    """
+    report = _Report()
+    rows = _numbered_rows(reader, report)
+    cursor = conn.cursor()
+    while True:
+        chunk = list(itertools.islice(rows, CHUNK_SIZE))
+        if not chunk:
+            break
+        _import_chunk(conn, cursor, chunk, recorded_by, report)
+
+    return report.as_dict(), sorted(report.students)
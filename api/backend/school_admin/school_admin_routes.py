@@ -1,41 +1,103 @@
 from flask import Blueprint, request, jsonify, make_response, current_app
+from backend.cache import cache
+from backend.data import define
 from backend.db_connection import db
+from backend.pagination import CursorError, keyset_condition, order_clause, page_args, page_response
+from backend.projections import enqueue_resume_sync
+from backend.school_admin.grade_import import GradeImportError, import_grades, read_csv
 
 school_admin = Blueprint('school_admin', __name__)
 
 # ------------------------------------------------------------
+STUDENTS_SORT = [('u.user_id', 'ASC')]
+STUDENTS_QUERY = define('school_admin.students', '''
+    SELECT u.user_id, u.full_name, u.email, u.dob, u.gender
+    FROM user u
+    WHERE u.role = 'Student' AND {keyset}
+    ORDER BY {order}
+    LIMIT %s
+''')
+
+STUDENT_GRADES_QUERY = define('school_admin.student_grades', '''
+    SELECT gr.student_id, gr.grade_id, gr.course_name, gr.grade, gr.recorded_date
+    FROM grade_record gr
+    WHERE gr.student_id IN ({placeholders})
+    ORDER BY gr.student_id, gr.recorded_date DESC
+''')
+
+STUDENT_COOPS_QUERY = define('school_admin.student_coops', '''
+    SELECT cr.student_id, cr.co_op_id, cr.company_name, cr.start_date, cr.end_date
+    FROM co_op_record cr
+    WHERE cr.student_id IN ({placeholders})
+    ORDER BY cr.student_id, cr.start_date DESC
+''')
+
 @school_admin.route('/students', methods=['GET'])
+@cache.conditional(tags=('students',))
 def get_students():
+    """Student roster: one object per student with nested grades and co-ops"""
     try:
+        limit, after = page_args(STUDENTS_SORT)
+        keyset, keyset_params = keyset_condition(STUDENTS_SORT, after)
+
         cursor = db.get_db().cursor()
-        query = '''
-            SELECT 
-                u.user_id, u.full_name, u.email, u.dob, u.gender,
-                gr.course_name, gr.grade, cr.company_name, cr.start_date, cr.end_date
-            FROM user u
-            LEFT JOIN grade_record gr ON u.user_id = gr.student_id
-            LEFT JOIN co_op_record cr ON u.user_id = cr.student_id
-            WHERE u.role = 'Student'
-        '''
-        cursor.execute(query)
-        students = cursor.fetchall()
-        return make_response(jsonify(students), 200)
+        cursor.execute(STUDENTS_QUERY.format(keyset=keyset, order=order_clause(STUDENTS_SORT)),
+                       (*keyset_params, limit + 1))
+        page = page_response(cursor.fetchall(), limit, ('user_id',))
+        students = page['items']
+
+        if students:
+            # one indexed query per child table instead of a grades x co-ops join
+            student_ids = [row['user_id'] for row in students]
+            placeholders = ', '.join(['%s'] * len(student_ids))
+
+            cursor.execute(STUDENT_GRADES_QUERY.format(placeholders=placeholders), student_ids)
+            grades = cursor.fetchall()
+
+            cursor.execute(STUDENT_COOPS_QUERY.format(placeholders=placeholders), student_ids)
+            coops = cursor.fetchall()
+
+            by_id = {}
+            for row in students:
+                row['grades'] = []
+                row['co_ops'] = []
+                by_id[row['user_id']] = row
+            for grade in grades:
+                by_id[grade.pop('student_id')]['grades'].append(grade)
+            for coop in coops:
+                by_id[coop.pop('student_id')]['co_ops'].append(coop)
+
+            for row in students:
+                scores = [float(g['grade']) for g in row['grades'] if g['grade'] is not None]
+                row['gpa'] = round(sum(scores) / len(scores), 2) if scores else None
+                row['co_op_count'] = len(row['co_ops'])
+
+        return make_response(jsonify(page), 200)
+    except CursorError as e:
+        return make_response(jsonify({'error': str(e)}), 400)
     except Exception as e:
         current_app.logger.error(f'Error in get_students: {str(e)}')
         return make_response(jsonify({'error': str(e)}), 500)
 
 # ------------------------------------------------------------
+GRADES_QUERY = define('school_admin.grades', '''
+    SELECT g.grade_id, g.course_name, g.grade, g.recorded_date
+    FROM grade_record g
+    WHERE g.student_id = %s
+''')
+
+ADD_GRADE_QUERY = define('school_admin.add_grade', '''
+    INSERT INTO grade_record (student_id, course_name, grade, recorded_by)
+    VALUES (%s, %s, %s, %s)
+''')
+
 @school_admin.route('/students/<int:user_id>/grades', methods=['GET', 'POST'])
+@cache.conditional(tags=('student:{user_id}',))
 def student_grades(user_id):
     if request.method == 'GET':
         try:
             cursor = db.get_db().cursor()
-            query = '''
-                SELECT g.grade_id, g.course_name, g.grade, g.recorded_date
-                FROM grade_record g
-                WHERE g.student_id = %s
-            '''
-            cursor.execute(query, (user_id,))
+            cursor.execute(GRADES_QUERY, (user_id,))
             grades = cursor.fetchall()
             return make_response(jsonify(grades), 200)
         except Exception as e:
@@ -45,31 +107,37 @@ def student_grades(user_id):
         try:
             grade_data = request.json
             cursor = db.get_db().cursor()
-            query = '''
-                INSERT INTO grade_record (student_id, course_name, grade, recorded_by)
-                VALUES (%s, %s, %s, %s)
-            '''
-            cursor.execute(query, (user_id, grade_data['course_name'], grade_data['grade'], grade_data['recorded_by']))
+            cursor.execute(ADD_GRADE_QUERY, (user_id, grade_data['course_name'], grade_data['grade'], grade_data['recorded_by']))
+            enqueue_resume_sync(cursor, [user_id])
             db.get_db().commit()
+            cache.invalidate('students', 'resumes', f'student:{user_id}')
             return make_response(jsonify({'message': 'Grade added successfully'}), 201)
         except Exception as e:
             current_app.logger.error(f'Error in add_student_grade: {str(e)}')
             return make_response(jsonify({'error': str(e)}), 500)
 
 # ------------------------------------------------------------
+UPDATE_GRADE_QUERY = define('school_admin.update_grade', '''
+    UPDATE grade_record
+    SET course_name = %s, grade = %s
+    WHERE grade_id = %s AND student_id = %s
+''')
+
+DELETE_GRADE_QUERY = define('school_admin.delete_grade', '''
+    DELETE FROM grade_record
+    WHERE grade_id = %s AND student_id = %s
+''')
+
 @school_admin.route('/students/<int:user_id>/grades/<int:grade_id>', methods=['PUT', 'DELETE'])
 def update_delete_student_grade(user_id, grade_id):
     if request.method == 'PUT':
         try:
             grade_data = request.json
             cursor = db.get_db().cursor()
-            query = '''
-                UPDATE grade_record
-                SET course_name = %s, grade = %s
-                WHERE grade_id = %s AND student_id = %s
-            '''
-            cursor.execute(query, (grade_data['course_name'], grade_data['grade'], grade_id, user_id))
+            cursor.execute(UPDATE_GRADE_QUERY, (grade_data['course_name'], grade_data['grade'], grade_id, user_id))
+            enqueue_resume_sync(cursor, [user_id])
             db.get_db().commit()
+            cache.invalidate('students', 'resumes', f'student:{user_id}')
             return make_response(jsonify({'message': 'Grade updated successfully'}), 200)
         except Exception as e:
             current_app.logger.error(f'Error in update_student_grade: {str(e)}')
@@ -77,29 +145,34 @@ def update_delete_student_grade(user_id, grade_id):
     elif request.method == 'DELETE':
         try:
             cursor = db.get_db().cursor()
-            query = '''
-                DELETE FROM grade_record
-                WHERE grade_id = %s AND student_id = %s
-            '''
-            cursor.execute(query, (grade_id, user_id))
+            cursor.execute(DELETE_GRADE_QUERY, (grade_id, user_id))
+            enqueue_resume_sync(cursor, [user_id])
             db.get_db().commit()
+            cache.invalidate('students', 'resumes', f'student:{user_id}')
             return make_response(jsonify({'message': 'Grade deleted successfully'}), 200)
         except Exception as e:
             current_app.logger.error(f'Error in delete_student_grade: {str(e)}')
             return make_response(jsonify({'error': str(e)}), 500)
 
 # ------------------------------------------------------------
+COOPS_QUERY = define('school_admin.coops', '''
+    SELECT cr.co_op_id, cr.company_name, cr.start_date, cr.end_date
+    FROM co_op_record cr
+    WHERE cr.student_id = %s
+''')
+
+ADD_COOP_QUERY = define('school_admin.add_coop', '''
+    INSERT INTO co_op_record (student_id, company_name, start_date, end_date)
+    VALUES (%s, %s, %s, %s)
+''')
+
 @school_admin.route('/students/<int:user_id>/coops', methods=['GET', 'POST'])
+@cache.conditional(tags=('student:{user_id}',))
 def student_coops(user_id):
     if request.method == 'GET':
         try:
             cursor = db.get_db().cursor()
-            query = '''
-                SELECT cr.co_op_id, cr.company_name, cr.start_date, cr.end_date
-                FROM co_op_record cr
-                WHERE cr.student_id = %s
-            '''
-            cursor.execute(query, (user_id,))
+            cursor.execute(COOPS_QUERY, (user_id,))
             coops = cursor.fetchall()
             return make_response(jsonify(coops), 200)
         except Exception as e:
@@ -109,31 +182,37 @@ def student_coops(user_id):
         try:
             coop_data = request.json
             cursor = db.get_db().cursor()
-            query = '''
-                INSERT INTO co_op_record (student_id, company_name, start_date, end_date)
-                VALUES (%s, %s, %s, %s)
-            '''
-            cursor.execute(query, (user_id, coop_data['company_name'], coop_data['start_date'], coop_data['end_date']))
+            cursor.execute(ADD_COOP_QUERY, (user_id, coop_data['company_name'], coop_data['start_date'], coop_data['end_date']))
+            enqueue_resume_sync(cursor, [user_id])
             db.get_db().commit()
+            cache.invalidate('students', 'resumes', f'student:{user_id}')
             return make_response(jsonify({'message': 'Co-op added successfully'}), 201)
         except Exception as e:
             current_app.logger.error(f'Error in add_student_coop: {str(e)}')
             return make_response(jsonify({'error': str(e)}), 500)
 
 # ------------------------------------------------------------
+UPDATE_COOP_QUERY = define('school_admin.update_coop', '''
+    UPDATE co_op_record
+    SET company_name = %s, start_date = %s, end_date = %s
+    WHERE co_op_id = %s AND student_id = %s
+''')
+
+DELETE_COOP_QUERY = define('school_admin.delete_coop', '''
+    DELETE FROM co_op_record
+    WHERE co_op_id = %s AND student_id = %s
+''')
+
 @school_admin.route('/students/<int:user_id>/coops/<int:coop_id>', methods=['PUT', 'DELETE'])
 def update_delete_student_coop(user_id, coop_id):
     if request.method == 'PUT':
         try:
             coop_data = request.json
             cursor = db.get_db().cursor()
-            query = '''
-                UPDATE co_op_record
-                SET company_name = %s, start_date = %s, end_date = %s
-                WHERE co_op_id = %s AND student_id = %s
-            '''
-            cursor.execute(query, (coop_data['company_name'], coop_data['start_date'], coop_data['end_date'], coop_id, user_id))
+            cursor.execute(UPDATE_COOP_QUERY, (coop_data['company_name'], coop_data['start_date'], coop_data['end_date'], coop_id, user_id))
+            enqueue_resume_sync(cursor, [user_id])
             db.get_db().commit()
+            cache.invalidate('students', 'resumes', f'student:{user_id}')
             return make_response(jsonify({'message': 'Co-op updated successfully'}), 200)
         except Exception as e:
             current_app.logger.error(f'Error in update_student_coop: {str(e)}')
@@ -141,13 +220,41 @@ def update_delete_student_coop(user_id, coop_id):
     elif request.method == 'DELETE':
         try:
             cursor = db.get_db().cursor()
-            query = '''
-                DELETE FROM co_op_record
-                WHERE co_op_id = %s AND student_id = %s
-            '''
-            cursor.execute(query, (coop_id, user_id))
+            cursor.execute(DELETE_COOP_QUERY, (coop_id, user_id))
+            enqueue_resume_sync(cursor, [user_id])
             db.get_db().commit()
+            cache.invalidate('students', 'resumes', f'student:{user_id}')
             return make_response(jsonify({'message': 'Co-op deleted successfully'}), 200)
         except Exception as e:
             current_app.logger.error(f'Error in delete_student_coop: {str(e)}')
             return make_response(jsonify({'error': str(e)}), 500)
+
+# ------------------------------------------------------------
+@school_admin.route('/grades/import', methods=['POST'])
+def import_student_grades():
+    """
+    Bulk grade import. Send the CSV as a multipart "file" field or as a
+    text/csv request body; ?recorded_by= applies to rows without a
+    recorded_by column.
+    """
+    try:
+        upload = request.files.get('file')
+        if upload is not None:
+            stream = upload.stream
+        elif request.mimetype == 'text/csv':
+            stream = request.stream
+        else:
+            return make_response(jsonify({'error': 'send a CSV file as "file" or a text/csv body'}), 400)
+
+        recorded_by = request.args.get('recorded_by') or request.form.get('recorded_by')
+        report, students = import_grades(db.get_db(), read_csv(stream), recorded_by)
+        if students:
+            cache.invalidate('students', 'resumes', *(f'student:{user_id}' for user_id in students))
+        return make_response(jsonify(report), 200)
+    except GradeImportError as e:
+        return make_response(jsonify({'error': str(e)}), 400)
+    except Exception as e:
+        db.get_db().rollback()
+        current_app.logger.error(f'Error in import_student_grades: {str(e)}')
+        return make_response(jsonify({'error': str(e)}), 500)
+
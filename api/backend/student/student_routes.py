@@ -1,24 +1,32 @@
 from flask import Blueprint, request, jsonify, make_response, current_app
+from backend.cache import cache
+from backend.data import define
 from backend.db_connection import db
+from backend.pagination import CursorError, NULLABLE, keyset_condition, order_clause, page_args, page_response
+from backend.projections import adjust_application_counters, refresh_current_application
+from backend.resume_store import RESUME_COLUMNS, RESUME_SECTIONS, create_version, current_version
 
 student = Blueprint('student', __name__)
 
 #------------------------------------------------------------
 # Get student personal information
+STUDENT_INFO_QUERY = define('student.info', f'''
+    SELECT s.user_id, s.full_name, s.email, u.dob, u.gender,
+           r.education, sk.content AS skills, pj.content AS projects, r.co_op
+    FROM student s
+    JOIN user u ON s.user_id = u.user_id
+    LEFT JOIN current_resume cr ON cr.user_id = s.user_id
+    LEFT JOIN resume r ON r.resume_id = cr.resume_id
+    {RESUME_SECTIONS}
+    WHERE s.user_id = %s
+''')
+
 @student.route('/info/<int:user_id>', methods=['GET'])
+@cache.conditional(tags=('student:{user_id}',))
 def get_student_info(user_id):
     try:
         cursor = db.get_db().cursor()
-        cursor.execute('''
-            SELECT s.user_id, s.full_name, s.email, u.dob, u.gender,
-                   r.education, r.skills, r.projects, r.co_op
-            FROM student s
-            JOIN user u ON s.user_id = u.user_id
-            LEFT JOIN resume r ON s.user_id = r.user_id
-            WHERE s.user_id = %s
-            ORDER BY r.time_uploaded DESC
-            LIMIT 1
-        ''', (user_id,))
+        cursor.execute(STUDENT_INFO_QUERY, (user_id,))
         student_info = cursor.fetchone()
         
         if not student_info:
@@ -31,18 +39,21 @@ def get_student_info(user_id):
 
 #------------------------------------------------------------
 # Get student grades
+GRADES_QUERY = define('student.grades', '''
+    SELECT g.course_name, g.grade, g.recorded_date, sa.full_name AS recorded_by
+    FROM grade_record g
+    JOIN school_admin sa ON g.recorded_by = sa.admin_id
+    WHERE g.student_id = %s
+    ORDER BY g.recorded_date DESC
+''')
+
 @student.route('/<int:user_id>/grades', methods=['GET'])
+@cache.conditional(tags=('student:{user_id}',))
 def get_student_grades(user_id):
     """Get student academic records"""
     try:
         cursor = db.get_db().cursor()
-        cursor.execute('''
-            SELECT g.course_name, g.grade, g.recorded_date, sa.full_name AS recorded_by
-            FROM grade_record g
-            JOIN school_admin sa ON g.recorded_by = sa.admin_id
-            WHERE g.student_id = %s
-            ORDER BY g.recorded_date DESC
-        ''', (user_id,))
+        cursor.execute(GRADES_QUERY, (user_id,))
         grades = cursor.fetchall()
 
         if not grades:
@@ -56,17 +67,20 @@ def get_student_grades(user_id):
 
 #------------------------------------------------------------
 # Get student co-op records
+COOPS_QUERY = define('student.coops', '''
+    SELECT co_op_id, company_name, start_date, end_date, 
+           (SELECT full_name FROM school_admin WHERE admin_id = co_op_record.approved_by) AS approved_by
+    FROM co_op_record
+    WHERE student_id = %s
+    ORDER BY start_date DESC
+''')
+
 @student.route('/<int:user_id>/coops', methods=['GET'])
+@cache.conditional(tags=('student:{user_id}',))
 def get_coop_history(user_id):
     try:
         cursor = db.get_db().cursor()
-        cursor.execute('''
-            SELECT co_op_id, company_name, start_date, end_date, 
-                   (SELECT full_name FROM school_admin WHERE admin_id = co_op_record.approved_by) AS approved_by
-            FROM co_op_record
-            WHERE student_id = %s
-            ORDER BY start_date DESC
-        ''', (user_id,))
+        cursor.execute(COOPS_QUERY, (user_id,))
         coops = cursor.fetchall()
 
         if not coops:
@@ -77,51 +91,66 @@ def get_coop_history(user_id):
         return make_response(jsonify({'error': str(e)}), 500)
 
 
+#------------------------------------------------------------
+# Get dashboard summary
+DASHBOARD_QUERY = define('student.dashboard', '''
+    SELECT
+        s.user_id,
+        s.full_name,
+        s.pending_applications AS active_applications,
+        s.resume_versions,
+        (SELECT c.company_name
+         FROM co_op_record c
+         WHERE c.student_id = s.user_id
+         ORDER BY c.end_date DESC
+         LIMIT 1) AS latest_coop,
+        lr.resume_id AS latest_resume_id,
+        lr.doc_name AS latest_resume_name,
+        lr.time_uploaded AS latest_resume_uploaded
+    FROM student s
+    LEFT JOIN current_resume cr ON cr.user_id = s.user_id
+    LEFT JOIN resume lr ON lr.resume_id = cr.resume_id
+    WHERE s.user_id = %s
+''')
+
+def _fetch_dashboard(user_id):
+    """Every dashboard figure for one student in a single round trip"""
+    cursor = db.get_db().cursor()
+    cursor.execute(DASHBOARD_QUERY, (user_id,))
+    return cursor.fetchone()
+
+
+@student.route('/<int:user_id>/dashboard', methods=['GET'])
+@cache.conditional(tags=('student:{user_id}', 'student_counters'))
+def get_student_dashboard(user_id):
+    """Fetch metrics, latest resume and latest co-op for the landing page"""
+    try:
+        dashboard = _fetch_dashboard(user_id)
+        if not dashboard:
+            return make_response(jsonify({'error': 'Student not found'}), 404)
+
+        return make_response(jsonify(dashboard), 200)
+    except Exception as e:
+        current_app.logger.error(f"Error fetching dashboard for user {user_id}: {str(e)}")
+        return make_response(jsonify({"error": str(e)}), 500)
+
+
 #------------------------------------------------------------
 # Get dashboard metrics
 @student.route('/<int:user_id>/metrics', methods=['GET'])
+@cache.conditional(tags=('student:{user_id}', 'student_counters'))
 def get_student_metrics(user_id):
     """Fetch student metrics for dashboard"""
     try:
-        cursor = db.get_db().cursor()
-
-        # Query for active applications
-        cursor.execute('''
-            SELECT COUNT(*) AS active_applications
-            FROM application 
-            WHERE user_id = %s AND status = 'Pending'
-        ''', (user_id,))
-        active_applications_result = cursor.fetchone()
-        
+        dashboard = _fetch_dashboard(user_id)
+        if not dashboard:
+            return make_response(jsonify({'error': 'Student not found'}), 404)
 
-        # Query for resume versions
-        cursor.execute('''
-            SELECT COUNT(*) AS resume_versions
-            FROM resume 
-            WHERE user_id = %s
-        ''', (user_id,))
-        resume_versions_result = cursor.fetchone()
-
-        # Query for latest co-op experience
-        cursor.execute('''
-            SELECT company_name AS latest_coop
-            FROM co_op_record 
-            WHERE student_id = %s 
-            ORDER BY end_date DESC 
-            LIMIT 1
-        ''', (user_id,))
-        latest_coop_result = cursor.fetchone()
-       
-
-        # Combine results
         metrics = {
-            "active_applications": active_applications_result,
-            "resume_versions": resume_versions_result,
-            "latest_coop": latest_coop_result
+            "active_applications": dashboard['active_applications'],
+            "resume_versions": dashboard['resume_versions'],
+            "latest_coop": dashboard['latest_coop']
         }
-
-        current_app.logger.info(f"Metrics for user {user_id}: {metrics}")
-
         return make_response(jsonify(metrics), 200)
     except Exception as e:
         current_app.logger.error(f"Error fetching metrics for user {user_id}: {str(e)}")
@@ -131,19 +160,22 @@ def get_student_metrics(user_id):
 
 #------------------------------------------------------------
 # Get resume details
+CURRENT_RESUME_QUERY = define('student.current_resume', f'''
+    SELECT {RESUME_COLUMNS}, s.full_name, s.email
+    FROM current_resume cr
+    JOIN resume r ON r.resume_id = cr.resume_id
+    JOIN student s ON s.user_id = cr.user_id
+    {RESUME_SECTIONS}
+    WHERE cr.user_id = %s
+''')
+
 @student.route('/<int:user_id>/resume', methods=['GET'])
+@cache.conditional(tags=('student:{user_id}',))
 def get_current_resume(user_id):
     """Get the current resume of a student"""
     try:
         cursor = db.get_db().cursor()
-        cursor.execute('''
-            SELECT r.*, s.full_name, s.email
-            FROM resume r
-            JOIN student s ON r.user_id = s.user_id
-            WHERE r.user_id = %s
-            ORDER BY r.time_uploaded DESC
-            LIMIT 1
-        ''', (user_id,))
+        cursor.execute(CURRENT_RESUME_QUERY, (user_id,))
         resume = cursor.fetchone()
 
         if not resume:
@@ -159,61 +191,85 @@ def get_current_resume(user_id):
 # Update resume content
 @student.route('/<int:user_id>/resume', methods=['PUT'])
 def update_resume(user_id):
-    """Update the resume of a student (excluding education and co-op)"""
+    """
+    Save an edit of the resume as a new version (education and co-op
+    excluded). Sections missing from the body are carried over.
+    """
     try:
         resume_data = request.json
 
-        cursor = db.get_db().cursor()
-        cursor.execute('''
-            SELECT education, co_op 
-            FROM resume 
-            WHERE user_id = %s
-        ''', (user_id,))
-        current_resume = cursor.fetchone()
-        
-        if not current_resume:
-            return make_response(jsonify({'message': 'Resume not found'}), 404)
-        
         if ('education' in resume_data or 'co_op' in resume_data):
             return make_response(
                 jsonify({'message': 'Education and Co-op fields can only be updated by School Admin'}),
                 403
             )
-        
-        cursor.execute('''
-            UPDATE resume
-            SET skills = %s,
-                projects = %s,
-                doc_name = %s,
-                time_uploaded = CURRENT_TIMESTAMP
-            WHERE user_id = %s
-        ''', (
-            resume_data.get('skills'),
-            resume_data.get('projects'),
-            resume_data.get('doc_name'),
-            user_id
-        ))
+
+        cursor = db.get_db().cursor()
+        current_resume = current_version(cursor, user_id, for_update=True)
+        if not current_resume:
+            db.get_db().rollback()
+            return make_response(jsonify({'message': 'Resume not found'}), 404)
+
+        changes = {field: resume_data[field]
+                   for field in ('doc_name', 'skills', 'projects') if field in resume_data}
+        resume_id = create_version(cursor, user_id, current_resume, changes)
         db.get_db().commit()
-        return make_response(jsonify({'message': 'Resume updated successfully'}), 200)
-        
+        if resume_id is None:
+            return make_response(jsonify({'message': 'Resume unchanged',
+                                          'resume_id': current_resume['resume_id']}), 200)
+
+        cache.invalidate(f'student:{user_id}', 'resumes')
+        return make_response(jsonify({'message': 'Resume updated successfully',
+                                      'resume_id': resume_id}), 200)
+
     except Exception as e:
         db.get_db().rollback()
         current_app.logger.error(f"Error in update_resume: {str(e)}")
         return make_response(jsonify({'message': 'Failed to update resume'}), 500)
+
+#------------------------------------------------------------
+# List resume versions
+RESUME_VERSIONS_QUERY = define('student.resume_versions', '''
+    SELECT r.resume_id, r.doc_name, r.time_uploaded,
+           r.resume_id = cr.resume_id AS is_current
+    FROM resume r
+    LEFT JOIN current_resume cr ON cr.user_id = r.user_id
+    WHERE r.user_id = %s
+    ORDER BY r.time_uploaded DESC, r.resume_id DESC
+''')
+
+@student.route('/<int:user_id>/resume/versions', methods=['GET'])
+@cache.conditional(tags=('student:{user_id}',))
+def get_resume_versions(user_id):
+    """Every version of a student's resume, newest first"""
+    try:
+        cursor = db.get_db().cursor()
+        cursor.execute(RESUME_VERSIONS_QUERY, (user_id,))
+        versions = cursor.fetchall()
+        for version in versions:
+            version['is_current'] = bool(version['is_current'])
+        return make_response(jsonify(versions), 200)
+    except Exception as e:
+        current_app.logger.error(f"Error in get_resume_versions: {str(e)}")
+        return make_response(jsonify({'error': str(e)}), 500)
+
 #------------------------------------------------------------
 # View resume suggestions
+SUGGESTIONS_QUERY = define('student.suggestions', '''
+    SELECT s.suggestion_id, s.suggestion_text, s.time_created
+    FROM suggestion s
+    JOIN resume r ON s.resume_id = r.resume_id
+    WHERE r.user_id = %s
+    ORDER BY s.time_created DESC
+''')
+
 @student.route('/<int:user_id>/resume/suggestions', methods=['GET'])
+@cache.conditional(tags=('student:{user_id}',))
 def get_resume_suggestions(user_id):
     """Get suggestions for the current resume of a student"""
     try:
         cursor = db.get_db().cursor()
-        cursor.execute('''
-            SELECT s.suggestion_id, s.suggestion_text, s.time_created
-            FROM suggestion s
-            JOIN resume r ON s.resume_id = r.resume_id
-            WHERE r.user_id = %s
-            ORDER BY s.time_created DESC
-        ''', (user_id,))
+        cursor.execute(SUGGESTIONS_QUERY, (user_id,))
         suggestions = cursor.fetchall()
 
         if not suggestions:
@@ -226,26 +282,29 @@ def get_resume_suggestions(user_id):
 
 #------------------------------------------------------------
 # Get active applications for a student
+ACTIVE_APPLICATIONS_QUERY = define('student.active_applications', '''
+    SELECT 
+        a.application_id,
+        i.title AS position_title,
+        i.description AS position_description,
+        i.requirements,
+        h.company_name,
+        a.status,
+        a.sent_on
+    FROM application a
+    JOIN internship_position i ON a.position_id = i.position_id
+    JOIN hr_manager h ON i.hr_id = h.hr_id
+    WHERE a.user_id = %s AND a.status = 'Pending'
+    ORDER BY a.sent_on DESC
+''')
+
 @student.route('/<int:user_id>/applications/active', methods=['GET'])
+@cache.conditional(tags=('student:{user_id}',))
 def get_active_applications(user_id):
     """Get active internship applications for a student"""
     try:
         cursor = db.get_db().cursor()
-        cursor.execute('''
-            SELECT 
-                a.application_id,
-                i.title AS position_title,
-                i.description AS position_description,
-                i.requirements,
-                h.company_name,
-                a.status,
-                a.sent_on
-            FROM application a
-            JOIN internship_position i ON a.position_id = i.position_id
-            JOIN hr_manager h ON i.hr_id = h.hr_id
-            WHERE a.user_id = %s AND a.status = 'Pending'
-            ORDER BY a.sent_on DESC
-        ''', (user_id,))
+        cursor.execute(ACTIVE_APPLICATIONS_QUERY, (user_id,))
         
         active_applications = cursor.fetchall()
         if not active_applications:
@@ -261,34 +320,41 @@ def get_active_applications(user_id):
 
 #------------------------------------------------------------
 # View application history
+HISTORY_SORT = [('a.sent_on', 'DESC', NULLABLE), ('a.application_id', 'DESC')]
+HISTORY_QUERY = define('student.history', '''
+    SELECT 
+        a.application_id,
+        i.title AS position_title,
+        i.description AS position_description,
+        i.requirements,
+        h.company_name,
+        a.status,
+        a.sent_on
+    FROM application a
+    JOIN internship_position i ON a.position_id = i.position_id
+    JOIN hr_manager h ON i.hr_id = h.hr_id
+    WHERE a.user_id = %s AND a.status != 'Pending' AND {keyset}
+    ORDER BY {order}
+    LIMIT %s
+''')
+
 @student.route('/<int:user_id>/applications/history', methods=['GET'])
+@cache.conditional(tags=('student:{user_id}',))
 def get_application_history(user_id):
     try:
+        limit, after = page_args(HISTORY_SORT)
+        keyset, keyset_params = keyset_condition(HISTORY_SORT, after)
+
         cursor = db.get_db().cursor()
-        cursor.execute('''
-            SELECT 
-                a.application_id,
-                i.title AS position_title,
-                i.description AS position_description,
-                i.requirements,
-                h.company_name,
-                a.status,
-                a.sent_on
-            FROM application a
-            JOIN internship_position i ON a.position_id = i.position_id
-            JOIN hr_manager h ON i.hr_id = h.hr_id
-            WHERE a.user_id = %s AND a.status != 'Pending'
-            ORDER BY a.sent_on DESC
-        ''', (user_id,))
-        application_history = cursor.fetchall()
-
-        # Debugging output to check data
-        current_app.logger.info(f"Application History Data: {application_history}")
-
-        if not application_history:
-            return make_response(jsonify([]), 200)
+        cursor.execute(HISTORY_QUERY.format(keyset=keyset, order=order_clause(HISTORY_SORT)),
+                       (user_id, *keyset_params, limit + 1))
+        page = page_response(cursor.fetchall(), limit, ('sent_on', 'application_id'))
 
-        return make_response(jsonify(application_history), 200)
+        current_app.logger.info(f"Application History page for user {user_id}: {len(page['items'])} rows")
+
+        return make_response(jsonify(page), 200)
+    except CursorError as e:
+        return make_response(jsonify({'error': str(e)}), 400)
     except Exception as e:
         current_app.logger.error(f"Error fetching application history: {str(e)}")
         return make_response(jsonify({'error': str(e)}), 500)
@@ -296,36 +362,49 @@ def get_application_history(user_id):
 
 #------------------------------------------------------------
 # Get available positions for a student
+POSITIONS_SORT = [('i.posted_date', 'DESC'), ('i.position_id', 'DESC')]
+POSITIONS_QUERY = define('student.positions', '''
+    SELECT 
+        i.position_id,
+        i.title AS position_title,
+        i.description AS position_description,
+        i.requirements,
+        h.company_name,
+        i.posted_date,
+        i.status
+    FROM internship_position i
+    JOIN hr_manager h ON i.hr_id = h.hr_id
+    WHERE i.status = 'Active' AND {keyset}
+    ORDER BY {order}
+    LIMIT %s
+''')
+
 @student.route('/<int:user_id>/applications/positions', methods=['GET'])
+@cache.cached(tags=('positions',), key='/student/applications/positions')
 def get_available_positions(user_id):
     try:
+        limit, after = page_args(POSITIONS_SORT)
+        keyset, keyset_params = keyset_condition(POSITIONS_SORT, after)
+
         cursor = db.get_db().cursor()
-        cursor.execute('''
-            SELECT 
-                i.position_id,
-                i.title AS position_title,
-                i.description AS position_description,
-                i.requirements,
-                h.company_name,
-                i.posted_date,
-                i.status
-            FROM internship_position i
-            JOIN hr_manager h ON i.hr_id = h.hr_id
-            WHERE i.status = 'Active'
-            ORDER BY i.posted_date DESC
-        ''')
-        
-        result = cursor.fetchall()
-        if not result:
-            return make_response(jsonify({'message': 'No available positions found'}), 404)
+        cursor.execute(POSITIONS_QUERY.format(keyset=keyset, order=order_clause(POSITIONS_SORT)),
+                       (*keyset_params, limit + 1))
+        page = page_response(cursor.fetchall(), limit, ('posted_date', 'position_id'))
 
-        return make_response(jsonify(result), 200)
+        return make_response(jsonify(page), 200)
+    except CursorError as e:
+        return make_response(jsonify({'error': str(e)}), 400)
     except Exception as e:
         current_app.logger.error(f"Error fetching available positions: {str(e)}")
         return make_response(jsonify({'error': str(e)}), 500)
 
 # ------------------------------------------------------------
 # Add a new application
+ADD_APPLICATION_QUERY = define('student.add_application', '''
+    INSERT INTO application (user_id, position_id, sent_on, status)
+    VALUES (%s, %s, %s, %s)
+''')
+
 @student.route('/<int:user_id>/applications', methods=['POST'])
 def add_application(user_id):
     """Add a new application for a student."""
@@ -339,12 +418,11 @@ def add_application(user_id):
             return make_response(jsonify({'error': 'Missing required fields: position_id or sent_on'}), 400)
 
         cursor = db.get_db().cursor()
-        query = '''
-            INSERT INTO application (user_id, position_id, sent_on, status)
-            VALUES (%s, %s, %s, %s)
-        '''
-        cursor.execute(query, (user_id, position_id, sent_on, status))
+        cursor.execute(ADD_APPLICATION_QUERY, (user_id, position_id, sent_on, status))
+        adjust_application_counters(cursor, user_id, position_id, None, status)
+        refresh_current_application(cursor, user_id, position_id)
         db.get_db().commit()
+        cache.invalidate('applications', 'application_counts', f'student:{user_id}')
 
         return make_response(jsonify({'message': 'Application added successfully'}), 201)
     except Exception as e:
@@ -354,21 +432,36 @@ def add_application(user_id):
 
 # ------------------------------------------------------------
 # Delete an application
+LOCK_APPLICATION_QUERY = define('student.lock_application', '''
+    SELECT position_id, status
+    FROM application
+    WHERE application_id = %s AND user_id = %s
+    FOR UPDATE
+''')
+
+DELETE_APPLICATION_QUERY = define('student.delete_application', '''
+    DELETE FROM application
+    WHERE application_id = %s AND user_id = %s
+''')
+
 @student.route('/<int:user_id>/applications/<int:application_id>', methods=['DELETE'])
 def delete_application(user_id, application_id):
     """Delete an application for a student."""
     try:
         cursor = db.get_db().cursor()
-        query = '''
-            DELETE FROM application
-            WHERE application_id = %s AND user_id = %s
-        '''
-        cursor.execute(query, (application_id, user_id))
-        db.get_db().commit()
+        cursor.execute(LOCK_APPLICATION_QUERY, (application_id, user_id))
+        application = cursor.fetchone()
 
-        if cursor.rowcount == 0:
+        if not application:
             return make_response(jsonify({'error': 'Application not found or not authorized to delete'}), 404)
 
+        cursor.execute(DELETE_APPLICATION_QUERY, (application_id, user_id))
+        adjust_application_counters(cursor, user_id, application['position_id'],
+                                    application['status'], None)
+        refresh_current_application(cursor, user_id, application['position_id'])
+        db.get_db().commit()
+        cache.invalidate('applications', 'application_counts', f'student:{user_id}')
+
         return make_response(jsonify({'message': 'Application deleted successfully'}), 200)
     except Exception as e:
         db.get_db().rollback()
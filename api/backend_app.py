@@ -1,17 +1,35 @@
 ###
 # Main application interface
 ###
+import os
 
-# import the create app function 
+# import the create app function
 # that lives in src/__init__.py
-from backend.rest_entry import create_app
-
-# create the app object
-app = create_app()
+from backend.rest_entry import create_app, migrate_before_serving
 
 if __name__ == '__main__':
-    # we want to run in debug mode (for hot reloading) 
-    # this app will be bound to port 4000. 
-    # Take a look at the docker-compose.yml to see 
-    # what port this might be mapped to... 
+    mode = os.getenv('API_SERVER_MODE', 'development').strip().lower()
+    if mode in ('production', 'async'):
+        # the launcher only applies the migrations (DB_MIGRATE_ON_START);
+        # the server imports the app in its own process(es)
+        migrate_before_serving()
+    if mode == 'production':
+        # hand the process over to gunicorn (prefork workers, see
+        # gunicorn.conf.py); it imports `app` from this module
+        os.execvp('gunicorn', ['gunicorn', '--config', 'gunicorn.conf.py', 'backend_app:app'])
+    if mode == 'async':
+        # uvicorn event loop(s) serving async_app.py (see backend/aio)
+        os.execvp('uvicorn', ['uvicorn', 'async_app:app', '--host', '0.0.0.0',
+                              '--port', os.getenv('API_PORT', '4000'),
+                              '--workers', os.getenv('UVICORN_WORKERS', '1'),
+                              '--loop', 'asyncio', '--no-access-log'])
+
+    # we want to run in debug mode (for hot reloading)
+    # this app will be bound to port 4000.
+    # Take a look at the docker-compose.yml to see
+    # what port this might be mapped to...
+    app = create_app()
     app.run(debug = True, host = '0.0.0.0', port = 4000)
+else:
+    # create the app object (gunicorn imports it from here)
+    app = create_app()
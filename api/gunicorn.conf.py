@@ -0,0 +1,80 @@
+###
+# Gunicorn settings for the production serving mode
+# (API_SERVER_MODE=production, see backend_app.py)
+###
+import multiprocessing
+import os
+import shutil
+
+
+def _env_int(name, default):
+    value = os.getenv(name)
+    return int(value) if value and value.strip() else default
+
+
+bind = f"0.0.0.0:{_env_int('API_PORT', 4000)}"
+
+# prefork workers; each one gets its own connection pool
+workers = _env_int('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1)
+threads = _env_int('GUNICORN_THREADS', 4)
+worker_class = 'gthread' if threads > 1 else 'sync'
+
+# recycle workers after N requests (jitter keeps them from restarting together)
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 10000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', 1000)
+
+# `kill -HUP <master pid>` reloads workers gracefully within this window
+timeout = _env_int('GUNICORN_TIMEOUT', 60)
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+keepalive = _env_int('GUNICORN_KEEPALIVE', 5)
+
+# import the app once in the master so workers fork with it already loaded
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true').strip().lower() in ('1', 'true', 'yes')
+
+# workers write their Prometheus metrics to files in this directory so
+# that /metrics on any worker reports all of them (see backend/metrics.py);
+# set before the app (and prometheus_client) is imported
+if os.getenv('METRICS_ENABLED', 'false').strip().lower() in ('1', 'true', 'yes'):
+    os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/prometheus-multiproc')
+    os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+
+def _pool(app):
+    extensions = getattr(app, 'extensions', None) or {}
+    return extensions.get('mysql_pool')
+
+
+def post_fork(server, worker):
+    # never share sockets opened in the master with a forked worker
+    pool = _pool(server.app.callable)
+    if pool is not None:
+        pool.dispose()
+
+
+def post_worker_init(worker):
+    pool = _pool(worker.wsgi)
+    prefill = _env_int('DB_POOL_PREFILL', 0)
+    if pool is not None and prefill:
+        try:
+            opened = pool.prefill(prefill)
+            worker.log.info(f'worker {worker.pid}: opened {opened} pooled connections')
+        except Exception as e:
+            worker.log.warning(f'worker {worker.pid}: pool prefill failed: {str(e)}')
+
+
+def on_starting(server):
+    # drop the files of a previous run (once, not on every HUP reload)
+    directory = os.getenv('PROMETHEUS_MULTIPROC_DIR')
+    if directory:
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
+
+
+def child_exit(server, worker):
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
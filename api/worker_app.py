@@ -0,0 +1,18 @@
+###
+# Background job worker
+#
+# Runs the jobs queued in the `job` table (see backend/jobs):
+#   python worker_app.py
+###
+import logging
+import os
+
+from backend.jobs.worker import Worker
+from backend.rest_entry import create_app
+
+app = create_app()
+
+if __name__ == '__main__':
+    logging.basicConfig(level=os.getenv('JOB_LOG_LEVEL', 'INFO').upper(),
+                        format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    Worker(app, threads=int(os.getenv('JOB_WORKER_THREADS', '4'))).run()
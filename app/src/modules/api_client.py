@@ -0,0 +1,51 @@
+import threading
+from collections import OrderedDict
+
+import requests
+
+# Shared HTTP client for the API. Every widget interaction re-runs the
+# whole page script, so most GETs ask for data the app already has: the
+# client remembers the ETag and body of recent GET responses and sends
+# If-None-Match, and a 304 from the API is answered from that copy.
+
+MAX_ENTRIES = 512
+
+
+class ConditionalSession(requests.Session):
+    """requests.Session that revalidates GETs with If-None-Match"""
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        super().__init__()
+        self.max_entries = max_entries
+        self._entries = OrderedDict()   # url -> (etag, response)
+        self._lock = threading.Lock()
+
+    def request(self, method, url, params=None, headers=None, **kwargs):
+        if method.upper() != "GET":
+            return super().request(method, url, params=params, headers=headers, **kwargs)
+
+        key = requests.Request("GET", url, params=params).prepare().url
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                self._entries.move_to_end(key)
+
+        headers = dict(headers or {})
+        if entry:
+            headers.setdefault("If-None-Match", entry[0])
+
+        response = super().request(method, url, params=params, headers=headers, **kwargs)
+
+        if response.status_code == 304 and entry:
+            return entry[1]
+
+        etag = response.headers.get("ETag")
+        if response.status_code == 200 and etag:
+            with self._lock:
+                self._entries[key] = (etag, response)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return response
+
+
+api = ConditionalSession()
@@ -0,0 +1,47 @@
+import streamlit as st
+
+from modules.api_client import api
+
+# Helpers for the API's cursor-paginated list endpoints, which answer
+# with {"items": [...], "next_cursor": "..."}.
+
+DEFAULT_PAGE_SIZE = 50
+
+
+def fetch_pages(url, key, params=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Fetch as many pages of `url` as the user has asked for so far
+    (one until "Load more" is clicked). Only the page count is kept in
+    session state, so every rerun re-reads fresh data.
+
+    Returns (items, next_cursor). Raises requests.HTTPError when the
+    API answers with an error status.
+    """
+    pages = st.session_state.get(f"{key}_pages", 1)
+    items, cursor = [], None
+
+    for _ in range(pages):
+        query = dict(params or {}, limit=page_size)
+        if cursor:
+            query["cursor"] = cursor
+        response = api.get(url, params=query)
+        response.raise_for_status()
+        body = response.json()
+        items.extend(body.get("items", []))
+        cursor = body.get("next_cursor")
+        if not cursor:
+            break
+
+    return items, cursor
+
+
+def load_more_button(key, next_cursor, label="Load more"):
+    """Render a button that fetches one more page on the next rerun"""
+    if next_cursor and st.button(label, key=f"{key}_load_more"):
+        st.session_state[f"{key}_pages"] = st.session_state.get(f"{key}_pages", 1) + 1
+        st.rerun()
+
+
+def reset_pages(key):
+    """Go back to a single page (e.g. after a filter changed)"""
+    st.session_state.pop(f"{key}_pages", None)
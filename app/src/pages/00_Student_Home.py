@@ -1,7 +1,7 @@
 import streamlit as st
 from modules.nav import SideBarLinks
 import logging
-import requests
+from modules.api_client import api
 
 # Configure logging
 logging.basicConfig(format='%(filename)s:%(lineno)s:%(levelname)s -- %(message)s', level=logging.INFO)
@@ -10,15 +10,14 @@ logger = logging.getLogger(__name__)
 def load_student_metrics(user_id=1):
     """Load metrics for student dashboard display"""
     try:
-        # Get student metrics
-        response = requests.get(f"http://web-api:4000/student/{user_id}/metrics")
+        # One call returns every figure the dashboard shows
+        response = api.get(f"http://web-api:4000/student/{user_id}/dashboard")
         if response.status_code == 200:
-            metrics = response.json()
+            dashboard = response.json()
 
-            # Correctly extract nested data
-            active_applications = metrics.get('active_applications', {}).get('active_applications', 0)
-            resume_versions = metrics.get('resume_versions', {}).get('resume_versions', 0)
-            latest_coop = metrics.get('latest_coop', {}).get('latest_coop', "None")
+            active_applications = dashboard.get('active_applications') or 0
+            resume_versions = dashboard.get('resume_versions') or 0
+            latest_coop = dashboard.get('latest_coop') or "None"
 
             return active_applications, resume_versions, latest_coop
         else:
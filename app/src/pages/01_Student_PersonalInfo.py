@@ -1,8 +1,8 @@
 import streamlit as st
-import requests
 import pandas as pd
 from datetime import datetime
 from modules.nav import SideBarLinks
+from modules.api_client import api
 
 # Page config
 st.title("Personal Information")
@@ -22,7 +22,7 @@ tabs = st.tabs(["Basic Information", "Academic Records", "Co-op History"])
 # Basic Information Tab
 with tabs[0]:
     with st.spinner("Loading personal information..."):
-        response = requests.get(f"http://web-api:4000/student/info/{user_id}")
+        response = api.get(f"http://web-api:4000/student/info/{user_id}")
         
     if response.status_code == 200:
         info = response.json()
@@ -48,7 +48,7 @@ with tabs[0]:
 # Academic Records Tab
 with tabs[1]:
     with st.spinner("Loading academic records..."):
-        response = requests.get(f"http://web-api:4000/student/{user_id}/grades")
+        response = api.get(f"http://web-api:4000/student/{user_id}/grades")
         
     if response.status_code == 200:
         grades = response.json()
@@ -68,7 +68,7 @@ with tabs[1]:
 # Co-op History Tab
 with tabs[2]:
     with st.spinner("Loading co-op history..."):
-        response = requests.get(f"http://web-api:4000/student/{user_id}/coops")
+        response = api.get(f"http://web-api:4000/student/{user_id}/coops")
         
     if response.status_code == 200:
         coops = response.json()
@@ -3,6 +3,7 @@ import requests
 import pandas as pd
 from datetime import datetime
 from modules.nav import SideBarLinks
+from modules.api_client import api
 
 # Page config
 st.title("Resume Management")
@@ -22,7 +23,7 @@ tabs = st.tabs(["Current Resume", "Update Resume", "Resume Suggestions"])
 # Current Resume Tab
 with tabs[0]:
     with st.spinner("Loading current resume..."):
-        response = requests.get(f"http://web-api:4000/student/{user_id}/resume")
+        response = api.get(f"http://web-api:4000/student/{user_id}/resume")
         if response.status_code == 200:
             resume = response.json()
             st.write("### Current Resume")
@@ -31,13 +32,18 @@ with tabs[0]:
             st.write(f"**Skills:** {resume.get('skills', 'N/A')}")
             st.write(f"**Projects:** {resume.get('projects', 'N/A')}")
             st.write(f"**Co-op:** {resume.get('co_op', 'N/A')}")
+
+            versions_response = api.get(f"http://web-api:4000/student/{user_id}/resume/versions")
+            if versions_response.status_code == 200:
+                with st.expander("Version history"):
+                    st.dataframe(pd.DataFrame(versions_response.json()))
         else:
             st.error("Failed to load current resume")
 
 # Update Resume Tab
 with tabs[1]:
     with st.spinner("Loading resume details..."):
-        response = requests.get(f"http://web-api:4000/student/{user_id}/resume")
+        response = api.get(f"http://web-api:4000/student/{user_id}/resume")
         if response.status_code == 200:
             resume = response.json()
             st.write("### Update Resume")
@@ -91,7 +97,7 @@ with tabs[1]:
 # Resume Suggestions Tab
 with tabs[2]:
     with st.spinner("Loading resume suggestions..."):
-        response = requests.get(f"http://web-api:4000/student/{user_id}/resume/suggestions")
+        response = api.get(f"http://web-api:4000/student/{user_id}/resume/suggestions")
         if response.status_code == 200:
             suggestions = response.json()
             st.write("### Resume Suggestions")
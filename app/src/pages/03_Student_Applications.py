@@ -2,6 +2,8 @@ import streamlit as st
 import requests
 from datetime import datetime
 from modules.nav import SideBarLinks
+from modules.pagination import fetch_pages, load_more_button
+from modules.api_client import api
 
 # Page title
 st.title("Application Tracker")
@@ -26,7 +28,7 @@ with tabs[0]:
     st.write("### Current Applications")
     try:
         with st.spinner("Loading active applications..."):
-            response = requests.get(f"http://web-api:4000/student/{user_id}/applications/active")
+            response = api.get(f"http://web-api:4000/student/{user_id}/applications/active")
             if response.status_code == 200:
                 active_apps = response.json()
                 if not active_apps:
@@ -48,20 +50,21 @@ with tabs[1]:
     st.write("### Application History")
     try:
         with st.spinner("Loading application history..."):
-            response = requests.get(f"http://web-api:4000/student/{user_id}/applications/history")
-            if response.status_code == 200:
-                application_history = response.json()
-                if not application_history:
-                    st.info("No application history found.")
-                else:
-                    for app in application_history:
-                        with st.expander(f"{app.get('position_title')} at {app.get('company_name')}"):
-                            st.write(f"**Status:** {app.get('status', 'Unknown')}")
-                            st.write(f"**Applied Date:** {app.get('sent_on', 'Unknown Date')}")
-                            st.write(f"**Position Description:** {app.get('position_description', 'No description available.')}")
-                            st.write(f"**Requirements:** {app.get('requirements', 'No requirements specified.')}")
-            else:
-                st.error("Unable to load application history.")
+            application_history, next_cursor = fetch_pages(
+                f"http://web-api:4000/student/{user_id}/applications/history", "application_history"
+            )
+        if not application_history:
+            st.info("No application history found.")
+        else:
+            for app in application_history:
+                with st.expander(f"{app.get('position_title')} at {app.get('company_name')}"):
+                    st.write(f"**Status:** {app.get('status', 'Unknown')}")
+                    st.write(f"**Applied Date:** {app.get('sent_on', 'Unknown Date')}")
+                    st.write(f"**Position Description:** {app.get('position_description', 'No description available.')}")
+                    st.write(f"**Requirements:** {app.get('requirements', 'No requirements specified.')}")
+            load_more_button("application_history", next_cursor)
+    except requests.exceptions.HTTPError:
+        st.error("Unable to load application history.")
     except Exception as e:
         st.error(f"An error occurred: {str(e)}")
 
@@ -70,20 +73,21 @@ with tabs[2]:
     st.write("### Available Positions")
     try:
         with st.spinner("Loading available positions..."):
-            response = requests.get(f"http://web-api:4000/student/{user_id}/applications/positions")
-            if response.status_code == 200:
-                available_positions = response.json()
-                if not available_positions:
-                    st.info("No available positions found.")
-                else:
-                    for position in available_positions:
-                        with st.expander(f"{position.get('position_title')} at {position.get('company_name')}"):
-                            st.write(f"**Status:** {position.get('status', 'Unknown')}")
-                            st.write(f"**Posted Date:** {position.get('posted_date', 'Unknown Date')}")
-                            st.write(f"**Position Description:** {position.get('position_description', 'No description available.')}")
-                            st.write(f"**Requirements:** {position.get('requirements', 'No requirements specified.')}")
-            else:
-                st.error("Unable to load available positions.")
+            available_positions, next_cursor = fetch_pages(
+                f"http://web-api:4000/student/{user_id}/applications/positions", "available_positions"
+            )
+        if not available_positions:
+            st.info("No available positions found.")
+        else:
+            for position in available_positions:
+                with st.expander(f"{position.get('position_title')} at {position.get('company_name')}"):
+                    st.write(f"**Status:** {position.get('status', 'Unknown')}")
+                    st.write(f"**Posted Date:** {position.get('posted_date', 'Unknown Date')}")
+                    st.write(f"**Position Description:** {position.get('position_description', 'No description available.')}")
+                    st.write(f"**Requirements:** {position.get('requirements', 'No requirements specified.')}")
+            load_more_button("available_positions", next_cursor)
+    except requests.exceptions.HTTPError:
+        st.error("Unable to load available positions.")
     except Exception as e:
         st.error(f"An error occurred: {str(e)}")
 
@@ -93,40 +97,41 @@ with tabs[3]:
     try:
         # Load available positions
         with st.spinner("Loading available positions..."):
-            response = requests.get(f"http://web-api:4000/student/{user_id}/applications/positions")
-            if response.status_code == 200:
-                available_positions = response.json()
-                if not available_positions:
-                    st.info("No positions available for application.")
-                else:
-                    position_dict = {f"{pos['position_title']} at {pos['company_name']}": pos['position_id'] for pos in available_positions}
-                    selected_position = st.selectbox("Select a Position", list(position_dict.keys()))
-                    position_id = position_dict[selected_position]
-                    position_details = next(pos for pos in available_positions if pos['position_id'] == position_id)
+            available_positions, next_cursor = fetch_pages(
+                f"http://web-api:4000/student/{user_id}/applications/positions", "apply_positions"
+            )
+        if not available_positions:
+            st.info("No positions available for application.")
+        else:
+            position_dict = {f"{pos['position_title']} at {pos['company_name']}": pos['position_id'] for pos in available_positions}
+            selected_position = st.selectbox("Select a Position", list(position_dict.keys()))
+            load_more_button("apply_positions", next_cursor, label="Load more positions")
+            position_id = position_dict[selected_position]
+            position_details = next(pos for pos in available_positions if pos['position_id'] == position_id)
 
-                    st.write(f"**Position Title:** {position_details.get('position_title')}")
-                    st.write(f"**Company Name:** {position_details.get('company_name')}")
-                    st.write(f"**Description:** {position_details.get('position_description', 'No description available.')}")
-                    st.write(f"**Requirements:** {position_details.get('requirements', 'No requirements specified.')}")
+            st.write(f"**Position Title:** {position_details.get('position_title')}")
+            st.write(f"**Company Name:** {position_details.get('company_name')}")
+            st.write(f"**Description:** {position_details.get('position_description', 'No description available.')}")
+            st.write(f"**Requirements:** {position_details.get('requirements', 'No requirements specified.')}")
 
-                    # Input for application date
-                    applied_date = st.date_input("Applied Date", datetime.now())
+            # Input for application date
+            applied_date = st.date_input("Applied Date", datetime.now())
 
-                    # Submit application
-                    if st.button("Add Application"):
-                        payload = {
-                            "position_id": position_id,
-                            "sent_on": applied_date.strftime("%Y-%m-%d"),
-                            "status": "Pending"
-                        }
-                        add_response = requests.post(f"http://web-api:4000/student/{user_id}/applications", json=payload)
-                        if add_response.status_code == 201:
-                            st.success("Application successfully added!")
-                            st.rerun()  # 添加自动刷新
-                        else:
-                            st.error(f"Failed to add application: {add_response.json().get('error', 'Unknown error')}")
-            else:
-                st.error("Unable to load available positions.")
+            # Submit application
+            if st.button("Add Application"):
+                payload = {
+                    "position_id": position_id,
+                    "sent_on": applied_date.strftime("%Y-%m-%d"),
+                    "status": "Pending"
+                }
+                add_response = requests.post(f"http://web-api:4000/student/{user_id}/applications", json=payload)
+                if add_response.status_code == 201:
+                    st.success("Application successfully added!")
+                    st.rerun()  # 添加自动刷新
+                else:
+                    st.error(f"Failed to add application: {add_response.json().get('error', 'Unknown error')}")
+    except requests.exceptions.HTTPError:
+        st.error("Unable to load available positions.")
     except Exception as e:
         st.error(f"An error occurred: {str(e)}")
 
@@ -136,7 +141,7 @@ with tabs[4]:
     try:
         # Load active applications for deletion
         with st.spinner("Loading applications..."):
-            response = requests.get(f"http://web-api:4000/student/{user_id}/applications/active")
+            response = api.get(f"http://web-api:4000/student/{user_id}/applications/active")
             if response.status_code == 200:
                 active_apps = response.json()
                 if not active_apps:
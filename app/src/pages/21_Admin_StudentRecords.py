@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
 import requests
+from modules.api_client import api
 
 BASE_API_URL = "http://web-api:4000"
 
@@ -16,7 +17,7 @@ user_id = st.text_input("Enter Student ID to Query Grades:")
 
 if user_id:
     # Fetch grades
-    response = requests.get(f"{BASE_API_URL}/school_admin/students/{user_id}/grades")
+    response = api.get(f"{BASE_API_URL}/school_admin/students/{user_id}/grades")
     
     if response.status_code == 200:
         grades = response.json()
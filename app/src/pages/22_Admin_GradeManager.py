@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 import requests
 import matplotlib.pyplot as plt
+from modules.api_client import api
 
 st.title("Student Grades Management")
 
@@ -12,7 +13,7 @@ if st.button("← Back to Home"):
 user_id = st.text_input("Enter Student ID to Query Grades:")
 
 if user_id:
-    response = requests.get(f"http://web-api:4000/school_admin/students/{user_id}/grades")
+    response = api.get(f"http://web-api:4000/school_admin/students/{user_id}/grades")
     if response.status_code == 200:
         grades = response.json()
         df = pd.DataFrame(grades)
@@ -32,3 +33,25 @@ if user_id:
                     st.error("Failed to update grade.")
     else:
         st.error("Failed to fetch grades from the API.")
+
+st.write("---")
+st.write("### Bulk Grade Import")
+st.caption("CSV with columns student_id, course_name, grade and optionally recorded_by.")
+
+uploaded = st.file_uploader("Grades CSV", type=["csv"])
+recorded_by = st.text_input("Recorded by (admin ID, for rows without recorded_by):")
+if uploaded is not None and st.button("Import Grades"):
+    import_response = requests.post(
+        "http://web-api:4000/school_admin/grades/import",
+        params={"recorded_by": recorded_by} if recorded_by else None,
+        files={"file": (uploaded.name, uploaded.getvalue(), "text/csv")},
+    )
+    if import_response.status_code == 200:
+        report = import_response.json()
+        st.success(f"Imported {report['inserted']} of {report['rows']} rows "
+                   f"for {report['students']} students.")
+        if report["errors"]:
+            st.warning(f"{report['failed']} rows were not imported.")
+            st.dataframe(pd.DataFrame(report["errors"]))
+    else:
+        st.error(f"Import failed: {import_response.json().get('error', import_response.text)}")
@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 import requests
 import matplotlib.pyplot as plt
+from modules.api_client import api
 
 st.title("Student Co-op Management")
 
@@ -12,7 +13,7 @@ if st.button("← Back to Home"):
 user_id = st.text_input("Enter Student ID to Query Co-ops:")
 
 if user_id:
-    response = requests.get(f"http://web-api:4000/school_admin/students/{user_id}/coops")
+    response = api.get(f"http://web-api:4000/school_admin/students/{user_id}/coops")
     if response.status_code == 200:
         coops = response.json()
         df = pd.DataFrame(coops)
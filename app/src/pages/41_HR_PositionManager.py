@@ -3,6 +3,7 @@ import requests
 from modules.nav import SideBarLinks
 import logging
 import time
+from modules.api_client import api
 
 logging.basicConfig(format='%(filename)s:%(lineno)s:%(levelname)s -- %(message)s', level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -25,38 +26,37 @@ def main():
     # Tab 1: Manage Positions
     with tabs[0]:
         try:
-            response = requests.get("http://web-api:4000/hr/internships")
-            if response.status_code == 200:
-                positions = response.json()
-                for pos in positions:
-                    with st.container():
-                        st.write(f"### {pos['title']} ({pos['status']})")
-                        st.write("**Description:**")
-                        st.write(pos['description'])
-                        st.write("**Requirements:**")
-                        st.write(pos['requirements'])
-                        st.write(f"**Posted on:** {pos['posted_date']}")
-                        
-                        # 简化按钮布局
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            if st.button("Edit", key=f"edit_{pos['position_id']}"):
-                                st.session_state['editing_position'] = pos
+            positions, next_cursor = fetch_pages("http://web-api:4000/hr/internships", "hr_positions")
+            for pos in positions:
+                with st.container():
+                    st.write(f"### {pos['title']} ({pos['status']})")
+                    st.write("**Description:**")
+                    st.write(pos['description'])
+                    st.write("**Requirements:**")
+                    st.write(pos['requirements'])
+                    st.write(f"**Posted on:** {pos['posted_date']}")
+
+                    # 简化按钮布局
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        if st.button("Edit", key=f"edit_{pos['position_id']}"):
+                            st.session_state['editing_position'] = pos
+                            st.rerun()
+                    with col2:
+                        if st.button("Delete", key=f"delete_{pos['position_id']}", type="secondary"):
+                            # 直接发送删除请求
+                            response = requests.delete(
+                                f"http://web-api:4000/hr/internships/{pos['position_id']}"
+                            )
+                            if response.status_code == 200:
+                                st.success("Position deleted successfully!")
                                 st.rerun()
-                        with col2:
-                            if st.button("Delete", key=f"delete_{pos['position_id']}", type="secondary"):
-                                # 直接发送删除请求
-                                response = requests.delete(
-                                    f"http://web-api:4000/hr/internships/{pos['position_id']}"
-                                )
-                                if response.status_code == 200:
-                                    st.success("Position deleted successfully!")
-                                    st.rerun()
-                                else:
-                                    st.error(f"Failed to delete position: {response.json().get('error', 'Unknown error')}")
-                        st.divider()
-            else:
-                st.error("Failed to load positions")
+                            else:
+                                st.error(f"Failed to delete position: {response.json().get('error', 'Unknown error')}")
+                    st.divider()
+            load_more_button("hr_positions", next_cursor)
+        except requests.exceptions.HTTPError:
+            st.error("Failed to load positions")
         except Exception as e:
             st.error(f"Error: {str(e)}")
 
@@ -109,7 +109,7 @@ def main():
     # Tab 3: Analytics
     with tabs[2]:
         try:
-            response = requests.get("http://web-api:4000/hr/analytics/positions")
+            response = api.get("http://web-api:4000/hr/analytics/positions")
             if response.status_code == 200:
                 analytics = response.json()
                 st.write("### Overall Metrics")
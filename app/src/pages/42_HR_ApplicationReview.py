@@ -1,13 +1,28 @@
 import streamlit as st
 import requests
 from modules.nav import SideBarLinks
+from modules.pagination import fetch_pages, load_more_button, reset_pages
 import logging
 import time
+from modules.api_client import api
 
 # Configure logging
 logging.basicConfig(format='%(filename)s:%(lineno)s:%(levelname)s -- %(message)s', level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def bulk_update_status(payload):
+    """Apply status changes to many applications in a single request"""
+    response = requests.post("http://web-api:4000/hr/applications/bulk-status", json=payload)
+    if response.status_code == 200:
+        result = response.json()
+        skipped = [r for r in result["results"] if r["result"] != "updated"]
+        st.success(f"Updated {result['updated']} application(s)")
+        if skipped:
+            st.warning(f"{len(skipped)} application(s) could not be updated")
+        st.rerun()
+    else:
+        st.error(f"Bulk update failed: {response.json().get('error', 'Unknown error')}")
+
 def main():
     # Authentication Check
     if not st.session_state.get("authenticated") or st.session_state.get("role") != "HR_Manager":
@@ -27,120 +42,147 @@ def main():
     with tabs[0]:
         with st.spinner("Loading pending applications..."):
             try:
-                response = requests.get("http://web-api:4000/hr/applications", params={"status": "Pending"})
-                if response.status_code == 200:
-                    applications = response.json()
-                    positions = {}
-                    
-                    # Group applications by position
-                    for app in applications:
-                        pos_id = app.get('position_id')
-                        if pos_id:
-                            if pos_id not in positions:
-                                positions[pos_id] = []
-                            positions[pos_id].append(app)
-                    
-                    if positions:
-                        st.write(f"### Found {len(applications)} pending applications")
-                        
-                        for pos_id, apps in positions.items():
-                            st.write(f"### {apps[0]['position_title']}")
-                            
-                            for app in apps:
-                                with st.container():
-                                    col1, col2 = st.columns([3, 3])
-                                    with col1:
-                                        st.write(f"**Applicant:** {app['full_name']}")
-                                        st.write(f"**Email:** {app['email']}")
-                                        st.write(f"**Applied:** {app['sent_on']}")
-                                    
-                                    with col2:
-                                        # 将按钮排成一行
-                                        btn_col1, btn_col2, btn_col3 = st.columns(3)
-                                        with btn_col1:
-                                            if st.button("Accept", key=f"accept_{app['application_id']}", type="primary"):
-                                                response = requests.put(
-                                                    f"http://web-api:4000/hr/applications/{app['application_id']}",
-                                                    json={"status": "Accepted"}
-                                                )
-                                                if response.status_code == 200:
-                                                    st.success("Application accepted!")
-                                                    st.rerun()
-                                        
-                                        with btn_col2:
-                                            if st.button("Reject", key=f"reject_{app['application_id']}", type="secondary"):
-                                                response = requests.put(
-                                                    f"http://web-api:4000/hr/applications/{app['application_id']}",
-                                                    json={"status": "Rejected"}
-                                                )
-                                                if response.status_code == 200:
-                                                    st.success("Application rejected!")
-                                                    st.rerun()
-                                        
-                                        with btn_col3:
-                                            # 简化删除功能
-                                            if st.button("Delete", key=f"delete_{app['application_id']}", type="secondary"):
-                                                response = requests.delete(
-                                                    f"http://web-api:4000/hr/applications/{app['application_id']}"
-                                                )
-                                                if response.status_code == 200:
-                                                    st.success("Application deleted!")
-                                                    st.rerun()
-                                                else:
-                                                    st.error(f"Failed to delete application: {response.json().get('error', 'Unknown error')}")
-                                    
-                                    st.divider()
-                    else:
-                        st.info("No pending applications to review.")
+                applications, next_cursor = fetch_pages(
+                    "http://web-api:4000/hr/applications", "pending_applications", params={"status": "Pending"}
+                )
+                positions = {}
+
+                # Group applications by position
+                for app in applications:
+                    pos_id = app.get('position_id')
+                    if pos_id:
+                        if pos_id not in positions:
+                            positions[pos_id] = []
+                        positions[pos_id].append(app)
+
+                if positions:
+                    st.write(f"### Showing {len(applications)} pending applications")
+
+                    for pos_id, apps in positions.items():
+                        st.write(f"### {apps[0]['position_title']}")
+
+                        # Bulk actions: one request for the whole selection
+                        names = {app['application_id']: app['full_name'] for app in apps}
+                        selected = st.multiselect(
+                            "Select applicants",
+                            options=list(names),
+                            format_func=lambda app_id, names=names: names[app_id],
+                            key=f"bulk_select_{pos_id}"
+                        )
+                        bulk_col1, bulk_col2, bulk_col3 = st.columns(3)
+                        with bulk_col1:
+                            if st.button("Accept selected", key=f"bulk_accept_{pos_id}", disabled=not selected):
+                                bulk_update_status({"updates": [
+                                    {"application_id": app_id, "status": "Accepted"} for app_id in selected
+                                ]})
+                        with bulk_col2:
+                            if st.button("Reject selected", key=f"bulk_reject_{pos_id}", disabled=not selected):
+                                bulk_update_status({"updates": [
+                                    {"application_id": app_id, "status": "Rejected"} for app_id in selected
+                                ]})
+                        with bulk_col3:
+                            if st.button("Reject all pending", key=f"bulk_reject_all_{pos_id}"):
+                                bulk_update_status({"position_id": pos_id, "from_status": "Pending", "status": "Rejected"})
+
+                        for app in apps:
+                            with st.container():
+                                col1, col2 = st.columns([3, 3])
+                                with col1:
+                                    st.write(f"**Applicant:** {app['full_name']}")
+                                    st.write(f"**Email:** {app['email']}")
+                                    st.write(f"**Applied:** {app['sent_on']}")
+
+                                with col2:
+                                    # 将按钮排成一行
+                                    btn_col1, btn_col2, btn_col3 = st.columns(3)
+                                    with btn_col1:
+                                        if st.button("Accept", key=f"accept_{app['application_id']}", type="primary"):
+                                            response = requests.put(
+                                                f"http://web-api:4000/hr/applications/{app['application_id']}",
+                                                json={"status": "Accepted"}
+                                            )
+                                            if response.status_code == 200:
+                                                st.success("Application accepted!")
+                                                st.rerun()
+
+                                    with btn_col2:
+                                        if st.button("Reject", key=f"reject_{app['application_id']}", type="secondary"):
+                                            response = requests.put(
+                                                f"http://web-api:4000/hr/applications/{app['application_id']}",
+                                                json={"status": "Rejected"}
+                                            )
+                                            if response.status_code == 200:
+                                                st.success("Application rejected!")
+                                                st.rerun()
+
+                                    with btn_col3:
+                                        # 简化删除功能
+                                        if st.button("Delete", key=f"delete_{app['application_id']}", type="secondary"):
+                                            response = requests.delete(
+                                                f"http://web-api:4000/hr/applications/{app['application_id']}"
+                                            )
+                                            if response.status_code == 200:
+                                                st.success("Application deleted!")
+                                                st.rerun()
+                                            else:
+                                                st.error(f"Failed to delete application: {response.json().get('error', 'Unknown error')}")
+
+                                st.divider()
                 else:
-                    st.error("Failed to load applications")
+                    st.info("No pending applications to review.")
+                load_more_button("pending_applications", next_cursor)
+            except requests.exceptions.HTTPError:
+                st.error("Failed to load applications")
             except Exception as e:
                 st.error(f"Error: {str(e)}")
 
     # Tab 2: Review History
     with tabs[1]:
         try:
-            response = requests.get("http://web-api:4000/hr/applications")
-            if response.status_code == 200:
-                applications = response.json()
-                
-                status_filter = st.selectbox(
-                    "Filter by Status",
-                    ["All", "Accepted", "Rejected", "Pending"]
-                )
-                
-                filtered_apps = applications if status_filter == "All" else [
-                    app for app in applications 
-                    if app.get('status', '').upper() == status_filter.upper()
-                ]
-                
-                if filtered_apps:
-                    # Display metrics
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        st.metric("Total", len(applications))
-                    with col2:
-                        st.metric("Accepted", sum(1 for app in applications if app.get('status') == 'Accepted'))
-                    with col3:
-                        st.metric("Rejected", sum(1 for app in applications if app.get('status') == 'Rejected'))
-                    
-                    # Display applications
-                    for app in filtered_apps:
-                        st.write(f"### {app['full_name']} - {app['position_title']}")
-                        st.write(f"**Status:** {app.get('status', 'Unknown')}")
-                        st.write(f"**Applied:** {app.get('sent_on', 'Unknown')}")
-                        st.divider()
-                else:
-                    st.info(f"No applications found with status: {status_filter}")
+            status_filter = st.selectbox(
+                "Filter by Status",
+                ["All", "Accepted", "Rejected", "Pending"],
+                on_change=reset_pages,
+                args=("review_history",)
+            )
+
+            # Totals come from the server-side aggregate rather than
+            # from however many pages happen to be loaded
+            analytics_response = api.get("http://web-api:4000/hr/analytics/positions")
+            if analytics_response.status_code == 200:
+                analytics = analytics_response.json()
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Total", sum(int(pos.get('total_applications', 0)) for pos in analytics))
+                with col2:
+                    st.metric("Accepted", sum(int(pos.get('accepted', 0)) for pos in analytics))
+                with col3:
+                    st.metric("Rejected", sum(int(pos.get('rejected', 0)) for pos in analytics))
+
+            params = {} if status_filter == "All" else {"status": status_filter}
+            filtered_apps, next_cursor = fetch_pages(
+                "http://web-api:4000/hr/applications", "review_history", params=params
+            )
+
+            if filtered_apps:
+                # Display applications
+                for app in filtered_apps:
+                    st.write(f"### {app['full_name']} - {app['position_title']}")
+                    st.write(f"**Status:** {app.get('status', 'Unknown')}")
+                    st.write(f"**Applied:** {app.get('sent_on', 'Unknown')}")
+                    st.divider()
+                load_more_button("review_history", next_cursor)
             else:
-                st.error("Failed to load applications")
+                st.info(f"No applications found with status: {status_filter}")
+        except requests.exceptions.HTTPError:
+            st.error("Failed to load applications")
         except Exception as e:
             st.error(f"Error: {str(e)}")
 
     # Tab 3: Analytics
     with tabs[2]:
         try:
-            response = requests.get("http://web-api:4000/hr/analytics/positions")
+            response = api.get("http://web-api:4000/hr/analytics/positions")
             if response.status_code == 200:
                 analytics = response.json()
                 
@@ -3,6 +3,7 @@ from modules.nav import SideBarLinks
 import logging
 import requests
 from datetime import datetime
+from modules.api_client import api
 
 # Configure logging
 logging.basicConfig(format='%(filename)s:%(lineno)s:%(levelname)s -- %(message)s', level=logging.INFO)
@@ -12,7 +13,7 @@ logger = logging.getLogger(__name__)
 def fetch_data(url):
     """Fetch data from a given API endpoint."""
     try:
-        response = requests.get(url)
+        response = api.get(url)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
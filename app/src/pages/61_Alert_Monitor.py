@@ -2,6 +2,7 @@ import streamlit as st
 import requests
 import pandas as pd
 import logging
+from modules.pagination import fetch_pages, load_more_button
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -16,22 +17,15 @@ if st.button("← Back to Home"):
 def fetch_alerts():
     try:
         with st.spinner("Loading alerts..."):
-            response = requests.get(f"{API_BASE_URL}/alerts")
-            if response.status_code == 200:
-                data = response.json()
-                if data:
-                    return data
-                else:
-                    st.info("No alerts available.")
-                    return None
-            else:
-                st.error(f"Failed to fetch alerts. Status Code: {response.status_code}")
-                logger.error(f"API Error: {response.text}")
-                return None
+            return fetch_pages(f"{API_BASE_URL}/alerts", "alerts")
+    except requests.exceptions.HTTPError as e:
+        st.error(f"Failed to fetch alerts. Status Code: {e.response.status_code}")
+        logger.error(f"API Error: {e.response.text}")
+        return None, None
     except requests.exceptions.RequestException as e:
         st.error("Failed to connect to the server.")
         logger.error(f"Connection Error: {str(e)}")
-        return None
+        return None, None
 
 
 def update_alert(alert_id, metrics, alerts, severity):
@@ -62,47 +56,43 @@ def main():
     st.title("Alert History Management")
     st.write("Manage alert history for databases.")
 
-    with st.spinner("Loading alerts..."):
-        response = requests.get(f"{API_BASE_URL}/alerts")
-        if response.status_code == 200:
-            alerts = response.json()
-            if alerts:
+    alerts, next_cursor = fetch_alerts()
+    if alerts:
 
-                df = pd.DataFrame(alerts)
-                st.subheader("Current Alerts")
-                
-                st.dataframe(
-                    df,
-                    hide_index=True,
-                    use_container_width=True
-                )
+        df = pd.DataFrame(alerts)
+        st.subheader("Current Alerts")
+
+        st.dataframe(
+            df,
+            hide_index=True,
+            use_container_width=True
+        )
+        load_more_button("alerts", next_cursor)
 
-                st.subheader("Edit Alert")
-                
-                selected_alert = st.selectbox(
-                    "Select Alert to Edit",
-                    options=df["database_id"].tolist(),
-                    format_func=lambda x: f"Database: {df[df['database_id']==x]['database_name'].iloc[0]} ({x})"
+        st.subheader("Edit Alert")
+
+        selected_alert = st.selectbox(
+            "Select Alert to Edit",
+            options=df["database_id"].tolist(),
+            format_func=lambda x: f"Database: {df[df['database_id']==x]['database_name'].iloc[0]} ({x})"
+        )
+
+        if selected_alert:
+            alert_data = df[df["database_id"] == selected_alert].iloc[0]
+
+            with st.form("edit_alert_form"):
+                metrics = st.text_input("Metrics", value=alert_data["metrics"])
+                alerts_text = st.text_area("Alerts", value=alert_data["alerts"])
+                severity = st.selectbox(
+                    "Severity",
+                    options=["Low", "Medium", "High"],
+                    index=["Low", "Medium", "High"].index(alert_data["severity"])
                 )
 
-                if selected_alert:
-                    alert_data = df[df["database_id"] == selected_alert].iloc[0]
-                    
-                    with st.form("edit_alert_form"):
-                        metrics = st.text_input("Metrics", value=alert_data["metrics"])
-                        alerts_text = st.text_area("Alerts", value=alert_data["alerts"])
-                        severity = st.selectbox(
-                            "Severity",
-                            options=["Low", "Medium", "High"],
-                            index=["Low", "Medium", "High"].index(alert_data["severity"])
-                        )
-                        
-                        if st.form_submit_button("Update Alert"):
-                            update_alert(selected_alert, metrics, alerts_text, severity)
-            else:
-                st.info("No alerts available.")
-        else:
-            st.error(f"Failed to fetch alerts. Status Code: {response.status_code}")
+                if st.form_submit_button("Update Alert"):
+                    update_alert(selected_alert, metrics, alerts_text, severity)
+    elif alerts is not None:
+        st.info("No alerts available.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -2,6 +2,7 @@ import streamlit as st
 import requests
 import pandas as pd
 from datetime import datetime
+from modules.pagination import fetch_pages, load_more_button
 
 
 API_BASE_URL = "http://web-api:4000/maintenance_staff"
@@ -12,13 +13,10 @@ if st.button("← Back to Home"):
     
 def fetch_alterations():
     try:
-        response = requests.get(f"{API_BASE_URL}/alterations")
-        if response.status_code == 200:
-            return response.json()
-        return None
+        return fetch_pages(f"{API_BASE_URL}/alterations", "alterations")
     except Exception as e:
         st.error(f"Error fetching alterations: {str(e)}")
-        return None
+        return None, None
 
 def update_alteration(alteration_id, alteration_type, alteration_date):
     try:
@@ -42,12 +40,13 @@ def main():
     st.title("Data Alteration Management")
     st.write("Manage data alteration history for databases.")
 
-    alterations = fetch_alterations()
+    alterations, next_cursor = fetch_alterations()
 
     if alterations:
         st.subheader("Current Alterations")
         df = pd.DataFrame(alterations)
         st.dataframe(df, hide_index=True, use_container_width=True)
+        load_more_button("alterations", next_cursor)
         st.subheader("Edit Alteration")
         selected_alteration = st.selectbox(
             "Select Alteration to Edit",
@@ -65,14 +64,9 @@ def main():
                     key="edit_type"
                 )
                 
-                current_date = datetime.strptime(
-                    alteration_data["alteration_date"], 
-                    "%a, %d %b %Y %H:%M:%S GMT"
-                ).strftime("%Y-%m-%d")
-                
                 alteration_date = st.date_input(
                     "Alteration Date",
-                    value=datetime.strptime(current_date, "%Y-%m-%d"),
+                    value=datetime.fromisoformat(alteration_data["alteration_date"]),
                     key="edit_date"
                 )
                 
@@ -2,6 +2,7 @@ import streamlit as st
 import requests
 import pandas as pd
 from datetime import datetime
+from modules.pagination import fetch_pages, load_more_button
 
 API_BASE_URL = "http://web-api:4000/maintenance_staff"
 
@@ -11,13 +12,10 @@ if st.button("← Back to Home"):
     
 def fetch_backups():
     try:
-        response = requests.get(f"{API_BASE_URL}/backups")
-        if response.status_code == 200:
-            return response.json()
-        return None
+        return fetch_pages(f"{API_BASE_URL}/backups", "backups")
     except Exception as e:
         st.error(f"Error fetching backups: {str(e)}")
-        return None
+        return None, None
 
 def add_backup(database_id, backup_type, backup_date, details):
     try:
@@ -78,9 +76,8 @@ def delete_backup(backup_id):
 def format_backup_display(backup):
     date_str = backup['backup_date']
     try:
-        
-        date_obj = datetime.strptime(date_str, "%a, %d %b %Y %H:%M:%S GMT")
-        formatted_date = date_obj.strftime("%Y-%m-%d %H:%M")
+        # the API sends ISO-8601 dates
+        formatted_date = datetime.fromisoformat(date_str).strftime("%Y-%m-%d")
     except:
         formatted_date = date_str
 
@@ -92,7 +89,7 @@ def main():
 
     tab1, tab2 = st.tabs(["View and Edit", "Add and Delete"])
 
-    backups = fetch_backups()
+    backups, next_cursor = fetch_backups()
 
     # Tab 1: View and Edit
     with tab1:
@@ -104,6 +101,7 @@ def main():
                 hide_index=True,
                 use_container_width=True
             )
+            load_more_button("backups", next_cursor)
 
             st.subheader("Edit Backup")
          
@@ -131,14 +129,9 @@ def main():
                         index=["Full", "Incremental", "Differential"].index(backup_data["type"])
                     )
                     
-                    current_date = datetime.strptime(
-                        backup_data["backup_date"], 
-                        "%a, %d %b %Y %H:%M:%S GMT"
-                    ).strftime("%Y-%m-%d")
-                    
                     backup_date = st.date_input(
                         "Backup Date",
-                        value=datetime.strptime(current_date, "%Y-%m-%d")
+                        value=datetime.fromisoformat(backup_data["backup_date"])
                     )
                     
                     details = st.text_area(